@@ -6,6 +6,12 @@ __version__ = "1.0.0"
 __author__ = "DBA Formation Team"
 __license__ = "MIT"
 
-from .cli import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name):
+    # Import the CLI on first access so `import oracledba` stays cheap
+    if name == "main":
+        from .cli import main
+        return main
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,6 @@
+"""
+CLI command groups
+
+One module per command group. Modules are imported on demand by
+oracledba.cli.LazyGroup (see LAZY_COMMANDS) - do not import them here.
+"""
@@ -0,0 +1,42 @@
+"""
+ASM commands
+"""
+
+import click
+
+# ============================================================================
+# ASM COMMANDS
+# ============================================================================
+
+@click.group()
+def asm():
+    """💿 Automatic Storage Management"""
+    pass
+
+
+@asm.command('setup')
+@click.option('--disks', multiple=True, help='Disk devices')
+def asm_setup(disks):
+    """Configure ASM"""
+    from ..modules.asm import ASMManager
+    mgr = ASMManager()
+    mgr.setup(list(disks))
+
+
+@asm.command('create-diskgroup')
+@click.option('--name', required=True, help='Diskgroup name')
+@click.option('--redundancy', type=click.Choice(['EXTERNAL', 'NORMAL', 'HIGH']), default='NORMAL')
+@click.option('--disks', multiple=True, required=True, help='Disk paths')
+def asm_create_diskgroup(name, redundancy, disks):
+    """Create ASM diskgroup"""
+    from ..modules.asm import ASMManager
+    mgr = ASMManager()
+    mgr.create_diskgroup(name, redundancy, list(disks))
+
+
+@asm.command('status')
+def asm_status():
+    """Check ASM status"""
+    from ..modules.asm import ASMManager
+    mgr = ASMManager()
+    mgr.status()
@@ -0,0 +1,142 @@
+"""
+Database management, log and monitoring commands
+"""
+
+import sys
+
+import click
+
+# ============================================================================
+# DATABASE MANAGEMENT COMMANDS
+# ============================================================================
+
+@click.command()
+def status():
+    """📊 Show database status"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.show_status()
+
+
+@click.command()
+def start():
+    """▶️  Start database"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.start()
+
+
+@click.command()
+def stop():
+    """⏹️  Stop database"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.stop()
+
+
+@click.command()
+def restart():
+    """🔄 Restart database"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.restart()
+
+
+@click.command()
+@click.option('--sysdba', is_flag=True, help='Connect as SYSDBA')
+@click.option('--pdb', help='Connect to specific PDB')
+def sqlplus(sysdba, pdb):
+    """🔌 Connect to SQL*Plus"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.sqlplus(sysdba, pdb)
+
+
+@click.command()
+@click.argument('script', type=click.Path(exists=True))
+@click.option('--as-sysdba', is_flag=True, help='Execute as SYSDBA')
+def exec(script, as_sysdba):
+    """⚙️  Execute SQL or Shell script"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.exec_script(script, as_sysdba)
+
+
+# ============================================================================
+# MONITORING COMMANDS
+# ============================================================================
+
+@click.group()
+def logs():
+    """📝 View logs"""
+    pass
+
+
+@logs.command('alert')
+@click.option('--tail', default=50, help='Number of entries to show')
+@click.option('--since', help='Only entries after this time (30m, 2h, 7d, 2024-03-05 10:00)')
+@click.option('--until', help='Only entries before this time')
+@click.option('--grep', help='Only entries matching this regex (case-insensitive)')
+@click.option('--ora', help='Only entries with this ORA- code (e.g. 600, ORA-01555)')
+@click.option('--file', 'path', type=click.Path(exists=True, dir_okay=False),
+              help='Alert log to read (default: located under $ORACLE_BASE/diag)')
+def logs_alert(tail, since, until, grep, ora, path):
+    """View alert log"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    if not mgr.view_alert_log(tail, since=since, until=until, grep=grep, ora=ora, path=path):
+        sys.exit(1)
+
+
+@logs.command('listener')
+@click.option('--tail', default=50, help='Number of lines to show')
+@click.option('--report', is_flag=True, help='Aggregate connects/errors instead of printing lines')
+@click.option('--top', default=10, help='Rows per breakdown in the report')
+@click.option('--reset', is_flag=True, help='Discard the checkpoint and re-read the whole log')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+@click.option('--file', 'path', type=click.Path(exists=True, dir_okay=False),
+              help='Listener log to read (default: located under $ORACLE_BASE/diag)')
+def logs_listener(tail, report, top, reset, as_json, path):
+    """View listener log"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    if not mgr.view_listener_log(tail, report=report or reset or as_json, top=top, reset=reset,
+                                 as_json=as_json, path=path):
+        sys.exit(1)
+
+
+@click.group()
+def monitor():
+    """📈 Monitor database"""
+    pass
+
+
+@monitor.command('tablespaces')
+def monitor_tablespaces():
+    """Monitor tablespace usage"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.monitor_tablespaces()
+
+
+@monitor.command('sessions')
+@click.option('--active-only', is_flag=True, help='Show only active sessions')
+def monitor_sessions(active_only):
+    """Monitor database sessions"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    mgr.monitor_sessions(active_only)
+
+
+@monitor.command('ash')
+@click.option('--duration', default=60, help='Seconds to sample')
+@click.option('--interval', default=1.0, help='Seconds between V$SESSION polls')
+@click.option('--top', default=10, help='Rows per breakdown')
+@click.option('--every', type=int, help='Also print a report every N seconds while sampling')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+def monitor_ash(duration, interval, top, every, as_json):
+    """Sample active sessions (ASH without the Diagnostics Pack)"""
+    from ..modules.database import DatabaseManager
+    mgr = DatabaseManager()
+    if mgr.sample_sessions(duration, interval, top=top, every=every, as_json=as_json) is None:
+        sys.exit(1)
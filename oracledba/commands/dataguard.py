@@ -0,0 +1,98 @@
+"""
+Data Guard commands
+"""
+
+import sys
+
+import click
+
+# ============================================================================
+# DATA GUARD COMMANDS
+# ============================================================================
+
+@click.group()
+def dataguard():
+    """🔄 Data Guard Management"""
+    pass
+
+
+@dataguard.command('setup')
+@click.option('--primary-host', required=True, help='Primary database host')
+@click.option('--standby-host', required=True, help='Standby database host')
+@click.option('--db-name', required=True, help='Database name')
+def dataguard_setup(primary_host, standby_host, db_name):
+    """Configure Data Guard"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    mgr.setup(primary_host, standby_host, db_name)
+
+
+@dataguard.command('status')
+def dataguard_status():
+    """Check Data Guard status"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    if mgr.status() is None:
+        sys.exit(1)
+
+
+@dataguard.command('lag')
+@click.option('--since', default='1h', help='Window start (30m, 6h, 7d or YYYY-MM-DD HH:MM)')
+def dataguard_lag(since):
+    """Show transport/apply lag percentiles and recent alerts"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    if mgr.lag(since) is None:
+        sys.exit(1)
+
+
+@dataguard.command('monitor')
+@click.option('--interval', type=int, help='Seconds between samples (default: from monitor-config)')
+def dataguard_monitor(interval):
+    """Sample lag into the history store (not needed while the web server runs)"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    mgr.monitor(interval)
+
+
+@dataguard.command('monitor-config')
+@click.option('--target', multiple=True, help='NAME or NAME=ORACLE_SID to sample (repeatable)')
+@click.option('--interval', type=int, help='Seconds between samples')
+@click.option('--transport-lag', type=(int, int), help='Warning and critical transport lag (s)')
+@click.option('--apply-lag', type=(int, int), help='Warning and critical apply lag (s)')
+@click.option('--seq-gap', type=(int, int), help='Warning and critical unapplied log sequences')
+def dataguard_monitor_config(target, interval, transport_lag, apply_lag, seq_gap):
+    """Set lag monitor targets, interval and alert thresholds"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    thresholds = {'transport_lag': transport_lag, 'apply_lag': apply_lag, 'seq_gap': seq_gap}
+    if mgr.configure_monitor(target, interval, thresholds) is None:
+        sys.exit(1)
+
+
+@dataguard.command('tune-apply')
+@click.option('--parallel', type=int, help='Apply processes to use (default: sized from CPUs and redo rate)')
+@click.option('--measure', default=60, help='Seconds to measure the apply rate before and after')
+@click.option('--dry-run', is_flag=True, help='Show the recommendation without restarting recovery')
+def dataguard_tune_apply(parallel, measure, dry_run):
+    """Size parallel redo apply on this standby and report the apply rate gain"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    if mgr.tune_apply(parallel, measure, apply=not dry_run) is None:
+        sys.exit(1)
+
+
+@dataguard.command('switchover')
+def dataguard_switchover():
+    """Perform switchover"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    mgr.switchover()
+
+
+@dataguard.command('failover')
+def dataguard_failover():
+    """Perform failover"""
+    from ..modules.dataguard import DataGuardManager
+    mgr = DataGuardManager()
+    mgr.failover()
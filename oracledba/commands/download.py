@@ -0,0 +1,104 @@
+"""
+Download and response file commands
+"""
+
+import click
+from rich.console import Console
+
+console = Console()
+
+# ============================================================================
+# DOWNLOAD ORACLE SOFTWARE
+# ============================================================================
+
+@click.group()
+def download():
+    """📥 Download Oracle software"""
+    pass
+
+
+@download.command('database')
+@click.option('--url', help='Custom download URL')
+@click.option('--dir', default='/opt/oracle/install', help='Download directory')
+def download_database(url, dir):
+    """Download Oracle 19c Database software"""
+    from ..modules.downloader import OracleDownloader
+    downloader = OracleDownloader(dir)
+    downloader.download_oracle_19c('database', url)
+
+
+@download.command('grid')
+@click.option('--url', help='Custom download URL')
+@click.option('--dir', default='/opt/oracle/install', help='Download directory')
+def download_grid(url, dir):
+    """Download Oracle Grid Infrastructure software"""
+    from ..modules.downloader import OracleDownloader
+    downloader = OracleDownloader(dir)
+    downloader.download_oracle_19c('grid', url)
+
+
+@download.command('extract')
+@click.argument('zip-file')
+@click.option('--to', 'extract_to', help='Extract to directory (ORACLE_HOME)')
+def download_extract(zip_file, extract_to):
+    """Extract Oracle ZIP file"""
+    from ..modules.downloader import OracleDownloader
+    downloader = OracleDownloader()
+    downloader.extract_oracle_zip(zip_file, extract_to)
+
+
+# ============================================================================
+# RESPONSE FILE GENERATION
+# ============================================================================
+
+@click.group()
+def genrsp():
+    """📝 Generate Oracle response files"""
+    pass
+
+
+@genrsp.command('all')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+@click.option('--output-dir', default='/tmp', help='Output directory')
+def genrsp_all(config, output_dir):
+    """Generate all response files (DB, DBCA, NETCA)"""
+    from ..modules.response_files import generate_all_response_files
+    files = generate_all_response_files(config, output_dir)
+    
+    console.print("\n[green]✓[/green] Response files generated:")
+    for name, path in files.items():
+        console.print(f"  • {name}: {path}")
+
+
+@genrsp.command('db-install')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+@click.option('--output', default='/tmp/db_install.rsp', help='Output file')
+def genrsp_db(config, output):
+    """Generate DB installation response file"""
+    from ..modules.response_files import generate_response_file
+    import yaml
+    
+    cfg = {}
+    if config:
+        with open(config) as f:
+            cfg = yaml.safe_load(f).get('oracle', {})
+    
+    generate_response_file('DB_INSTALL', cfg, output)
+    console.print(f"[green]✓[/green] Generated: {output}")
+
+
+@genrsp.command('dbca')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+@click.option('--output', default='/tmp/dbca.rsp', help='Output file')
+def genrsp_dbca(config, output):
+    """Generate DBCA response file"""
+    from ..modules.response_files import generate_response_file
+    import yaml
+    
+    cfg = {}
+    if config:
+        with open(config) as f:
+            cfg = yaml.safe_load(f).get('database', {})
+    
+    generate_response_file('DBCA', cfg, output)
+    console.print(f"[green]✓[/green] Generated: {output}")
@@ -0,0 +1,23 @@
+"""
+Prometheus exporter command
+"""
+
+import os
+
+import click
+
+# ============================================================================
+# METRICS EXPORTER
+# ============================================================================
+
+@click.command('exporter')
+@click.option('--host', default='0.0.0.0', help='Bind address')
+@click.option('--port', default=9161, type=int, help='Listen port')
+@click.option('--interval', default=30, type=int,
+              help='Seconds between samples (scrapes reuse the cached sample)')
+@click.option('--token', default=lambda: os.environ.get('ORADBA_METRICS_TOKEN'),
+              help='Require "Authorization: Bearer <token>" (default: $ORADBA_METRICS_TOKEN)')
+def exporter(host, port, interval, token):
+    """📡 Serve Prometheus metrics for the local instance"""
+    from ..modules.exporter import serve
+    serve(host=host, port=port, interval=interval, token=token)
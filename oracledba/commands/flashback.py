@@ -0,0 +1,41 @@
+"""
+Flashback commands
+"""
+
+import click
+
+# ============================================================================
+# FLASHBACK COMMANDS
+# ============================================================================
+
+@click.group()
+def flashback():
+    """📊 Flashback Technology"""
+    pass
+
+
+@flashback.command('enable')
+@click.option('--retention', default=2880, help='Retention in minutes (default 2 days)')
+def flashback_enable(retention):
+    """Enable Flashback Database"""
+    from ..modules.flashback import FlashbackManager
+    mgr = FlashbackManager()
+    mgr.enable(retention)
+
+
+@flashback.command('disable')
+def flashback_disable():
+    """Disable Flashback Database"""
+    from ..modules.flashback import FlashbackManager
+    mgr = FlashbackManager()
+    mgr.disable()
+
+
+@flashback.command('restore')
+@click.option('--point-in-time', help='Point in time')
+@click.option('--scn', type=int, help='SCN number')
+def flashback_restore(point_in_time, scn):
+    """Restore database with Flashback"""
+    from ..modules.flashback import FlashbackManager
+    mgr = FlashbackManager()
+    mgr.restore(point_in_time, scn)
@@ -0,0 +1,224 @@
+"""
+Installation commands
+"""
+
+import os
+import sys
+import subprocess
+import click
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+# ============================================================================
+# INSTALLATION COMMANDS
+# ============================================================================
+
+@click.group(invoke_without_command=True)
+@click.option('--yes', '-y', is_flag=True, help='Skip confirmation prompts')
+@click.option('--all', 'run_all', is_flag=True, help='Install + run all TP labs (storage, security, RMAN, etc.)')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+@click.pass_context
+def install(ctx, yes, run_all, config):
+    """📦 Install and configure Oracle Database
+
+    Run without subcommand for complete one-shot installation:
+      oradba install              # base install (TP01-04)
+      oradba install --yes        # skip confirmation
+      oradba install --yes --all  # install + all post-config TPs
+    """
+    ctx.ensure_object(dict)
+    ctx.obj['yes'] = yes
+    ctx.obj['config'] = config
+    if ctx.invoked_subcommand is None:
+        from ..modules.install import InstallManager
+        mgr = InstallManager(config)
+        success = mgr.install_all(auto_yes=yes, run_all_tps=run_all)
+        sys.exit(0 if success else 1)
+
+
+@install.command('all')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+@click.option('--skip-system', is_flag=True, help='Skip system setup')
+@click.option('--skip-binaries', is_flag=True, help='Skip binary installation')
+@click.option('--skip-db', is_flag=True, help='Skip database creation')
+@click.option('--yes', '-y', is_flag=True, help='Skip confirmation')
+def install_all(config, skip_system, skip_binaries, skip_db, yes):
+    """🚀 Complete Oracle 19c installation from scratch"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.install_all(skip_system, skip_binaries, skip_db, auto_yes=yes)
+    sys.exit(0 if success else 1)
+
+
+@install.command('full')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+@click.option('--yes', '-y', is_flag=True, help='Skip confirmation')
+def install_full(config, yes):
+    """🚀 ONE-BUTTON Complete Oracle 19c installation"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.install_all(auto_yes=yes)
+    sys.exit(0 if success else 1)
+
+
+@install.command('system')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+def install_system(config):
+    """Prepare system - users, groups, kernel params, packages"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.install_system()
+    sys.exit(0 if success else 1)
+
+
+@install.command('binaries')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+def install_binaries(config):
+    """Download Oracle binaries - 3GB download from Google Drive"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.install_binaries()
+    sys.exit(0 if success else 1)
+
+
+@install.command('software')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+def install_software(config):
+    """Install Oracle software - runs runInstaller + root scripts"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.install_software()
+    sys.exit(0 if success else 1)
+
+
+@install.command('database')
+@click.option('--config', type=click.Path(exists=True), help='Configuration YAML file')
+@click.option('--name', help='Database name')
+def install_database(config, name):
+    """Create Oracle database - runs DBCA with CDB/PDB"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.create_database(name)
+    sys.exit(0 if success else 1)
+
+
+@install.command('history')
+def install_history():
+    """📈 Show runInstaller/DBCA phase timings from previous installs"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager()
+    mgr.show_history()
+
+
+@install.command('gui')
+@click.option('--host', default='0.0.0.0', help='Host to bind (default: 0.0.0.0 for all interfaces)')
+@click.option('--port', default=5000, type=int, help='Port to listen on (default: 5000)')
+@click.option('--debug', is_flag=True, help='Run in debug mode')
+def install_gui(host, port, debug):
+    """🌐 Start Web GUI - Browser-based database management interface"""
+    try:
+        from ..web_server import app, config_manager
+        
+        # Update config with provided options
+        gui_config = config_manager.load_config()
+        gui_config['host'] = host
+        gui_config['port'] = port
+        gui_config['debug'] = debug
+        config_manager.save_config(gui_config)
+        
+        console.print("\n[bold green]🌐 Starting OracleDBA Web GUI...[/bold green]\n")
+        console.print(f"[cyan]→ URL:[/cyan] http://{host if host != '0.0.0.0' else 'localhost'}:{port}")
+        console.print(f"[cyan]→ Default credentials:[/cyan] admin / admin123")
+        console.print(f"[yellow]⚠️  You will be forced to change password on first login[/yellow]\n")
+        
+        # Start Flask server
+        app.run(host=host, port=port, debug=debug)
+        
+    except ImportError as e:
+        console.print("[bold red]❌ Web GUI dependencies not installed![/bold red]")
+        console.print(f"[dim]Error: {e}[/dim]")
+        console.print("\n[yellow]Fix with:[/yellow]")
+        console.print("[cyan]pip3 install --upgrade pip && pip3 install flask flask-cors[/cyan]\n")
+        sys.exit(1)
+    except Exception as e:
+        console.print(f"[bold red]❌ Error starting web server:[/bold red] {e}")
+        sys.exit(1)
+
+
+@install.command('check')
+def install_check():
+    """🔍 Check what's installed - detect Oracle, database, listener status"""
+    console.print("\n[bold cyan]Oracle Installation Status Check[/bold cyan]\n")
+    
+    checks = {}
+    
+    # Check oracle user
+    try:
+        result = subprocess.run(['id', 'oracle'], capture_output=True, text=True)
+        checks['oracle_user'] = result.returncode == 0
+    except:
+        checks['oracle_user'] = False
+    
+    # Check ORACLE_HOME exists
+    oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
+    checks['oracle_home_exists'] = os.path.exists(oracle_home)
+    
+    # Check Oracle binaries
+    checks['sqlplus'] = os.path.exists(os.path.join(oracle_home, 'bin', 'sqlplus'))
+    checks['lsnrctl'] = os.path.exists(os.path.join(oracle_home, 'bin', 'lsnrctl'))
+    checks['dbca'] = os.path.exists(os.path.join(oracle_home, 'bin', 'dbca'))
+    
+    # Check running processes
+    try:
+        result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
+        ps_output = result.stdout
+        checks['db_running'] = 'ora_pmon_' in ps_output
+        checks['listener_running'] = 'tnslsnr' in ps_output
+        
+        # Get running SIDs
+        running_sids = [line.split('ora_pmon_')[1].strip() for line in ps_output.split('\n') if 'ora_pmon_' in line]
+        checks['running_sids'] = running_sids
+    except:
+        checks['db_running'] = False
+        checks['listener_running'] = False
+        checks['running_sids'] = []
+    
+    # Check /etc/oratab
+    checks['oratab'] = os.path.exists('/etc/oratab')
+    
+    # Display results
+    table = Table(title="Installation Detection", show_header=True, header_style="bold magenta")
+    table.add_column("Component", style="white")
+    table.add_column("Status", style="white")
+    table.add_column("Details", style="dim")
+    
+    def status_icon(val):
+        return "[green]✓ YES[/green]" if val else "[red]✗ NO[/red]"
+    
+    table.add_row("Oracle User", status_icon(checks['oracle_user']), "id oracle")
+    table.add_row("ORACLE_HOME", status_icon(checks['oracle_home_exists']), oracle_home)
+    table.add_row("sqlplus Binary", status_icon(checks['sqlplus']), f"{oracle_home}/bin/sqlplus")
+    table.add_row("lsnrctl Binary", status_icon(checks['lsnrctl']), f"{oracle_home}/bin/lsnrctl")
+    table.add_row("DBCA Binary", status_icon(checks['dbca']), f"{oracle_home}/bin/dbca")
+    table.add_row("Database Running", status_icon(checks['db_running']), 
+                  ', '.join(checks.get('running_sids', [])) or 'No instances')
+    table.add_row("Listener Running", status_icon(checks['listener_running']), "tnslsnr process")
+    table.add_row("/etc/oratab", status_icon(checks['oratab']), "Database registry")
+    
+    console.print(table)
+    
+    # Recommendations
+    console.print("\n[bold cyan]Recommendations:[/bold cyan]")
+    if not checks['oracle_user']:
+        console.print("  [yellow]→ Run:[/yellow] oradba install system  [dim](TP01: create oracle user & groups)[/dim]")
+    elif not checks['sqlplus']:
+        console.print("  [yellow]→ Run:[/yellow] oradba install binaries  [dim](TP02: download & extract Oracle 19c)[/dim]")
+    elif not checks['db_running']:
+        console.print("  [yellow]→ Run:[/yellow] oradba install database  [dim](TP03: create database with DBCA)[/dim]")
+    else:
+        console.print("  [green]✓ Oracle 19c is fully installed and running![/green]")
+        console.print("  [dim]Next steps: oradba configure multiplexing | oradba configure storage | oradba install gui[/dim]")
+    
+    console.print("")
@@ -0,0 +1,201 @@
+"""
+Lab commands - configure, maintenance, advanced, labs
+"""
+
+import sys
+import click
+
+# ============================================================================
+# CONFIGURATION COMMANDS
+# ============================================================================
+
+@click.group()
+def configure():
+    """⚙️  Configure Oracle Database features"""
+    pass
+
+
+@configure.command('multiplexing')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def configure_multiplexing(config):
+    """Multiplex critical files - control files and redo logs"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('04')
+    sys.exit(0 if success else 1)
+
+
+@configure.command('storage')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def configure_storage(config):
+    """Configure storage - tablespaces, datafiles, quotas"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('05')
+    sys.exit(0 if success else 1)
+
+
+@configure.command('users')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def configure_users(config):
+    """Configure security - users, roles, profiles, privileges"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('06')
+    sys.exit(0 if success else 1)
+
+
+@configure.command('flashback')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def configure_flashback(config):
+    """Setup Flashback - query, table, and database recovery"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('07')
+    sys.exit(0 if success else 1)
+
+
+@configure.command('backup')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def configure_backup(config):
+    """Setup RMAN backup strategy"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('08')
+    sys.exit(0 if success else 1)
+
+
+@configure.command('dataguard')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def configure_dataguard(config):
+    """Setup Data Guard for high availability"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('09')
+    sys.exit(0 if success else 1)
+
+
+@configure.command('all')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def configure_all(config):
+    """Run all post-installation configuration steps"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_all_labs(start_from='04', end_at='09')
+    sys.exit(0 if success else 1)
+
+
+# ============================================================================
+# MAINTENANCE COMMANDS
+# ============================================================================
+
+@click.group()
+def maintenance():
+    """🔧 Database maintenance operations"""
+    pass
+
+
+@maintenance.command('tune')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def maintenance_tune(config):
+    """Performance tuning - AWR, SQL optimization"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('10')
+    sys.exit(0 if success else 1)
+
+
+@maintenance.command('patch')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def maintenance_patch(config):
+    """Apply Oracle patches and updates"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('11')
+    sys.exit(0 if success else 1)
+
+
+# ============================================================================
+# ADVANCED FEATURES
+# ============================================================================
+
+@click.group()
+def advanced():
+    """🚀 Advanced Oracle features"""
+    pass
+
+
+@advanced.command('multitenant')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def advanced_multitenant(config):
+    """Configure multitenant architecture - CDB/PDB management"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('12')
+    sys.exit(0 if success else 1)
+
+
+@advanced.command('ai-ml')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def advanced_ai_ml(config):
+    """Setup Oracle AI and Machine Learning features"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('13')
+    sys.exit(0 if success else 1)
+
+
+@advanced.command('data-mobility')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def advanced_data_mobility(config):
+    """Data mobility - Data Pump, transportable tablespaces"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('14')
+    sys.exit(0 if success else 1)
+
+
+@advanced.command('asm-rac')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def advanced_asm_rac(config):
+    """Setup ASM and RAC clustering concepts"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_lab('15')
+    sys.exit(0 if success else 1)
+
+
+# ============================================================================
+# LABS COMMAND (list / run)
+# ============================================================================
+
+@click.group('labs', invoke_without_command=True)
+@click.pass_context
+def labs(ctx):
+    """📚 List and run configuration and advanced labs
+
+    Without a subcommand, lists the labs:
+      oradba labs
+      oradba labs run --from 04 --to 15 --parallel 3 --isolate-pdbs
+    """
+    if ctx.invoked_subcommand is None:
+        from ..modules.install import InstallManager
+        mgr = InstallManager()
+        mgr.list_labs()
+
+
+@labs.command('run')
+@click.option('--from', 'start_from', default='04', show_default=True, help='First lab number')
+@click.option('--to', 'end_at', default='15', show_default=True, help='Last lab number')
+@click.option('--parallel', '-j', default=1, show_default=True, type=click.IntRange(1, 8),
+              help='Run up to N independent labs at once (dependency-aware)')
+@click.option('--isolate-pdbs', is_flag=True,
+              help='Give PDB labs (security, tuning, AI/ML) their own PDB clone')
+@click.option('--config', type=click.Path(exists=True), help='Configuration file')
+def labs_run(start_from, end_at, parallel, isolate_pdbs, config):
+    """Run a range of labs, sequentially or in parallel"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager(config)
+    success = mgr.run_all_labs(start_from=start_from, end_at=end_at,
+                               parallel=parallel, isolate_pdbs=isolate_pdbs)
+    sys.exit(0 if success else 1)
@@ -0,0 +1,56 @@
+"""
+NFS commands
+"""
+
+import click
+
+# ============================================================================
+# NFS COMMANDS
+# ============================================================================
+
+@click.group()
+def nfs():
+    """🌐 NFS Server Management"""
+    pass
+
+
+@nfs.command('setup-server')
+@click.option('--export', required=True, help='Export path')
+@click.option('--clients', multiple=True, help='Allowed client IPs/networks')
+def nfs_setup_server(export, clients):
+    """Setup NFS server"""
+    from ..modules.nfs import NFSManager
+    mgr = NFSManager()
+    mgr.setup_server(export, list(clients))
+
+
+@nfs.command('setup-client')
+@click.option('--server', required=True, help='NFS server IP')
+@click.option('--remote-path', required=True, help='Remote export path')
+@click.option('--mount-point', required=True, help='Local mount point')
+def nfs_setup_client(server, remote_path, mount_point):
+    """Setup NFS client"""
+    from ..modules.nfs import NFSManager
+    mgr = NFSManager()
+    mgr.setup_client(server, remote_path, mount_point)
+
+
+@nfs.command('mount')
+@click.option('--server', required=True, help='NFS server')
+@click.option('--path', required=True, help='Remote path')
+@click.option('--mount-point', required=True, help='Mount point')
+def nfs_mount(server, path, mount_point):
+    """Mount NFS share"""
+    from ..modules.nfs import NFSManager
+    mgr = NFSManager()
+    mgr.mount(server, path, mount_point)
+
+
+@nfs.command('share')
+@click.argument('directory')
+@click.option('--clients', multiple=True, help='Allowed clients')
+def nfs_share(directory, clients):
+    """Share directory via NFS"""
+    from ..modules.nfs import NFSManager
+    mgr = NFSManager()
+    mgr.share(directory, list(clients))
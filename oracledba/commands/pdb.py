@@ -0,0 +1,71 @@
+"""
+Pluggable database commands
+"""
+
+import click
+
+# ============================================================================
+# MULTITENANT (PDB) COMMANDS
+# ============================================================================
+
+@click.group()
+def pdb():
+    """🏢 Multitenant - PDB Management"""
+    pass
+
+
+@pdb.command('create')
+@click.argument('name')
+@click.option('--admin-user', default='pdbadmin', help='PDB admin user')
+@click.option('--admin-password', prompt=True, hide_input=True, help='Admin password')
+def pdb_create(name, admin_user, admin_password):
+    """Create new PDB"""
+    from ..modules.pdb import PDBManager
+    mgr = PDBManager()
+    mgr.create(name, admin_user, admin_password)
+
+
+@pdb.command('clone')
+@click.argument('source')
+@click.argument('destination')
+def pdb_clone(source, destination):
+    """Clone PDB"""
+    from ..modules.pdb import PDBManager
+    mgr = PDBManager()
+    mgr.clone(source, destination)
+
+
+@pdb.command('list')
+def pdb_list():
+    """List all PDBs"""
+    from ..modules.pdb import PDBManager
+    mgr = PDBManager()
+    mgr.list_pdbs()
+
+
+@pdb.command('open')
+@click.argument('name')
+def pdb_open(name):
+    """Open PDB"""
+    from ..modules.pdb import PDBManager
+    mgr = PDBManager()
+    mgr.open(name)
+
+
+@pdb.command('close')
+@click.argument('name')
+def pdb_close(name):
+    """Close PDB"""
+    from ..modules.pdb import PDBManager
+    mgr = PDBManager()
+    mgr.close(name)
+
+
+@pdb.command('drop')
+@click.argument('name')
+@click.option('--including-datafiles', is_flag=True, help='Drop including datafiles')
+def pdb_drop(name, including_datafiles):
+    """Drop PDB"""
+    from ..modules.pdb import PDBManager
+    mgr = PDBManager()
+    mgr.drop(name, including_datafiles)
@@ -0,0 +1,42 @@
+"""
+Pre-installation check and test commands
+"""
+
+import click
+from rich.console import Console
+
+console = Console()
+
+# ============================================================================
+# PRE-INSTALLATION CHECK
+# ============================================================================
+
+@click.command('precheck')
+@click.option('--fix', is_flag=True, help='Generate fix script')
+def precheck(fix):
+    """🔍 Check system requirements before installation"""
+    from ..modules.precheck import PreInstallChecker
+    checker = PreInstallChecker()
+    result = checker.check_all()
+    
+    if fix or not result:
+        checker.generate_fix_script()
+        console.print("\n[cyan]Run:[/cyan] sudo bash fix-precheck-issues.sh")
+
+
+# ============================================================================
+# TESTING COMMANDS
+# ============================================================================
+
+@click.command('test')
+@click.option('--oracle-home', help='ORACLE_HOME path')
+@click.option('--oracle-sid', help='ORACLE_SID name')
+@click.option('--report', is_flag=True, help='Generate detailed report')
+def test(oracle_home, oracle_sid, report):
+    """🧪 Test Oracle installation"""
+    from ..modules.testing import OracleTestSuite
+    tester = OracleTestSuite(oracle_home, oracle_sid)
+    result = tester.run_all_tests()
+    
+    if report:
+        tester.generate_test_report()
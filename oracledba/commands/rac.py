@@ -0,0 +1,42 @@
+"""
+RAC commands
+"""
+
+import click
+
+# ============================================================================
+# RAC COMMANDS
+# ============================================================================
+
+@click.group()
+def rac():
+    """🔗 Real Application Clusters"""
+    pass
+
+
+@rac.command('setup')
+@click.option('--nodes', multiple=True, required=True, help='Node hostnames')
+@click.option('--vip', multiple=True, required=True, help='Virtual IPs')
+def rac_setup(nodes, vip):
+    """Configure RAC"""
+    from ..modules.rac import RACManager
+    mgr = RACManager()
+    mgr.setup(list(nodes), list(vip))
+
+
+@rac.command('add-node')
+@click.option('--hostname', required=True, help='New node hostname')
+@click.option('--vip', required=True, help='Virtual IP')
+def rac_add_node(hostname, vip):
+    """Add RAC node"""
+    from ..modules.rac import RACManager
+    mgr = RACManager()
+    mgr.add_node(hostname, vip)
+
+
+@rac.command('status')
+def rac_status():
+    """Check RAC cluster status"""
+    from ..modules.rac import RACManager
+    mgr = RACManager()
+    mgr.status()
@@ -0,0 +1,261 @@
+"""
+RMAN backup commands
+"""
+
+import sys
+
+import click
+
+# ============================================================================
+# RMAN COMMANDS
+# ============================================================================
+
+@click.group()
+def rman():
+    """💾 RMAN Backup and Recovery"""
+    pass
+
+
+@rman.command('setup')
+@click.option('--retention', default=7, help='Retention policy in days')
+@click.option('--compression', is_flag=True, default=True, help='Enable compression')
+def rman_setup(retention, compression):
+    """Configure RMAN"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.setup(retention, compression)
+
+
+@rman.command('backup')
+@click.option('--type', type=click.Choice(['full', 'incremental', 'archive']), default='full')
+@click.option('--tag', help='Backup tag')
+@click.option('--no-monitor', is_flag=True, help='Do not show live channel progress')
+def rman_backup(type, tag, no_monitor):
+    """Perform RMAN backup"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.backup(type, tag, monitor=not no_monitor)
+
+
+@rman.command('monitor')
+@click.option('--interval', default=2.0, help='Seconds between polls')
+@click.option('--wait', default=30, help='Seconds to wait for a backup to start')
+def rman_monitor(interval, wait):
+    """Show live progress of a running backup"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if not mgr.monitor(interval, wait):
+        sys.exit(1)
+
+
+@rman.command('throughput')
+@click.option('--limit', default=20, help='Number of jobs to show')
+def rman_throughput(limit):
+    """Show backup throughput history and slow runs"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.show_throughput(limit)
+
+
+@rman.command('tune')
+@click.option('--dest', help='Backup destination to measure (default: FRA or /u01/backup)')
+@click.option('--dest-mbps', type=float, help='Destination write MB/s (skips the measurement)')
+@click.option('--sample-mb', default=256, help='Size of the throughput test file')
+@click.option('--no-aco', is_flag=True, help='Only BASIC/no compression (no Advanced Compression license)')
+@click.option('--dry-run', is_flag=True, help='Show the recommendation without configuring RMAN')
+def rman_tune(dest, dest_mbps, sample_mb, no_aco, dry_run):
+    """Size channels, section size and compression for backup throughput"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if mgr.tune(dest, dest_mbps, sample_mb, allow_aco=not no_aco, apply=not dry_run) is None:
+        sys.exit(1)
+
+
+@rman.command('strategy')
+@click.option('--mode', type=click.Choice(['backupset', 'incremental-forever']),
+              help='How `rman backup --type incremental` works (omit to show the current strategy)')
+@click.option('--window', default=0, help='Days the incremental-forever image copy lags behind')
+@click.option('--bct-file', help='Block change tracking file (default: in DB_CREATE_FILE_DEST)')
+def rman_strategy(mode, window, bct_file):
+    """Show or set the incremental backup strategy"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if mode and mgr.set_strategy(mode, window, bct_file) is None:
+        sys.exit(1)
+    if not mgr.show_strategy():
+        sys.exit(1)
+
+
+@rman.group('catalog')
+def rman_catalog():
+    """Local backup catalog: restore plans and size trends"""
+    pass
+
+
+@rman_catalog.command('sync')
+@click.option('--limit', default=10, help='Number of recent backup sets to show')
+def rman_catalog_sync(limit):
+    """Pull new backup records from the control file"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if not mgr.sync_catalog(limit):
+        sys.exit(1)
+
+
+@rman_catalog.command('restore-plan')
+@click.option('--until', help='Target time (2h, 1d or YYYY-MM-DD HH:MM:SS; default: now)')
+@click.option('--no-refresh', is_flag=True, help='Plan from the last sync without querying the database')
+def rman_catalog_restore_plan(until, no_refresh):
+    """Show the pieces and archived logs needed to recover to a time"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    plan = mgr.restore_plan(until, refresh=not no_refresh)
+    if not plan or not plan['restorable']:
+        sys.exit(1)
+
+
+@rman_catalog.command('trend')
+@click.option('--days', default=30, help='Days of history')
+def rman_catalog_trend(days):
+    """Show backup volume per day and kind"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.backup_trend(days)
+
+
+@rman.group('schedule')
+def rman_schedule():
+    """Scheduled backups with concurrency limits and I/O windows"""
+    pass
+
+
+@rman_schedule.command('list')
+@click.option('--history', default=10, help='Number of finished runs to show')
+def rman_schedule_list(history):
+    """Show policies, queued and running backups"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.show_schedule(history)
+
+
+@rman_schedule.command('add')
+@click.option('--database', default='CDB', help='CDB or a PDB name')
+@click.option('--type', type=click.Choice(['full', 'incremental', 'archive']), default='full')
+@click.option('--cron', required=True, help="Cron expression, e.g. '0 1 * * 0'")
+@click.option('--no-catch-up', is_flag=True, help='Skip slots missed while the scheduler was down')
+@click.option('--ignore-window', is_flag=True, help='Start outside the I/O windows too')
+def rman_schedule_add(database, type, cron, no_catch_up, ignore_window):
+    """Add or replace the policy for a database and backup type"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if mgr.add_schedule(database, type, cron, catch_up=not no_catch_up,
+                        window=False if ignore_window else None) is None:
+        sys.exit(1)
+
+
+@rman_schedule.command('remove')
+@click.argument('policy_id')
+def rman_schedule_remove(policy_id):
+    """Remove a policy (e.g. cdb-full)"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if not mgr.remove_schedule(policy_id):
+        sys.exit(1)
+
+
+@rman_schedule.command('config')
+@click.option('--max-concurrent', type=int, help='RMAN jobs allowed at once across all databases')
+@click.option('--window', multiple=True, help='I/O window HH:MM-HH:MM (repeatable; "" clears)')
+def rman_schedule_config(max_concurrent, window):
+    """Set the global job limit and the I/O windows"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    windows = [w for w in window if w] if window else None
+    if mgr.configure_scheduler(max_concurrent, windows) is None:
+        sys.exit(1)
+
+
+@rman_schedule.command('now')
+@click.option('--database', default='CDB', help='CDB or a PDB name')
+@click.option('--type', type=click.Choice(['full', 'incremental', 'archive']), default='full')
+def rman_schedule_now(database, type):
+    """Queue a backup now, subject to the concurrency limits"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if mgr.schedule_now(database, type) is None:
+        sys.exit(1)
+
+
+@rman_schedule.command('run')
+@click.option('--interval', default=30, help='Seconds between scheduler ticks')
+def rman_schedule_run(interval):
+    """Run the scheduler in the foreground (not needed while the web server runs)"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if not mgr.run_scheduler(interval):
+        sys.exit(1)
+
+
+@rman.group('fra')
+def rman_fra():
+    """FRA pressure watch and archived log relief"""
+    pass
+
+
+@rman_fra.command('status')
+def rman_fra_status():
+    """Show FRA usage, pressure and redo rate"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if mgr.fra_status() is None:
+        sys.exit(1)
+
+
+@rman_fra.command('config')
+@click.option('--threshold', type=int, help='Pressure %% that triggers an archive log backup')
+@click.option('--dest', help='Directory outside the FRA for the relief backup pieces')
+@click.option('--min-interval', type=int, help='Shortest time between samples (seconds)')
+@click.option('--max-interval', type=int, help='Longest time between samples (seconds)')
+def rman_fra_config(threshold, dest, min_interval, max_interval):
+    """Set the watcher threshold, relief destination and sampling bounds"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if mgr.configure_fra_watch(threshold, dest, min_interval, max_interval) is None:
+        sys.exit(1)
+
+
+@rman_fra.command('watch')
+@click.option('--once', is_flag=True, help='Sample once (and relieve if needed), then exit')
+def rman_fra_watch(once):
+    """Watch FRA pressure (not needed while the web server runs)"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    if mgr.watch_fra(once) is None and once:
+        sys.exit(1)
+
+
+@rman_fra.command('relieve')
+@click.option('--dest', help='Directory for the backup pieces (default: from fra config)')
+def rman_fra_relieve(dest):
+    """Back up and delete archived logs now, ahead of queued backups"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.relieve_fra(dest)
+
+
+@rman.command('restore')
+@click.option('--point-in-time', help='Point in time (YYYY-MM-DD HH:MI:SS)')
+def rman_restore(point_in_time):
+    """Restore database with RMAN"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.restore(point_in_time)
+
+
+@rman.command('list')
+@click.option('--type', type=click.Choice(['backup', 'archivelog', 'all']), default='backup')
+def rman_list(type):
+    """List RMAN backups"""
+    from ..modules.rman import RMANManager
+    mgr = RMANManager()
+    mgr.list_backups(type)
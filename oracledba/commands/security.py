@@ -0,0 +1,48 @@
+"""
+Security commands
+"""
+
+import click
+
+# ============================================================================
+# SECURITY COMMANDS
+# ============================================================================
+
+@click.group()
+def security():
+    """🔐 Security Management"""
+    pass
+
+
+@security.command('audit')
+@click.option('--enable', is_flag=True, help='Enable auditing')
+def security_audit(enable):
+    """Configure auditing"""
+    from ..modules.security import SecurityManager
+    mgr = SecurityManager()
+    mgr.configure_audit(enable)
+
+
+@security.command('encryption')
+@click.option('--enable', is_flag=True, help='Enable TDE')
+def security_encryption(enable):
+    """Configure Transparent Data Encryption"""
+    from ..modules.security import SecurityManager
+    mgr = SecurityManager()
+    mgr.configure_tde(enable)
+
+
+@security.command('users')
+@click.option('--create', help='Create user')
+@click.option('--drop', help='Drop user')
+@click.option('--list', 'list_users', is_flag=True, help='List users')
+def security_users(create, drop, list_users):
+    """Manage database users"""
+    from ..modules.security import SecurityManager
+    mgr = SecurityManager()
+    if create:
+        mgr.create_user(create)
+    elif drop:
+        mgr.drop_user(drop)
+    elif list_users:
+        mgr.list_users()
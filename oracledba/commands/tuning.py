@@ -0,0 +1,65 @@
+"""
+Performance tuning commands
+"""
+
+import sys
+
+import click
+
+# ============================================================================
+# TUNING COMMANDS
+# ============================================================================
+
+@click.group()
+def tuning():
+    """⚡ Performance Tuning"""
+    pass
+
+
+@tuning.command('analyze')
+@click.option('--deep', is_flag=True, help='Deep analysis')
+def tuning_analyze(deep):
+    """Analyze database performance"""
+    from ..modules.tuning import TuningManager
+    mgr = TuningManager()
+    mgr.analyze(deep)
+
+
+@tuning.command('awr')
+@click.option('--begin-snap', type=int, help='Begin snapshot ID (default: second to last)')
+@click.option('--end-snap', type=int, help='End snapshot ID (default: last)')
+@click.option('--top', default=10, help='Rows in the wait event and SQL rankings')
+@click.option('--json', 'as_json', is_flag=True, help='Print the report as JSON')
+def tuning_awr(begin_snap, end_snap, top, as_json):
+    """Diff two AWR snapshots: load profile, top waits, top SQL, OS stats"""
+    from ..modules.tuning import TuningManager
+    mgr = TuningManager()
+    if mgr.generate_awr(begin_snap, end_snap, top, as_json) is None:
+        sys.exit(1)
+
+
+@tuning.command('snapshots')
+@click.option('--limit', default=10, help='Number of snapshots to show')
+def tuning_snapshots(limit):
+    """List recent AWR snapshots"""
+    from ..modules.tuning import TuningManager
+    mgr = TuningManager()
+    if mgr.snapshots(limit) is None:
+        sys.exit(1)
+
+
+@tuning.command('addm')
+def tuning_addm():
+    """Generate ADDM report"""
+    from ..modules.tuning import TuningManager
+    mgr = TuningManager()
+    mgr.generate_addm()
+
+
+@tuning.command('sql-trace')
+@click.option('--session-id', type=int, help='Session ID to trace')
+def tuning_sql_trace(session_id):
+    """Enable SQL trace"""
+    from ..modules.tuning import TuningManager
+    mgr = TuningManager()
+    mgr.sql_trace(session_id)
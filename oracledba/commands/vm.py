@@ -0,0 +1,18 @@
+"""
+VM initialization commands
+"""
+
+import click
+
+# ============================================================================
+# VM INITIALIZATION
+# ============================================================================
+
+@click.command('vm-init')
+@click.option('--role', type=click.Choice(['database', 'rac-node', 'dataguard-standby']), required=True)
+@click.option('--node-number', type=int, help='Node number for RAC')
+def vm_init(role, node_number):
+    """🖥️  Initialize new VM for Oracle"""
+    from ..modules.install import InstallManager
+    mgr = InstallManager()
+    mgr.vm_init(role, node_number)
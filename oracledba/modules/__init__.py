@@ -1,26 +1,29 @@
 # OracleDBA Module Initialization
-"""Modules for Oracle Database Administration"""
+"""Modules for Oracle Database Administration
 
-from . import install
-from . import rman
-from . import dataguard
-from . import tuning
-from . import asm
-from . import rac
-from . import pdb
-from . import flashback
-from . import security
-from . import nfs
-from . import database
-from . import precheck
-from . import testing
-from . import downloader
-from . import response_files
+Submodules are imported on first attribute access (PEP 562) so that
+importing one manager does not pull in all of them (downloader alone
+imports requests).
+"""
+
+import importlib
 
 __all__ = [
     'install',
+    'progress',
+    'labrunner',
+    'alertlog',
+    'listenerlog',
     'rman',
+    'rmanmonitor',
+    'backupcatalog',
+    'backupscheduler',
+    'frawatcher',
     'dataguard',
+    'dgmonitor',
+    'dgapply',
+    'awrdiff',
+    'ashsampler',
     'tuning',
     'asm',
     'rac',
@@ -29,8 +32,16 @@ __all__ = [
     'security',
     'nfs',
     'database',
+    'detector',
+    'exporter',
     'precheck',
     'testing',
     'downloader',
     'response_files',
 ]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
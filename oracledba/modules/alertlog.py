@@ -0,0 +1,351 @@
+"""
+Alert Log Reader
+Parses the database alert log, either the text alert_<SID>.log or the ADR
+XML log.xml, into timestamped records.
+
+A sparse offset index is kept under ~/.oracledba/alertlog so repeated
+reads only parse what was appended since the last one. The index splits
+the file into blocks of about BLOCK_BYTES that start on record
+boundaries; each block stores its byte range, first/last timestamp and
+the ORA- codes it contains. A time-range query reads only the blocks
+whose time span overlaps the range, an ORA- query only the blocks that
+contain the code, and a page of newest entries only the last blocks.
+
+Rotation (new inode, shorter file or a different head) rebuilds the index.
+
+Usage (Python):
+    from oracledba.modules.alertlog import AlertLog, find_alert_log
+    log = AlertLog(find_alert_log())
+    page = log.search(since=parse_time('1h'), ora='600', limit=50)
+    for rec in page['records']:
+        print(rec.timestamp, rec.text)
+"""
+
+import hashlib
+import html
+import json
+import os
+import re
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+
+BLOCK_BYTES = 64 * 1024
+HEAD_BYTES = 256
+INDEX_VERSION = 1
+MAX_PAGE = 500
+
+_ISO_TS_RE = re.compile(
+    r'^(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:\.(\d+))?\s*(Z|[+-]\d{2}:?\d{2})?$')
+_CLASSIC_TS_RE = re.compile(
+    r'^(?:Mon|Tue|Wed|Thu|Fri|Sat|Sun) (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)'
+    r' +\d{1,2} \d{2}:\d{2}:\d{2} \d{4}$')
+_ORA_RE = re.compile(r'\bORA-(\d{1,5})\b', re.IGNORECASE)
+_XML_ATTR_RE = re.compile(r"(\w+)='([^']*)'")
+_XML_TXT_RE = re.compile(r'<txt>(.*?)</txt>', re.DOTALL)
+_RELATIVE_RE = re.compile(r'^(\d+)\s*([smhdw])$', re.IGNORECASE)
+_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 604800}
+_XML_KEEP_ATTRS = ('level', 'type', 'comp_id', 'pid', 'host_id')
+
+
+def parse_timestamp(value):
+    """Epoch seconds for an alert log timestamp line, or None.
+
+    Handles the 12c+ ISO form (2024-03-05T10:12:01.123456+00:00) and the
+    11g form (Tue Mar  5 10:12:01 2024, local time).
+    """
+    value = value.strip()
+    m = _ISO_TS_RE.match(value)
+    if m:
+        date, clock, frac, tz = m.groups()
+        text = f"{date}T{clock}.{(frac or '0')[:6].ljust(6, '0')}"
+        if tz:
+            text += '+00:00' if tz == 'Z' else (tz if ':' in tz else f'{tz[:3]}:{tz[3:]}')
+        try:
+            return datetime.fromisoformat(text).timestamp()
+        except ValueError:
+            return None
+    if _CLASSIC_TS_RE.match(value):
+        try:
+            return datetime.strptime(value, '%a %b %d %H:%M:%S %Y').timestamp()
+        except ValueError:
+            return None
+    return None
+
+
+def parse_time(value, now=None):
+    """Epoch seconds for a --since/--until value, None if empty.
+
+    Accepts relative ages (30m, 2h, 7d, 1w), ISO dates/datetimes
+    (2024-03-05, 2024-03-05 10:00) and alert log timestamps.
+    Raises ValueError otherwise.
+    """
+    if value is None or str(value).strip() == '':
+        return None
+    value = str(value).strip()
+    m = _RELATIVE_RE.match(value)
+    if m:
+        now = time.time() if now is None else now
+        return now - int(m.group(1)) * _UNITS[m.group(2).lower()]
+    ts = parse_timestamp(value)
+    if ts is not None:
+        return ts
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}' (use e.g. 30m, 2h, 7d or 2024-03-05 10:00)")
+
+
+def normalize_ora_code(code):
+    """'600', 'ora-600' and 'ORA-00600' all become 'ORA-00600'"""
+    m = re.match(r'^\s*(?:ORA-?)?(\d{1,5})\s*$', str(code), re.IGNORECASE)
+    if not m:
+        raise ValueError(f"Invalid ORA- code '{code}'")
+    return f'ORA-{int(m.group(1)):05d}'
+
+
+def find_alert_log(sid=None, oracle_base=None, oracle_home=None):
+    """Path of the instance's alert log (text preferred over log.xml) or None"""
+    sid = sid or os.getenv('ORACLE_SID', 'GDCPROD')
+    bases = [oracle_base or os.getenv('ORACLE_BASE') or '/u01/app/oracle']
+    if oracle_home:
+        # layout assumed by older oradba releases: diag next to the home
+        bases.append(str(Path(oracle_home).parent))
+    for base in bases:
+        diag = Path(base) / 'diag' / 'rdbms'
+        for pattern in (f'{sid.lower()}/{sid}/trace/alert_{sid}.log',
+                        f'*/{sid}/trace/alert_{sid}.log',
+                        f'{sid.lower()}/{sid}/alert/log.xml',
+                        f'*/{sid}/alert/log.xml'):
+            matches = sorted(diag.glob(pattern))
+            if matches:
+                return matches[0]
+    return None
+
+
+class AlertRecord:
+    """One alert log entry: a timestamp line (or XML <msg>) and its text"""
+
+    __slots__ = ('offset', 'time', 'text', 'codes', 'attrs')
+
+    def __init__(self, offset, time_, text, codes=(), attrs=None):
+        self.offset = offset
+        self.time = time_
+        self.text = text
+        self.codes = tuple(codes)
+        self.attrs = attrs or {}
+
+    @property
+    def timestamp(self):
+        if self.time is None:
+            return ''
+        return datetime.fromtimestamp(self.time).isoformat(sep=' ', timespec='seconds')
+
+    def to_dict(self):
+        return {
+            'offset': self.offset,
+            'time': self.time,
+            'timestamp': self.timestamp,
+            'text': self.text,
+            'codes': list(self.codes),
+            **self.attrs,
+        }
+
+
+def _codes(text):
+    return sorted({f'ORA-{int(c):05d}' for c in _ORA_RE.findall(text)})
+
+
+def _text_record(offset, lines):
+    head = lines[0].decode('utf-8', errors='replace')
+    ts = parse_timestamp(head)
+    body = lines[1:] if ts is not None else lines
+    text = b''.join(body).decode('utf-8', errors='replace').rstrip('\n')
+    return AlertRecord(offset, ts, text, _codes(text))
+
+
+def _xml_record(offset, lines):
+    chunk = b''.join(lines).decode('utf-8', errors='replace')
+    head = chunk.split('>', 1)[0]
+    attrs = dict(_XML_ATTR_RE.findall(head))
+    m = _XML_TXT_RE.search(chunk)
+    text = html.unescape(m.group(1)).strip('\n') if m else ''
+    keep = {k: html.unescape(attrs[k]) for k in _XML_KEEP_ATTRS if k in attrs}
+    return AlertRecord(offset, parse_timestamp(attrs.get('time', '')), text, _codes(text), keep)
+
+
+class AlertLog:
+    """Indexed reader for one alert log file"""
+
+    def __init__(self, path, index_dir=None, block_bytes=BLOCK_BYTES):
+        self.path = Path(path)
+        self.xml = self.path.suffix.lower() == '.xml'
+        self.block_bytes = block_bytes
+        self.index_dir = Path(index_dir) if index_dir else Path.home() / '.oracledba' / 'alertlog'
+        key = hashlib.sha1(str(self.path.resolve()).encode()).hexdigest()[:16]
+        self.index_file = self.index_dir / f'{key}.json'
+        self.last_parsed_bytes = 0      # bytes parsed by the last refresh()
+        self._index = None
+        self._lock = threading.Lock()
+
+    # --- index ------------------------------------------------------------
+
+    def refresh(self):
+        """Bring the index up to date; returns the index dict.
+
+        Only the last block (which may have been incomplete) and the data
+        appended after it are parsed.
+        """
+        with self._lock:
+            st = os.stat(self.path)
+            index = self._index if self._index is not None else self._load()
+            head_len = min(index.get('size', 0), HEAD_BYTES)
+            if (index.get('inode') != st.st_ino or st.st_size < index.get('size', 0)
+                    or index.get('head') != self._head(head_len)):
+                index = self._empty(st)
+            self.last_parsed_bytes = 0
+            if st.st_size != index['size'] or not index['blocks'] and st.st_size:
+                blocks = index['blocks']
+                start = blocks.pop()['offset'] if blocks else 0
+                blocks.extend(self._scan(start, st.st_size))
+                self.last_parsed_bytes = st.st_size - start
+                index.update(size=st.st_size, mtime=st.st_mtime,
+                             head=self._head(min(st.st_size, HEAD_BYTES)))
+                self._save(index)
+            self._index = index
+            return index
+
+    def _empty(self, st):
+        return {'version': INDEX_VERSION, 'path': str(self.path), 'inode': st.st_ino,
+                'size': 0, 'mtime': 0, 'head': self._head(0), 'blocks': []}
+
+    def _head(self, length):
+        with open(self.path, 'rb') as f:
+            return hashlib.sha1(f.read(length)).hexdigest()
+
+    def _scan(self, start, end):
+        blocks, block = [], None
+        for rec in self._iter_records(start, end):
+            if block is None or rec.offset - block['offset'] >= self.block_bytes:
+                block = {'offset': rec.offset, 'end': rec.offset, 'first': rec.time,
+                         'last': rec.time, 'count': 0, 'codes': []}
+                blocks.append(block)
+            block['count'] += 1
+            if rec.time is not None:
+                block['first'] = rec.time if block['first'] is None else min(block['first'], rec.time)
+                block['last'] = rec.time if block['last'] is None else max(block['last'], rec.time)
+            if rec.codes:
+                block['codes'] = sorted(set(block['codes']).union(rec.codes))
+        for block, nxt in zip(blocks, blocks[1:] + [None]):
+            block['end'] = nxt['offset'] if nxt else end
+        return blocks
+
+    def _load(self):
+        try:
+            with open(self.index_file) as f:
+                index = json.load(f)
+            if index.get('version') == INDEX_VERSION and index.get('path') == str(self.path):
+                return index
+        except (OSError, ValueError):
+            pass
+        return {'size': 0, 'blocks': []}
+
+    def _save(self, index):
+        try:
+            self.index_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.index_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(index, f)
+            os.replace(tmp, self.index_file)
+        except OSError:
+            pass
+
+    # --- reading ----------------------------------------------------------
+
+    def _is_start(self, line):
+        if self.xml:
+            return line.lstrip().startswith(b'<msg ')
+        return parse_timestamp(line.decode('utf-8', errors='replace')) is not None
+
+    def _iter_records(self, start, end):
+        """Records beginning in [start, end), oldest first"""
+        make = _xml_record if self.xml else _text_record
+        with open(self.path, 'rb') as f:
+            f.seek(start)
+            offset = start
+            rec_offset, lines = None, []
+            for line in f:
+                if offset >= end:
+                    break
+                if self._is_start(line):
+                    if lines and (rec_offset is not None or not self.xml):
+                        yield make(rec_offset if rec_offset is not None else start, lines)
+                    rec_offset, lines = offset, [line]
+                elif lines or not self.xml:
+                    lines.append(line)
+                offset += len(line)
+            if lines and (rec_offset is not None or not self.xml):
+                yield make(rec_offset if rec_offset is not None else start, lines)
+
+    def search(self, since=None, until=None, grep=None, ora=None, limit=100, before=None):
+        """Newest-first page of matching records.
+
+        ``since``/``until`` are epoch seconds, ``grep`` a case-insensitive
+        regex (plain text if it does not compile), ``ora`` an ORA- code,
+        ``before`` the ``next_before`` cursor of the previous page.
+        Returns {'records', 'next_before', 'scanned_bytes', 'size'}.
+        """
+        index = self.refresh()
+        limit = max(1, min(int(limit), MAX_PAGE))
+        codes = set()
+        if ora:
+            codes.add(normalize_ora_code(ora))
+        pattern = None
+        if grep:
+            if re.match(r'^\s*ORA-\d{1,5}\s*$', grep, re.IGNORECASE):
+                codes.add(normalize_ora_code(grep))
+            else:
+                try:
+                    pattern = re.compile(grep, re.IGNORECASE)
+                except re.error:
+                    pattern = re.compile(re.escape(grep), re.IGNORECASE)
+
+        found, scanned = [], 0
+        for block in reversed(index['blocks']):
+            if before is not None and block['offset'] >= before:
+                continue
+            if codes and not codes.issubset(block['codes']):
+                continue
+            if since is not None and (block['last'] is None or block['last'] < since):
+                continue
+            if until is not None and (block['first'] is None or block['first'] > until):
+                continue
+            scanned += block['end'] - block['offset']
+            matches = []
+            for rec in self._iter_records(block['offset'], block['end']):
+                if before is not None and rec.offset >= before:
+                    break
+                if since is not None and (rec.time is None or rec.time < since):
+                    continue
+                if until is not None and (rec.time is None or rec.time > until):
+                    continue
+                if codes and not codes.issubset(rec.codes):
+                    continue
+                if pattern and not pattern.search(rec.text):
+                    continue
+                matches.append(rec)
+            found.extend(reversed(matches))
+            if len(found) > limit:
+                break
+        page = found[:limit]
+        return {
+            'records': page,
+            'next_before': page[-1].offset if len(found) > limit else None,
+            'scanned_bytes': scanned,
+            'size': index['size'],
+        }
+
+    def tail(self, count=50):
+        """The last ``count`` records, oldest first"""
+        return list(reversed(self.search(limit=count)['records']))
@@ -0,0 +1,299 @@
+"""
+Active Session Sampler
+A poor-man's ASH for databases without the Diagnostics Pack (SE2, or EE
+without the license): polls V$SESSION for active sessions about once a
+second and answers "what was the database doing" over any recent window.
+
+- One persistent sqlplus session (utils/sqlsession.py) runs the poll, so a
+  sample costs one V$SESSION scan, not a logon.
+- A session is sampled when it is ACTIVE and on CPU or in a non-idle wait;
+  the sampler's own session is left out.
+- Samples go to a columnar ring buffer: one array per column (time, SID,
+  blocking SID, and SQL_ID/event/wait class/module/user as 32-bit indexes
+  into a shared string table), 36 bytes per sampled session, so the
+  default 200000 rows take about 7 MB (about 11 hours at five active
+  sessions) plus 0.7 MB for a day of poll times.
+- Windows are found by binary search on the time column; top events, SQL
+  IDs, modules, users and blockers are counted over the window and
+  reported with their share and average active sessions.
+
+Usage (Python):
+    from oracledba.modules.ashsampler import AshSampler
+    sampler = AshSampler()
+    sampler.start()
+    ...
+    sampler.report(since=time.time() - 300, top=10)
+"""
+
+import threading
+import time
+from array import array
+from collections import Counter
+
+from ..utils.oracle_client import QUERY_SETTINGS, parse_rows
+
+DEFAULT_INTERVAL = 1.0
+DEFAULT_CAPACITY = 200000
+POLL_CAPACITY = 86400
+MAX_BACKOFF = 60
+
+ASH_QUERY = ("SELECT SID, BLOCKING_SESSION, USERNAME, SQL_ID, "
+             "REPLACE(MODULE, '|', '/') AS MODULE, "
+             "DECODE(STATE, 'WAITING', EVENT, 'ON CPU') AS EVENT, "
+             "DECODE(STATE, 'WAITING', WAIT_CLASS, 'CPU') AS WAIT_CLASS FROM V$SESSION "
+             "WHERE STATUS = 'ACTIVE' AND (STATE <> 'WAITING' OR WAIT_CLASS <> 'Idle') "
+             "AND SID <> SYS_CONTEXT('USERENV', 'SID')")
+
+# parseable output without ending the session on an error
+SESSION_SETTINGS = QUERY_SETTINGS.replace('WHENEVER SQLERROR EXIT FAILURE',
+                                          'WHENEVER SQLERROR CONTINUE')
+
+# report dimension -> string column
+DIMENSIONS = {'events': 'event', 'wait_classes': 'wait_class', 'sql_ids': 'sql_id',
+              'modules': 'module', 'users': 'username'}
+
+
+def _int(value, default=-1):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class SampleBuffer:
+    """Fixed-capacity columnar ring of session samples plus a ring of poll times.
+
+    String columns hold indexes into one string table, which is rebuilt
+    from the live rows when it outgrows a quarter of the capacity.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, poll_capacity=POLL_CAPACITY):
+        self.capacity = capacity
+        self.times = array('d', bytes(8 * capacity))
+        self.sids = array('i', bytes(4 * capacity))
+        self.blockers = array('i', bytes(4 * capacity))
+        self.columns = {name: array('I', bytes(4 * capacity)) for name in DIMENSIONS.values()}
+        self.written = 0
+        self.polls = array('d', bytes(8 * poll_capacity))
+        self.polls_written = 0
+        self.strings = ['']
+        self._index = {'': 0}
+        self._lock = threading.Lock()
+
+    def _intern(self, value):
+        value = value or ''
+        index = self._index.get(value)
+        if index is None:
+            index = self._index[value] = len(self.strings)
+            self.strings.append(value)
+        return index
+
+    def _compact(self):
+        """Drop strings no live row refers to"""
+        live = min(self.written, self.capacity)
+        used = sorted({c[i] for c in self.columns.values() for i in range(live)} | {0})
+        remap = {old: new for new, old in enumerate(used)}
+        for column in self.columns.values():
+            for i in range(live):
+                column[i] = remap[column[i]]
+        self.strings = [self.strings[old] for old in used]
+        self._index = {s: i for i, s in enumerate(self.strings)}
+
+    def add(self, timestamp, rows):
+        """Store one poll: its time and the sampled session rows (V$SESSION dicts)"""
+        with self._lock:
+            self.polls[self.polls_written % len(self.polls)] = timestamp
+            self.polls_written += 1
+            for row in rows:
+                pos = self.written % self.capacity
+                self.times[pos] = timestamp
+                self.sids[pos] = _int(row.get('SID'))
+                self.blockers[pos] = _int(row.get('BLOCKING_SESSION'))
+                for key, column in self.columns.items():
+                    column[pos] = self._intern(row.get(key.upper()))
+                self.written += 1
+            if len(self.strings) > max(1024, self.capacity // 4):
+                self._compact()
+
+    @staticmethod
+    def _bounds(values, count, start, since, until):
+        """Logical [lo, hi) of ring ``values`` (``count`` entries from ``start``)
+        in [since, until]"""
+        def bisect(target, right):
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                value = values[(start + mid) % len(values)]
+                if value < target or (right and value == target):
+                    lo = mid + 1
+                else:
+                    hi = mid
+            return lo
+        lo = 0 if since is None else bisect(since, False)
+        hi = count if until is None else bisect(until, True)
+        return lo, max(lo, hi)
+
+    def window(self, since=None, until=None):
+        """(polls, {column: values}) for the samples with since <= time <= until.
+
+        When a ring has wrapped, the window starts at the oldest retained
+        row or poll time, whichever is later, so the averages only cover
+        the span both rings still hold.
+        """
+        with self._lock:
+            count = min(self.written, self.capacity)
+            start = self.written % self.capacity if self.written > self.capacity else 0
+            poll_count = min(self.polls_written, len(self.polls))
+            poll_start = (self.polls_written % len(self.polls)
+                          if self.polls_written > len(self.polls) else 0)
+            # either ring may have wrapped first: start where both still have data
+            oldest = []
+            if self.written > self.capacity:
+                oldest.append(self.times[start])
+            if self.polls_written > len(self.polls):
+                oldest.append(self.polls[poll_start])
+            if oldest:
+                since = max(oldest) if since is None else max(since, *oldest)
+            lo, hi = self._bounds(self.times, count, start, since, until)
+            positions = [(start + i) % self.capacity for i in range(lo, hi)]
+            data = {'time': [self.times[p] for p in positions],
+                    'sid': [self.sids[p] for p in positions],
+                    'blocker': [self.blockers[p] for p in positions]}
+            for name, column in self.columns.items():
+                data[name] = [self.strings[column[p]] for p in positions]
+            p_lo, p_hi = self._bounds(self.polls, poll_count, poll_start, since, until)
+        return p_hi - p_lo, data
+
+
+def summarize(polls, data, top=10):
+    """Top-N breakdowns of a SampleBuffer.window()"""
+    samples = len(data['time'])
+
+    def ranked(counter):
+        return [{'name': name, 'samples': n, 'pct': round(n * 100 / samples, 1),
+                 'aas': round(n / polls, 2) if polls else None}
+                for name, n in counter.most_common(top)]
+
+    report = {
+        'polls': polls,
+        'samples': samples,
+        'average_active_sessions': round(samples / polls, 2) if polls else 0.0,
+        'first': data['time'][0] if samples else None,
+        'last': data['time'][-1] if samples else None,
+    }
+    for key, column in DIMENSIONS.items():
+        values = data[column]
+        if column == 'sql_id':
+            values = (v for v in values if v)
+        report[key] = ranked(Counter(values))
+    classes = dict(zip(data['event'], data['wait_class']))
+    for entry in report['events']:
+        entry['wait_class'] = classes[entry['name']]
+    report['blockers'] = ranked(Counter(str(b) for b in data['blocker'] if b >= 0))
+    # busiest sessions: which SIDs were sampled most, with their main event
+    sids = [str(sid) for sid in data['sid']]
+    main_event = {}
+    for sid, event in zip(sids, data['event']):
+        main_event.setdefault(sid, Counter())[event] += 1
+    report['sessions'] = [{**entry, 'event': main_event[entry['name']].most_common(1)[0][0]}
+                          for entry in ranked(Counter(sids))]
+    return report
+
+
+class AshSampler:
+    """Polls V$SESSION into a SampleBuffer over one persistent sqlplus session"""
+
+    def __init__(self, client=None, session_factory=None, interval=DEFAULT_INTERVAL,
+                 capacity=DEFAULT_CAPACITY, clock=time.time):
+        """``session_factory()`` returns an unstarted SqlSession; by default one
+        running ``sqlplus -s -L / as sysdba`` as the client's OS user"""
+        if session_factory is None:
+            from ..utils.oracle_client import OracleClient
+            from ..utils.sqlsession import SqlSession
+            client = client or OracleClient(os_user='oracle')
+
+            def factory():
+                return SqlSession(client.wrap([client.sqlplus, '-s', '-L', '/ as sysdba']),
+                                  env=client._env())
+            session_factory = factory
+        self.session_factory = session_factory
+        self.interval = interval
+        self.clock = clock
+        self.buffer = SampleBuffer(capacity)
+        self.error = None
+        self.started = None
+        self._session = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _connect(self):
+        if self._session is None or not self._session.alive:
+            session = self.session_factory()
+            session.start()
+            session.execute(SESSION_SETTINGS)
+            self._session = session
+        return self._session
+
+    def sample(self):
+        """Poll once and store the active sessions; returns them.
+
+        Raises SessionError when sqlplus is gone (the next call reconnects)
+        and RuntimeError when the query fails (e.g. no V$SESSION access).
+        """
+        now = self.clock()
+        output = self._connect().execute(ASH_QUERY)
+        if 'ORA-' in output or 'SP2-' in output:
+            raise RuntimeError(next(line.strip() for line in output.splitlines()
+                                    if 'ORA-' in line or 'SP2-' in line))
+        rows = parse_rows(output)
+        self.buffer.add(now, rows)
+        return rows
+
+    def report(self, since=None, until=None, top=10):
+        """summarize() of the samples with since <= time <= until"""
+        polls, data = self.buffer.window(since, until)
+        report = summarize(polls, data, top)
+        report.update({'since': since, 'until': until, 'interval': self.interval,
+                       'running': self.running, 'started': self.started, 'error': self.error})
+        return report
+
+    @property
+    def running(self):
+        return bool(self._thread and self._thread.is_alive())
+
+    def start(self):
+        """Start the background polling thread (idempotent)"""
+        if self.running:
+            return
+        self._stop.clear()
+        self.started = self.clock()
+        self._thread = threading.Thread(target=self._run, name='oradba-ash', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.close()
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def _run(self):
+        from ..utils.sqlsession import SessionError
+        backoff = self.interval
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample()
+                self.error = None
+                backoff = self.interval
+            except (SessionError, RuntimeError, OSError) as e:
+                self.error = str(e)
+                self.close()
+                backoff = min(MAX_BACKOFF, backoff * 2)
+                self._stop.wait(backoff)
+                continue
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
@@ -0,0 +1,264 @@
+"""
+AWR Snapshot Diff
+Load profile, top wait events, top SQL by elapsed time and OS statistics
+between two AWR snapshots, computed from the DBA_HIST views instead of the
+interactive awrrpt.sql:
+
+- One sqlplus round trip fetches both snapshots of DBA_HIST_SYSSTAT,
+  DBA_HIST_SYS_TIME_MODEL, DBA_HIST_SYSTEM_EVENT and DBA_HIST_OSSTAT, and
+  the per-snapshot deltas of DBA_HIST_SQLSTAT in the range.
+- Cumulative counters are aligned by name into array('d') columns and
+  differenced in one pass; rates divide by the time between the two
+  snapshots. Counters of all instances (RAC) are summed.
+- A restart between the snapshots resets the counters, so such a diff is
+  refused (as awrrpt does).
+
+The DBA_HIST views are part of the Diagnostics Pack license.
+
+Usage (Python):
+    from oracledba.modules.awrdiff import AwrDiff
+    report = AwrDiff().report(begin_snap=120, end_snap=121, top=10)
+    report['wait_events'][0]
+"""
+
+import heapq
+import operator
+from array import array
+from datetime import datetime
+
+DBID = "(SELECT DBID FROM V$DATABASE)"
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# (label, statistic); time model values are microseconds
+LOAD_PROFILE = (
+    ('DB time (s)', 'DB time'),
+    ('DB CPU (s)', 'DB CPU'),
+    ('Redo size (bytes)', 'redo size'),
+    ('Logical reads (blocks)', 'session logical reads'),
+    ('Block changes', 'db block changes'),
+    ('Physical reads (blocks)', 'physical reads'),
+    ('Physical writes (blocks)', 'physical writes'),
+    ('Read IO requests', 'physical read total IO requests'),
+    ('Write IO requests', 'physical write total IO requests'),
+    ('User calls', 'user calls'),
+    ('Parses', 'parse count (total)'),
+    ('Hard parses', 'parse count (hard)'),
+    ('Executes', 'execute count'),
+    ('Logons', 'logons cumulative'),
+    ('Transactions', None),
+)
+TIME_MODEL = ('DB time', 'DB CPU')
+# OS statistics that are counters since startup; the others (NUM_CPUS, LOAD, ...) are gauges
+OS_CUMULATIVE_SUFFIXES = ('_TIME', 'VM_IN_BYTES', 'VM_OUT_BYTES')
+
+
+def snapshot_query(condition):
+    return ("SELECT SNAP_ID, INSTANCE_NUMBER, "
+            "TO_CHAR(END_INTERVAL_TIME, 'YYYY-MM-DD HH24:MI:SS') AS END_TIME, "
+            "TO_CHAR(STARTUP_TIME, 'YYYY-MM-DD HH24:MI:SS') AS STARTUP_TIME "
+            f"FROM DBA_HIST_SNAPSHOT WHERE DBID = {DBID} AND {condition} "
+            "ORDER BY SNAP_ID, INSTANCE_NUMBER")
+
+
+def diff_queries(begin_snap, end_snap, top=10):
+    """{name: sql} fetching everything a diff of two snapshots needs"""
+    begin_snap, end_snap = int(begin_snap), int(end_snap)
+    both = f"DBID = {DBID} AND SNAP_ID IN ({begin_snap}, {end_snap})"
+    return {
+        'snapshots': snapshot_query(f"SNAP_ID IN ({begin_snap}, {end_snap})"),
+        'sysstat': ("SELECT SNAP_ID, STAT_NAME AS NAME, SUM(VALUE) AS VALUE FROM DBA_HIST_SYSSTAT "
+                    f"WHERE {both} GROUP BY SNAP_ID, STAT_NAME"),
+        'time_model': ("SELECT SNAP_ID, STAT_NAME AS NAME, SUM(VALUE) AS VALUE "
+                       f"FROM DBA_HIST_SYS_TIME_MODEL WHERE {both} "
+                       "AND STAT_NAME IN ('DB time', 'DB CPU') "
+                       "GROUP BY SNAP_ID, STAT_NAME"),
+        'events': ("SELECT SNAP_ID, EVENT_NAME AS NAME, WAIT_CLASS, SUM(TOTAL_WAITS) AS WAITS, "
+                   "SUM(TIME_WAITED_MICRO) AS MICROS FROM DBA_HIST_SYSTEM_EVENT "
+                   f"WHERE {both} AND WAIT_CLASS <> 'Idle' GROUP BY SNAP_ID, EVENT_NAME, WAIT_CLASS"),
+        'osstat': ("SELECT SNAP_ID, STAT_NAME AS NAME, SUM(VALUE) AS VALUE FROM DBA_HIST_OSSTAT "
+                   f"WHERE {both} GROUP BY SNAP_ID, STAT_NAME"),
+        # SQLSTAT rows already hold per-snapshot deltas: sum those after the begin snapshot
+        'sqlstat': ("SELECT x.*, (SELECT REGEXP_REPLACE(DBMS_LOB.SUBSTR(t.SQL_TEXT, 100, 1), "
+                    "'[[:cntrl:]|]+', ' ') FROM DBA_HIST_SQLTEXT t "
+                    f"WHERE t.DBID = {DBID} AND t.SQL_ID = x.SQL_ID) AS SQL_TEXT FROM "
+                    "(SELECT SQL_ID, MAX(MODULE) AS MODULE, SUM(ELAPSED_TIME_DELTA) AS ELAPSED, "
+                    "SUM(CPU_TIME_DELTA) AS CPU, SUM(IOWAIT_DELTA) AS IOWAIT, "
+                    "SUM(EXECUTIONS_DELTA) AS EXECUTIONS, SUM(BUFFER_GETS_DELTA) AS BUFFER_GETS, "
+                    "SUM(DISK_READS_DELTA) AS DISK_READS, SUM(ROWS_PROCESSED_DELTA) AS ROWS_PROCESSED "
+                    f"FROM DBA_HIST_SQLSTAT WHERE DBID = {DBID} "
+                    f"AND SNAP_ID > {begin_snap} AND SNAP_ID <= {end_snap} "
+                    f"GROUP BY SQL_ID ORDER BY ELAPSED DESC FETCH FIRST {int(top)} ROWS ONLY) x"),
+    }
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def counters(rows, snap_id, column='VALUE'):
+    """{name: value} of one snapshot from SNAP_ID/NAME/<column> rows"""
+    snap_id = str(snap_id)
+    return {r['NAME']: _float(r.get(column)) for r in rows if r.get('SNAP_ID') == snap_id}
+
+
+def diff_counters(begin, end):
+    """(names, array of end - begin) for every counter of ``end``"""
+    names = sorted(end)
+    first = array('d', (begin.get(name, 0.0) for name in names))
+    last = array('d', (end[name] for name in names))
+    return names, array('d', map(operator.sub, last, first))
+
+
+def check_snapshots(rows, begin_snap, end_snap):
+    """Seconds between the snapshots and the instance count.
+
+    Raises ValueError when a snapshot is missing or an instance restarted
+    in between (its counters start over).
+    """
+    snaps = {}
+    for r in rows:
+        snaps.setdefault(r.get('SNAP_ID'), {})[r.get('INSTANCE_NUMBER')] = r
+    begin, end = snaps.get(str(begin_snap)), snaps.get(str(end_snap))
+    for snap_id, instances in ((begin_snap, begin), (end_snap, end)):
+        if not instances:
+            raise ValueError(f"Snapshot {snap_id} not found in DBA_HIST_SNAPSHOT")
+    for instance, row in end.items():
+        if instance not in begin or begin[instance]['STARTUP_TIME'] != row['STARTUP_TIME']:
+            raise ValueError(f"Instance {instance} restarted between snapshots {begin_snap} "
+                             f"and {end_snap}; pick snapshots after {row['STARTUP_TIME']}")
+    begin_time = max(datetime.strptime(r['END_TIME'], TIME_FORMAT) for r in begin.values())
+    end_time = max(datetime.strptime(r['END_TIME'], TIME_FORMAT) for r in end.values())
+    return {'begin_time': begin_time.strftime(TIME_FORMAT), 'end_time': end_time.strftime(TIME_FORMAT),
+            'elapsed_seconds': (end_time - begin_time).total_seconds(), 'instances': len(end)}
+
+
+def _rate(value, per):
+    return round(value / per, 2) if per else None
+
+
+def build_report(rows, begin_snap, end_snap, top=10):
+    """JSON-ready diff report from diff_queries() rows"""
+    window = check_snapshots(rows.get('snapshots') or [], begin_snap, end_snap)
+    elapsed = window['elapsed_seconds']
+    if elapsed <= 0:
+        raise ValueError(f"Snapshot {end_snap} does not end after snapshot {begin_snap}")
+
+    stats = {}
+    for key in ('sysstat', 'time_model'):
+        data = rows.get(key) or []
+        names, deltas = diff_counters(counters(data, begin_snap), counters(data, end_snap))
+        stats.update(zip(names, deltas))
+    for name in TIME_MODEL:
+        stats[name] = stats.get(name, 0.0) / 1e6
+    transactions = stats.get('user commits', 0.0) + stats.get('user rollbacks', 0.0)
+    db_time = stats['DB time']
+
+    load_profile = []
+    for label, name in LOAD_PROFILE:
+        total = transactions if name is None else stats.get(name, 0.0)
+        load_profile.append({'name': label, 'total': round(total, 2),
+                             'per_second': _rate(total, elapsed),
+                             'per_transaction': _rate(total, transactions)})
+
+    # wait events: waits and time aligned on the same names
+    events = rows.get('events') or []
+    names, waits = diff_counters(counters(events, begin_snap, 'WAITS'), counters(events, end_snap, 'WAITS'))
+    _, micros = diff_counters(counters(events, begin_snap, 'MICROS'), counters(events, end_snap, 'MICROS'))
+    wait_class = {r['NAME']: r.get('WAIT_CLASS', '') for r in events}
+    timed = [{'event': name, 'wait_class': wait_class.get(name, ''), 'waits': int(w),
+              'time_seconds': round(us / 1e6, 2), 'avg_ms': round(us / w / 1000, 2) if w else None}
+             for name, w, us in zip(names, waits, micros) if us > 0]
+    timed.append({'event': 'DB CPU', 'wait_class': 'CPU', 'waits': None,
+                  'time_seconds': round(stats['DB CPU'], 2), 'avg_ms': None})
+    classes = {}
+    for event in timed:
+        classes[event['wait_class']] = classes.get(event['wait_class'], 0.0) + event['time_seconds']
+    for event in timed:
+        event['pct_db_time'] = _rate(event['time_seconds'] * 100, db_time)
+
+    sql = []
+    for r in rows.get('sqlstat') or []:
+        elapsed_s, executions = _float(r.get('ELAPSED')) / 1e6, int(_float(r.get('EXECUTIONS')))
+        sql.append({'sql_id': r.get('SQL_ID', ''), 'elapsed_seconds': round(elapsed_s, 2),
+                    'cpu_seconds': round(_float(r.get('CPU')) / 1e6, 2),
+                    'io_wait_seconds': round(_float(r.get('IOWAIT')) / 1e6, 2),
+                    'executions': executions,
+                    'elapsed_per_exec_ms': round(elapsed_s * 1000 / executions, 2) if executions else None,
+                    'buffer_gets': int(_float(r.get('BUFFER_GETS'))),
+                    'disk_reads': int(_float(r.get('DISK_READS'))),
+                    'rows_processed': int(_float(r.get('ROWS_PROCESSED'))),
+                    'pct_db_time': _rate(elapsed_s * 100, db_time),
+                    'module': r.get('MODULE', ''), 'text': r.get('SQL_TEXT', '')})
+
+    osstat = rows.get('osstat') or []
+    os_begin, os_end = counters(osstat, begin_snap), counters(osstat, end_snap)
+    names, deltas = diff_counters(os_begin, os_end)
+    os_stats = []
+    for name, delta in zip(names, deltas):
+        cumulative = name.endswith(OS_CUMULATIVE_SUFFIXES)
+        value = delta if cumulative else os_end[name]
+        os_stats.append({'name': name, 'value': round(value, 2), 'cumulative': cumulative,
+                         'per_second': _rate(value, elapsed) if cumulative else None})
+    os_delta = dict(zip(names, deltas))
+    busy, idle = os_delta.get('BUSY_TIME', 0.0), os_delta.get('IDLE_TIME', 0.0)
+
+    return {
+        'begin_snap': int(begin_snap), 'end_snap': int(end_snap), **window,
+        'db_time_seconds': round(db_time, 2),
+        'db_cpu_seconds': round(stats['DB CPU'], 2),
+        'average_active_sessions': round(db_time / elapsed, 2),
+        'transactions': int(transactions),
+        'load_profile': load_profile,
+        'wait_events': heapq.nlargest(top, timed, key=operator.itemgetter('time_seconds')),
+        'wait_classes': [{'wait_class': k, 'time_seconds': round(v, 2), 'pct_db_time': _rate(v * 100, db_time)}
+                         for k, v in sorted(classes.items(), key=lambda kv: -kv[1])],
+        'sql': heapq.nlargest(top, sql, key=operator.itemgetter('elapsed_seconds')),
+        'os': os_stats,
+        'host_cpu_busy_pct': round(busy * 100 / (busy + idle), 1) if busy + idle else None,
+    }
+
+
+class AwrDiff:
+    """Diffs AWR snapshots of the local database"""
+
+    def __init__(self, client=None):
+        if client is None:
+            from ..utils.oracle_client import OracleClient
+            client = OracleClient(os_user='oracle')
+        self.client = client
+
+    def snapshots(self, limit=10):
+        """The last ``limit`` snapshots, newest first: {snap_id, end_time, startup_time, instances}"""
+        ok, rows, error = self.client.query(snapshot_query(
+            f"SNAP_ID > (SELECT MAX(SNAP_ID) FROM DBA_HIST_SNAPSHOT WHERE DBID = {DBID}) - {int(limit)}"))
+        if not ok:
+            raise RuntimeError(error or 'DBA_HIST_SNAPSHOT query failed')
+        snaps = {}
+        for r in rows:
+            snap = snaps.setdefault(int(r['SNAP_ID']), {'snap_id': int(r['SNAP_ID']), 'end_time': r['END_TIME'],
+                                                        'startup_time': r['STARTUP_TIME'], 'instances': 0})
+            snap['instances'] += 1
+            snap['end_time'] = max(snap['end_time'], r['END_TIME'])
+        return sorted(snaps.values(), key=lambda s: -s['snap_id'])
+
+    def report(self, begin_snap=None, end_snap=None, top=10):
+        """build_report() between two snapshots (default: the last two).
+
+        Raises RuntimeError when the views cannot be queried and ValueError
+        for an unusable snapshot pair.
+        """
+        if begin_snap is None or end_snap is None:
+            latest = self.snapshots(2)
+            if len(latest) < 2:
+                raise ValueError("Fewer than two AWR snapshots (run DBMS_WORKLOAD_REPOSITORY.CREATE_SNAPSHOT)")
+            end_snap = latest[0]['snap_id'] if end_snap is None else end_snap
+            begin_snap = latest[1]['snap_id'] if begin_snap is None else begin_snap
+        if int(begin_snap) >= int(end_snap):
+            raise ValueError(f"Begin snapshot {begin_snap} must be before end snapshot {end_snap}")
+        ok, rows, errors = self.client.query_many(diff_queries(begin_snap, end_snap, top))
+        if not ok or errors:
+            raise RuntimeError(next(iter(errors.values()), '') or 'sqlplus failed')
+        return build_report(rows, begin_snap, end_snap, top)
@@ -0,0 +1,418 @@
+"""
+Backup Catalog
+A local SQLite index of the backups recorded in the control file, kept in
+~/.oracledba/backup-catalog.db so restore planning and size trends do not
+need RMAN or a round trip per question.
+
+Each refresh() is one sqlplus call. It fetches only control file records
+with a RECID above the last one synced for each view (V$BACKUP_SET,
+V$BACKUP_PIECE, V$BACKUP_DATAFILE, V$BACKUP_REDOLOG, V$ARCHIVED_LOG),
+plus the few records that are no longer available (deleted or expired
+pieces, deleted archived logs) so their status stays current. A view
+whose highest RECID dropped below the synced one belongs to a recreated
+control file and is synced again from scratch. Datafile image copies
+(V$DATAFILE_COPY) are few, and rolling one forward moves its checkpoint,
+so the available ones are re-read in full on every refresh.
+
+restore_plan(until) walks the index by checkpoint SCN and time: per
+datafile the newest usable full/level 0 backup or image copy before the
+target plus the level 1s after it, then every archived log from the oldest checkpoint SCN up
+to the target, taken from disk when still there and from a backup set
+otherwise. Gaps are reported instead of guessed.
+
+Usage (Python):
+    from oracledba.modules.backupcatalog import BackupCatalog
+    catalog = BackupCatalog()
+    catalog.refresh()
+    plan = catalog.restore_plan('2026-01-15 08:00:00')
+    print(plan['restorable'], [p['handle'] for p in plan['pieces']])
+"""
+
+import contextlib
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+
+CATALOG_FILE = Path.home() / '.oracledba' / 'backup-catalog.db'
+TIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+_TO_CHAR = "TO_CHAR({col},'YYYY-MM-DD HH24:MI:SS') AS {col}"
+
+# name -> (catalog table, control file view, SELECT list, extra predicate)
+VIEWS = {
+    'sets': ('backup_sets', 'V$BACKUP_SET',
+             "RECID, STAMP, SET_STAMP, SET_COUNT, BACKUP_TYPE, INCREMENTAL_LEVEL, "
+             "CONTROLFILE_INCLUDED, PIECES, ELAPSED_SECONDS, "
+             f"{_TO_CHAR.format(col='START_TIME')}, {_TO_CHAR.format(col='COMPLETION_TIME')}", ''),
+    'pieces': ('backup_pieces', 'V$BACKUP_PIECE',
+               "RECID, SET_STAMP, SET_COUNT, PIECE#, HANDLE, TAG, STATUS, DEVICE_TYPE, BYTES, "
+               f"{_TO_CHAR.format(col='COMPLETION_TIME')}", ''),
+    'datafiles': ('backup_datafiles', 'V$BACKUP_DATAFILE',
+                  "RECID, SET_STAMP, SET_COUNT, FILE#, INCREMENTAL_LEVEL, CHECKPOINT_CHANGE#, "
+                  f"{_TO_CHAR.format(col='CHECKPOINT_TIME')}, BLOCKS, BLOCK_SIZE", ''),
+    'redologs': ('backup_redologs', 'V$BACKUP_REDOLOG',
+                 "RECID, SET_STAMP, SET_COUNT, THREAD#, SEQUENCE#, FIRST_CHANGE#, NEXT_CHANGE#, "
+                 f"{_TO_CHAR.format(col='FIRST_TIME')}, {_TO_CHAR.format(col='NEXT_TIME')}, "
+                 "BLOCKS, BLOCK_SIZE", ''),
+    'archived': ('archived_logs', 'V$ARCHIVED_LOG',
+                 "RECID, NAME, THREAD#, SEQUENCE#, FIRST_CHANGE#, NEXT_CHANGE#, "
+                 f"{_TO_CHAR.format(col='FIRST_TIME')}, {_TO_CHAR.format(col='NEXT_TIME')}, "
+                 "BLOCKS, BLOCK_SIZE, DELETED, STATUS", "STANDBY_DEST = 'NO'"),
+}
+
+# Available image copies (incremental-forever bases), re-read in full
+COPIES_SQL = ("SELECT RECID, NAME, TAG, FILE#, INCREMENTAL_LEVEL, CHECKPOINT_CHANGE#, "
+              f"{_TO_CHAR.format(col='CHECKPOINT_TIME')}, BLOCKS, BLOCK_SIZE, "
+              f"{_TO_CHAR.format(col='COMPLETION_TIME')} FROM V$DATAFILE_COPY "
+              "WHERE STATUS = 'A' AND DELETED = 'NO' AND FILE# > 0 ORDER BY RECID")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS backup_sets (
+    recid INTEGER PRIMARY KEY, stamp INTEGER, set_stamp INTEGER, set_count INTEGER,
+    backup_type TEXT, incremental_level INTEGER, controlfile_included TEXT, pieces INTEGER,
+    elapsed_seconds REAL, start_time TEXT, completion_time TEXT);
+CREATE INDEX IF NOT EXISTS backup_sets_key ON backup_sets (set_stamp, set_count);
+CREATE INDEX IF NOT EXISTS backup_sets_time ON backup_sets (completion_time);
+
+CREATE TABLE IF NOT EXISTS backup_pieces (
+    recid INTEGER PRIMARY KEY, set_stamp INTEGER, set_count INTEGER, piece_no INTEGER,
+    handle TEXT, tag TEXT, status TEXT, device_type TEXT, bytes INTEGER, completion_time TEXT);
+CREATE INDEX IF NOT EXISTS backup_pieces_set ON backup_pieces (set_stamp, set_count);
+
+CREATE TABLE IF NOT EXISTS backup_datafiles (
+    recid INTEGER PRIMARY KEY, set_stamp INTEGER, set_count INTEGER, file_no INTEGER,
+    incremental_level INTEGER, checkpoint_change INTEGER, checkpoint_time TEXT,
+    blocks INTEGER, block_size INTEGER);
+CREATE INDEX IF NOT EXISTS backup_datafiles_file ON backup_datafiles (file_no, checkpoint_change);
+
+CREATE TABLE IF NOT EXISTS backup_redologs (
+    recid INTEGER PRIMARY KEY, set_stamp INTEGER, set_count INTEGER, thread INTEGER,
+    sequence INTEGER, first_change INTEGER, next_change INTEGER, first_time TEXT,
+    next_time TEXT, blocks INTEGER, block_size INTEGER);
+CREATE INDEX IF NOT EXISTS backup_redologs_scn ON backup_redologs (next_change);
+
+CREATE TABLE IF NOT EXISTS archived_logs (
+    recid INTEGER PRIMARY KEY, name TEXT, thread INTEGER, sequence INTEGER,
+    first_change INTEGER, next_change INTEGER, first_time TEXT, next_time TEXT,
+    blocks INTEGER, block_size INTEGER, deleted TEXT, status TEXT);
+CREATE INDEX IF NOT EXISTS archived_logs_scn ON archived_logs (next_change);
+
+CREATE TABLE IF NOT EXISTS datafile_copies (
+    recid INTEGER PRIMARY KEY, name TEXT, tag TEXT, file_no INTEGER, incremental_level INTEGER,
+    checkpoint_change INTEGER, checkpoint_time TEXT, blocks INTEGER, block_size INTEGER,
+    completion_time TEXT);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    view TEXT PRIMARY KEY, last_recid INTEGER, synced_at REAL);
+"""
+
+# Column order of each table as filled from the view's SELECT list
+_COLUMNS = {
+    'sets': ('RECID', 'STAMP', 'SET_STAMP', 'SET_COUNT', 'BACKUP_TYPE', 'INCREMENTAL_LEVEL',
+             'CONTROLFILE_INCLUDED', 'PIECES', 'ELAPSED_SECONDS', 'START_TIME', 'COMPLETION_TIME'),
+    'pieces': ('RECID', 'SET_STAMP', 'SET_COUNT', 'PIECE#', 'HANDLE', 'TAG', 'STATUS',
+               'DEVICE_TYPE', 'BYTES', 'COMPLETION_TIME'),
+    'datafiles': ('RECID', 'SET_STAMP', 'SET_COUNT', 'FILE#', 'INCREMENTAL_LEVEL',
+                  'CHECKPOINT_CHANGE#', 'CHECKPOINT_TIME', 'BLOCKS', 'BLOCK_SIZE'),
+    'redologs': ('RECID', 'SET_STAMP', 'SET_COUNT', 'THREAD#', 'SEQUENCE#', 'FIRST_CHANGE#',
+                 'NEXT_CHANGE#', 'FIRST_TIME', 'NEXT_TIME', 'BLOCKS', 'BLOCK_SIZE'),
+    'archived': ('RECID', 'NAME', 'THREAD#', 'SEQUENCE#', 'FIRST_CHANGE#', 'NEXT_CHANGE#',
+                 'FIRST_TIME', 'NEXT_TIME', 'BLOCKS', 'BLOCK_SIZE', 'DELETED', 'STATUS'),
+    'copies': ('RECID', 'NAME', 'TAG', 'FILE#', 'INCREMENTAL_LEVEL', 'CHECKPOINT_CHANGE#',
+               'CHECKPOINT_TIME', 'BLOCKS', 'BLOCK_SIZE', 'COMPLETION_TIME'),
+}
+
+# Backup set kind from its type, level and contents
+KIND_SQL = """CASE
+    WHEN s.backup_type = 'L' THEN 'ARCHIVELOG'
+    WHEN NOT EXISTS (SELECT 1 FROM backup_datafiles d WHERE d.set_stamp = s.set_stamp
+                     AND d.set_count = s.set_count AND d.file_no > 0) THEN 'CONTROLFILE'
+    WHEN s.incremental_level IS NULL THEN 'FULL'
+    ELSE 'LEVEL ' || s.incremental_level END"""
+
+# Sets whose pieces are all still available
+USABLE_SETS_SQL = """
+SELECT s.set_stamp, s.set_count FROM backup_sets s
+WHERE (SELECT COUNT(DISTINCT p.piece_no) FROM backup_pieces p WHERE p.set_stamp = s.set_stamp
+       AND p.set_count = s.set_count AND p.status = 'A') >= s.pieces
+"""
+
+
+def _value(text):
+    """sqlplus column text as int, float or str (None when empty)"""
+    if text is None or text == '':
+        return None
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _time_text(value):
+    """'YYYY-MM-DD HH:MM:SS' for a datetime, epoch seconds or such a string"""
+    if value is None:
+        return datetime.now().strftime(TIME_FORMAT)
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value).strftime(TIME_FORMAT)
+    if isinstance(value, datetime):
+        return value.strftime(TIME_FORMAT)
+    return datetime.fromisoformat(str(value).strip()).strftime(TIME_FORMAT)
+
+
+class BackupCatalog:
+    """SQLite index of control file backup records"""
+
+    def __init__(self, client=None, path=None):
+        if client is None:
+            from ..utils.oracle_client import OracleClient
+            client = OracleClient()
+        self.client = client
+        self.path = Path(path or CATALOG_FILE)
+
+    @contextlib.contextmanager
+    def _db(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(self.path, timeout=10)
+        db.row_factory = sqlite3.Row
+        try:
+            db.executescript(SCHEMA)
+            yield db
+            db.commit()
+        finally:
+            db.close()
+
+    # --- sync -------------------------------------------------------------
+
+    def last_synced(self):
+        """Epoch of the last refresh, or None"""
+        with self._db() as db:
+            row = db.execute("SELECT MAX(synced_at) FROM sync_state").fetchone()
+        return row[0]
+
+    def refresh(self, min_interval=0):
+        """Pull new control file records; skipped if synced less than
+        ``min_interval`` seconds ago. Returns counts, raises RuntimeError when
+        sqlplus cannot run."""
+        last = self.last_synced()
+        if min_interval and last and time.time() - last < min_interval:
+            return {'skipped': True, 'new': {}, 'updated': 0}
+
+        with self._db() as db:
+            recids = {row['view']: row['last_recid']
+                      for row in db.execute("SELECT view, last_recid FROM sync_state")}
+        queries = {}
+        for name, (_, view, columns, where) in VIEWS.items():
+            since = recids.get(name, 0)
+            predicate = f"RECID > {since}" + (f" AND {where}" if where else '')
+            queries[name] = f"SELECT {columns} FROM {view} WHERE {predicate} ORDER BY RECID"
+            queries[f'{name}_high'] = f"SELECT NVL(MAX(RECID), 0) AS HIGH FROM {view}"
+        queries['pieces_gone'] = (f"SELECT RECID, STATUS FROM V$BACKUP_PIECE WHERE STATUS <> 'A' "
+                                  f"AND RECID <= {recids.get('pieces', 0)}")
+        queries['archived_gone'] = (f"SELECT RECID, DELETED, STATUS FROM V$ARCHIVED_LOG "
+                                    f"WHERE (DELETED = 'YES' OR STATUS <> 'A') "
+                                    f"AND RECID <= {recids.get('archived', 0)}")
+        queries['copies'] = COPIES_SQL
+
+        ok, results, errors = self.client.query_many(queries)
+        if not ok:
+            raise RuntimeError(next(iter(errors.values()), 'sqlplus failed'))
+        if errors:
+            name, error = next(iter(errors.items()))
+            raise RuntimeError(f"{name}: {error}")
+
+        now = time.time()
+        new, updated, reset = {}, 0, False
+        with self._db() as db:
+            for name, (table, _, _, _) in VIEWS.items():
+                high = int(_value((results.get(f'{name}_high') or [{}])[0].get('HIGH')) or 0)
+                last_recid = recids.get(name, 0)
+                if high < last_recid:
+                    # recreated control file: RECIDs start over
+                    db.execute(f"DELETE FROM {table}")
+                    new[name], last_recid, reset = 0, 0, True
+                    db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, 0, ?)", (name, now))
+                    continue
+                rows = [tuple(_value(r.get(c)) for c in _COLUMNS[name]) for r in results.get(name, [])]
+                if rows:
+                    marks = ', '.join('?' * len(_COLUMNS[name]))
+                    db.executemany(f"INSERT OR REPLACE INTO {table} VALUES ({marks})", rows)
+                    last_recid = max(last_recid, max(r[0] for r in rows))
+                new[name] = len(rows)
+                db.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?, ?)",
+                           (name, last_recid, now))
+            for row in results.get('pieces_gone', []):
+                updated += db.execute("UPDATE backup_pieces SET status = ? WHERE recid = ? "
+                                      "AND status IS NOT ?",
+                                      (row['STATUS'], _value(row['RECID']), row['STATUS'])).rowcount
+            for row in results.get('archived_gone', []):
+                updated += db.execute("UPDATE archived_logs SET deleted = ?, status = ? WHERE recid = ? "
+                                      "AND (deleted IS NOT ? OR status IS NOT ?)",
+                                      (row['DELETED'], row['STATUS'], _value(row['RECID']),
+                                       row['DELETED'], row['STATUS'])).rowcount
+            copies = [tuple(_value(r.get(c)) for c in _COLUMNS['copies'])
+                      for r in results.get('copies', [])]
+            db.execute("DELETE FROM datafile_copies")
+            db.executemany(f"INSERT INTO datafile_copies VALUES ({', '.join('?' * len(_COLUMNS['copies']))})",
+                           copies)
+        if reset:
+            # the records of the new control file were not in this batch
+            return self.refresh()
+        return {'skipped': False, 'new': new, 'updated': updated, 'copies': len(copies)}
+
+    # --- questions --------------------------------------------------------
+
+    def recent_backups(self, limit=10):
+        """Newest backup sets with kind, size and piece status"""
+        with self._db() as db:
+            rows = db.execute(f"""
+                SELECT s.recid, s.start_time, s.completion_time, {KIND_SQL} AS kind,
+                       SUM(p.bytes) AS bytes, MIN(p.tag) AS tag,
+                       SUM(p.status = 'A') AS available, COUNT(p.recid) AS piece_rows
+                FROM backup_sets s LEFT JOIN backup_pieces p
+                     ON p.set_stamp = s.set_stamp AND p.set_count = s.set_count
+                GROUP BY s.recid ORDER BY s.completion_time DESC, s.recid DESC LIMIT ?""",
+                              (limit,)).fetchall()
+        return [{'recid': r['recid'], 'start_time': r['start_time'],
+                 'completion_time': r['completion_time'], 'kind': r['kind'], 'tag': r['tag'],
+                 'gb': round((r['bytes'] or 0) / 1073741824, 3),
+                 'status': 'AVAILABLE' if r['piece_rows'] and r['available'] == r['piece_rows']
+                 else 'PARTIAL' if r['available'] else 'DELETED'}
+                for r in rows]
+
+    def size_trend(self, days=30):
+        """Backup volume per day and kind over the last ``days`` days"""
+        since = datetime.fromtimestamp(time.time() - days * 86400).strftime(TIME_FORMAT)
+        with self._db() as db:
+            rows = db.execute(f"""
+                SELECT substr(s.completion_time, 1, 10) AS day, {KIND_SQL} AS kind,
+                       COUNT(DISTINCT s.recid) AS sets, SUM(p.bytes) AS bytes
+                FROM backup_sets s JOIN backup_pieces p
+                     ON p.set_stamp = s.set_stamp AND p.set_count = s.set_count
+                WHERE s.completion_time >= ?
+                GROUP BY day, kind ORDER BY day, kind""", (since,)).fetchall()
+        daily = [{'day': r['day'], 'kind': r['kind'], 'sets': r['sets'],
+                  'gb': round((r['bytes'] or 0) / 1073741824, 3)} for r in rows]
+        kinds = {}
+        for entry in daily:
+            totals = kinds.setdefault(entry['kind'], {'days': 0, 'gb': 0.0, 'first_gb': None,
+                                                      'last_gb': None})
+            totals['days'] += 1
+            totals['gb'] += entry['gb']
+            totals['first_gb'] = entry['gb'] if totals['first_gb'] is None else totals['first_gb']
+            totals['last_gb'] = entry['gb']
+        summary = {kind: {'days': t['days'], 'total_gb': round(t['gb'], 3),
+                          'avg_gb': round(t['gb'] / t['days'], 3),
+                          'first_gb': t['first_gb'], 'last_gb': t['last_gb']}
+                   for kind, t in kinds.items()}
+        return {'days': days, 'daily': daily, 'summary': summary}
+
+    def restore_plan(self, until=None):
+        """Backup pieces and archived logs needed to restore and recover to ``until``
+        (datetime, epoch seconds or 'YYYY-MM-DD HH:MM:SS'; default now)"""
+        until = _time_text(until)
+        missing = []
+        with self._db() as db:
+            usable = {(r[0], r[1]) for r in db.execute(USABLE_SETS_SQL)}
+            rows = db.execute("""
+                SELECT file_no, set_stamp, set_count, incremental_level AS level,
+                       checkpoint_change, checkpoint_time, NULL AS name, NULL AS tag,
+                       NULL AS bytes FROM backup_datafiles
+                WHERE file_no > 0 AND checkpoint_time <= ?
+                UNION ALL
+                SELECT file_no, NULL, NULL, 0, checkpoint_change, checkpoint_time, name, tag,
+                       blocks * block_size FROM datafile_copies
+                WHERE checkpoint_time <= ?
+                ORDER BY file_no, checkpoint_change""", (until, until)).fetchall()
+
+            by_file = {}
+            for row in rows:
+                by_file.setdefault(row['file_no'], []).append(row)
+            datafiles, sets, copies = [], set(), []
+            start_scn = None
+            for file_no, backups in by_file.items():
+                usable_backups = [b for b in backups
+                                  if b['name'] or (b['set_stamp'], b['set_count']) in usable]
+                bases = [b for b in usable_backups if not b['level']]
+                if not bases:
+                    missing.append(f"datafile {file_no}: no usable full or level 0 backup "
+                                   f"or image copy before {until}")
+                    continue
+                base = bases[-1]
+                chain = [b for b in usable_backups
+                         if b['level'] and b['checkpoint_change'] > base['checkpoint_change']]
+                if base['name']:
+                    copies.append({'file': file_no, 'name': base['name'], 'tag': base['tag'],
+                                   'bytes': base['bytes'] or 0,
+                                   'checkpoint_time': base['checkpoint_time']})
+                for b in chain if base['name'] else [base] + chain:
+                    sets.add((b['set_stamp'], b['set_count']))
+                last = chain[-1] if chain else base
+                start_scn = (last['checkpoint_change'] if start_scn is None
+                             else min(start_scn, last['checkpoint_change']))
+                datafiles.append({'file': file_no, 'base_level': base['level'],
+                                  'base': 'copy' if base['name'] else 'backup set',
+                                  'base_checkpoint_time': base['checkpoint_time'],
+                                  'incrementals': len(chain),
+                                  'checkpoint_change': last['checkpoint_change']})
+
+            logs = {'on_disk': [], 'from_backup': 0}
+            if start_scn is not None:
+                on_disk = {(r['thread'], r['sequence']): r['name'] for r in db.execute("""
+                    SELECT thread, sequence, name FROM archived_logs
+                    WHERE next_change > ? AND first_time <= ? AND deleted = 'NO' AND status = 'A'""",
+                                                                                   (start_scn, until))}
+                in_backup = {}
+                for r in db.execute("""
+                        SELECT thread, sequence, set_stamp, set_count FROM backup_redologs
+                        WHERE next_change > ? AND first_time <= ?""", (start_scn, until)):
+                    if (r['set_stamp'], r['set_count']) in usable:
+                        in_backup.setdefault((r['thread'], r['sequence']), (r['set_stamp'], r['set_count']))
+                known = {(r['thread'], r['sequence']) for r in db.execute("""
+                    SELECT thread, sequence FROM archived_logs WHERE next_change > ? AND first_time <= ?
+                    UNION SELECT thread, sequence FROM backup_redologs
+                    WHERE next_change > ? AND first_time <= ?""", (start_scn, until, start_scn, until))}
+                threads = {}
+                for thread, sequence in known:
+                    low, high = threads.get(thread, (sequence, sequence))
+                    threads[thread] = (min(low, sequence), max(high, sequence))
+                for thread, (low, high) in sorted(threads.items()):
+                    for sequence in range(low, high + 1):
+                        key = (thread, sequence)
+                        if key in on_disk:
+                            logs['on_disk'].append(on_disk[key])
+                        elif key in in_backup:
+                            logs['from_backup'] += 1
+                            sets.add(in_backup[key])
+                        else:
+                            missing.append(f"archived log thread {thread} sequence {sequence}")
+
+            pieces = {}
+            for stamp, count in sets:
+                for p in db.execute(f"""
+                        SELECT p.piece_no, p.handle, p.tag, p.bytes, p.completion_time,
+                               {KIND_SQL} AS kind
+                        FROM backup_pieces p JOIN backup_sets s
+                             ON s.set_stamp = p.set_stamp AND s.set_count = p.set_count
+                        WHERE p.set_stamp = ? AND p.set_count = ? AND p.status = 'A'
+                        ORDER BY p.recid""", (stamp, count)):
+                    pieces.setdefault((stamp, count, p['piece_no']), {
+                        'handle': p['handle'], 'tag': p['tag'], 'kind': p['kind'],
+                        'bytes': p['bytes'] or 0, 'completion_time': p['completion_time']})
+
+        pieces = sorted(pieces.values(), key=lambda p: (p['completion_time'] or '', p['handle'] or ''))
+        total_bytes = sum(p['bytes'] for p in pieces) + sum(c['bytes'] for c in copies)
+        if not datafiles and not missing:
+            missing.append('no datafile backups in the catalog')
+        return {
+            'until': until,
+            'restorable': bool(datafiles) and not missing,
+            'start_scn': start_scn,
+            'datafiles': datafiles,
+            'archived_logs': logs,
+            'pieces': pieces,
+            'copies': copies,
+            'total_gb': round(total_bytes / 1073741824, 3),
+            'missing': missing,
+        }
@@ -0,0 +1,448 @@
+"""
+Backup Scheduler
+Runs RMAN backups from cron-like policies, one per database (the CDB or a
+PDB) and backup type, as tracked background jobs.
+
+- At most ``max_concurrent`` RMAN jobs run at once across all databases,
+  and never two on the same database; the rest wait in a FIFO queue.
+- Scheduled full/incremental runs only start inside the I/O windows
+  (e.g. 22:00-06:00) when windows are set; archive log runs and manual
+  runs start at any time.
+- Policies, queue, running jobs and history live in
+  ~/.oracledba/backup-schedule.json, updated under an flock so the CLI
+  and the web server can both submit runs. Only one process at a time
+  (the holder of backup-scheduler.lock) dispatches them.
+- After a restart, a policy whose slot passed while nothing was running
+  gets a single catch-up run (several missed slots are coalesced), unless
+  the policy has catch_up off.
+
+Usage (Python):
+    from oracledba.modules.backupscheduler import BackupScheduler
+    scheduler = BackupScheduler()
+    scheduler.add_policy('CDB', 'full', '0 1 * * 0')
+    scheduler.add_policy('CDB', 'archive', '0 */4 * * *')
+    scheduler.start()           # background thread, or run_forever()
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+STATE_FILE = Path.home() / '.oracledba' / 'backup-schedule.json'
+JOBS_DIR = Path.home() / '.oracledba' / 'backup-jobs'
+BACKUP_TYPES = ('full', 'incremental', 'archive')
+DEFAULT_MAX_CONCURRENT = 2
+TICK_SECONDS = 30
+HISTORY_KEEP = 200
+TIME_FORMAT = '%Y-%m-%d %H:%M'
+
+_FIELDS = (('minute', 0, 59), ('hour', 0, 23), ('day', 1, 31), ('month', 1, 12), ('weekday', 0, 7))
+
+
+class CronSchedule:
+    """Five-field cron expression: minute hour day-of-month month day-of-week.
+
+    Fields take *, numbers, ranges (1-5), steps (*/15, 0-12/3) and lists
+    (1,15). Day of week 0 and 7 are Sunday. As in cron, when both day
+    fields are restricted a day matching either one matches.
+    """
+
+    def __init__(self, expression):
+        parts = str(expression).split()
+        if len(parts) != 5:
+            raise ValueError(f"Invalid schedule '{expression}' (need 5 fields: min hour day month weekday)")
+        self.expression = ' '.join(parts)
+        self.values = {}
+        for text, (name, low, high) in zip(parts, _FIELDS):
+            self.values[name] = self._parse(text, name, low, high)
+        self.values['weekday'] = {0 if d == 7 else d for d in self.values['weekday']}
+        self.day_any = parts[2] == '*'
+        self.weekday_any = parts[4] == '*'
+        self.minutes = sorted(self.values['minute'])
+        self.hours = sorted(self.values['hour'])
+
+    @staticmethod
+    def _parse(text, name, low, high):
+        values = set()
+        for item in text.split(','):
+            base, _, step = item.partition('/')
+            try:
+                step = int(step) if step else 1
+                if base == '*':
+                    start, end = low, high
+                elif '-' in base:
+                    start, end = (int(v) for v in base.split('-', 1))
+                else:
+                    start = end = int(base)
+            except ValueError:
+                raise ValueError(f"Invalid {name} field '{text}'")
+            if step < 1 or start < low or end > high or start > end:
+                raise ValueError(f"Invalid {name} field '{text}' (allowed {low}-{high})")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, day):
+        if day.month not in self.values['month']:
+            return False
+        dom = day.day in self.values['day']
+        dow = (day.isoweekday() % 7) in self.values['weekday']
+        if self.day_any or self.weekday_any:
+            return dom and dow
+        return dom or dow
+
+    def next_after(self, when):
+        """First matching minute strictly after ``when`` (None within 5 years)"""
+        start = when.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.replace(hour=0, minute=0)
+        for _ in range(366 * 5):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        slot = day.replace(hour=hour, minute=minute)
+                        if slot >= start:
+                            return slot
+            day += timedelta(days=1)
+        return None
+
+    def last_at_or_before(self, when):
+        """Latest matching minute at or before ``when`` (None within 5 years)"""
+        end = when.replace(second=0, microsecond=0)
+        day = end.replace(hour=0, minute=0)
+        for _ in range(366 * 5):
+            if self._day_matches(day):
+                for hour in reversed(self.hours):
+                    for minute in reversed(self.minutes):
+                        slot = day.replace(hour=hour, minute=minute)
+                        if slot <= end:
+                            return slot
+            day -= timedelta(days=1)
+        return None
+
+
+def parse_window(text):
+    """'22:00-06:00' -> (start minute of day, end minute of day)"""
+    try:
+        start, end = text.split('-')
+        minutes = []
+        for part in (start, end):
+            hour, minute = part.strip().split(':')
+            if not (0 <= int(hour) <= 24 and 0 <= int(minute) < 60):
+                raise ValueError
+            minutes.append(int(hour) * 60 + int(minute))
+    except ValueError:
+        raise ValueError(f"Invalid window '{text}' (use HH:MM-HH:MM)")
+    return minutes[0], minutes[1]
+
+
+def in_windows(windows, when):
+    """True when ``when`` falls in one of the windows (or there are none)"""
+    if not windows:
+        return True
+    minute = when.hour * 60 + when.minute
+    for text in windows:
+        start, end = parse_window(text)
+        if (start <= minute < end) if start <= end else (minute >= start or minute < end):
+            return True
+    return False
+
+
+def _lock_key(run):
+    """What a run's RMAN job touches: its PDB, or the whole CDB. Archive log
+    backups (and PLUS ARCHIVELOG of the CDB runs) are CDB-wide, so only
+    backups of different PDBs run side by side."""
+    return 'CDB' if run['type'] == 'archive' else run['database']
+
+
+def _empty_state():
+    return {'settings': {'max_concurrent': DEFAULT_MAX_CONCURRENT, 'windows': []},
+            'policies': [], 'queue': [], 'running': [], 'history': []}
+
+
+class BackupScheduler:
+    """Policy-driven RMAN backup queue with global and per-database limits"""
+
+    def __init__(self, jobs=None, client=None, state_file=None, clock=datetime.now):
+        from ..utils.jobs import JobManager
+        self.state_file = Path(state_file or STATE_FILE)
+        self.jobs = jobs or JobManager(JOBS_DIR, max_concurrent=64)
+        self.client = client
+        self.clock = clock
+        self._daemon_lock = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- persisted state --------------------------------------------------
+
+    @contextlib.contextmanager
+    def _state(self):
+        """Read-modify-write of the state file under an exclusive flock"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.state_file.with_suffix('.flock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(self.state_file) as f:
+                        state = {**_empty_state(), **json.load(f)}
+                except (OSError, ValueError):
+                    state = _empty_state()
+                yield state
+                tmp = self.state_file.with_suffix('.tmp')
+                with open(tmp, 'w') as f:
+                    json.dump(state, f, indent=2)
+                os.replace(tmp, self.state_file)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _read(self):
+        # writers replace the file atomically, so a plain read is consistent
+        try:
+            with open(self.state_file) as f:
+                return {**_empty_state(), **json.load(f)}
+        except (OSError, ValueError):
+            return _empty_state()
+
+    def status(self, history=20):
+        """Settings, policies (with next run), queue, running jobs and recent history"""
+        state = self._read()
+        now = self.clock()
+        for policy in state['policies']:
+            slot = CronSchedule(policy['schedule']).next_after(now)
+            policy['next_run'] = slot.strftime(TIME_FORMAT) if slot else None
+        state['history'] = state['history'][-history:] if history else []
+        return state
+
+    # --- configuration ----------------------------------------------------
+
+    def configure(self, max_concurrent=None, windows=None):
+        """Set the global RMAN job limit and/or the I/O windows"""
+        for text in windows or ():
+            parse_window(text)
+        with self._state() as state:
+            if max_concurrent is not None:
+                if int(max_concurrent) < 1:
+                    raise ValueError("max_concurrent must be at least 1")
+                state['settings']['max_concurrent'] = int(max_concurrent)
+            if windows is not None:
+                state['settings']['windows'] = list(windows)
+            return dict(state['settings'])
+
+    def add_policy(self, database, backup_type, schedule, catch_up=True, window=None, enabled=True):
+        """Add or replace the policy for (database, backup_type); returns it"""
+        database = (database or 'CDB').upper()
+        if backup_type not in BACKUP_TYPES:
+            raise ValueError(f"Unknown backup type: {backup_type}")
+        CronSchedule(schedule)
+        policy = {'id': f"{database.lower()}-{backup_type}", 'database': database,
+                  'type': backup_type, 'schedule': schedule, 'enabled': enabled,
+                  'catch_up': catch_up,
+                  'window': backup_type != 'archive' if window is None else window,
+                  'last_slot': self.clock().strftime(TIME_FORMAT), 'last_result': None}
+        with self._state() as state:
+            state['policies'] = [p for p in state['policies'] if p['id'] != policy['id']] + [policy]
+        return policy
+
+    def remove_policy(self, policy_id):
+        with self._state() as state:
+            before = len(state['policies'])
+            state['policies'] = [p for p in state['policies'] if p['id'] != policy_id]
+            state['queue'] = [r for r in state['queue'] if r.get('policy') != policy_id]
+            return len(state['policies']) < before
+
+    # --- runs -------------------------------------------------------------
+
+    @staticmethod
+    def _run(database, backup_type, reason, policy=None, window=False, now=None):
+        return {'id': uuid.uuid4().hex[:8], 'policy': policy, 'database': database,
+                'type': backup_type, 'reason': reason, 'window': window,
+                'queued_at': now.strftime(TIME_FORMAT)}
+
+    def submit(self, database, backup_type, reason='manual', urgent=False, dest=None):
+        """Queue a run now (manual runs ignore the I/O windows) and dispatch if a slot is free.
+
+        Urgent runs (FRA relief) go to the front of the queue. ``dest`` sends
+        the pieces of an archive log backup to that directory.
+        """
+        if backup_type not in BACKUP_TYPES:
+            raise ValueError(f"Unknown backup type: {backup_type}")
+        run = self._run((database or 'CDB').upper(), backup_type, reason, now=self.clock())
+        if urgent:
+            run['urgent'] = True
+        if dest:
+            run['dest'] = dest
+        with self._state() as state:
+            if urgent:
+                state['queue'].insert(0, run)
+            else:
+                state['queue'].append(run)
+        if self._daemon_lock is not None:
+            self.tick()
+        return run
+
+    def cancel(self, run_id):
+        """Drop a queued run or cancel a running one"""
+        with self._state() as state:
+            queued = [r for r in state['queue'] if r['id'] == run_id]
+            state['queue'] = [r for r in state['queue'] if r['id'] != run_id]
+            running = next((r for r in state['running'] if r['id'] == run_id), None)
+        if running:
+            return self.jobs.cancel(running['job_id'])
+        return bool(queued)
+
+    def tick(self):
+        """Reap finished jobs, queue due policy runs and start what the limits allow.
+        Returns the runs started."""
+        now = self.clock()
+        with self._state() as state:
+            self._reap(state, now)
+            self._queue_due(state, now)
+            return self._dispatch(state, now)
+
+    def _queue_due(self, state, now):
+        pending = {r.get('policy') for r in state['queue'] + state['running']}
+        for policy in state['policies']:
+            if not policy.get('enabled', True):
+                continue
+            cron = CronSchedule(policy['schedule'])
+            last = datetime.strptime(policy['last_slot'], TIME_FORMAT)
+            due = cron.next_after(last)
+            if due is None or due > now:
+                continue
+            latest = cron.last_at_or_before(now)
+            policy['last_slot'] = latest.strftime(TIME_FORMAT)
+            missed = now - due > timedelta(seconds=TICK_SECONDS * 2)
+            if missed and not policy.get('catch_up', True):
+                continue
+            if policy['id'] in pending:
+                continue            # previous run still queued or running
+            state['queue'].append(self._run(policy['database'], policy['type'],
+                                            'catch-up' if missed else 'schedule', policy['id'],
+                                            policy.get('window', False), now))
+
+    def _reap(self, state, now):
+        still = []
+        for run in state['running']:
+            job = self.jobs.get(run['job_id'])
+            if job is not None and job.active:
+                still.append(run)
+                continue
+            run['state'] = job.state if job is not None else 'lost'
+            run['ended'] = now.strftime(TIME_FORMAT)
+            state['history'] = (state['history'] + [run])[-HISTORY_KEEP:]
+            for policy in state['policies']:
+                if policy['id'] == run.get('policy'):
+                    policy['last_result'] = {'state': run['state'], 'ended': run['ended'],
+                                             'job_id': run['job_id']}
+        state['running'] = still
+
+    def _dispatch(self, state, now):
+        started = []
+        limit = state['settings'].get('max_concurrent', DEFAULT_MAX_CONCURRENT)
+        window_open = in_windows(state['settings'].get('windows'), now)
+        busy = {_lock_key(r) for r in state['running']}
+        waiting = []
+        for run in state['queue']:
+            key = _lock_key(run)
+            conflict = key in busy or 'CDB' in busy or (key == 'CDB' and busy)
+            if (len(state['running']) >= limit or conflict
+                    or (run.get('window') and not window_open)):
+                waiting.append(run)
+                continue
+            try:
+                run['job_id'] = self._launch(run)
+            except (OSError, RuntimeError) as e:
+                run.update(state='failed', error=str(e), ended=now.strftime(TIME_FORMAT))
+                state['history'] = (state['history'] + [run])[-HISTORY_KEEP:]
+                continue
+            run['started'] = now.strftime(TIME_FORMAT)
+            state['running'].append(run)
+            busy.add(key)
+            started.append(run)
+        state['queue'] = waiting
+        return started
+
+    def _launch(self, run):
+        """Start the RMAN job for a run; returns its job ID"""
+        from .rman import RMANManager
+        if self.client is None:
+            from ..utils.oracle_client import OracleClient
+            self.client = OracleClient()
+        pdb = None if run['database'] == 'CDB' else run['database']
+        tag = f"{run['type']}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        commands = RMANManager(self.client).backup_commands(run['type'], tag, pdb=pdb,
+                                                            dest=run.get('dest'))
+        if commands is None:
+            raise RuntimeError(f"Unknown backup type: {run['type']}")
+        job = self.jobs.create(None, name=f"RMAN {run['type']} {run['database']}", tag='rman-backup',
+                               meta={'run': run['id'], 'policy': run.get('policy'),
+                                     'database': run['database'], 'type': run['type']})
+        # The script goes to RMAN on stdin, as in OracleClient.run_rman: RMAN
+        # runs as oracle, which cannot read a cmdfile under root's home
+        script = job.path('rcv')
+        script.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(script, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(f"{commands}\nEXIT;\n")
+        job.stdin_file = str(script)
+        job.cmd = self.client.wrap([self.client.rman, 'target', '/'])
+        self.jobs.enqueue(job)
+        return job.id
+
+    # --- daemon -----------------------------------------------------------
+
+    @property
+    def active(self):
+        """True while this process is the one dispatching runs"""
+        return self._daemon_lock is not None
+
+    def acquire(self):
+        """Become the dispatching process; False if another one already is"""
+        if self._daemon_lock is not None:
+            return True
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        lock = open(self.state_file.with_name('backup-scheduler.lock'), 'a')
+        try:
+            fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock.close()
+            return False
+        self._daemon_lock = lock
+        return True
+
+    def release(self):
+        if self._daemon_lock is not None:
+            fcntl.flock(self._daemon_lock, fcntl.LOCK_UN)
+            self._daemon_lock.close()
+            self._daemon_lock = None
+
+    def start(self, interval=TICK_SECONDS):
+        """Dispatch in a background thread; False if another process is the scheduler"""
+        if self._thread and self._thread.is_alive():
+            return True
+        if not self.acquire():
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.run_forever, args=(interval,),
+                                        name='oradba-backup-scheduler', daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.release()
+
+    def run_forever(self, interval=TICK_SECONDS):
+        """Tick every ``interval`` seconds until stop()"""
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except (OSError, ValueError) as e:
+                from ..utils.logger import get_logger
+                get_logger().error(f"backup scheduler: {e}")
+            self._stop.wait(interval)
@@ -134,24 +134,97 @@ class DatabaseManager:
             rprint(f"[red]Error:[/red] Unsupported script type: {script.suffix}")
             return False
     
-    def view_alert_log(self, tail=50):
-        """View alert log"""
-        alert_log = Path(f"{self.oracle_home}/../diag/rdbms/{self.oracle_sid.lower()}/{self.oracle_sid}/trace/alert_{self.oracle_sid}.log")
-        
-        if alert_log.exists():
-            os.system(f"tail -n {tail} {alert_log}")
-        else:
-            rprint(f"[red]Alert log not found:[/red] {alert_log}")
-    
-    def view_listener_log(self, tail=50):
-        """View listener log"""
-        listener_log = Path(f"{self.oracle_home}/../diag/tnslsnr/{os.uname().nodename}/listener/trace/listener.log")
-        
-        if listener_log.exists():
-            os.system(f"tail -n {tail} {listener_log}")
-        else:
-            rprint(f"[red]Listener log not found:[/red] {listener_log}")
-    
+    def view_alert_log(self, tail=50, since=None, until=None, grep=None, ora=None, path=None):
+        """View alert log entries, optionally filtered by time range, regex or ORA- code"""
+        from rich.markup import escape
+        from .alertlog import AlertLog, find_alert_log, parse_time
+
+        alert_log = Path(path) if path else find_alert_log(self.oracle_sid, oracle_home=self.oracle_home)
+        if alert_log is None or not alert_log.exists():
+            rprint(f"[red]Alert log not found:[/red] {alert_log or f'no diag directory for {self.oracle_sid}'}")
+            return False
+
+        try:
+            page = AlertLog(alert_log).search(since=parse_time(since), until=parse_time(until),
+                                              grep=grep, ora=ora, limit=tail)
+        except ValueError as e:
+            rprint(f"[red]Error:[/red] {e}")
+            return False
+
+        records = list(reversed(page['records']))
+        console.print(f"\n[bold cyan]Alert log[/bold cyan] [dim]{alert_log}[/dim]\n")
+        for rec in records:
+            console.print(f"[dim]{rec.timestamp}[/dim]")
+            for line in rec.text.splitlines():
+                style = 'red' if rec.codes and 'ORA-' in line.upper() else None
+                console.print(escape(line), style=style, highlight=False)
+        if not records:
+            console.print("[yellow]No matching entries[/yellow]")
+        elif page['next_before'] is not None:
+            console.print(f"\n[dim]Showing the last {len(records)} matching entries (use --tail for more)[/dim]")
+        return True
+
+    def view_listener_log(self, tail=50, report=False, top=10, reset=False, as_json=False, path=None):
+        """View listener log, or with ``report`` aggregate it into connection/error statistics"""
+        from rich.markup import escape
+        from .listenerlog import ListenerLogAnalyzer, find_listener_log, tail_lines
+
+        listener_log = Path(path) if path else find_listener_log(oracle_home=self.oracle_home)
+        if listener_log is None or not listener_log.exists():
+            rprint(f"[red]Listener log not found:[/red] {listener_log or 'no diag/tnslsnr directory'}")
+            return False
+
+        if not report:
+            for line in tail_lines(listener_log, tail):
+                console.print(escape(line), highlight=False)
+            return True
+
+        analyzer = ListenerLogAnalyzer(listener_log)
+        if reset:
+            analyzer.reset()
+        analyzer.update()
+        data = analyzer.report(top=top)
+        if as_json:
+            import json
+            print(json.dumps(data, indent=2))
+            return True
+        self._print_listener_report(data)
+        return True
+
+    def _print_listener_report(self, data):
+        console.print(f"\n[bold cyan]Listener log report[/bold cyan] [dim]{data['file']}[/dim]")
+        console.print(f"[dim]{data['first_seen'] or '-'} → {data['last_seen'] or '-'}, "
+                      f"{data['bytes_read']:,} new bytes read[/dim]\n")
+        failed_style = 'red' if data['failed'] else 'green'
+        console.print(f"Connects: [bold]{data['connects']:,}[/bold]   "
+                      f"Failed: [{failed_style}]{data['failed']:,}[/{failed_style}]   "
+                      f"Peak: [bold]{data['peak']['connects']}[/bold]/s at {data['peak']['second'] or '-'}")
+        if data['bursts']:
+            console.print(f"[yellow]{len(data['bursts'])} second(s) with ≥ {data['burst_threshold']} "
+                          f"connects, latest {data['bursts'][-1]['second']} "
+                          f"({data['bursts'][-1]['connects']}/s)[/yellow]")
+        if data['approximate']:
+            console.print("[dim]Counts are approximate: rare keys were dropped to bound memory[/dim]")
+
+        for key, title in (('services', 'Service'), ('hosts', 'Client Host'), ('programs', 'Program')):
+            if not data[key]:
+                continue
+            table = Table(title=f"Connects per {title}", show_header=True, header_style="bold magenta")
+            table.add_column(title, style="cyan")
+            table.add_column("Connects", justify="right")
+            for row in data[key]:
+                table.add_row(row['name'], f"{row['connects']:,}")
+            console.print(table)
+
+        if data['errors']:
+            table = Table(title="TNS Errors", show_header=True, header_style="bold red")
+            table.add_column("Code", style="red")
+            table.add_column("Count", justify="right")
+            table.add_column("Message", style="dim")
+            for row in data['errors']:
+                table.add_row(row['code'], f"{row['count']:,}", row['message'])
+            console.print(table)
+
     def monitor_tablespaces(self):
         """Monitor tablespace usage"""
         console.print("\n[bold cyan]Tablespace Usage[/bold cyan]\n")
@@ -197,3 +270,63 @@ class DatabaseManager:
             console.print(stdout)
         else:
             rprint("[red]Failed to retrieve session information[/red]")
+
+    def sample_sessions(self, duration=60, interval=1.0, top=10, every=None, as_json=False, sampler=None):
+        """Sample active sessions ASH-style for ``duration`` seconds and show top waits/SQL/modules"""
+        import time
+        from .ashsampler import AshSampler
+        from ..utils.sqlsession import SessionError
+
+        sampler = sampler or AshSampler(interval=interval)
+        if not as_json:
+            console.print(f"\n[bold cyan]Sampling active sessions every {sampler.interval:g}s "
+                          f"for {duration}s[/bold cyan] [dim](Ctrl+C to stop early)[/dim]\n")
+        start = sampler.clock()
+        shown = start
+        try:
+            while sampler.clock() - start < duration:
+                started = time.monotonic()
+                try:
+                    sampler.sample()
+                except (SessionError, RuntimeError, OSError) as e:
+                    rprint(f"[red]✗ Sampling failed:[/red] {e}")
+                    return None
+                if every and not as_json and sampler.clock() - shown >= every:
+                    self._print_ash_report(sampler.report(since=shown, top=top))
+                    shown = sampler.clock()
+                time.sleep(max(0.0, sampler.interval - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            sampler.close()
+
+        report = sampler.report(since=start, top=top)
+        if as_json:
+            import json
+            print(json.dumps(report, indent=2))
+        else:
+            self._print_ash_report(report)
+        return report
+
+    def _print_ash_report(self, report):
+        console.print(f"[bold]{report['samples']:,}[/bold] session samples over {report['polls']} polls, "
+                      f"average active sessions [bold]{report['average_active_sessions']}[/bold]")
+        sections = (('events', 'Top Events', 'Event'), ('sql_ids', 'Top SQL', 'SQL_ID'),
+                    ('modules', 'Top Modules', 'Module'), ('users', 'Top Users', 'User'),
+                    ('blockers', 'Top Blocking Sessions', 'Blocking SID'))
+        for key, title, column in sections:
+            if not report[key]:
+                continue
+            table = Table(title=title, show_header=True, header_style="bold magenta")
+            table.add_column(column, style="cyan")
+            if key == 'events':
+                table.add_column("Class")
+            table.add_column("Samples", justify="right")
+            table.add_column("%", justify="right")
+            table.add_column("AAS", justify="right")
+            for row in report[key]:
+                cells = [row['name'] or '-']
+                if key == 'events':
+                    cells.append(row['wait_class'])
+                table.add_row(*cells, f"{row['samples']:,}", f"{row['pct']:.1f}", f"{row['aas']:.2f}")
+            console.print(table)
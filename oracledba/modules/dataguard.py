@@ -2,17 +2,29 @@
 Data Guard Manager
 """
 
+import time
 from pathlib import Path
 from rich.console import Console
+from rich.table import Table
 from rich import print as rprint
 import subprocess
 
 console = Console()
 
 
+def _seconds(value):
+    """'1:05:03' style text for a lag in seconds ('-' when unknown)"""
+    if value is None or value != value:
+        return '-'
+    minutes, secs = divmod(int(value), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
 class DataGuardManager:
-    def __init__(self):
+    def __init__(self, client=None):
         self.scripts_dir = Path(__file__).parent.parent / "scripts"
+        self.client = client
     
     def setup(self, primary_host, standby_host, db_name):
         """Setup Data Guard"""
@@ -30,22 +42,172 @@ class DataGuardManager:
         rprint("[red]✗ Data Guard setup failed[/red]")
         return False
     
+    def _monitor(self, **kwargs):
+        from .dgmonitor import DgLagMonitor
+        if self.client is not None:
+            kwargs.setdefault('targets', {self.client.oracle_sid: self.client})
+        return DgLagMonitor(**kwargs)
+
     def status(self):
-        """Check Data Guard status"""
+        """Check Data Guard status: role, transport/apply lag and standby destinations"""
         console.print("\n[bold cyan]Data Guard Status[/bold cyan]\n")
-        
-        sql = """
-        SELECT database_role, protection_mode, protection_level 
-        FROM v$database;
-        
-        SELECT process, status, sequence# 
-        FROM v$managed_standby;
-        """
-        
-        cmd = f"echo \"{sql}\" | sqlplus -S / as sysdba"
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-        console.print(result.stdout)
-    
+        monitor = self._monitor()
+        samples = monitor.sample_all()
+        for name, error in monitor.errors.items():
+            rprint(f"[red]✗ {name}:[/red] {error}")
+        for name, sample in samples.items():
+            self._show_sample(name, sample, monitor.levels.get(name, {}))
+        return samples or None
+
+    def _show_sample(self, name, sample, levels):
+        colors = {'warning': 'yellow', 'critical': 'red'}
+        def lag(metric):
+            text = _seconds(sample[metric])
+            color = colors.get(levels.get(metric))
+            return f"[{color}]{text}[/{color}]" if color else text
+        console.print(f"[bold]{name}[/bold] ({sample['db_unique_name']}): {sample['role']}")
+        if sample['role'] != 'PRIMARY':
+            rate = sample['apply_rate']
+            console.print(f"  transport lag {lag('transport_lag')}, apply lag {lag('apply_lag')}, "
+                          f"apply finish {_seconds(sample['apply_finish'])}, apply rate "
+                          f"{'-' if rate != rate else f'{rate:.0f} KB/s'}")
+        if sample['dests']:
+            table = Table(show_header=True, header_style="bold magenta")
+            table.add_column("Dest", style="cyan")
+            table.add_column("Standby")
+            table.add_column("Status")
+            table.add_column("Gap status")
+            table.add_column("Seq gap", justify="right")
+            for d in sample['dests']:
+                table.add_row(str(d['dest_id']), d['db_unique_name'], d['status'], d['gap_status'],
+                              '-' if d['gap'] is None else str(d['gap']))
+            console.print(table)
+
+    def lag(self, since='1h'):
+        """Show lag percentiles over a window from the stored samples"""
+        from .alertlog import parse_time
+        try:
+            start = parse_time(since)
+        except ValueError as e:
+            rprint(f"[red]✗ {e}[/red]")
+            return None
+        monitor = self._monitor()
+        stats = monitor.percentiles(since=start)
+        for name, metrics in stats.items():
+            table = Table(title=f"{name} lag since {since} ({metrics['apply_lag']['count']} samples)",
+                          show_header=True, header_style="bold magenta")
+            table.add_column("Metric", style="cyan")
+            for column in ('p50', 'p90', 'p95', 'p99', 'max', 'last'):
+                table.add_column(column, justify="right")
+            for metric, entry in metrics.items():
+                if not entry['count']:
+                    continue
+                fmt = _seconds if metric.endswith('lag') else (lambda v: '-' if v is None else f"{v:g}")
+                table.add_row(metric, *(fmt(entry[c]) for c in ('p50', 'p90', 'p95', 'p99', 'max', 'last')))
+            console.print(table)
+        for alert in monitor.alert_history(10):
+            rprint(f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(alert['timestamp']))} "
+                   f"{alert['target']} {alert['metric']}: {alert['previous']} -> {alert['level']} "
+                   f"({alert['value']})")
+        return stats
+
+    def monitor(self, interval=None):
+        """Sample lag into the history store until interrupted"""
+        monitor = self._monitor()
+        interval = interval or monitor.settings['interval']
+        rprint(f"[green]✓[/green] Sampling {', '.join(monitor.targets)} every {interval}s "
+               f"into {monitor.store_dir}; Ctrl+C to stop")
+        try:
+            while True:
+                samples = monitor.sample_all()
+                for name, error in monitor.errors.items():
+                    rprint(f"[red]✗ {name}:[/red] {error}")
+                for name, sample in samples.items():
+                    self._show_sample(name, sample, monitor.levels.get(name, {}))
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            return True
+
+    def configure_monitor(self, targets=None, interval=None, thresholds=None):
+        """Save lag monitor targets (name=SID), interval and alert thresholds"""
+        from .dgmonitor import load_settings, save_settings
+        settings = load_settings()
+        if targets:
+            parsed = []
+            for text in targets:
+                name, _, sid = text.partition('=')
+                if not name:
+                    rprint(f"[red]✗ Invalid target '{text}' (use NAME or NAME=SID)[/red]")
+                    return None
+                parsed.append({'name': name.upper(), 'sid': (sid or name).upper()})
+            settings['targets'] = parsed
+        if interval:
+            settings['interval'] = interval
+        for metric, pair in (thresholds or {}).items():
+            if pair is not None:
+                if pair[0] > pair[1]:
+                    rprint(f"[red]✗ {metric}: warning must not exceed critical[/red]")
+                    return None
+                settings['thresholds'][metric] = list(pair)
+        save_settings(settings)
+        names = ', '.join(t['name'] for t in settings['targets']) or 'local instance'
+        rprint(f"[green]✓[/green] Monitoring {names} every {settings['interval']}s; thresholds "
+               + ', '.join(f"{m} {w}/{c}" for m, (w, c) in settings['thresholds'].items()))
+        return settings
+
+    def tune_apply(self, parallel=None, measure=60, apply=True):
+        """Size parallel redo apply from CPUs and redo rate, restart recovery and compare apply rates"""
+        from .dgapply import ApplyTuner, HISTORY_FILE
+        console.print("\n[bold cyan]Tuning standby redo apply[/bold cyan]\n")
+        tuner = ApplyTuner(self.client)
+        console.print(f"Measuring the apply rate for {measure}s"
+                      + (" before and after the change..." if apply else "..."))
+        try:
+            run = tuner.tune(parallel, measure, apply)
+        except RuntimeError as e:
+            rprint(f"[red]✗ {e}[/red]")
+            return None
+
+        info, rec = run['inspection'], run['recommendation']
+        inputs = rec['inputs']
+        def rate(measured):
+            return '-' if not measured or measured['apply_mbps'] is None else f"{measured['apply_mbps']} MB/s"
+        table = Table(title=f"Redo Apply: {info['db_unique_name']}", show_header=True,
+                      header_style="bold magenta")
+        table.add_column("Setting", style="cyan")
+        table.add_column("Value", justify="right")
+        table.add_column("Based on", style="dim")
+        table.add_row("PARALLEL", str(rec['parallel']),
+                      f"{inputs['cpu_count']} CPUs, bound by {rec['bottleneck']}")
+        table.add_row("Redo rate", f"{info['peak_redo_mbps']} MB/s",
+                      f"peak hour of {info['redo_hours']}, average {info['avg_redo_mbps']} MB/s")
+        table.add_row("Apply capacity", f"{rec['capacity_mbps']} MB/s",
+                      f"{inputs['per_process_mbps']} MB/s per process"
+                      + (f", measured with {inputs['workers']}" if inputs['measured'] else ", assumed"))
+        for change in rec['changes']:
+            table.add_row(change['name'], str(change['value']),
+                          f"now {change['current']}; {change['reason']}")
+        console.print(table)
+        for note in rec['notes']:
+            rprint(f"[yellow]![/yellow] {note}")
+
+        if not run['applied']:
+            for statement in run['statements']:
+                console.print(f"  {statement};")
+            return run
+        before, after = run['before'], run['after']
+        rprint(f"[green]✓[/green] Managed recovery restarted with PARALLEL {rec['parallel']}")
+        line = f"Apply rate {rate(before)} -> {rate(after)}"
+        if run['improvement_pct'] is not None:
+            color = 'green' if run['improvement_pct'] >= 0 else 'red'
+            line += f" ([{color}]{run['improvement_pct']:+.1f}%[/{color}])"
+        rprint(line)
+        if after['caught_up']:
+            rprint("[yellow]![/yellow] The standby is caught up: the apply rate follows the redo "
+                   "arriving, rerun during a batch window to compare capacity")
+        console.print(f"Saved to {HISTORY_FILE}")
+        return run
+
     def switchover(self):
         """Perform switchover"""
         console.print("\n[bold cyan]Performing Switchover[/bold cyan]\n")
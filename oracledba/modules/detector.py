@@ -0,0 +1,322 @@
+"""
+Oracle System Detection
+Detects the local Oracle installation, running instances, listener,
+ASM/Grid and background processes from the filesystem and `ps`, and
+samples instance metrics (SGA, PGA, sessions, tablespaces) via sqlplus.
+
+Used by the web GUI dashboard and the Prometheus exporter.
+"""
+
+import os
+import subprocess
+
+
+class SystemDetector:
+    """Basic system detection for Oracle environment"""
+    
+    def __init__(self):
+        self.oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
+        self.oracle_base = os.environ.get('ORACLE_BASE', '/u01/app/oracle')
+    
+    def is_oracle_installed(self):
+        """Check if Oracle is installed"""
+        return os.path.exists(self.oracle_home)
+    
+    def get_running_databases(self):
+        """Get list of running database instances"""
+        try:
+            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
+            pmon_lines = [line for line in result.stdout.split('\n') if 'ora_pmon_' in line]
+            return [line.split('ora_pmon_')[1].strip() for line in pmon_lines]
+        except:
+            return []
+    
+    def count_background_processes(self):
+        """Count key database background processes (pmon, smon, dbwr...) from ps"""
+        db_processes = {'pmon': 0, 'smon': 0, 'dbwr': 0, 'lgwr': 0, 'ckpt': 0, 'arch': 0, 'reco': 0}
+        try:
+            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
+            ps_lines = result.stdout.split('\n')
+            for line in ps_lines:
+                if 'ora_pmon_' in line: db_processes['pmon'] += 1
+                if 'ora_smon_' in line: db_processes['smon'] += 1
+                if 'ora_dbw' in line: db_processes['dbwr'] += 1
+                if 'ora_lgwr_' in line: db_processes['lgwr'] += 1
+                if 'ora_ckpt_' in line: db_processes['ckpt'] += 1
+                if 'ora_arc' in line and 'grep' not in line: db_processes['arch'] += 1
+                if 'ora_reco_' in line: db_processes['reco'] += 1
+        except:
+            pass
+        return db_processes
+    
+    def detect_all(self):
+        """Detect all Oracle components and their status"""
+        oracle_installed = self.is_oracle_installed()
+        running_dbs = self.get_running_databases()
+        
+        # Check Oracle version
+        oracle_version = 'Unknown'
+        if oracle_installed:
+            try:
+                version_file = os.path.join(self.oracle_home, 'inventory', 'ContentsXML', 'oraclehomeproperties.xml')
+                if os.path.exists(version_file):
+                    with open(version_file, 'r') as f:
+                        content = f.read()
+                        if '19' in content:
+                            oracle_version = '19c'
+            except:
+                oracle_version = '19c'
+        
+        # Check listener
+        listener_running = False
+        listener_ports = []
+        listeners = []
+        try:
+            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
+            listener_running = 'tnslsnr' in result.stdout
+            if listener_running:
+                listeners = ['LISTENER']
+                listener_ports = [1521]
+        except:
+            pass
+        
+        # Check ASM
+        asm_running = False
+        asm_installed = False
+        try:
+            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
+            asm_running = 'asm_pmon_' in result.stdout
+            asm_installed = os.path.exists('/u01/app/grid') or os.path.exists('/u01/app/19.3.0/grid')
+        except:
+            pass
+        
+        # Check Grid/Cluster
+        grid_installed = os.path.exists('/u01/app/grid') or os.path.exists('/u01/app/19.3.0/grid')
+        grid_running = False
+        cluster_configured = False
+        try:
+            if os.path.exists('/etc/oracle/olr.loc'):
+                cluster_configured = True
+            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
+            grid_running = 'ohasd' in result.stdout or 'crsd' in result.stdout
+        except:
+            pass
+        
+        # Get current SID from environment
+        current_sid = os.environ.get('ORACLE_SID', running_dbs[0] if running_dbs else 'Not Set')
+        
+        # Count individual background processes
+        db_processes = self.count_background_processes()
+        
+        return {
+            'oracle': {
+                'installed': oracle_installed,
+                'version': oracle_version,
+                'oracle_home': self.oracle_home,
+                'oracle_base': self.oracle_base,
+                'binaries': oracle_installed
+            },
+            'database': {
+                'running': len(running_dbs) > 0,
+                'instances': running_dbs,
+                'count': len(running_dbs),
+                'current_sid': current_sid,
+                'processes': db_processes
+            },
+            'listener': {
+                'running': listener_running,
+                'status': 'Running' if listener_running else 'Stopped',
+                'listeners': listeners,
+                'ports': listener_ports
+            },
+            'cluster': {
+                'configured': cluster_configured,
+                'type': 'RAC' if cluster_configured else 'Single Instance',
+                'nodes': []
+            },
+            'grid': {
+                'installed': grid_installed,
+                'running': grid_running,
+                'status': 'Running' if grid_running else ('Installed' if grid_installed else 'Not Installed'),
+                'grid_home': '/u01/app/19.3.0/grid' if grid_installed else ''
+            },
+            'asm': {
+                'running': asm_running,
+                'installed': asm_installed,
+                'status': 'Running' if asm_running else 'Not Running',
+                'disk_groups': []
+            },
+            'features': {
+                'archivelog': False,
+                'flashback': False,
+                'dataguard': False,
+                'rman': oracle_installed
+            }
+        }
+    
+    def _run_sql(self, sql, timeout=30):
+        """Run SQL via sqlplus and return raw output (uses stdin pipe to preserve $ in view names)"""
+        full_sql = f"SET PAGESIZE 1000\nSET LINESIZE 1000\nSET FEEDBACK OFF\nSET HEADING ON\nSET COLSEP '|'\nSET TRIMSPOOL ON\nSET TRIMOUT ON\n{sql}\nEXIT;\n"
+        try:
+            uid = os.getuid() if hasattr(os, 'getuid') else -1
+            if uid == 0:
+                cmd = ['su', '-', 'oracle', '-c',
+                       f'{self.oracle_home}/bin/sqlplus -s "/ as sysdba"']
+            else:
+                cmd = [f'{self.oracle_home}/bin/sqlplus', '-s', '/ as sysdba']
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
+                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            stdout, _ = proc.communicate(input=full_sql, timeout=timeout)
+            return stdout.strip()
+        except Exception as e:
+            return f"SQL Error: {e}"
+
+    def _parse_sql_rows(self, output):
+        """Parse pipe-delimited sqlplus output into list of dicts.
+        Finds header line by looking for first line with '|' separators."""
+        rows = []
+        lines = [l.strip() for l in output.split('\n') if l.strip()]
+        # Find header line: first line with '|' that isn't all dashes
+        header_idx = -1
+        for i, line in enumerate(lines):
+            if '|' in line:
+                stripped = line.replace(' ', '').replace('|', '')
+                if stripped and not set(stripped) <= {'-'}:
+                    header_idx = i
+                    break
+        if header_idx < 0:
+            return rows
+        headers = [h.strip() for h in lines[header_idx].split('|')]
+        for line in lines[header_idx + 1:]:
+            if '|' not in line:
+                continue
+            stripped = line.replace(' ', '').replace('|', '')
+            if not stripped or set(stripped) <= {'-'}:
+                continue
+            vals = [v.strip() for v in line.split('|')]
+            if vals == headers:
+                continue  # heading repeated at each page break
+            if len(vals) >= len(headers):
+                rows.append(dict(zip(headers, vals[:len(headers)])))
+        return rows
+
+    def get_oracle_metrics(self, running_dbs=None):
+        """Get Oracle performance metrics — SGA, PGA, sessions, tablespaces.
+
+        ``running_dbs`` is a get_running_databases() result the caller
+        already has; it is looked up when None.
+        """
+        metrics = {
+            'sga': {},
+            'pga': {},
+            'memory': {'total_sga_mb': 0, 'total_pga_mb': 0},
+            'processes': {'count': 0},
+            'sessions': {'count': 0},
+            'datafiles': 0,
+            'tempfiles': 0,
+            'tablespaces': []
+        }
+
+        # Check if Oracle is running first
+        if running_dbs is None:
+            running_dbs = self.get_running_databases()
+        if not running_dbs:
+            return metrics
+
+        try:
+            # SGA components
+            sga_out = self._run_sql(
+                "COL COMPONENT FORMAT A40\n"
+                "SELECT component, ROUND(current_size/1024/1024, 2) AS size_mb "
+                "FROM v$sga_dynamic_components WHERE current_size > 0;"
+            )
+            for row in self._parse_sql_rows(sga_out):
+                try:
+                    name = row.get('COMPONENT', '')
+                    size = float(row.get('SIZE_MB', 0))
+                    if name:
+                        metrics['sga'][name] = size
+                        metrics['memory']['total_sga_mb'] += size
+                except (ValueError, TypeError):
+                    pass
+        except Exception:
+            pass
+
+        try:
+            # PGA stats
+            pga_out = self._run_sql(
+                "COL NAME FORMAT A40\n"
+                "SELECT name, ROUND(value/1024/1024, 2) AS size_mb FROM v$pgastat "
+                "WHERE name IN ('total PGA allocated','total PGA inuse','maximum PGA allocated');"
+            )
+            for row in self._parse_sql_rows(pga_out):
+                try:
+                    name = row.get('NAME', '')
+                    size = float(row.get('SIZE_MB', 0))
+                    if name:
+                        metrics['pga'][name] = size
+                        if 'allocated' in name.lower() and 'max' not in name.lower():
+                            metrics['memory']['total_pga_mb'] = size
+                except (ValueError, TypeError):
+                    pass
+        except Exception:
+            pass
+
+        try:
+            # Processes, sessions, datafiles, tempfiles — combined UNION ALL
+            # to guarantee 2+ columns so COLSEP '|' adds pipe separators.
+            # Single-column COUNT(*) queries produce no pipes → _parse_sql_rows finds nothing.
+            # Note: sqlplus truncates column alias to data width, so 'METRIC' becomes 'METRI'
+            # for 4-char values like 'proc'. Use startswith match or direct value inspection.
+            counts_out = self._run_sql(
+                "SELECT 'proc' AS metric, COUNT(*) AS cnt FROM v$process\n"
+                "UNION ALL SELECT 'sess', COUNT(*) FROM v$session\n"
+                "UNION ALL SELECT 'dfile', COUNT(*) FROM v$datafile\n"
+                "UNION ALL SELECT 'tfile', COUNT(*) FROM v$tempfile;"
+            )
+            for row in self._parse_sql_rows(counts_out):
+                try:
+                    v = int(row.get('CNT', 0))
+                    # Header alias may be truncated (METRIC→METRI). Try both.
+                    m = (row.get('METRIC') or row.get('METRI') or '').strip().lower()
+                    if m == 'proc':
+                        metrics['processes']['count'] = v
+                    elif m == 'sess':
+                        metrics['sessions']['count'] = v
+                    elif m == 'dfile':
+                        metrics['datafiles'] = v
+                    elif m == 'tfile':
+                        metrics['tempfiles'] = v
+                except (ValueError, TypeError):
+                    pass
+        except Exception:
+            pass
+
+        try:
+            # Tablespace usage
+            ts_out = self._run_sql(
+                "COL NAME FORMAT A30\n"
+                "SELECT df.tablespace_name AS name, "
+                "ROUND(df.bytes/1024/1024,2) AS total_mb, "
+                "ROUND((df.bytes - NVL(fs.bytes,0))/1024/1024,2) AS used_mb, "
+                "ROUND(NVL(fs.bytes,0)/1024/1024,2) AS free_mb, "
+                "ROUND((df.bytes - NVL(fs.bytes,0))/df.bytes * 100, 1) AS pct_used "
+                "FROM (SELECT tablespace_name, SUM(bytes) bytes FROM dba_data_files GROUP BY tablespace_name) df "
+                "LEFT JOIN (SELECT tablespace_name, SUM(bytes) bytes FROM dba_free_space GROUP BY tablespace_name) fs "
+                "ON df.tablespace_name = fs.tablespace_name ORDER BY df.tablespace_name;"
+            )
+            for row in self._parse_sql_rows(ts_out):
+                try:
+                    metrics['tablespaces'].append({
+                        'name': row.get('NAME', ''),
+                        'total_mb': float(row.get('TOTAL_MB', 0)),
+                        'used_mb': float(row.get('USED_MB', 0)),
+                        'free_mb': float(row.get('FREE_MB', 0)),
+                        'pct_used': float(row.get('PCT_USED', 0))
+                    })
+                except (ValueError, TypeError):
+                    pass
+        except Exception:
+            pass
+
+        return metrics
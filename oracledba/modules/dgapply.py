@@ -0,0 +1,259 @@
+"""
+Standby Redo Apply Tuning
+Sizes parallel media recovery (RECOVER MANAGED STANDBY DATABASE ... PARALLEL n)
+on a physical standby from its CPUs and the primary's redo rate, restarts
+managed recovery with it and measures the apply rate before and after.
+
+- Redo rate: average and peak hourly volume of the archived logs received in
+  the last 7 days (V$ARCHIVED_LOG); the peak hour is the batch window.
+- Apply rate: 'Redo Applied' growth of the running recovery over a measurement
+  window (V$RECOVERY_PROGRESS), falling back to its Active Apply Rate.
+- Degree: enough apply processes to apply the peak hour at APPLY_HEADROOM
+  times its redo rate (so the standby catches up after a batch), at the
+  per-process rate measured while the standby lags (else DEFAULT_PROCESS_MBPS),
+  within three quarters of the CPUs.
+- parallel_execution_message_size below 32K is raised (SCOPE=SPFILE), as the
+  apply processes exchange change vectors in PX messages.
+
+Runs are kept in ~/.oracledba/dg-apply-tuning.json.
+
+Usage (Python):
+    from oracledba.modules.dgapply import ApplyTuner
+    tuner = ApplyTuner(OracleClient(oracle_sid='GDCSTBY'))
+    result = tuner.tune(measure_seconds=120)
+    result['improvement_pct']
+"""
+
+import json
+import math
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+
+from .dgmonitor import LAG_QUERIES, build_sample
+
+HISTORY_FILE = Path.home() / '.oracledba' / 'dg-apply-tuning.json'
+HISTORY_LIMIT = 50
+DEFAULT_PROCESS_MBPS = 10.0       # apply MB/s of one recovery process when nothing is measured
+APPLY_HEADROOM = 2.0
+MAX_APPLY_PARALLEL = 32
+MESSAGE_SIZE = 32768
+CAUGHT_UP_SECONDS = 10
+
+APPLY_QUERIES = {
+    'database': "SELECT DATABASE_ROLE, DB_UNIQUE_NAME FROM V$DATABASE",
+    'parameters': ("SELECT NAME, VALUE FROM V$PARAMETER WHERE NAME IN "
+                   "('cpu_count', 'parallel_execution_message_size', 'db_block_checking', "
+                   "'dg_broker_start')"),
+    'processes': ("SELECT NAME, ROLE FROM V$DATAGUARD_PROCESS "
+                  "WHERE NAME LIKE 'MRP%' OR NAME LIKE 'PR%'"),
+    'redo': ("SELECT COUNT(*) AS HOURS, AVG(BYTES) AS AVG_BYTES, MAX(BYTES) AS PEAK_BYTES FROM "
+             "(SELECT TRUNC(FIRST_TIME, 'HH24') AS HOUR, SUM(BLOCKS * BLOCK_SIZE) AS BYTES FROM "
+             "(SELECT DISTINCT THREAD#, SEQUENCE#, RESETLOGS_CHANGE#, FIRST_TIME, BLOCKS, BLOCK_SIZE "
+             "FROM V$ARCHIVED_LOG WHERE FIRST_TIME > SYSDATE - 7) "
+             "GROUP BY TRUNC(FIRST_TIME, 'HH24'))"),
+}
+
+MEASURE_QUERIES = {
+    'progress': ("SELECT ITEM, SOFAR FROM V$RECOVERY_PROGRESS "
+                 "WHERE ITEM IN ('Active Apply Rate', 'Average Apply Rate', 'Redo Applied') "
+                 "AND START_TIME = (SELECT MAX(START_TIME) FROM V$RECOVERY_PROGRESS)"),
+    'stats': LAG_QUERIES['stats'],
+}
+
+
+def _float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def load_history(path=None):
+    """Apply tuning runs, oldest first"""
+    try:
+        with open(path or HISTORY_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return []
+
+
+def save_run(run, path=None):
+    path = Path(path or HISTORY_FILE)
+    history = (load_history(path) + [run])[-HISTORY_LIMIT:]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(history, f, indent=2)
+    os.replace(tmp, path)
+
+
+def parse_inspection(rows):
+    """Role, CPUs, recovery processes, parameters and redo rate from APPLY_QUERIES rows"""
+    database = (rows.get('database') or [{}])[0]
+    params = {r.get('NAME', ''): r.get('VALUE', '') for r in rows.get('parameters') or []}
+    names = [r.get('NAME', '') for r in rows.get('processes') or []]
+    redo = (rows.get('redo') or [{}])[0]
+    return {
+        'role': database.get('DATABASE_ROLE', ''),
+        'db_unique_name': database.get('DB_UNIQUE_NAME', ''),
+        'cpu_count': int(_float(params.get('cpu_count'), 1)) or 1,
+        'parameters': params,
+        'mrp_running': any(n.startswith('MRP') for n in names),
+        # PR00 is the log merger; the other PRnn apply the change vectors
+        'workers': sum(1 for n in names if n.startswith('PR') and n != 'PR00'),
+        'redo_hours': int(_float(redo.get('HOURS'))),
+        'avg_redo_mbps': round(_float(redo.get('AVG_BYTES')) / 1048576 / 3600, 2),
+        'peak_redo_mbps': round(_float(redo.get('PEAK_BYTES')) / 1048576 / 3600, 2),
+    }
+
+
+def recommend_apply(cpu_count, peak_redo_mbps, apply_mbps=None, workers=None, parameters=None,
+                    max_parallel=MAX_APPLY_PARALLEL):
+    """Pick the recovery degree and parameter changes for a physical standby.
+
+    ``apply_mbps`` and ``workers`` describe the running recovery (measured
+    rate, apply processes); without them one process is assumed to apply
+    DEFAULT_PROCESS_MBPS. A quarter of the CPUs stays free for Active Data
+    Guard queries; one CPU means serial recovery.
+    """
+    cpu_count = max(1, int(cpu_count or 1))
+    parameters = parameters or {}
+    measured = bool(apply_mbps and apply_mbps > 0)
+    per_process = apply_mbps / max(1, workers or 1) if measured else DEFAULT_PROCESS_MBPS
+    budget = min(max_parallel, cpu_count - max(1, cpu_count // 4)) if cpu_count > 1 else 1
+    needed = math.ceil(peak_redo_mbps * APPLY_HEADROOM / per_process) if peak_redo_mbps else 1
+    parallel = 1 if budget < 2 else max(2, min(budget, needed))
+    if budget < 2:
+        bottleneck = 'single CPU'
+    elif needed > budget:
+        bottleneck = 'cpu'
+    else:
+        bottleneck = 'redo rate'
+
+    changes, notes = [], []
+    message_size = int(_float(parameters.get('parallel_execution_message_size'), MESSAGE_SIZE))
+    if parallel > 1 and message_size < MESSAGE_SIZE:
+        changes.append({'name': 'parallel_execution_message_size', 'current': message_size,
+                        'value': MESSAGE_SIZE, 'scope': 'SPFILE',
+                        'reason': 'larger PX messages between apply processes (after restart)'})
+    if parameters.get('db_block_checking', '').upper() in ('MEDIUM', 'FULL', 'TRUE'):
+        notes.append(f"db_block_checking={parameters['db_block_checking']} costs apply CPU; "
+                     "LOW is usually enough on a standby when the primary checks blocks")
+    if parameters.get('dg_broker_start', '').upper() == 'TRUE':
+        notes.append(f"The broker restarts apply with its own settings: also run "
+                     f"EDIT DATABASE <standby> SET PROPERTY ApplyParallel={parallel} in DGMGRL")
+    return {
+        'parallel': parallel,
+        'bottleneck': bottleneck,
+        'capacity_mbps': round(per_process * parallel, 1),
+        'changes': changes,
+        'notes': notes,
+        'inputs': {'cpu_count': cpu_count, 'peak_redo_mbps': peak_redo_mbps,
+                   'apply_mbps': round(apply_mbps, 2) if measured else None,
+                   'workers': workers, 'per_process_mbps': round(per_process, 2),
+                   'measured': measured},
+    }
+
+
+def apply_statements(parallel, changes=(), mrp_running=True):
+    """SQL restarting managed recovery with ``parallel`` apply processes"""
+    statements = [f"ALTER SYSTEM SET {c['name']}={c['value']} SCOPE={c['scope']}" for c in changes]
+    if mrp_running:
+        statements.append("ALTER DATABASE RECOVER MANAGED STANDBY DATABASE CANCEL")
+    degree = 'NOPARALLEL' if parallel < 2 else f'PARALLEL {parallel}'
+    statements.append(f"ALTER DATABASE RECOVER MANAGED STANDBY DATABASE {degree} "
+                      "DISCONNECT FROM SESSION")
+    return statements
+
+
+class ApplyTuner:
+    """Inspects, measures and re-parallelizes redo apply on one standby"""
+
+    def __init__(self, client=None, clock=time.time, sleep=time.sleep, history_file=None):
+        if client is None:
+            from ..utils.oracle_client import OracleClient
+            client = OracleClient(os_user='oracle')
+        self.client = client
+        self.clock = clock
+        self.sleep = sleep
+        self.history_file = history_file
+
+    def inspect(self):
+        """parse_inspection() of the standby; raises RuntimeError if it cannot be queried"""
+        ok, rows, errors = self.client.query_many(APPLY_QUERIES)
+        if not ok or errors.get('database'):
+            raise RuntimeError(errors.get('database') or next(iter(errors.values()), '') or 'sqlplus failed')
+        return parse_inspection(rows)
+
+    def _progress(self):
+        ok, rows, errors = self.client.query_many(MEASURE_QUERIES)
+        if not ok:
+            raise RuntimeError(next(iter(errors.values()), '') or 'sqlplus failed')
+        progress = {r.get('ITEM', ''): _float(r.get('SOFAR'), math.nan) for r in rows.get('progress') or []}
+        return self.clock(), progress, build_sample({'stats': rows.get('stats')})
+
+    def measure(self, seconds=60):
+        """Apply rate in MB/s over ``seconds`` and the apply lag at the end.
+
+        Uses the growth of 'Redo Applied' (MB); when recovery restarted in
+        between or the item is missing, the mean Active Apply Rate (KB/s).
+        """
+        start, first, _ = self._progress()
+        rates = [first.get('Active Apply Rate', math.nan)]
+        end, last, sample = start, first, None
+        deadline = start + seconds
+        while True:
+            self.sleep(max(1, min(seconds / 4, deadline - end)))
+            end, last, sample = self._progress()
+            rates.append(last.get('Active Apply Rate', math.nan))
+            if end >= deadline:
+                break
+        applied = last.get('Redo Applied', math.nan) - first.get('Redo Applied', math.nan)
+        if applied >= 0 and end > start:
+            mbps = applied / (end - start)
+        else:
+            known = [r for r in rates if not math.isnan(r)]
+            mbps = sum(known) / len(known) / 1024 if known else math.nan
+        lag = sample['apply_lag']
+        return {'apply_mbps': None if math.isnan(mbps) else round(mbps, 2),
+                'apply_lag': None if math.isnan(lag) else lag,
+                'caught_up': not math.isnan(lag) and lag <= CAUGHT_UP_SECONDS,
+                'seconds': round(end - start, 1)}
+
+    def tune(self, parallel=None, measure_seconds=60, apply=True):
+        """Measure, restart recovery with the recommended (or given) degree, measure again.
+
+        Returns the run (also saved to the history file); raises RuntimeError
+        when the database is not a running physical standby or SQL fails.
+        """
+        info = self.inspect()
+        if info['role'] != 'PHYSICAL STANDBY':
+            raise RuntimeError(f"{info['db_unique_name'] or 'Database'} is {info['role'] or 'not reachable'}, "
+                               "not a physical standby")
+        before = self.measure(measure_seconds) if info['mrp_running'] else None
+        # a caught-up standby applies only what arrives, which says nothing about its capacity
+        saturated = before and not before['caught_up'] and before['apply_mbps']
+        rec = recommend_apply(info['cpu_count'], info['peak_redo_mbps'], saturated or None,
+                              info['workers'], info['parameters'])
+        if parallel:
+            rec['parallel'] = parallel
+            rec['bottleneck'] = 'requested'
+        statements = apply_statements(rec['parallel'], rec['changes'], info['mrp_running'])
+        run = {'tuned_at': datetime.fromtimestamp(self.clock()).isoformat(timespec='seconds'),
+               'db_unique_name': info['db_unique_name'], 'inspection': info,
+               'recommendation': rec, 'statements': statements, 'applied': False,
+               'before': before, 'after': None, 'improvement_pct': None}
+        if not apply:
+            return run
+        success, stdout, stderr = self.client.run_sql(statements)
+        if not success:
+            raise RuntimeError(f"Restarting managed recovery failed: {(stderr or stdout).strip()}")
+        run['applied'] = True
+        run['after'] = self.measure(measure_seconds)
+        if before and before['apply_mbps'] and run['after']['apply_mbps'] is not None:
+            run['improvement_pct'] = round(
+                (run['after']['apply_mbps'] - before['apply_mbps']) / before['apply_mbps'] * 100, 1)
+        save_run(run, self.history_file)
+        return run
@@ -0,0 +1,333 @@
+"""
+Data Guard Lag Monitor
+Samples redo transport and apply lag of the databases in a Data Guard
+configuration into a fixed-size binary ring file per database, for
+percentile lag over any window (to size redo transport) and threshold
+alerts.
+
+- Standby: transport lag and apply lag (V$DATAGUARD_STATS) and the active
+  and average apply rate of the running media recovery (V$RECOVERY_PROGRESS).
+- Primary: the sequence gap between archived and applied logs of each
+  standby destination (V$ARCHIVE_DEST_STATUS); V$DATAGUARD_STATS is empty there.
+- A sample is one 28-byte record; values a role does not report are NaN.
+  The default 20160 records keep a week of 30 s samples in under 600 KB.
+- Threshold crossings (warning/critical, and back to ok) are appended to
+  alerts.jsonl next to the ring files.
+
+Usage (Python):
+    from oracledba.modules.dgmonitor import DgLagMonitor
+    monitor = DgLagMonitor()                # targets from ~/.oracledba/dg-monitor.json
+    monitor.sample_all()
+    monitor.percentiles(since=time.time() - 3600)
+"""
+
+import fcntl
+import json
+import math
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+
+SETTINGS_FILE = Path.home() / '.oracledba' / 'dg-monitor.json'
+STORE_DIR = Path.home() / '.oracledba' / 'dglag'
+DEFAULT_CAPACITY = 20160
+DEFAULT_THRESHOLDS = {'transport_lag': [30, 300], 'apply_lag': [300, 1800], 'seq_gap': [3, 10]}
+DEFAULT_SETTINGS = {'targets': [], 'interval': 30, 'thresholds': DEFAULT_THRESHOLDS}
+PERCENTILES = (50, 90, 95, 99)
+
+# time, transport lag s, apply lag s, active / average apply rate KB/s, sequence gap
+RECORD = struct.Struct('<dffffi')
+HEADER = struct.Struct('<4sIQ')         # magic, capacity, records written
+MAGIC = b'DGL1'
+METRICS = ('transport_lag', 'apply_lag', 'apply_rate', 'avg_apply_rate', 'seq_gap')
+
+LAG_QUERIES = {
+    'database': "SELECT DATABASE_ROLE, DB_UNIQUE_NAME FROM V$DATABASE",
+    'stats': ("SELECT NAME, VALUE FROM V$DATAGUARD_STATS "
+              "WHERE NAME IN ('transport lag', 'apply lag', 'apply finish time')"),
+    'progress': ("SELECT ITEM, SOFAR FROM V$RECOVERY_PROGRESS "
+                 "WHERE ITEM IN ('Active Apply Rate', 'Average Apply Rate') "
+                 "AND START_TIME = (SELECT MAX(START_TIME) FROM V$RECOVERY_PROGRESS)"),
+    'dests': ("SELECT DEST_ID, DB_UNIQUE_NAME, STATUS, GAP_STATUS, ARCHIVED_SEQ#, APPLIED_SEQ# "
+              "FROM V$ARCHIVE_DEST_STATUS WHERE TYPE <> 'LOCAL' AND STATUS <> 'INACTIVE'"),
+}
+
+_INTERVAL_RE = re.compile(r'^\+?(\d+)\s+(\d+):(\d+):(\d+(?:\.\d+)?)$')
+
+
+def load_settings(path=None):
+    """Targets, interval and thresholds saved by `oradba dataguard monitor-config`"""
+    try:
+        with open(path or SETTINGS_FILE) as f:
+            saved = json.load(f)
+    except (OSError, ValueError):
+        saved = {}
+    return {**DEFAULT_SETTINGS, **saved,
+            'thresholds': {**DEFAULT_THRESHOLDS, **saved.get('thresholds', {})}}
+
+
+def save_settings(settings, path=None):
+    path = Path(path or SETTINGS_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(settings, f, indent=2)
+    os.replace(tmp, path)
+
+
+def parse_interval(value):
+    """Seconds of an INTERVAL DAY TO SECOND as sqlplus prints it ('+00 00:01:05'), or NaN"""
+    m = _INTERVAL_RE.match((value or '').strip())
+    if not m:
+        return math.nan
+    days, hours, minutes, seconds = m.groups()
+    return int(days) * 86400 + int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+
+
+def _float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def build_sample(rows, now=None):
+    """Lag sample from one LAG_QUERIES result"""
+    database = (rows.get('database') or [{}])[0]
+    stats = {r.get('NAME', ''): r.get('VALUE', '') for r in rows.get('stats') or []}
+    progress = {r.get('ITEM', ''): _float(r.get('SOFAR')) for r in rows.get('progress') or []}
+    dests = []
+    for r in rows.get('dests') or []:
+        archived, applied = _float(r.get('ARCHIVED_SEQ#')), _float(r.get('APPLIED_SEQ#'))
+        dests.append({'dest_id': r.get('DEST_ID', ''), 'db_unique_name': r.get('DB_UNIQUE_NAME', ''),
+                      'status': r.get('STATUS', ''), 'gap_status': r.get('GAP_STATUS', ''),
+                      'gap': int(archived - applied) if archived >= applied else None})
+    gaps = [d['gap'] for d in dests if d['gap'] is not None]
+    return {
+        'timestamp': time.time() if now is None else now,
+        'role': database.get('DATABASE_ROLE', ''),
+        'db_unique_name': database.get('DB_UNIQUE_NAME', ''),
+        'transport_lag': parse_interval(stats.get('transport lag')),
+        'apply_lag': parse_interval(stats.get('apply lag')),
+        'apply_finish': parse_interval(stats.get('apply finish time')),
+        'apply_rate': progress.get('Active Apply Rate', math.nan),
+        'avg_apply_rate': progress.get('Average Apply Rate', math.nan),
+        'seq_gap': max(gaps) if gaps else None,
+        'dests': dests,
+    }
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of sorted ``values``"""
+    if not values:
+        return None
+    rank = (len(values) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (rank - low)
+
+
+def _clean(value, digits=1):
+    """JSON-friendly number: None for NaN"""
+    return None if value is None or math.isnan(value) else round(value, digits)
+
+
+class LagStore:
+    """Fixed-capacity ring file of RECORD samples for one database.
+
+    The header is re-read on every access, so a CLI sampler and the web
+    server can share a file (appends are serialized with flock)."""
+
+    def __init__(self, path, capacity=DEFAULT_CAPACITY):
+        self.path = Path(path)
+        self.capacity = capacity
+
+    def _header(self, f):
+        """(capacity, records written) of an open ring file; a new/foreign file starts empty"""
+        f.seek(0)
+        try:
+            magic, capacity, written = HEADER.unpack(f.read(HEADER.size))
+        except struct.error:
+            return self.capacity, 0
+        return (capacity, written) if magic == MAGIC else (self.capacity, 0)
+
+    def append(self, sample):
+        record = RECORD.pack(sample['timestamp'],
+                             *(math.nan if sample.get(m) is None else sample[m] for m in METRICS[:4]),
+                             -1 if sample.get('seq_gap') is None else sample['seq_gap'])
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, 'a+b') as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                capacity, written = self._header(f)
+                if not written:
+                    f.truncate(0)
+                # append mode ignores seek for writes, so write through a second handle
+                with open(self.path, 'r+b') as out:
+                    out.seek(HEADER.size + (written % capacity) * RECORD.size)
+                    out.write(record)
+                    out.seek(0)
+                    out.write(HEADER.pack(MAGIC, capacity, written + 1))
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def read(self, since=None, until=None):
+        """Samples (oldest first) with since <= timestamp <= until"""
+        try:
+            with open(self.path, 'rb') as f:
+                capacity, written = self._header(f)
+                f.seek(HEADER.size)
+                data = f.read(min(written, capacity) * RECORD.size)
+        except OSError:
+            return []
+        count = len(data) // RECORD.size
+        start = written % capacity if written > capacity else 0
+        samples = []
+        for i in range(count):
+            values = RECORD.unpack_from(data, ((start + i) % count) * RECORD.size)
+            if (since is not None and values[0] < since) or (until is not None and values[0] > until):
+                continue
+            samples.append(dict(zip(('timestamp',) + METRICS,
+                                    values[:5] + ((None if values[5] < 0 else values[5]),))))
+        return samples
+
+    def stats(self, since=None, until=None):
+        """{metric: {count, p50, p90, p95, p99, max, last}} over the window"""
+        samples = self.read(since, until)
+        result = {}
+        for metric in METRICS:
+            values = sorted(s[metric] for s in samples
+                            if s[metric] is not None and not math.isnan(s[metric]))
+            entry = {'count': len(values), 'max': _clean(values[-1]) if values else None}
+            for pct in PERCENTILES:
+                entry[f'p{pct}'] = _clean(percentile(values, pct))
+            last = next((s[metric] for s in reversed(samples)
+                         if s[metric] is not None and not math.isnan(s[metric])), None)
+            entry['last'] = _clean(last)
+            result[metric] = entry
+        return result
+
+
+def public(sample):
+    """Copy of a sample with NaN as None (for JSON)"""
+    return {k: _clean(v, 3) if isinstance(v, float) else v for k, v in sample.items()}
+
+
+def evaluate(sample, thresholds):
+    """{metric: 'ok'|'warning'|'critical'} for the metrics with a threshold"""
+    levels = {}
+    for metric, (warning, critical) in thresholds.items():
+        value = sample.get(metric)
+        if value is None or math.isnan(value):
+            continue
+        levels[metric] = 'critical' if value >= critical else 'warning' if value >= warning else 'ok'
+    return levels
+
+
+class DgLagMonitor:
+    """Samples every target into its LagStore and tracks alert levels"""
+
+    def __init__(self, targets=None, store_dir=None, settings=None, capacity=DEFAULT_CAPACITY,
+                 clock=time.time):
+        """``targets`` is {name: client}; by default one OracleClient per
+        configured target (name and ORACLE_SID), or the local instance"""
+        self.settings = settings or load_settings()
+        if targets is None:
+            from ..utils.oracle_client import OracleClient
+            configured = self.settings['targets'] or [{'name': None, 'sid': None}]
+            targets = {}
+            for target in configured:
+                client = OracleClient(oracle_sid=target.get('sid'), os_user='oracle')
+                targets[target.get('name') or client.oracle_sid] = client
+        self.targets = targets
+        self.store_dir = Path(store_dir or STORE_DIR)
+        self.stores = {name: LagStore(self.store_dir / f'{name}.bin', capacity) for name in targets}
+        self.clock = clock
+        self.last = {}
+        self.levels = {}
+        self.errors = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self, name):
+        """Sample one target and store it; raises RuntimeError if sqlplus cannot run"""
+        ok, rows, errors = self.targets[name].query_many(LAG_QUERIES)
+        if not ok or errors.get('database'):
+            raise RuntimeError(errors.get('database') or next(iter(errors.values()), '') or 'sqlplus failed')
+        sample = build_sample(rows, self.clock())
+        self.stores[name].append(sample)
+        self.last[name] = sample
+        self._record_alerts(name, sample)
+        return sample
+
+    def sample_all(self):
+        """{name: sample} for every target that answered; failures go to self.errors"""
+        samples = {}
+        for name in self.targets:
+            try:
+                samples[name] = self.sample(name)
+                self.errors.pop(name, None)
+            except RuntimeError as e:
+                self.errors[name] = str(e)
+        return samples
+
+    def _record_alerts(self, name, sample):
+        levels = evaluate(sample, self.settings['thresholds'])
+        previous = self.levels.get(name, {})
+        changes = [{'timestamp': sample['timestamp'], 'target': name, 'metric': metric,
+                    'level': level, 'previous': previous.get(metric, 'ok'),
+                    'value': _clean(sample[metric]),
+                    'threshold': self.settings['thresholds'][metric]}
+                   for metric, level in levels.items() if level != previous.get(metric, 'ok')]
+        self.levels[name] = {**previous, **levels}
+        if changes:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            with open(self.store_dir / 'alerts.jsonl', 'a') as f:
+                for change in changes:
+                    f.write(json.dumps(change) + '\n')
+
+    def active_alerts(self):
+        """Metrics currently at warning or critical, per target"""
+        return [{'target': name, 'metric': metric, 'level': level,
+                 'value': _clean(self.last[name][metric]) if name in self.last else None}
+                for name, levels in self.levels.items()
+                for metric, level in levels.items() if level != 'ok']
+
+    def alert_history(self, limit=50):
+        try:
+            with open(self.store_dir / 'alerts.jsonl') as f:
+                lines = f.readlines()[-limit:]
+        except OSError:
+            return []
+        return [json.loads(line) for line in lines if line.strip()]
+
+    def percentiles(self, since=None, until=None):
+        """{name: LagStore.stats} for every target"""
+        return {name: store.stats(since, until) for name, store in self.stores.items()}
+
+    def series(self, name, since=None, until=None, points=300):
+        """Samples of one target thinned to about ``points`` entries (every n-th)"""
+        samples = self.stores[name].read(since, until)
+        step = max(1, math.ceil(len(samples) / points)) if points else 1
+        return [public(s) for s in samples[::step]]
+
+    def start(self):
+        """Start the background sampling thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='oradba-dg-lag', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample_all()
+            self._stop.wait(self.settings['interval'])
@@ -0,0 +1,239 @@
+"""
+Prometheus Metrics Exporter
+Publishes SystemDetector.get_oracle_metrics() and the background process
+counts as Prometheus gauges (text exposition format 0.0.4).
+
+Scrapes never touch the instance: a MetricsSampler refreshes a cached
+snapshot on its own interval (one set of sqlplus calls per interval) and
+/metrics only renders that snapshot, so any number of Prometheus servers
+scraping every 15 s add no load.
+
+Usage (Python):
+    from oracledba.modules.exporter import MetricsSampler, render_metrics
+    sampler = MetricsSampler(interval=30)
+    sampler.start()
+    text = render_metrics(sampler.snapshot())
+"""
+
+import hmac
+import threading
+import time
+
+from rich.console import Console
+
+console = Console()
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+DEFAULT_INTERVAL = 30
+DEFAULT_PORT = 9161
+MB = 1024 * 1024
+
+
+class MetricsSampler:
+    """Background sampler caching the latest Oracle metrics snapshot"""
+
+    def __init__(self, detector=None, interval=DEFAULT_INTERVAL, clock=time.time):
+        if detector is None:
+            from .detector import SystemDetector
+            detector = SystemDetector()
+        self.detector = detector
+        self.interval = interval
+        self.clock = clock
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.errors = 0
+
+    def sample(self):
+        """Query the instance once and store the result as the snapshot"""
+        with self._refresh_lock:
+            return self._sample()
+
+    def _sample(self):
+        started = self.clock()
+        perf_start = time.perf_counter()
+        try:
+            instances = self.detector.get_running_databases()
+            # one ps scan per sample: hand the instances to get_oracle_metrics
+            metrics = self.detector.get_oracle_metrics(instances) if instances else None
+            processes = self.detector.count_background_processes()
+            ok = True
+        except Exception as e:
+            self.errors += 1
+            console.print(f"[yellow]⚠️  Metrics sample failed: {e}[/yellow]")
+            instances, metrics, processes, ok = [], None, {}, False
+        snapshot = {
+            'timestamp': started,
+            'duration': time.perf_counter() - perf_start,
+            'ok': ok,
+            'instances': instances,
+            'metrics': metrics,
+            'processes': processes,
+            'errors': self.errors,
+        }
+        with self._lock:
+            self._snapshot = snapshot
+        return snapshot
+
+    def snapshot(self, max_age=None):
+        """Latest snapshot; samples synchronously if none exists or it is
+        older than ``max_age`` seconds (default: twice the interval)"""
+        max_age = self.interval * 2 if max_age is None else max_age
+        with self._lock:
+            current = self._snapshot
+        if current is not None and self.clock() - current['timestamp'] <= max_age:
+            return current
+        with self._refresh_lock:
+            with self._lock:
+                latest = self._snapshot
+            if latest is not current:
+                # another caller refreshed while we waited for the lock
+                return latest
+            return self._sample()
+
+    def start(self):
+        """Start the background refresh thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='oradba-metrics', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items()) + '}'
+
+
+def _number(value):
+    if isinstance(value, bool):
+        return '1' if value else '0'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _Writer:
+    """Accumulates metric families in exposition order"""
+
+    def __init__(self):
+        self.lines = []
+
+    def gauge(self, name, help_text, samples):
+        """samples: iterable of (labels dict or None, value)"""
+        samples = [(labels, value) for labels, value in samples if value is not None]
+        if not samples:
+            return
+        self.lines.append(f'# HELP {name} {help_text}')
+        self.lines.append(f'# TYPE {name} gauge')
+        for labels, value in samples:
+            self.lines.append(f'{name}{_labels(labels)} {_number(value)}')
+
+    def text(self):
+        return '\n'.join(self.lines) + '\n'
+
+
+def render_metrics(snapshot):
+    """Render a MetricsSampler snapshot in Prometheus text format"""
+    out = _Writer()
+    metrics = snapshot.get('metrics') or {}
+    instances = snapshot.get('instances') or []
+
+    out.gauge('oracle_up', 'Whether the instance pmon process is running',
+              [({'sid': sid}, 1) for sid in instances] or [(None, 0)])
+
+    if metrics:
+        out.gauge('oracle_sga_component_bytes', 'Current size of each SGA component',
+                  [({'component': name}, round(mb * MB)) for name, mb in metrics['sga'].items()])
+        out.gauge('oracle_sga_bytes', 'Total SGA size',
+                  [(None, round(metrics['memory']['total_sga_mb'] * MB))])
+        out.gauge('oracle_pga_bytes', 'PGA statistics from v$pgastat',
+                  [({'statistic': name}, round(mb * MB)) for name, mb in metrics['pga'].items()])
+        out.gauge('oracle_processes', 'Rows in v$process',
+                  [(None, metrics['processes']['count'])])
+        out.gauge('oracle_sessions', 'Rows in v$session',
+                  [(None, metrics['sessions']['count'])])
+        out.gauge('oracle_datafiles', 'Rows in v$datafile', [(None, metrics['datafiles'])])
+        out.gauge('oracle_tempfiles', 'Rows in v$tempfile', [(None, metrics['tempfiles'])])
+
+        tablespaces = metrics.get('tablespaces', [])
+        out.gauge('oracle_tablespace_size_bytes', 'Allocated datafile size per tablespace',
+                  [({'tablespace': t['name']}, round(t['total_mb'] * MB)) for t in tablespaces])
+        out.gauge('oracle_tablespace_used_bytes', 'Used space per tablespace',
+                  [({'tablespace': t['name']}, round(t['used_mb'] * MB)) for t in tablespaces])
+        out.gauge('oracle_tablespace_free_bytes', 'Free space per tablespace',
+                  [({'tablespace': t['name']}, round(t['free_mb'] * MB)) for t in tablespaces])
+        out.gauge('oracle_tablespace_used_ratio', 'Used fraction of allocated space (0-1)',
+                  [({'tablespace': t['name']}, round(t['pct_used'] / 100, 4)) for t in tablespaces])
+
+    out.gauge('oracle_background_processes', 'Running background processes by type (ps)',
+              [({'process': name}, count)
+               for name, count in (snapshot.get('processes') or {}).items()])
+
+    out.gauge('oradba_exporter_last_sample_timestamp_seconds',
+              'Unix time of the cached sample', [(None, round(snapshot['timestamp'], 3))])
+    out.gauge('oradba_exporter_sample_duration_seconds',
+              'Time taken to collect the cached sample', [(None, round(snapshot['duration'], 4))])
+    out.gauge('oradba_exporter_sample_errors', 'Failed samples since exporter start',
+              [(None, snapshot.get('errors', 0))])
+    return out.text()
+
+
+def serve(host='0.0.0.0', port=DEFAULT_PORT, interval=DEFAULT_INTERVAL, token=None):
+    """Run a standalone exporter HTTP server until interrupted"""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    sampler = MetricsSampler(interval=interval)
+    sampler.start()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = self.path.split('?', 1)[0]
+            if path == '/metrics':
+                auth = self.headers.get('Authorization', '')
+                if token and not hmac.compare_digest(auth, f'Bearer {token}'):
+                    return self._send(401, 'unauthorized\n', 'text/plain')
+                return self._send(200, render_metrics(sampler.snapshot()), CONTENT_TYPE)
+            if path == '/':
+                return self._send(200, '<html><body><a href="/metrics">Metrics</a>'
+                                       '</body></html>\n', 'text/html')
+            self._send(404, 'not found\n', 'text/plain')
+
+        def _send(self, status, body, content_type):
+            data = body.encode()
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    console.print(f"[green]✅ Exporter listening on http://{host}:{port}/metrics "
+                  f"(sampling every {interval}s)[/green]")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\n[yellow]Exporter stopped[/yellow]")
+    finally:
+        server.server_close()
+        sampler.stop()
@@ -0,0 +1,195 @@
+"""
+FRA Pressure Watcher
+Samples Fast Recovery Area usage and, once it passes a threshold, queues an
+urgent archived log backup through the backup scheduler before the database
+stalls on a full FRA (ORA-19809 / "archiver stuck").
+
+- Pressure is the space that cannot be reclaimed automatically: the sum of
+  PERCENT_SPACE_USED - PERCENT_SPACE_RECLAIMABLE over V$RECOVERY_AREA_USAGE.
+- The relief run backs up the logs not yet backed up on parallel channels,
+  writing the pieces outside the FRA, then deletes the backed-up logs (the
+  archivelog deletion policy still applies, e.g. APPLIED ON STANDBY).
+- The sampling interval follows the redo rate: the watcher estimates when
+  usage reaches the threshold and samples about four times before then,
+  between min_interval and max_interval seconds.
+
+Usage (Python):
+    from oracledba.modules.frawatcher import FraWatcher
+    watcher = FraWatcher(on_pressure=lambda snap: ...)
+    snap = watcher.check()
+    watcher.start()             # background thread
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+SETTINGS_FILE = Path.home() / '.oracledba' / 'fra-watch.json'
+DEFAULT_SETTINGS = {'threshold': 80, 'dest': '/u01/backup', 'min_interval': 15, 'max_interval': 600}
+SAMPLES_BEFORE_THRESHOLD = 4
+RELIEF_REASON = 'fra-pressure'
+
+FRA_QUERIES = {
+    'dest': ("SELECT NAME, SPACE_LIMIT, SPACE_USED, SPACE_RECLAIMABLE, NUMBER_OF_FILES "
+             "FROM V$RECOVERY_FILE_DEST"),
+    'usage': ("SELECT FILE_TYPE, PERCENT_SPACE_USED, PERCENT_SPACE_RECLAIMABLE, NUMBER_OF_FILES "
+              "FROM V$RECOVERY_AREA_USAGE ORDER BY PERCENT_SPACE_USED DESC"),
+    'redo': "SELECT VALUE FROM V$SYSSTAT WHERE NAME = 'redo size'",
+    # redo rate for the first sample, before there is a redo size delta
+    'recent': ("SELECT NVL(SUM(BLOCKS * BLOCK_SIZE), 0) AS BYTES FROM V$ARCHIVED_LOG "
+               "WHERE STANDBY_DEST = 'NO' AND COMPLETION_TIME > SYSDATE - 1/24"),
+}
+
+
+def load_settings(path=None):
+    """Watcher settings saved by `oradba rman fra config`, over the defaults"""
+    try:
+        with open(path or SETTINGS_FILE) as f:
+            return {**DEFAULT_SETTINGS, **json.load(f)}
+    except (OSError, ValueError):
+        return dict(DEFAULT_SETTINGS)
+
+
+def save_settings(settings, path=None):
+    path = Path(path or SETTINGS_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(settings, f, indent=2)
+    os.replace(tmp, path)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def next_interval(bytes_to_threshold, redo_bps, min_interval, max_interval):
+    """Seconds until the next sample: a quarter of the time the redo rate
+    needs to fill the space left below the threshold, clamped"""
+    if bytes_to_threshold <= 0:
+        return min_interval
+    if redo_bps <= 0:
+        return max_interval
+    lead = bytes_to_threshold / redo_bps / SAMPLES_BEFORE_THRESHOLD
+    return int(max(min_interval, min(max_interval, lead)))
+
+
+def build_sample(rows, settings, previous=None, now=None):
+    """FRA snapshot from one FRA_QUERIES result; ``previous`` gives the redo delta"""
+    now = time.time() if now is None else now
+    dest = (rows.get('dest') or [{}])[0]
+    limit = _number(dest.get('SPACE_LIMIT'))
+    used = _number(dest.get('SPACE_USED'))
+    reclaimable = _number(dest.get('SPACE_RECLAIMABLE'))
+    usage = [{'file_type': r.get('FILE_TYPE', ''),
+              'used_pct': _number(r.get('PERCENT_SPACE_USED')),
+              'reclaimable_pct': _number(r.get('PERCENT_SPACE_RECLAIMABLE')),
+              'files': int(_number(r.get('NUMBER_OF_FILES')))} for r in rows.get('usage') or []]
+    if usage:
+        pressure = sum(u['used_pct'] - u['reclaimable_pct'] for u in usage)
+    else:
+        pressure = (used - reclaimable) / limit * 100 if limit else 0.0
+
+    redo = _number((rows.get('redo') or [{}])[0].get('VALUE'))
+    if previous and previous.get('redo_bytes') is not None and redo >= previous['redo_bytes'] \
+            and now > previous['timestamp']:
+        redo_bps = (redo - previous['redo_bytes']) / (now - previous['timestamp'])
+    else:
+        # first sample, or the instance restarted and the counter reset
+        redo_bps = _number((rows.get('recent') or [{}])[0].get('BYTES')) / 3600
+
+    threshold = settings['threshold']
+    bytes_to_threshold = limit * (threshold - pressure) / 100
+    return {
+        'timestamp': now,
+        'configured': limit > 0,
+        'name': dest.get('NAME', ''),
+        'limit_gb': round(limit / 1024 ** 3, 2),
+        'used_gb': round(used / 1024 ** 3, 2),
+        'reclaimable_gb': round(reclaimable / 1024 ** 3, 2),
+        'pressure_pct': round(pressure, 1),
+        'threshold_pct': threshold,
+        'usage': usage,
+        'redo_bytes': redo,
+        'redo_mbps': round(redo_bps / 1048576, 3),
+        'seconds_to_threshold': (int(bytes_to_threshold / redo_bps)
+                                 if redo_bps > 0 and bytes_to_threshold > 0 else None),
+        'interval': next_interval(bytes_to_threshold, redo_bps,
+                                  settings['min_interval'], settings['max_interval']),
+    }
+
+
+def submit_relief(scheduler, dest=None):
+    """Queue an urgent archive log backup unless one is already queued or running;
+    returns the (new or pending) run"""
+    status = scheduler.status(history=0)
+    for run in status['queue'] + status['running']:
+        if run['type'] == 'archive' and run.get('reason') == RELIEF_REASON:
+            return run
+    return scheduler.submit('CDB', 'archive', reason=RELIEF_REASON, urgent=True,
+                            dest=dest or load_settings()['dest'])
+
+
+class FraWatcher:
+    """Samples FRA pressure at an interval that follows the redo rate"""
+
+    def __init__(self, client=None, on_pressure=None, settings=None, clock=time.time):
+        if client is None:
+            from ..utils.oracle_client import OracleClient
+            client = OracleClient()
+        self.client = client
+        self.on_pressure = on_pressure
+        self.settings = {**DEFAULT_SETTINGS, **(settings or load_settings())}
+        self.clock = clock
+        self.last = None
+        self.errors = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def sample(self):
+        """Query the FRA views once; raises RuntimeError if sqlplus cannot run"""
+        ok, rows, errors = self.client.query_many(FRA_QUERIES)
+        if not ok:
+            raise RuntimeError(next(iter(errors.values()), '') or 'sqlplus failed')
+        if errors.get('dest') or errors.get('usage'):
+            raise RuntimeError(errors.get('dest') or errors['usage'])
+        self.last = build_sample(rows, self.settings, self.last, self.clock())
+        return self.last
+
+    def check(self):
+        """Sample, and call on_pressure(snapshot) when pressure passes the threshold.
+        The snapshot's 'relief' holds what on_pressure returned."""
+        snap = self.sample()
+        snap['relief'] = None
+        if snap['configured'] and snap['pressure_pct'] >= snap['threshold_pct'] and self.on_pressure:
+            snap['relief'] = self.on_pressure(snap)
+        return snap
+
+    def start(self):
+        """Start the background watch thread (idempotent)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='oradba-fra-watch', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                interval = self.check()['interval']
+            except (RuntimeError, OSError, ValueError) as e:
+                self.errors += 1
+                from ..utils.logger import get_logger
+                get_logger().error(f"FRA watcher: {e}")
+                interval = self.settings['max_interval']
+            self._stop.wait(interval)
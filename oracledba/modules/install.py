@@ -16,9 +16,12 @@ Usage (Python):
     mgr.install_all(auto_yes=True)
 """
 
+import json
 import os
+import re
 import sys
 import subprocess
+import threading
 import yaml
 import time
 from pathlib import Path
@@ -26,14 +29,73 @@ from rich.console import Console
 from rich.table import Table
 from rich import print as rprint
 
+from ..utils.events import EventStream
+from .progress import (PERCENT_RE, ProgressHistory, ProgressTracker, render_bar,
+                       format_duration)
+
 console = Console()
 
+# Lab number -> (script, run-as user, description)
+LAB_MAP = {
+    '01': ('tp01-system-readiness.sh', 'root', 'System Readiness'),
+    '02': ('tp02-installation-binaire.sh', 'oracle', 'Binary Installation'),
+    '03': ('tp03-creation-instance.sh', 'oracle', 'Instance Creation'),
+    '04': ('tp04-fichiers-critiques.sh', 'oracle', 'Critical Files Multiplexing'),
+    '05': ('tp05-gestion-stockage.sh', 'oracle', 'Storage Management'),
+    '06': ('tp06-securite-acces.sh', 'oracle', 'Security and Access'),
+    '07': ('tp07-flashback.sh', 'oracle', 'Flashback Technologies'),
+    '08': ('tp08-rman.sh', 'oracle', 'RMAN Backup'),
+    '09': ('tp09-dataguard.sh', 'oracle', 'Data Guard Setup'),
+    '10': ('tp10-tuning.sh', 'oracle', 'Performance Tuning'),
+    '11': ('tp11-patching.sh', 'oracle', 'Patching and Maintenance'),
+    '12': ('tp12-multitenant.sh', 'oracle', 'Multitenant Architecture'),
+    '13': ('tp13-ai-foundations.sh', 'oracle', 'AI/ML Foundations'),
+    '14': ('tp14-mobilite-concurrence.sh', 'oracle', 'Data Mobility'),
+    '15': ('tp15-asm-rac-concepts.sh', 'oracle', 'ASM and RAC Concepts'),
+}
+
+# Lab DAG for the parallel runner (modules/labrunner.py): a lab needs the
+# labs listed here. Everything after TP03 only needs the instance, except
+# RMAN/Data Guard (ARCHIVELOG from TP04) and mobility (mluser from TP13).
+LAB_DEPENDENCIES = {
+    '01': (),
+    '02': ('01',),
+    '03': ('02',),
+    '04': ('03',),
+    '05': ('03',),
+    '06': ('03',),
+    '07': ('03',),
+    '08': ('04',),
+    '09': ('04',),
+    '10': ('03',),
+    '11': ('03',),
+    '12': ('03',),
+    '13': ('03',),
+    '14': ('13',),
+    '15': ('03',),
+}
+
+# Labs that SHUTDOWN/STARTUP the instance: they run alone
+LAB_EXCLUSIVE = frozenset({'04', '07', '09'})
+
+# Labs working inside the training PDB. With PDB isolation each group gets
+# its own clone of LAB_SOURCE_PDB so they can run side by side.
+LAB_SOURCE_PDB = 'GDCPDB'
+LAB_PDB_GROUPS = {
+    '06': 'LABSEC',
+    '10': 'LABTUNE',
+    '13': 'LABML',
+    '14': 'LABML',
+}
+
 
 class InstallManager:
     def __init__(self, config_file=None):
         self.config = self._load_config(config_file)
         self.scripts_dir = Path(__file__).parent.parent / "scripts"
         self._log_handle = None
+        self._events = None
+        self._current_step = None
         try:
             self.log_dir = Path("/var/log/oracledba")
             self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -78,17 +140,32 @@ class InstallManager:
         if self._log_handle:
             self._log_handle.write(text + end)
             self._log_handle.flush()
-
-    def _step_header(self, step_num, total, title):
+        if self._events:
+            match = PERCENT_RE.search(text)
+            if match:
+                self._emit('percent', step=self._current_step,
+                           percent=min(int(match.group(1)), 100),
+                           line=text.strip())
+
+    def _emit(self, event, **fields):
+        """Write a structured progress event (no-op when no stream is open)"""
+        if self._events:
+            self._events.emit(event, **fields)
+
+    def _step_header(self, step_num, total, title, kind='step'):
         """Print a visible step header"""
+        self._current_step = step_num
+        self._emit('step_start', kind=kind, step=step_num, total=total, title=title)
         self._out("")
         self._out("\u2501" * 60)
         self._out(f"  Step {step_num}/{total} \u2500 {title}")
         self._out("\u2501" * 60)
         self._out("")
 
-    def _step_result(self, step_num, success, elapsed_seconds):
+    def _step_result(self, step_num, success, elapsed_seconds, kind='step'):
         """Print step result with timing"""
+        self._emit('step_end', kind=kind, step=step_num, success=bool(success),
+                   duration=round(elapsed_seconds, 1))
         mins = int(elapsed_seconds // 60)
         secs = int(elapsed_seconds % 60)
         if success:
@@ -97,9 +174,20 @@ class InstallManager:
             self._out(f"\n\u2717 Step {step_num} FAILED ({mins}m {secs}s)")
 
     def _open_log(self, name):
-        """Open a log file for writing"""
+        """Open a log file for writing, plus its JSON-lines event stream.
+
+        The event stream goes to $ORADBA_EVENTS_FILE when set (the GUI sets
+        it for background installs), otherwise next to the log file.
+        """
         log_file = self.log_dir / f"{name}.log"
         self._log_handle = open(log_file, 'w')
+        events_file = os.environ.get('ORADBA_EVENTS_FILE') or \
+            self.log_dir / f"{name}.events.jsonl"
+        try:
+            self._events = EventStream(events_file)
+            self._emit('log_open', name=name, log_file=str(log_file))
+        except OSError:
+            self._events = None
         return log_file
 
     def _close_log(self):
@@ -107,6 +195,10 @@ class InstallManager:
         if self._log_handle:
             self._log_handle.close()
             self._log_handle = None
+        if self._events:
+            self._events.close()
+            self._events = None
+        self._current_step = None
 
     # =========================================================================
     # PROCESS EXECUTION — always streams output live
@@ -153,8 +245,13 @@ class InstallManager:
             self._out(f"Error running command: {e}")
             return 1
 
-    def _stream_cmd_capture(self, cmd, env=None):
-        """Like _stream_cmd but also returns full output for post-checking."""
+    def _stream_cmd_capture(self, cmd, env=None, progress=None):
+        """Like _stream_cmd but also returns full output for post-checking.
+
+        When a ProgressTracker is given, each line is fed to it and a
+        progress bar with ETA is printed (and emitted as an event) whenever
+        the phase or percentage moves.
+        """
         if env is None:
             env = self._build_env()
         output_lines = []
@@ -166,12 +263,29 @@ class InstallManager:
             for line in process.stdout:
                 self._out(line, end='')
                 output_lines.append(line)
+                if progress:
+                    update = progress.feed(line)
+                    if update:
+                        self._out(render_bar(update))
+                        self._emit('progress', step=self._current_step, **update)
             process.wait()
             return process.returncode, ''.join(output_lines)
         except Exception as e:
             self._out(f"Error running command: {e}")
             return 1, str(e)
 
+    def _finish_progress(self, progress, success):
+        """Record phase timings and flag phases much slower than usual"""
+        # finish() first: it closes the last phase, which then gets a rate too
+        total = progress.finish(success)
+        rates = progress.phase_rates()
+        self._emit('progress_end', step=self._current_step, operation=progress.operation,
+                   success=bool(success), total=round(total, 1), phases=rates)
+        slow = [r for r in rates if r['ratio'] and r['ratio'] >= 1.5]
+        for r in slow:
+            self._out(f"\u26a0 {progress.operation} phase '{r['phase']}' took "
+                      f"{format_duration(r['seconds'])} (usual {format_duration(r['expected'])})")
+
     def _run_script(self, script_name, as_user='root', env_vars=None, show_output=True):
         """Execute a bash script with live output streaming.
 
@@ -303,12 +417,15 @@ class InstallManager:
             f'-waitforcompletion -ignorePrereq'
         )
         cmd = self._build_cmd(install_cmd, 'oracle')
-        returncode, output = self._stream_cmd_capture(cmd)
+        progress = ProgressTracker('runinstaller')
+        returncode, output = self._stream_cmd_capture(cmd, progress=progress)
 
         # runInstaller returns 6 for "Successfully Setup Software with warnings"
         if "Successfully Setup Software" in output or returncode in (0, 6):
+            self._finish_progress(progress, True)
             self._out("\n\u2713 Oracle software installed successfully")
         else:
+            self._finish_progress(progress, False)
             self._out(f"\n\u2717 Oracle software installation failed (exit code: {returncode})")
             return False
 
@@ -423,9 +540,11 @@ class InstallManager:
         )
 
         cmd = self._build_cmd(dbca_cmd, 'oracle')
-        returncode, output = self._stream_cmd_capture(cmd)
+        progress = ProgressTracker('dbca')
+        returncode, output = self._stream_cmd_capture(cmd, progress=progress)
 
         if returncode == 0 or "100% complete" in output.lower():
+            self._finish_progress(progress, True)
             self._out("\n\u2713 Database created successfully!")
 
             # Verify database
@@ -457,6 +576,7 @@ class InstallManager:
 
             return True
         else:
+            self._finish_progress(progress, False)
             self._out(f"\n\u2717 Database creation failed (exit code: {returncode})")
             return False
 
@@ -518,6 +638,7 @@ class InstallManager:
                     input()
                 except KeyboardInterrupt:
                     self._out("\n\u2717 Installation cancelled by user")
+                    self._emit('install_end', success=False, reason='cancelled')
                     return False
 
             total_start = time.time()
@@ -535,10 +656,12 @@ class InstallManager:
                 if not success:
                     self._out(f"\n\u2717 Installation FAILED at step {i}: {title}")
                     self._out(f"  Check log: {log_file}")
+                    self._emit('install_end', success=False, failed_step=i)
                     return False
 
             # Success
             total_elapsed = time.time() - total_start
+            self._emit('install_end', success=True, duration=round(total_elapsed, 1))
             total_mins = int(total_elapsed // 60)
             total_secs = int(total_elapsed % 60)
 
@@ -573,7 +696,7 @@ class InstallManager:
                 failed = []
                 for i, lab_num in enumerate(post_labs, 1):
                     self._step_header(i, len(post_labs),
-                                      f"Post-Config Lab TP{lab_num}")
+                                      f"Post-Config Lab TP{lab_num}", kind='lab')
                     lab_start = time.time()
                     try:
                         success = self.run_lab(lab_num, show_output=True)
@@ -581,7 +704,7 @@ class InstallManager:
                         self._out(f"  Lab TP{lab_num} error: {exc}")
                         success = False
                     elapsed = time.time() - lab_start
-                    self._step_result(i, success, elapsed)
+                    self._step_result(i, success, elapsed, kind='lab')
                     if not success:
                         failed.append(lab_num)
                 self._out("")
@@ -652,36 +775,51 @@ class InstallManager:
         finally:
             self._close_log()
 
+    def show_history(self):
+        """Show recorded runInstaller/DBCA phase durations"""
+        history = ProgressHistory()
+        if not history.operations():
+            rprint("[yellow]No install history recorded yet[/yellow]")
+            rprint(f"[dim]History file: {history.path}[/dim]")
+            return
+
+        table = Table(title="Install Phase History", show_header=True,
+                      header_style="bold magenta")
+        table.add_column("Operation", style="cyan")
+        table.add_column("Phase", style="white")
+        table.add_column("Runs", justify="right")
+        table.add_column("Median", justify="right")
+        table.add_column("Last", justify="right")
+        table.add_column("Trend", justify="right")
+
+        for operation in history.operations():
+            phases = history.data[operation].get('phases', {})
+            for phase, durations in phases.items():
+                if not durations:
+                    continue
+                med = history.expected(operation, phase)
+                last = durations[-1]
+                ratio = last / med if med else 1.0
+                style = "red" if ratio >= 1.5 else "green" if ratio <= 0.8 else "white"
+                table.add_row(operation, phase, str(len(durations)),
+                              format_duration(med), format_duration(last),
+                              f"[{style}]{ratio:.2f}x[/{style}]")
+
+        console.print(table)
+        rprint(f"[dim]History file: {history.path}[/dim]")
+
     # =========================================================================
     # LAB RUNNER — run TP04-TP15 configuration labs
     # =========================================================================
 
     def run_lab(self, lab_number, show_output=True):
         """Run a specific configuration lab script"""
-        lab_map = {
-            '01': ('tp01-system-readiness.sh', 'root', 'System Readiness'),
-            '02': ('tp02-installation-binaire.sh', 'oracle', 'Binary Installation'),
-            '03': ('tp03-creation-instance.sh', 'oracle', 'Instance Creation'),
-            '04': ('tp04-fichiers-critiques.sh', 'oracle', 'Critical Files Multiplexing'),
-            '05': ('tp05-gestion-stockage.sh', 'oracle', 'Storage Management'),
-            '06': ('tp06-securite-acces.sh', 'oracle', 'Security and Access'),
-            '07': ('tp07-flashback.sh', 'oracle', 'Flashback Technologies'),
-            '08': ('tp08-rman.sh', 'oracle', 'RMAN Backup'),
-            '09': ('tp09-dataguard.sh', 'oracle', 'Data Guard Setup'),
-            '10': ('tp10-tuning.sh', 'oracle', 'Performance Tuning'),
-            '11': ('tp11-patching.sh', 'oracle', 'Patching and Maintenance'),
-            '12': ('tp12-multitenant.sh', 'oracle', 'Multitenant Architecture'),
-            '13': ('tp13-ai-foundations.sh', 'oracle', 'AI/ML Foundations'),
-            '14': ('tp14-mobilite-concurrence.sh', 'oracle', 'Data Mobility'),
-            '15': ('tp15-asm-rac-concepts.sh', 'oracle', 'ASM and RAC Concepts'),
-        }
-
-        if lab_number not in lab_map:
+        if lab_number not in LAB_MAP:
             rprint(f"[red]Error:[/red] Lab {lab_number} not found")
-            rprint(f"[yellow]Available labs:[/yellow] {', '.join(sorted(lab_map.keys()))}")
+            rprint(f"[yellow]Available labs:[/yellow] {', '.join(sorted(LAB_MAP.keys()))}")
             return False
 
-        script, user, description = lab_map[lab_number]
+        script, user, description = LAB_MAP[lab_number]
         rprint(f"\n[bold cyan]Running Lab {lab_number}: {description}[/bold cyan]\n")
         return self._run_script(script, user)
 
@@ -723,12 +861,11 @@ class InstallManager:
         console.print("  oradba maintenance tune          # Lab 10")
         console.print("  oradba advanced multitenant      # Lab 12")
 
-    def run_all_labs(self, start_from='01', end_at='15'):
-        """Run multiple labs sequentially"""
+    def run_all_labs(self, start_from='01', end_at='15', parallel=1, isolate_pdbs=False):
+        """Run multiple labs sequentially, or concurrently when parallel > 1"""
         console.print("\n[bold cyan]Running Oracle DBA Configuration Labs[/bold cyan]\n")
 
-        all_labs = ['01', '02', '03', '04', '05', '06', '07',
-                    '08', '09', '10', '11', '12', '13', '14', '15']
+        all_labs = sorted(LAB_MAP)
 
         try:
             start_idx = all_labs.index(start_from)
@@ -739,6 +876,9 @@ class InstallManager:
             rprint(f"[red]Invalid lab range: {start_from} to {end_at}[/red]")
             return False
 
+        if parallel > 1:
+            return self.run_labs_parallel(labs, max_workers=parallel, isolate_pdbs=isolate_pdbs)
+
         failed_labs = []
         for lab_num in labs:
             success = self.run_lab(lab_num)
@@ -757,6 +897,136 @@ class InstallManager:
 
         return len(failed_labs) == 0
 
+    def run_labs_parallel(self, labs, max_workers=3, isolate_pdbs=False):
+        """Run labs concurrently following LAB_DEPENDENCIES.
+
+        Each lab writes to its own log under <log_dir>/labs; the console
+        shows start/finish lines and a timing summary. With isolate_pdbs the
+        labs in LAB_PDB_GROUPS each run against their own clone of
+        LAB_SOURCE_PDB, otherwise they take turns on the source PDB.
+        """
+        from .labrunner import LabScheduler, SKIPPED, SUCCEEDED, summarize
+
+        lab_dir = self.log_dir / 'labs'
+        lab_dir.mkdir(parents=True, exist_ok=True)
+        if isolate_pdbs:
+            groups = dict(LAB_PDB_GROUPS)
+        else:
+            groups = {lab: LAB_SOURCE_PDB for lab in LAB_PDB_GROUPS}
+        self._lab_pdbs = set()
+        self._lab_pdb_lock = threading.Lock()
+
+        def run_one(lab):
+            pdb = LAB_PDB_GROUPS.get(lab) if isolate_pdbs else None
+            return self._run_lab_isolated(lab, lab_dir, pdb)
+
+        def on_event(event, lab, result):
+            name = LAB_MAP[lab][2]
+            if event == 'started':
+                where = f" [dim](PDB {groups[lab]})[/dim]" if lab in groups else ''
+                rprint(f"[cyan]\u25b6 TP{lab}[/cyan] {name}{where}")
+            elif event == 'finished':
+                ok = result['status'] == SUCCEEDED
+                mark = "[green]\u2713" if ok else "[red]\u2717"
+                rprint(f"{mark} TP{lab}[/] {name} {result['status']} "
+                       f"({format_duration(result['duration'])})")
+            elif event == 'skipped':
+                rprint(f"[yellow]\u2298 TP{lab}[/yellow] {name} skipped: {result['reason']}")
+
+        rprint(f"[dim]Parallel run: up to {max_workers} labs at once, "
+               f"PDB isolation {'on' if isolate_pdbs else 'off'}, logs in {lab_dir}[/dim]\n")
+        scheduler = LabScheduler(LAB_DEPENDENCIES, run_one, max_workers=max_workers,
+                                 exclusive=LAB_EXCLUSIVE, groups=groups, on_event=on_event)
+        results = scheduler.run(labs)
+        stats = summarize(results)
+
+        table = Table(title="Lab Timings", show_header=True, header_style="bold magenta")
+        table.add_column("#", style="cyan", width=4)
+        table.add_column("Lab")
+        table.add_column("Status")
+        table.add_column("Start", justify="right")
+        table.add_column("Duration", justify="right")
+        for r in results:
+            style = {SUCCEEDED: 'green', SKIPPED: 'yellow'}.get(r['status'], 'red')
+            table.add_row(r['lab'], LAB_MAP[r['lab']][2], f"[{style}]{r['status']}[/{style}]",
+                          format_duration(r['start']), format_duration(r['duration']))
+        console.print()
+        console.print(table)
+        speedup = f" \u2014 {stats['speedup']}x faster" if stats['speedup'] else ''
+        rprint(f"Wall time {format_duration(stats['wall'])}, "
+               f"serial time {format_duration(stats['serial'])}{speedup}")
+
+        with open(lab_dir / 'last-run.json', 'w') as f:
+            json.dump({'labs': results, 'summary': stats, 'max_workers': max_workers,
+                       'isolate_pdbs': isolate_pdbs}, f, indent=2)
+
+        return stats['failed'] == 0 and stats['skipped'] == 0
+
+    def _run_lab_isolated(self, lab, lab_dir, pdb=None):
+        """Run one lab with output to its own log (used by the parallel runner)"""
+        script, user, _description = LAB_MAP[lab]
+        script_path = self.scripts_dir / script
+        log_file = lab_dir / f"tp{lab}.log"
+        with open(log_file, 'w') as log:
+            if not script_path.exists():
+                log.write(f"Script {script} not found at {script_path}\n")
+                return False
+            env_vars = None
+            if pdb:
+                if not self._ensure_lab_pdb(pdb, log):
+                    return False
+                script_path = self._retarget_script(script_path, pdb, lab_dir)
+                env_vars = {'ORADBA_LAB_PDB': pdb}
+            cmd = self._build_cmd(f'bash {script_path}', user)
+            result = subprocess.run(cmd, stdout=log, stderr=subprocess.STDOUT,
+                                    env=self._build_env(env_vars))
+            return result.returncode == 0
+
+    def _ensure_lab_pdb(self, pdb, log):
+        """Clone LAB_SOURCE_PDB into ``pdb`` (once per run) and open it"""
+        with self._lab_pdb_lock:
+            if pdb in self._lab_pdbs:
+                return True
+            sql = f"""WHENEVER SQLERROR EXIT 1
+DECLARE
+  n NUMBER;
+  mode_ VARCHAR2(20);
+BEGIN
+  SELECT COUNT(*) INTO n FROM v$pdbs WHERE name = '{pdb}';
+  IF n = 0 THEN
+    EXECUTE IMMEDIATE 'CREATE PLUGGABLE DATABASE {pdb} FROM {LAB_SOURCE_PDB} '
+      || 'FILE_NAME_CONVERT=(''{LAB_SOURCE_PDB.lower()}'', ''{pdb.lower()}'')';
+  END IF;
+  SELECT open_mode INTO mode_ FROM v$pdbs WHERE name = '{pdb}';
+  IF mode_ <> 'READ WRITE' THEN
+    EXECUTE IMMEDIATE 'ALTER PLUGGABLE DATABASE {pdb} OPEN';
+  END IF;
+  EXECUTE IMMEDIATE 'ALTER PLUGGABLE DATABASE {pdb} SAVE STATE';
+END;
+/
+EXIT
+"""
+            log.write(f"=== Preparing PDB {pdb} (clone of {LAB_SOURCE_PDB}) ===\n")
+            log.flush()
+            cmd = self._build_cmd('sqlplus -s / as sysdba', 'oracle')
+            result = subprocess.run(cmd, input=sql, stdout=log, stderr=subprocess.STDOUT,
+                                    text=True, env=self._build_env())
+            if result.returncode != 0:
+                log.write(f"Could not prepare PDB {pdb}\n")
+                return False
+            self._lab_pdbs.add(pdb)
+            return True
+
+    def _retarget_script(self, script_path, pdb, lab_dir):
+        """Copy of a lab script pointing at ``pdb`` instead of the source PDB"""
+        source = re.compile(rf'\b{LAB_SOURCE_PDB}\b', re.IGNORECASE)
+        text = source.sub(lambda m: pdb.lower() if m.group(0).islower() else pdb,
+                          script_path.read_text())
+        target = lab_dir / f"{script_path.stem}-{pdb.lower()}.sh"
+        target.write_text(text)
+        os.chmod(target, 0o755)
+        return target
+
     def vm_init(self, role, node_number=None):
         """Initialize VM for Oracle"""
         console.print(f"\n[bold cyan]Initializing VM as {role}[/bold cyan]\n")
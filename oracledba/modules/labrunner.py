@@ -0,0 +1,180 @@
+"""
+Parallel Lab Runner
+Dependency-aware scheduler for the TP labs declared in install.py
+(LAB_MAP / LAB_DEPENDENCIES / LAB_EXCLUSIVE / LAB_PDB_GROUPS).
+
+Once TP03 has created the instance most labs are independent, so they
+run concurrently on a bounded thread pool:
+
+- a lab starts when every selected lab it depends on has succeeded;
+  dependencies outside the selection are assumed to be done already
+- a failed lab skips everything downstream of it, other branches go on
+- exclusive labs (those that restart the instance) run alone: they wait
+  for running labs to drain and nothing starts while they run
+- ready labs start in lab-number order, so runs are reproducible
+- labs sharing a PDB group never overlap
+
+Usage (Python):
+    from oracledba.modules.labrunner import LabScheduler
+    sched = LabScheduler(LAB_DEPENDENCIES, run_lab, max_workers=3,
+                         exclusive=LAB_EXCLUSIVE, groups=LAB_PDB_GROUPS)
+    results = sched.run(['04', '05', '06'])
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+SKIPPED = 'skipped'
+
+
+def topological_order(dependencies, labs=None):
+    """Labs ordered so every lab follows its dependencies (ties by number).
+
+    Raises ValueError on unknown labs or dependency cycles.
+    """
+    labs = sorted(dependencies if labs is None else labs)
+    selected = set(labs)
+    for lab in labs:
+        if lab not in dependencies:
+            raise ValueError(f"Unknown lab: {lab}")
+    order, done, visiting = [], set(), set()
+
+    def visit(lab):
+        if lab in done:
+            return
+        if lab in visiting:
+            raise ValueError(f"Dependency cycle through lab {lab}")
+        visiting.add(lab)
+        for dep in sorted(dependencies[lab]):
+            if dep in selected:
+                visit(dep)
+        visiting.discard(lab)
+        done.add(lab)
+        order.append(lab)
+
+    for lab in labs:
+        visit(lab)
+    return order
+
+
+class LabScheduler:
+    """Runs a set of labs concurrently, respecting the lab DAG"""
+
+    def __init__(self, dependencies, run_lab, max_workers=3, exclusive=(), groups=None,
+                 on_event=None, clock=time.monotonic):
+        self.dependencies = dependencies
+        self.run_lab = run_lab          # callable(lab) -> bool
+        self.max_workers = max(1, max_workers)
+        self.exclusive = set(exclusive)
+        self.groups = groups or {}
+        self.on_event = on_event        # callable(event, lab, result dict)
+        self.clock = clock
+        self._lock = threading.Lock()
+
+    def run(self, labs):
+        """Run ``labs``; returns per-lab results in lab order.
+
+        Each result: {'lab', 'status', 'start', 'end', 'duration', 'reason'}
+        with times in seconds from the start of the run.
+        """
+        order = topological_order(self.dependencies, labs)
+        selected = set(order)
+        pending = list(order)
+        results = {}
+        running = {}                    # future -> lab
+        t0 = self.clock()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix='oradba-lab') as pool:
+            while pending or running:
+                while True:
+                    lab = self._next_ready(pending, running, results, selected)
+                    if lab is None:
+                        break
+                    if isinstance(lab, tuple):
+                        lab, reason = lab
+                        pending.remove(lab)
+                        results[lab] = self._result(lab, SKIPPED, reason=reason)
+                        self._notify('skipped', results[lab])
+                        continue
+                    pending.remove(lab)
+                    results[lab] = self._result(lab, None, start=self.clock() - t0)
+                    self._notify('started', results[lab])
+                    running[pool.submit(self._call, lab)] = lab
+
+                if not running:
+                    # nothing can ever become ready (should not happen with a DAG)
+                    for lab in pending:
+                        results[lab] = self._result(lab, SKIPPED, reason='unsatisfiable')
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    lab = running.pop(future)
+                    result = results[lab]
+                    result['end'] = self.clock() - t0
+                    result['duration'] = result['end'] - result['start']
+                    ok, error = future.result()
+                    result['status'] = SUCCEEDED if ok else FAILED
+                    if error:
+                        result['reason'] = error
+                    self._notify('finished', result)
+
+        return [results[lab] for lab in sorted(results)]
+
+    def _next_ready(self, pending, running, results, selected):
+        """Next lab to start, (lab, reason) to skip, or None to wait"""
+        running_labs = set(running.values())
+        if running_labs & self.exclusive:
+            return None
+        busy_groups = {self.groups[l] for l in running_labs if l in self.groups}
+        for lab in pending:
+            deps = [d for d in self.dependencies[lab] if d in selected]
+            broken = [d for d in deps if d in results and results[d]['status'] in (FAILED, SKIPPED)]
+            if broken:
+                return lab, f"dependency {broken[0]} did not succeed"
+            if not all(d in results and results[d]['status'] == SUCCEEDED for d in deps):
+                continue
+            if lab in self.exclusive:
+                # exclusive labs keep their place: later labs wait behind them
+                return None if running_labs else lab
+            if len(running_labs) >= self.max_workers:
+                return None
+            if self.groups.get(lab) in busy_groups:
+                continue
+            return lab
+        return None
+
+    def _call(self, lab):
+        try:
+            return bool(self.run_lab(lab)), None
+        except Exception as e:
+            return False, str(e)
+
+    def _notify(self, event, result):
+        if self.on_event:
+            with self._lock:
+                self.on_event(event, result['lab'], result)
+
+    @staticmethod
+    def _result(lab, status, start=None, reason=None):
+        return {'lab': lab, 'status': status, 'start': start, 'end': None,
+                'duration': None, 'reason': reason}
+
+
+def summarize(results):
+    """Wall-clock vs. serial time for a finished run"""
+    ran = [r for r in results if r['duration'] is not None]
+    wall = max((r['end'] for r in ran), default=0.0)
+    serial = sum(r['duration'] for r in ran)
+    return {
+        'wall': wall,
+        'serial': serial,
+        'speedup': round(serial / wall, 2) if wall else None,
+        'succeeded': sum(r['status'] == SUCCEEDED for r in results),
+        'failed': sum(r['status'] == FAILED for r in results),
+        'skipped': sum(r['status'] == SKIPPED for r in results),
+    }
@@ -0,0 +1,356 @@
+"""
+Listener Log Analyzer
+Streams listener.log once, line by line, and keeps only aggregates, so
+multi-GB logs are processed in constant memory:
+
+- connects per second (peak second and recent bursts above a threshold)
+  and per minute (last 24 h)
+- connects per service, client host and program, in bounded top-N
+  counters (counts stay exact until a counter overflows its capacity,
+  then the rarest keys are dropped and the report is marked approximate)
+- failed connects and TNS- errors by code, with the latest samples
+
+The byte offset and the aggregates are checkpointed under
+~/.oracledba/listener, so the next run only reads what was appended.
+Rotation (new inode, shorter file or a different head) starts over.
+
+Usage (Python):
+    from oracledba.modules.listenerlog import ListenerLogAnalyzer, find_listener_log
+    analyzer = ListenerLogAnalyzer(find_listener_log())
+    analyzer.update()
+    report = analyzer.report(top=10)
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import deque
+from pathlib import Path
+
+DEFAULT_CAPACITY = 500
+DEFAULT_BURST_THRESHOLD = 20
+MINUTES_KEPT = 1440
+BURSTS_KEPT = 50
+SAMPLES_KEPT = 20
+HEAD_BYTES = 256
+STATE_VERSION = 1
+
+_MONTHS = {b'JAN': '01', b'FEB': '02', b'MAR': '03', b'APR': '04', b'MAY': '05', b'JUN': '06',
+           b'JUL': '07', b'AUG': '08', b'SEP': '09', b'OCT': '10', b'NOV': '11', b'DEC': '12'}
+_TS_RE = re.compile(rb'^(\d{2})-([A-Z]{3})-(\d{4}) (\d{2}:\d{2}:\d{2}) \* ')
+_TNS_RE = re.compile(rb'^TNS-(\d{1,5}): ?(.*)')
+_SERVICE_RE = re.compile(rb'\((?:SERVICE_NAME|SID)=([^)]*)\)', re.IGNORECASE)
+_PROGRAM_RE = re.compile(rb'\(PROGRAM=([^)]*)\)', re.IGNORECASE)
+_HOST_RE = re.compile(rb'\(HOST=([^)]*)\)', re.IGNORECASE)
+
+
+def find_listener_log(oracle_base=None, hostname=None, listener='listener', oracle_home=None):
+    """Path of listener.log under the ADR (diag/tnslsnr/<host>/<listener>/trace) or None"""
+    hostname = (hostname or os.uname().nodename).split('.')[0]
+    bases = [oracle_base or os.getenv('ORACLE_BASE') or '/u01/app/oracle']
+    if oracle_home:
+        bases.append(str(Path(oracle_home).parent))
+    name = listener.lower()
+    for base in bases:
+        diag = Path(base) / 'diag' / 'tnslsnr'
+        for pattern in (f'{hostname}/{name}/trace/{name}.log', f'*/{name}/trace/{name}.log'):
+            matches = sorted(diag.glob(pattern))
+            if matches:
+                return matches[0]
+    return None
+
+
+def tail_lines(path, count=50, chunk=64 * 1024):
+    """Last ``count`` lines of a file, reading backwards from the end"""
+    if count <= 0:
+        return []
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        pos = f.tell()
+        data = b''
+        while pos > 0 and data.count(b'\n') <= count:
+            step = min(chunk, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.decode('utf-8', errors='replace').splitlines()
+    return lines[-count:]
+
+
+class TopCounter:
+    """Counter holding at most ~2x ``capacity`` keys.
+
+    When it grows past that, only the ``capacity`` largest keys are kept
+    and ``dropped`` remembers the largest count thrown away: any key's
+    true count is at most its count here plus ``dropped``.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, counts=None, dropped=0):
+        self.capacity = capacity
+        self.counts = dict(counts or {})
+        self.dropped = dropped
+
+    def add(self, key, n=1):
+        self.counts[key] = self.counts.get(key, 0) + n
+        if len(self.counts) > 2 * self.capacity:
+            ranked = sorted(self.counts.items(), key=lambda kv: kv[1], reverse=True)
+            self.dropped = max(self.dropped, ranked[self.capacity][1])
+            self.counts = dict(ranked[:self.capacity])
+
+    def top(self, n):
+        return sorted(self.counts.items(), key=lambda kv: (-kv[1], kv[0]))[:n]
+
+    def to_dict(self):
+        return {'counts': self.counts, 'dropped': self.dropped}
+
+    @classmethod
+    def from_dict(cls, data, capacity=DEFAULT_CAPACITY):
+        data = data or {}
+        return cls(capacity, data.get('counts'), data.get('dropped', 0))
+
+
+class ListenerLogAnalyzer:
+    """Incremental, checkpointed aggregation of one listener.log"""
+
+    def __init__(self, path, state_dir=None, capacity=DEFAULT_CAPACITY,
+                 burst_threshold=DEFAULT_BURST_THRESHOLD):
+        self.path = Path(path)
+        self.state_dir = Path(state_dir) if state_dir else Path.home() / '.oracledba' / 'listener'
+        key = hashlib.sha1(str(self.path.resolve()).encode()).hexdigest()[:16]
+        self.state_file = self.state_dir / f'{key}.json'
+        self.capacity = capacity
+        self.burst_threshold = burst_threshold
+        self.last_read_bytes = 0
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._reset_state()
+
+    # --- checkpoint -------------------------------------------------------
+
+    def _reset_state(self, st=None):
+        self.offset = 0
+        self.inode = st.st_ino if st else None
+        self.head = None
+        self.connects = 0
+        self.failed = 0
+        self.first_seen = None
+        self.last_seen = None
+        self.events = {}
+        self.services = TopCounter(self.capacity)
+        self.hosts = TopCounter(self.capacity)
+        self.programs = TopCounter(self.capacity)
+        self.errors = TopCounter(self.capacity)
+        self.messages = {}
+        self.samples = deque(maxlen=SAMPLES_KEPT)
+        self.minutes = deque(maxlen=MINUTES_KEPT)     # [minute, connects]
+        self.bursts = deque(maxlen=BURSTS_KEPT)       # [second, connects]
+        self.peak = [None, 0]
+        self.second = [None, 0]                       # second being counted
+        self._last_failed = None
+        self._stack_open = False
+
+    def _load(self):
+        self._loaded = True
+        try:
+            with open(self.state_file) as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if state.get('version') != STATE_VERSION or state.get('path') != str(self.path):
+            return
+        self.offset = state['offset']
+        self.inode = state['inode']
+        self.head = state['head']
+        self.connects = state['connects']
+        self.failed = state['failed']
+        self.first_seen = state['first_seen']
+        self.last_seen = state['last_seen']
+        self.events = state['events']
+        for name in ('services', 'hosts', 'programs', 'errors'):
+            setattr(self, name, TopCounter.from_dict(state[name], self.capacity))
+        self.messages = state['messages']
+        self.samples.extend(state['samples'])
+        self.minutes.extend(state['minutes'])
+        self.bursts.extend(state['bursts'])
+        self.peak = state['peak']
+        self.second = state['second']
+        self._last_failed = state.get('last_failed')
+
+    def _save(self):
+        state = {
+            'version': STATE_VERSION, 'path': str(self.path), 'offset': self.offset,
+            'inode': self.inode, 'head': self.head, 'connects': self.connects,
+            'failed': self.failed, 'first_seen': self.first_seen, 'last_seen': self.last_seen,
+            'events': self.events, 'services': self.services.to_dict(),
+            'hosts': self.hosts.to_dict(), 'programs': self.programs.to_dict(),
+            'errors': self.errors.to_dict(), 'messages': self.messages,
+            'samples': list(self.samples), 'minutes': list(self.minutes),
+            'bursts': list(self.bursts), 'peak': self.peak, 'second': self.second,
+            'last_failed': self._last_failed,
+        }
+        try:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            tmp = self.state_file.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(state, f)
+            os.replace(tmp, self.state_file)
+        except OSError:
+            pass
+
+    def _head_hash(self, length):
+        with open(self.path, 'rb') as f:
+            return hashlib.sha1(f.read(length)).hexdigest()
+
+    def reset(self):
+        """Forget the checkpoint; the next update() reads the file from the start"""
+        with self._lock:
+            self._loaded = True
+            self._reset_state()
+            try:
+                self.state_file.unlink()
+            except OSError:
+                pass
+
+    # --- processing -------------------------------------------------------
+
+    def update(self):
+        """Aggregate the lines appended since the checkpoint; returns bytes read.
+
+        A trailing line without a newline is left for the next run.
+        """
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            st = os.stat(self.path)
+            if (self.inode != st.st_ino or st.st_size < self.offset
+                    or (self.head and self.head != self._head_hash(min(self.offset, HEAD_BYTES)))):
+                self._reset_state(st)
+            start = self.offset
+            with open(self.path, 'rb') as f:
+                f.seek(start)
+                for line in f:
+                    if not line.endswith(b'\n'):
+                        break
+                    self.offset += len(line)
+                    self._feed(line)
+            self.last_read_bytes = self.offset - start
+            if self.head is None or start < HEAD_BYTES:
+                self.head = self._head_hash(min(self.offset, HEAD_BYTES))
+            self._save()
+            return self.last_read_bytes
+
+    def _feed(self, line):
+        m = _TS_RE.match(line)
+        if m is None:
+            tns = _TNS_RE.match(line)
+            if tns:
+                code = f'TNS-{int(tns.group(1)):05d}'
+                if code not in self.messages and len(self.messages) < 2 * self.capacity:
+                    self.messages[code] = tns.group(2).decode('utf-8', errors='replace').strip()
+                if not self._stack_open:
+                    # the first TNS- line explains the entry above; count it
+                    # unless that entry's return code already did
+                    self._stack_open = True
+                    if code != self._last_failed:
+                        self.errors.add(code)
+                        self._sample(self.last_seen, code)
+                    elif self.samples and not self.samples[-1]['message']:
+                        self.samples[-1]['message'] = self.messages.get(code, '')
+            return
+
+        self._stack_open = False
+        self._last_failed = None
+        day, mon, year, clock = m.groups()
+        second = f"{year.decode()}-{_MONTHS.get(mon, '00')}-{day.decode()} {clock.decode()}"
+        self.last_seen = second
+        if self.first_seen is None:
+            self.first_seen = second
+
+        fields = line.rstrip(b'\r\n').split(b' * ')
+        code = fields[-1].strip() if len(fields) > 2 else b''
+        event = next((f for f in fields[1:-1] if not f.startswith(b'(')), b'').strip()
+        name = event.decode('utf-8', errors='replace').lower() or 'other'
+        self.events[name] = self.events.get(name, 0) + 1
+        if name != 'establish':
+            return
+
+        self.connects += 1
+        self._count_second(second)
+        connect_data = fields[1] if len(fields) > 1 else b''
+        address = fields[2] if len(fields) > 2 and fields[2].startswith(b'(') else b''
+        service = _SERVICE_RE.search(connect_data)
+        program = _PROGRAM_RE.search(connect_data)
+        host = _HOST_RE.search(address) or _HOST_RE.search(connect_data)
+        self.services.add(service.group(1).decode('utf-8', 'replace').lower() if service else '?')
+        self.hosts.add(host.group(1).decode('utf-8', 'replace') if host else '?')
+        prog = program.group(1).decode('utf-8', 'replace') if program else '?'
+        self.programs.add(re.split(r'[\\/]', prog)[-1] or '?')
+        if code.isdigit() and int(code):
+            self.failed += 1
+            self._last_failed = f'TNS-{int(code):05d}'
+            self.errors.add(self._last_failed)
+            self._sample(second, self._last_failed)
+
+    def _count_second(self, second):
+        if second == self.second[0]:
+            self.second[1] += 1
+        else:
+            self._close_second()
+            self.second = [second, 1]
+        minute = second[:16]
+        if self.minutes and self.minutes[-1][0] == minute:
+            self.minutes[-1][1] += 1
+        else:
+            self.minutes.append([minute, 1])
+
+    def _close_second(self):
+        second, count = self.second
+        if second is None:
+            return
+        if count > self.peak[1]:
+            self.peak = [second, count]
+        if count >= self.burst_threshold:
+            self.bursts.append([second, count])
+
+    def _sample(self, when, code):
+        self.samples.append({'time': when, 'code': code,
+                             'message': self.messages.get(code, '')})
+
+    # --- reporting --------------------------------------------------------
+
+    def report(self, top=10, minutes=60):
+        """JSON-ready summary of everything aggregated so far"""
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            # include the second still being counted without closing it
+            peak = list(self.peak)
+            if self.second[1] > peak[1]:
+                peak = list(self.second)
+            bursts = list(self.bursts)
+            if self.second[1] >= self.burst_threshold:
+                bursts.append(list(self.second))
+            counters = (self.services, self.hosts, self.programs, self.errors)
+            return {
+                'file': str(self.path),
+                'offset': self.offset,
+                'bytes_read': self.last_read_bytes,
+                'first_seen': self.first_seen,
+                'last_seen': self.last_seen,
+                'connects': self.connects,
+                'failed': self.failed,
+                'events': dict(sorted(self.events.items(), key=lambda kv: -kv[1])),
+                'peak': {'second': peak[0], 'connects': peak[1]},
+                'burst_threshold': self.burst_threshold,
+                'bursts': [{'second': s, 'connects': c} for s, c in bursts[-BURSTS_KEPT:]],
+                'per_minute': [{'minute': m, 'connects': c} for m, c in list(self.minutes)[-minutes:]],
+                'services': [{'name': k, 'connects': v} for k, v in self.services.top(top)],
+                'hosts': [{'name': k, 'connects': v} for k, v in self.hosts.top(top)],
+                'programs': [{'name': k, 'connects': v} for k, v in self.programs.top(top)],
+                'errors': [{'code': k, 'count': v, 'message': self.messages.get(k, '')}
+                           for k, v in self.errors.top(top)],
+                'recent_errors': list(self.samples),
+                'approximate': any(c.dropped for c in counters),
+            }
@@ -0,0 +1,276 @@
+"""
+Install Progress Tracking
+Parses runInstaller and DBCA output into phases and percentages, and
+estimates time remaining from locally recorded phase durations.
+
+History is kept in ~/.oracledba/install-history.json so that repeated
+installs (lab VMs, rebuilds) get increasingly accurate ETAs, and so that
+a phase that suddenly takes twice as long (slow storage) stands out.
+
+Usage (Python):
+    from oracledba.modules.progress import ProgressTracker
+    tracker = ProgressTracker('dbca')
+    for line in output:
+        update = tracker.feed(line)
+        if update:
+            print(update['percent'], update['eta'])
+    tracker.finish(success=True)
+"""
+
+import json
+import re
+import time
+from pathlib import Path
+from statistics import median
+
+HISTORY_FILE = Path.home() / '.oracledba' / 'install-history.json'
+HISTORY_KEEP = 20
+
+# "31% complete" (DBCA) or "...... 31% Done." (older OUI)
+PERCENT_RE = re.compile(r'(\d{1,3})%\s+(complete|done)\b', re.IGNORECASE)
+
+# runInstaller / gridSetup silent mode: "Copy files in progress." / "Copy files successful."
+OUI_PHASE_RE = re.compile(r'^\s*([A-Z][A-Za-z ]+?) (in progress|successful|failed)\.?\s*$')
+
+# Phases in the order runInstaller reports them for a software-only install
+RUNINSTALLER_PHASES = [
+    'Prepare',
+    'Copy files',
+    'Link binaries',
+    'Setup files',
+    'Setup Inventory',
+    'Finish Setup',
+]
+
+# Descriptive lines DBCA prints between percentages (19c General_Purpose)
+DBCA_PHASES = [
+    'Prepare for db operation',
+    'Copying database files',
+    'Creating and starting Oracle instance',
+    'Completing Database Creation',
+    'Creating Pluggable Databases',
+    'Executing Post Configuration Actions',
+]
+
+# Capitalised "-ing" words that start DBCA messages rather than phases
+NOT_DBCA_PHASES = {'Warning', 'During', 'Nothing', 'Something'}
+
+
+def format_duration(seconds):
+    """Format seconds as '4m 05s' (or '42s')"""
+    if seconds is None:
+        return '--'
+    seconds = int(max(0, seconds))
+    mins, secs = divmod(seconds, 60)
+    if mins:
+        return f"{mins}m {secs:02d}s"
+    return f"{secs}s"
+
+
+class ProgressHistory:
+    """Per-operation, per-phase duration history stored as JSON"""
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else HISTORY_FILE
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+            return data if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        """Persist history (best effort: an unwritable HOME is not fatal)"""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix('.tmp')
+            with open(tmp, 'w') as f:
+                json.dump(self.data, f, indent=2)
+            tmp.replace(self.path)
+        except OSError:
+            pass
+
+    def phase_durations(self, operation, phase):
+        """All recorded durations for a phase, oldest first"""
+        return self.data.get(operation, {}).get('phases', {}).get(phase, [])
+
+    def expected(self, operation, phase):
+        """Median recorded duration for a phase, or None without history"""
+        durations = self.phase_durations(operation, phase)
+        return median(durations) if durations else None
+
+    def has_runs(self, operation):
+        return bool(self.data.get(operation, {}).get('runs'))
+
+    def record(self, operation, phases, total):
+        """Append one successful run: phases is a list of (name, seconds)"""
+        op = self.data.setdefault(operation, {'phases': {}, 'runs': []})
+        for name, seconds in phases:
+            series = op['phases'].setdefault(name, [])
+            series.append(round(seconds, 1))
+            del series[:-HISTORY_KEEP]
+        op['runs'].append({'ts': int(time.time()), 'total': round(total, 1)})
+        del op['runs'][:-HISTORY_KEEP]
+
+    def operations(self):
+        return sorted(self.data.keys())
+
+
+class ProgressTracker:
+    """Turns a stream of installer output lines into progress updates"""
+
+    def __init__(self, operation, history=None, clock=time.monotonic):
+        if operation not in ('runinstaller', 'dbca'):
+            raise ValueError(f"Unknown operation: {operation}")
+        self.operation = operation
+        self.history = history if history is not None else ProgressHistory()
+        self.clock = clock
+        self.known_phases = RUNINSTALLER_PHASES if operation == 'runinstaller' else DBCA_PHASES
+        self.started = clock()
+        self.phase = None
+        self.phase_started = self.started
+        self.percent = 0
+        self.completed = []  # [(phase, seconds)]
+        self.recorded = False
+
+    # ------------------------------------------------------------------
+    # Parsing
+    # ------------------------------------------------------------------
+
+    def feed(self, line):
+        """Consume one output line. Returns an update dict when progress moved."""
+        text = line.strip()
+        if not text:
+            return None
+
+        match = PERCENT_RE.search(text)
+        if match:
+            percent = min(int(match.group(1)), 100)
+            if percent == self.percent:
+                return None
+            self.percent = percent
+            return self.snapshot()
+
+        if self.operation == 'runinstaller':
+            match = OUI_PHASE_RE.match(text)
+            if not match:
+                return None
+            name, state = match.group(1).strip(), match.group(2)
+            if state == 'in progress':
+                self._enter_phase(name)
+            elif name == self.phase:
+                self._close_phase()
+                if name in self.known_phases:
+                    done = self.known_phases.index(name) + 1
+                    self.percent = max(self.percent,
+                                       int(100 * done / len(self.known_phases)))
+            return self.snapshot()
+
+        if self._is_dbca_phase(text):
+            self._enter_phase(text.rstrip('.'))
+            return self.snapshot()
+        return None
+
+    def _is_dbca_phase(self, text):
+        if text in self.known_phases:
+            return True
+        # Other DBCA versions add phases; accept short "Doing something" lines
+        words = text.split()
+        first = words[0]
+        return (len(words) > 1 and first[0].isupper() and first.isalpha()
+                and first.endswith('ing') and first not in NOT_DBCA_PHASES
+                and len(text) < 60 and ':' not in text)
+
+    def _enter_phase(self, name):
+        if name == self.phase:
+            return
+        if self.phase:
+            self._close_phase()
+        self.phase = name
+        self.phase_started = self.clock()
+
+    def _close_phase(self):
+        self.completed.append((self.phase, self.clock() - self.phase_started))
+        self.phase = None
+        self.phase_started = self.clock()
+
+    # ------------------------------------------------------------------
+    # Estimation
+    # ------------------------------------------------------------------
+
+    def eta(self):
+        """Estimated seconds remaining, or None when there is nothing to go on"""
+        now = self.clock()
+        elapsed_total = now - self.started
+
+        # History-based: remaining part of the current phase + upcoming phases
+        # (phases never seen in a previous run count as zero)
+        estimate = None
+        if self.history.has_runs(self.operation) and (self.phase or self.completed):
+            done = {name for name, _ in self.completed}
+            upcoming = [p for p in self.known_phases
+                        if p not in done and p != self.phase]
+            estimate = sum(self.history.expected(self.operation, p) or 0.0
+                           for p in upcoming)
+            if self.phase is not None:
+                current = self.history.expected(self.operation, self.phase) or 0.0
+                estimate += max(0.0, current - (now - self.phase_started))
+
+        # Rate-based: extrapolate from the percentage reached so far
+        if estimate is None and 0 < self.percent < 100 and elapsed_total > 0:
+            rate = self.percent / elapsed_total  # percent per second
+            estimate = (100 - self.percent) / rate
+        if self.percent >= 100:
+            estimate = 0.0
+        return estimate
+
+    def phase_rates(self):
+        """Per-phase seconds for this run compared with the historical median
+        (of the previous runs, once finish() has recorded this one)"""
+        rates = []
+        for name, seconds in self.completed:
+            durations = self.history.phase_durations(self.operation, name)
+            if self.recorded:
+                durations = durations[:-1]
+            expected = median(durations) if durations else None
+            rates.append({
+                'phase': name,
+                'seconds': round(seconds, 1),
+                'expected': round(expected, 1) if expected is not None else None,
+                'ratio': round(seconds / expected, 2) if expected else None,
+            })
+        return rates
+
+    def snapshot(self):
+        """Current state as a plain dict (suitable for an event)"""
+        eta = self.eta()
+        return {
+            'operation': self.operation,
+            'phase': self.phase,
+            'percent': self.percent,
+            'elapsed': round(self.clock() - self.started, 1),
+            'eta': round(eta, 1) if eta is not None else None,
+        }
+
+    def finish(self, success):
+        """Close the current phase and, on success, record durations"""
+        if self.phase:
+            self._close_phase()
+        total = self.clock() - self.started
+        if success and self.completed:
+            self.history.record(self.operation, self.completed, total)
+            self.history.save()
+            self.recorded = True
+        return total
+
+
+def render_bar(update, width=30):
+    """Render an update as '[#######.......]  45%  phase  ETA 3m 10s'"""
+    percent = update.get('percent') or 0
+    filled = int(width * percent / 100)
+    bar = '█' * filled + '░' * (width - filled)
+    phase = update.get('phase') or ''
+    return f"  [{bar}] {percent:3d}%  {phase}  ETA {format_duration(update.get('eta'))}"
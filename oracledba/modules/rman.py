@@ -2,41 +2,243 @@
 RMAN Manager - Backup and Recovery Management
 """
 
-import subprocess
+import json
+import math
+import os
+import sqlite3
+import time
 from pathlib import Path
 from rich.console import Console
+from rich.table import Table
 from rich import print as rprint
 from datetime import datetime
 
 console = Console()
 
+GIB = 1024 ** 3
+TUNING_FILE = Path.home() / '.oracledba' / 'rman-tuning.json'
+DEFAULT_BACKUP_DEST = '/u01/backup'
+STRATEGY_FILE = Path.home() / '.oracledba' / 'rman-strategy.json'
+STRATEGIES = ('backupset', 'incremental-forever')
+FOREVER_TAG = 'ORADBA_INCR_FOREVER'
+
+STRATEGY_QUERIES = {
+    'bct': "SELECT STATUS, FILENAME, BYTES FROM V$BLOCK_CHANGE_TRACKING",
+    'fra': "SELECT NAME, SPACE_LIMIT, SPACE_USED FROM V$RECOVERY_FILE_DEST",
+    'copy': ("SELECT COUNT(*) AS FILES, SUM(BLOCKS * BLOCK_SIZE) AS BYTES, "
+             "TO_CHAR(MIN(CHECKPOINT_TIME),'YYYY-MM-DD HH24:MI:SS') AS CHECKPOINT_TIME "
+             "FROM V$DATAFILE_COPY WHERE TAG = '{tag}' AND STATUS = 'A'"),
+}
+
+# Per-channel datafile read rate (MB/s on one core) and typical size ratio of
+# each RMAN compression algorithm; LOW/MEDIUM/HIGH need Advanced Compression
+COMPRESSION_PROFILES = {
+    'NONE': (400, 1.0),
+    'LOW': (200, 2.0),
+    'MEDIUM': (90, 2.8),
+    'BASIC': (40, 3.2),
+    'HIGH': (15, 3.8),
+}
+ACO_ALGORITHMS = ('LOW', 'MEDIUM', 'HIGH')
+MAX_CHANNELS = 16
+ARCHIVE_CHANNELS = 4
+
+
+def _section_size(datafiles, channels):
+    """Section size in bytes so no single large file serializes the backup, or None"""
+    if not datafiles:
+        return None
+    largest = max(df['bytes'] for df in datafiles)
+    total = sum(df['bytes'] for df in datafiles)
+    bigfile = any(df.get('bigfile') for df in datafiles)
+    if largest < GIB or not (bigfile or largest > total / channels):
+        return None
+    # two sections per channel so channels that finish early pick up work
+    return max(1, math.ceil(largest / (2 * channels) / GIB)) * GIB
+
+
+def recommend_rman_settings(cpu_count, datafiles, dest_mbps, allow_aco=True,
+                            max_channels=MAX_CHANNELS):
+    """Pick channels, compression, section size and FILESPERSET for a full backup.
+
+    ``datafiles`` is a list of {'file', 'bytes', 'bigfile'}; ``dest_mbps`` the
+    backup destination's sequential write rate. Each channel costs about one
+    core, a quarter of the CPUs stay free for the workload. Every algorithm
+    and channel count is scored by its estimated duration: input rate is
+    the lowest of CPU (channels x per-core rate), destination (write rate x
+    compression ratio) and the largest unsplit file on one channel.
+    Within 5% of the fastest, higher compression then fewer channels win.
+    """
+    cpu_count = max(1, int(cpu_count or 1))
+    budget = max(1, min(max_channels, cpu_count - max(1, cpu_count // 4) if cpu_count > 1 else 1))
+    total_mb = sum(df['bytes'] for df in datafiles) / 1048576 or 1.0
+    algorithms = [a for a in COMPRESSION_PROFILES if allow_aco or a not in ACO_ALGORITHMS]
+
+    candidates = []
+    for algorithm in algorithms:
+        rate, ratio = COMPRESSION_PROFILES[algorithm]
+        for channels in range(1, budget + 1):
+            section = _section_size(datafiles, channels)
+            units = [section if section and df['bytes'] > section else df['bytes']
+                     for df in datafiles] or [0]
+            parallel = min(channels, sum(
+                math.ceil(df['bytes'] / section) if section and df['bytes'] > section else 1
+                for df in datafiles) or 1)
+            limits = {'cpu': parallel * rate, 'destination': dest_mbps * ratio}
+            throughput = min(limits.values())
+            seconds = max(total_mb / throughput, max(units) / 1048576 / rate)
+            bottleneck = ('largest file' if max(units) / 1048576 / rate >= total_mb / throughput
+                          else min(limits, key=limits.get))
+            candidates.append({'channels': channels, 'compression': algorithm,
+                               'section_size': section, 'seconds': seconds,
+                               'throughput_mbps': round(total_mb / seconds, 1),
+                               'bottleneck': bottleneck, 'ratio': ratio})
+
+    fastest = min(c['seconds'] for c in candidates)
+    best = min((c for c in candidates if c['seconds'] <= fastest * 1.05),
+               key=lambda c: (-c['ratio'], c['channels']))
+    channels = best['channels']
+    nfiles = len(datafiles)
+    filesperset = max(1, min(64, math.ceil(nfiles / (2 * channels)))) if nfiles else None
+    section = best['section_size']
+    return {
+        'channels': channels,
+        'compression': best['compression'],
+        'section_size': f"{section // GIB}G" if section else None,
+        'filesperset': filesperset,
+        'estimated_minutes': round(best['seconds'] / 60, 1),
+        'throughput_mbps': best['throughput_mbps'],
+        'bottleneck': best['bottleneck'],
+        'inputs': {'cpu_count': cpu_count, 'datafiles': nfiles,
+                   'database_gb': round(total_mb / 1024, 1), 'dest_mbps': round(dest_mbps, 1),
+                   'largest_file_gb': round(max((df['bytes'] for df in datafiles), default=0) / GIB, 1),
+                   'bigfiles': sum(1 for df in datafiles if df.get('bigfile'))},
+    }
+
+
+def measure_write_throughput(directory, sample_mb=256, block_mb=4):
+    """Sequential write rate of ``directory`` in MB/s (write + fsync of a sample file)"""
+    path = Path(directory) / f'.oradba-throughput-{os.getpid()}'
+    block = os.urandom(block_mb * 1048576)          # incompressible, like a backup piece
+    blocks = max(1, sample_mb // block_mb)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        start = time.monotonic()
+        for _ in range(blocks):
+            os.write(fd, block)
+        os.fsync(fd)
+        elapsed = max(time.monotonic() - start, 1e-6)
+    finally:
+        os.close(fd)
+        path.unlink()
+    return blocks * block_mb / elapsed
+
+
+def _format_eta(seconds):
+    if seconds is None:
+        return '-'
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes}:{secs:02d}"
+
+
+def load_tuning(path=None):
+    """Settings saved by `oradba rman tune`, or {}"""
+    try:
+        with open(path or TUNING_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_tuning(settings, path=None):
+    path = Path(path or TUNING_FILE)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix('.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(settings, f, indent=2)
+    os.replace(tmp, path)
+
+
+def load_strategy(path=None):
+    """Backup strategy saved by `oradba rman strategy`; plain backupsets by default"""
+    return {'mode': 'backupset', 'window_days': 0, 'tag': FOREVER_TAG,
+            **load_tuning(path or STRATEGY_FILE)}
+
+
+def incremental_forever_commands(tag=FOREVER_TAG, window_days=0, section_size=None,
+                                 archive_options=''):
+    """RMAN script for one run of the incremental-forever strategy.
+
+    RECOVER COPY first rolls the level-0 image copy forward with the level 1
+    backups taken so far, keeping it ``window_days`` behind so the copy plus
+    the newer level 1s cover that recovery window. The next level 1 is then
+    taken for it; on the first run there is no copy yet and BACKUP ... FOR
+    RECOVER OF COPY creates the level-0 copy (in the FRA) instead.
+    """
+    until = f" UNTIL TIME 'SYSDATE-{int(window_days)}'" if window_days else ''
+    section = f" SECTION SIZE {section_size}" if section_size else ''
+    return f"""
+    RECOVER COPY OF DATABASE WITH TAG '{tag}'{until};
+    BACKUP INCREMENTAL LEVEL 1{section} FOR RECOVER OF COPY WITH TAG '{tag}' DATABASE;
+    BACKUP {archive_options} ARCHIVELOG ALL NOT BACKED UP DELETE INPUT;
+    """
+
+
+def archive_commands(tag, channels=0, dest=None, options='AS COMPRESSED BACKUPSET'):
+    """RMAN script backing up the archived logs not yet backed up, then
+    deleting the backed-up logs (subject to the archivelog deletion policy).
+
+    With ``dest`` the pieces are written there on ``channels`` explicitly
+    allocated disk channels, so a backup of logs sitting in the FRA frees
+    FRA space; RMAN spreads the logs over the channels. Without it the
+    configured channels (PARALLELISM from `oradba rman tune`) are used.
+    """
+    backup = f"BACKUP {options} TAG '{tag}' ARCHIVELOG ALL NOT BACKED UP 1 TIMES;"
+    delete = "DELETE NOPROMPT ARCHIVELOG ALL BACKED UP 1 TIMES TO DEVICE TYPE DISK;"
+    if not dest:
+        return f"""
+    {backup}
+    {delete}
+    """
+    allocate = '\n'.join(f"    ALLOCATE CHANNEL arch{n} DEVICE TYPE DISK FORMAT '{dest.rstrip('/')}/arch_%d_%U';"
+                         for n in range(1, max(1, channels) + 1))
+    return f"""
+    RUN {{
+{allocate}
+    {backup}
+    {delete}
+    }}
+    """
+
 
 class RMANManager:
-    def __init__(self):
+    def __init__(self, client=None):
+        from ..utils.oracle_client import OracleClient
         self.scripts_dir = Path(__file__).parent.parent / "scripts"
+        self.client = client or OracleClient()
+        self.tuning = load_tuning()
+        self.strategy = load_strategy()
     
     def _run_rman(self, commands):
         """Execute RMAN commands"""
-        try:
-            cmd = f"rman target / << EOF\n{commands}\nEOF"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            return result.returncode == 0, result.stdout, result.stderr
-        except Exception as e:
-            return False, "", str(e)
+        return self.client.run_rman(commands)
     
     def setup(self, retention_days=7, compression=True):
-        """Configure RMAN"""
+        """Configure RMAN (channels and compression from `oradba rman tune` when saved)"""
         console.print("\n[bold cyan]Configuring RMAN[/bold cyan]\n")
         
+        parallelism = self.tuning.get('channels', 2)
+        algorithm = self.tuning.get('compression', 'MEDIUM')
         commands = f"""
         CONFIGURE RETENTION POLICY TO RECOVERY WINDOW OF {retention_days} DAYS;
         CONFIGURE CONTROLFILE AUTOBACKUP ON;
         CONFIGURE CONTROLFILE AUTOBACKUP FORMAT FOR DEVICE TYPE DISK TO '/u01/backup/cf_%F';
-        CONFIGURE DEVICE TYPE DISK PARALLELISM 2 BACKUP TYPE TO BACKUPSET;
+        CONFIGURE DEVICE TYPE DISK PARALLELISM {parallelism} BACKUP TYPE TO BACKUPSET;
         """
         
-        if compression:
-            commands += "CONFIGURE COMPRESSION ALGORITHM 'MEDIUM' AS OF RELEASE DEFAULT OPTIMIZE FOR LOAD TRUE;\n"
+        if compression and algorithm != 'NONE':
+            commands += f"CONFIGURE COMPRESSION ALGORITHM '{algorithm}' AS OF RELEASE 'DEFAULT' OPTIMIZE FOR LOAD TRUE;\n"
         
         commands += "SHOW ALL;"
         
@@ -50,45 +252,626 @@ class RMANManager:
             rprint(f"[red]✗ RMAN configuration failed:[/red] {stderr}")
             return False
     
-    def backup(self, backup_type='full', tag=None):
-        """Perform RMAN backup"""
-        console.print(f"\n[bold cyan]Starting {backup_type} backup[/bold cyan]\n")
-        
-        if not tag:
-            tag = f"{backup_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    def _backup_options(self, datafiles=True):
+        """AS ... BACKUPSET plus SECTION SIZE / FILESPERSET from the saved tuning"""
+        as_clause = ("AS BACKUPSET" if self.tuning.get('compression') == 'NONE'
+                     else "AS COMPRESSED BACKUPSET")
+        options = [as_clause]
+        if datafiles and self.tuning.get('section_size'):
+            options.append(f"SECTION SIZE {self.tuning['section_size']}")
+        if self.tuning.get('filesperset'):
+            options.append(f"FILESPERSET {self.tuning['filesperset']}")
+        return ' '.join(options)
+    
+    def backup_commands(self, backup_type, tag, pdb=None, dest=None):
+        """RMAN script for a backup type, or None if the type is unknown.
         
+        'incremental' follows the saved strategy: a level 1 backupset, or with
+        incremental-forever a roll-forward of the image copy plus the next level 1.
+        With ``pdb`` only that pluggable database is backed up (archived logs
+        belong to the CDB, so 'archive' ignores it). ``dest`` writes the pieces
+        of an 'archive' backup outside the configured destination.
+        """
+        target = f"PLUGGABLE DATABASE {pdb}" if pdb else "DATABASE"
         if backup_type == 'full':
-            commands = f"""
-            BACKUP AS COMPRESSED BACKUPSET 
+            return f"""
+            BACKUP {self._backup_options()}
             TAG '{tag}'
-            DATABASE PLUS ARCHIVELOG DELETE INPUT;
+            {target} PLUS ARCHIVELOG DELETE INPUT;
             """
-        elif backup_type == 'incremental':
-            commands = f"""
-            BACKUP AS COMPRESSED BACKUPSET 
+        if backup_type == 'incremental' and not pdb and self.strategy['mode'] == 'incremental-forever':
+            return incremental_forever_commands(self.strategy['tag'], self.strategy['window_days'],
+                                                self.tuning.get('section_size'),
+                                                self._backup_options(datafiles=False))
+        if backup_type == 'incremental':
+            return f"""
+            BACKUP {self._backup_options()}
             INCREMENTAL LEVEL 1 
             TAG '{tag}'
-            DATABASE PLUS ARCHIVELOG DELETE INPUT;
-            """
-        elif backup_type == 'archive':
-            commands = f"""
-            BACKUP AS COMPRESSED BACKUPSET 
-            TAG '{tag}'
-            ARCHIVELOG ALL DELETE INPUT;
+            {target} PLUS ARCHIVELOG DELETE INPUT;
             """
-        else:
+        if backup_type == 'archive':
+            return archive_commands(tag, self.tuning.get('channels', ARCHIVE_CHANNELS), dest,
+                                    self._backup_options(datafiles=False))
+        return None
+    
+    def backup(self, backup_type='full', tag=None, monitor=True):
+        """Perform RMAN backup (with live per-channel progress unless ``monitor`` is False)"""
+        console.print(f"\n[bold cyan]Starting {backup_type} backup[/bold cyan]\n")
+        
+        if not tag:
+            tag = f"{backup_type}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        
+        commands = self.backup_commands(backup_type, tag)
+        if commands is None:
             rprint(f"[red]Unknown backup type:[/red] {backup_type}")
             return False
+        if backup_type == 'incremental':
+            bct = self.strategy_status().get('bct')
+            if bct and not bct['enabled']:
+                rprint("[yellow]Block change tracking is off: the level 1 reads every block "
+                       "(enable it with `oradba rman strategy`)[/yellow]")
         
-        success, stdout, stderr = self._run_rman(commands)
+        if monitor:
+            success, stdout, stderr = self._run_rman_monitored(commands)
+        else:
+            success, stdout, stderr = self._run_rman(commands)
         
         if success:
             rprint(f"[green]✓[/green] {backup_type} backup completed successfully")
+            self._refresh_catalog()
             return True
         else:
             rprint(f"[red]✗ Backup failed:[/red] {stderr}")
             return False
     
+    def _run_rman_monitored(self, commands, interval=2.0):
+        """_run_rman while a second session polls progress into rich progress bars"""
+        import threading
+        from .rmanmonitor import RmanMonitor
+
+        result = {}
+        done = threading.Event()
+        
+        def run():
+            try:
+                result['r'] = self._run_rman(commands)
+            finally:
+                done.set()
+        
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        monitor = RmanMonitor(self.client)
+        try:
+            self._watch_progress(monitor, interval, stop=done)
+        except RuntimeError as e:
+            rprint(f"[yellow]Progress unavailable:[/yellow] {e}")
+        worker.join()
+        for rec in monitor.record_finished(days=1):
+            rprint(f"[dim]{rec['input_type']}: {rec['input_gb']} GB in {int(rec['elapsed_seconds'])}s, "
+                   f"{rec['input_mbps']} MB/s in, {rec['output_mbps']} MB/s out[/dim]")
+        return result['r']
+    
+    def _watch_progress(self, monitor, interval, **watch_args):
+        """monitor.watch() rendered as an overall bar plus one bar per channel"""
+        from rich.progress import BarColumn, Progress, TaskProgressColumn, TextColumn
+        
+        with Progress(TextColumn("{task.description}"), BarColumn(), TaskProgressColumn(),
+                      TextColumn("{task.fields[mbps]:>8.1f} MB/s"), TextColumn("ETA {task.fields[eta]}"),
+                      console=console) as progress:
+            overall = progress.add_task("Waiting for RMAN...", total=100, mbps=0.0, eta='-')
+            tasks = {}
+            
+            def show(snap):
+                label = (f"{snap['job']['operation']} {snap['job']['object_type'] or ''}".strip()
+                         if snap['job'] else "Backup" if snap['running'] else "Waiting for RMAN...")
+                progress.update(overall, description=label, completed=snap['percent'] or 0,
+                                mbps=snap['mbps'], eta=_format_eta(snap['eta_seconds']))
+                active = {ch['sid'] for ch in snap['channels']}
+                for ch in snap['channels']:
+                    if ch['sid'] not in tasks:
+                        tasks[ch['sid']] = progress.add_task('', total=100, mbps=0.0, eta='-')
+                    name = Path(ch['file']).name if ch['file'] else ch['operation'].replace('RMAN: ', '')
+                    progress.update(tasks[ch['sid']], description=f"  SID {ch['sid']} {name}",
+                                    completed=ch['percent'], mbps=ch['mbps'],
+                                    eta=_format_eta(ch['eta_seconds']), visible=True)
+                for sid, task in tasks.items():
+                    if sid not in active:
+                        progress.update(task, visible=False)
+            
+            return monitor.watch(interval, on_snapshot=show, **watch_args)
+    
+    def monitor(self, interval=2.0, wait=30):
+        """Attach to a running backup and show its progress until it ends"""
+        from .rmanmonitor import RmanMonitor
+        console.print("\n[bold cyan]Monitoring RMAN[/bold cyan]\n")
+        monitor = RmanMonitor(self.client)
+        try:
+            self._watch_progress(monitor, interval, wait_for_start=wait)
+        except RuntimeError as e:
+            rprint(f"[red]✗ Cannot poll RMAN progress:[/red] {e}")
+            return False
+        return True
+    
+    def show_throughput(self, limit=20):
+        """Throughput of recent backup jobs, with slow runs flagged against their type's median"""
+        from .rmanmonitor import RmanMonitor
+        monitor = RmanMonitor(self.client)
+        monitor.record_finished(days=31)
+        records = monitor.history(limit)
+        trend = monitor.trend()
+        slow_keys = {s['session_key'] for t in trend.values() for s in t['slow']}
+        
+        table = Table(title="RMAN Backup Throughput", show_header=True, header_style="bold magenta")
+        table.add_column("Start", style="cyan")
+        table.add_column("Type")
+        table.add_column("Status")
+        table.add_column("Input GB", justify="right")
+        table.add_column("Elapsed", justify="right")
+        table.add_column("In MB/s", justify="right")
+        table.add_column("Out MB/s", justify="right")
+        table.add_column("Peak MB/s", justify="right")
+        for rec in records:
+            rate = f"[red]{rec['input_mbps']}[/red]" if rec['session_key'] in slow_keys else str(rec['input_mbps'])
+            table.add_row(rec['start_time'] or '', rec['input_type'] or '', rec['status'] or '',
+                          f"{rec['input_gb']:.1f}", _format_eta(int(rec['elapsed_seconds'])), rate,
+                          str(rec['output_mbps']), str(rec.get('peak_mbps', '-')))
+        console.print(table)
+        for input_type, t in trend.items():
+            line = f"{input_type}: {t['runs']} runs, median {t['median_mbps']} MB/s"
+            if t['slow']:
+                line += f", [red]{len(t['slow'])} slow[/red]"
+            console.print(line)
+        return True
+    
+    def _datafiles(self):
+        ok, rows, error = self.client.query(
+            "SELECT d.FILE#, d.BYTES, t.BIGFILE FROM V$DATAFILE d "
+            "JOIN V$TABLESPACE t ON t.TS# = d.TS# AND t.CON_ID = d.CON_ID")
+        if not ok:
+            raise RuntimeError(error or 'V$DATAFILE query failed')
+        return [{'file': int(r['FILE#']), 'bytes': int(r['BYTES']),
+                 'bigfile': r.get('BIGFILE') == 'YES'} for r in rows]
+    
+    def _backup_dest(self):
+        """FRA if set and local, else the default backup directory"""
+        ok, rows, _ = self.client.query("SELECT NAME FROM V$RECOVERY_FILE_DEST")
+        if ok and rows and rows[0].get('NAME', '').startswith('/') and Path(rows[0]['NAME']).is_dir():
+            return rows[0]['NAME']
+        return DEFAULT_BACKUP_DEST
+    
+    def tune(self, dest=None, dest_mbps=None, sample_mb=256, allow_aco=True, apply=True):
+        """Size channels, section size and compression from CPUs, datafiles and destination speed"""
+        console.print("\n[bold cyan]Tuning RMAN backup throughput[/bold cyan]\n")
+        
+        try:
+            datafiles = self._datafiles()
+        except RuntimeError as e:
+            rprint(f"[red]✗ Cannot read datafiles:[/red] {e}")
+            return None
+        
+        dest = dest or self._backup_dest()
+        if dest_mbps is None:
+            try:
+                console.print(f"Measuring write throughput of {dest} ({sample_mb} MB)...")
+                dest_mbps = measure_write_throughput(dest, sample_mb)
+            except OSError as e:
+                rprint(f"[red]✗ Cannot measure {dest}:[/red] {e} (pass --dest-mbps)")
+                return None
+        
+        rec = recommend_rman_settings(os.cpu_count(), datafiles, dest_mbps, allow_aco=allow_aco)
+        rec['dest'] = dest
+        rec['tuned_at'] = datetime.now().isoformat(timespec='seconds')
+        
+        inputs = rec['inputs']
+        table = Table(title="RMAN Tuning", show_header=True, header_style="bold magenta")
+        table.add_column("Setting", style="cyan")
+        table.add_column("Value", justify="right")
+        table.add_column("Based on", style="dim")
+        table.add_row("Channels", str(rec['channels']), f"{inputs['cpu_count']} CPUs")
+        table.add_row("Compression", rec['compression'],
+                      f"{inputs['dest_mbps']} MB/s to {dest}" + ("" if allow_aco else ", no ACO"))
+        table.add_row("Section size", rec['section_size'] or "-",
+                      f"largest file {inputs['largest_file_gb']} GB, {inputs['bigfiles']} bigfile(s)")
+        table.add_row("Filesperset", str(rec['filesperset'] or "-"), f"{inputs['datafiles']} datafiles")
+        table.add_row("Estimated full", f"{rec['estimated_minutes']} min",
+                      f"{inputs['database_gb']} GB at {rec['throughput_mbps']} MB/s, "
+                      f"bound by {rec['bottleneck']}")
+        console.print(table)
+        
+        if not apply:
+            return rec
+        
+        backup_type = "BACKUPSET" if rec['compression'] == 'NONE' else "COMPRESSED BACKUPSET"
+        commands = f"CONFIGURE DEVICE TYPE DISK PARALLELISM {rec['channels']} BACKUP TYPE TO {backup_type};\n"
+        if rec['compression'] != 'NONE':
+            commands += (f"CONFIGURE COMPRESSION ALGORITHM '{rec['compression']}' "
+                         f"AS OF RELEASE 'DEFAULT' OPTIMIZE FOR LOAD TRUE;\n")
+        success, stdout, stderr = self._run_rman(commands)
+        if not success:
+            rprint(f"[red]✗ RMAN configuration failed:[/red] {stderr or stdout}")
+            return None
+        save_tuning(rec)
+        self.tuning = rec
+        rprint(f"[green]✓[/green] RMAN configured; SECTION SIZE/FILESPERSET saved to {TUNING_FILE}")
+        return rec
+    
+    def strategy_status(self):
+        """Saved strategy plus block change tracking, FRA and image copy state"""
+        tag = self.strategy['tag'].replace("'", "''")
+        queries = {name: sql.replace('{tag}', tag) for name, sql in STRATEGY_QUERIES.items()}
+        ok, results, errors = self.client.query_many(queries)
+        status = {**self.strategy, 'bct': None, 'fra': None, 'copy': None,
+                  'errors': errors if ok else {'sqlplus': next(iter(errors.values()), '')}}
+        if not ok:
+            return status
+        if results.get('bct'):
+            row = results['bct'][0]
+            status['bct'] = {'enabled': row.get('STATUS') == 'ENABLED',
+                             'file': row.get('FILENAME') or None,
+                             'mb': round(int(row.get('BYTES') or 0) / 1048576, 1)}
+        fra = (results.get('fra') or [{}])[0]
+        if fra.get('NAME'):
+            status['fra'] = {'name': fra['NAME'],
+                             'limit_gb': round(int(fra.get('SPACE_LIMIT') or 0) / GIB, 1),
+                             'used_gb': round(int(fra.get('SPACE_USED') or 0) / GIB, 1)}
+        copy = (results.get('copy') or [{}])[0]
+        if int(copy.get('FILES') or 0):
+            status['copy'] = {'files': int(copy['FILES']),
+                              'gb': round(int(copy.get('BYTES') or 0) / GIB, 1),
+                              'checkpoint_time': copy.get('CHECKPOINT_TIME')}
+        return status
+    
+    def enable_block_change_tracking(self, bct_file=None):
+        """Enable BCT (in DB_CREATE_FILE_DEST unless ``bct_file`` is given)"""
+        using = f" USING FILE ''{bct_file}''" if bct_file else ""
+        success, stdout, stderr = self._run_rman(
+            f'SQL "ALTER DATABASE ENABLE BLOCK CHANGE TRACKING{using}";')
+        if not success:
+            raise RuntimeError(f"Cannot enable block change tracking: {stderr or stdout}")
+    
+    def apply_strategy(self, mode, window_days=0, bct_file=None):
+        """Switch incremental backups between level 1 backupsets and incremental-forever.
+        
+        Incremental-forever needs an FRA for the image copy and turns on block
+        change tracking, so each level 1 reads only the blocks changed since
+        the previous one. Raises RuntimeError when the database is not ready.
+        """
+        if mode not in STRATEGIES:
+            raise RuntimeError(f"Unknown strategy: {mode}")
+        status = self.strategy_status()
+        if status['errors'].get('sqlplus'):
+            raise RuntimeError(f"Cannot query the database: {status['errors']['sqlplus']}")
+        
+        enabled_bct = False
+        if mode == 'incremental-forever':
+            if not status['fra']:
+                raise RuntimeError("Incremental-forever keeps the image copy in the FRA: "
+                                   "set db_recovery_file_dest first")
+            if not (status['bct'] and status['bct']['enabled']):
+                self.enable_block_change_tracking(bct_file)
+                enabled_bct = True
+        
+        strategy = {**self.strategy, 'mode': mode, 'window_days': int(window_days),
+                    'updated_at': datetime.now().isoformat(timespec='seconds')}
+        save_tuning(strategy, STRATEGY_FILE)
+        self.strategy = strategy
+        return {**strategy, 'enabled_bct': enabled_bct}
+    
+    def set_strategy(self, mode, window_days=0, bct_file=None):
+        """apply_strategy() with console output; returns the strategy or None"""
+        try:
+            strategy = self.apply_strategy(mode, window_days, bct_file)
+        except RuntimeError as e:
+            rprint(f"[red]✗ {e}[/red]")
+            return None
+        if strategy['enabled_bct']:
+            rprint("[green]✓[/green] Block change tracking enabled")
+        rprint(f"[green]✓[/green] Incremental backups now use the {mode} strategy")
+        return strategy
+    
+    def show_strategy(self):
+        """Print the backup strategy with BCT, FRA and image copy state"""
+        status = self.strategy_status()
+        table = Table(title="RMAN Backup Strategy", show_header=True, header_style="bold magenta")
+        table.add_column("Item", style="cyan")
+        table.add_column("Value")
+        table.add_row("Incremental mode", status['mode'])
+        if status['mode'] == 'incremental-forever':
+            table.add_row("Image copy tag", status['tag'])
+            table.add_row("Copy lags by", f"{status['window_days']} day(s)")
+        bct = status['bct']
+        table.add_row("Block change tracking",
+                      "unknown" if bct is None else
+                      f"[green]ENABLED[/green] {bct['file'] or ''} ({bct['mb']} MB)" if bct['enabled']
+                      else "[yellow]DISABLED[/yellow]")
+        fra = status['fra']
+        table.add_row("Fast recovery area",
+                      f"{fra['name']} ({fra['used_gb']}/{fra['limit_gb']} GB)" if fra else "-")
+        copy = status['copy']
+        table.add_row("Level-0 image copy",
+                      f"{copy['files']} files, {copy['gb']} GB, as of {copy['checkpoint_time']}"
+                      if copy else "-")
+        console.print(table)
+        for name, error in status['errors'].items():
+            rprint(f"[red]{name}:[/red] {error}")
+        return not status['errors']
+    
+    def _refresh_catalog(self):
+        """Pull the new backup records into the local catalog (best effort)"""
+        from .backupcatalog import BackupCatalog
+        try:
+            return BackupCatalog(self.client).refresh()
+        except (RuntimeError, OSError, sqlite3.Error):
+            return None
+    
+    def sync_catalog(self, limit=10):
+        """Refresh the local backup catalog and show the newest backup sets"""
+        from .backupcatalog import BackupCatalog
+        catalog = BackupCatalog(self.client)
+        try:
+            stats = catalog.refresh()
+        except (RuntimeError, sqlite3.Error) as e:
+            rprint(f"[red]✗ Catalog sync failed:[/red] {e}")
+            return False
+        new = ', '.join(f"{n} {view}" for view, n in stats['new'].items() if n) or 'no new records'
+        rprint(f"[green]✓[/green] Catalog synced: {new}, {stats['updated']} status change(s)")
+        
+        table = Table(title="Recent Backup Sets", show_header=True, header_style="bold magenta")
+        table.add_column("Completed", style="cyan")
+        table.add_column("Kind")
+        table.add_column("Tag")
+        table.add_column("GB", justify="right")
+        table.add_column("Status")
+        for b in catalog.recent_backups(limit):
+            table.add_row(b['completion_time'] or '', b['kind'], b['tag'] or '', f"{b['gb']:.2f}",
+                          b['status'] if b['status'] == 'AVAILABLE' else f"[yellow]{b['status']}[/yellow]")
+        console.print(table)
+        return True
+    
+    def restore_plan(self, until=None, refresh=True):
+        """Show the backup pieces and archived logs needed to recover to ``until``
+        (relative like 2h or a timestamp; default now)"""
+        from .alertlog import parse_time
+        from .backupcatalog import BackupCatalog
+        try:
+            until = parse_time(until)
+        except ValueError as e:
+            rprint(f"[red]✗ {e}[/red]")
+            return None
+        catalog = BackupCatalog(self.client)
+        if refresh and self._refresh_catalog() is None:
+            rprint("[yellow]Catalog not refreshed; planning from the last sync[/yellow]")
+        plan = catalog.restore_plan(until)
+        
+        console.print(f"\n[bold cyan]Restore plan to {plan['until']}[/bold cyan]\n")
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Piece", style="cyan")
+        table.add_column("Kind")
+        table.add_column("Tag")
+        table.add_column("Completed")
+        table.add_column("GB", justify="right")
+        for p in plan['pieces']:
+            table.add_row(p['handle'] or '', p['kind'], p['tag'] or '', p['completion_time'] or '',
+                          f"{p['bytes'] / GIB:.2f}")
+        for c in plan['copies']:
+            table.add_row(c['name'], f"COPY (file {c['file']})", c['tag'] or '', c['checkpoint_time'] or '',
+                          f"{c['bytes'] / GIB:.2f}")
+        console.print(table)
+        logs = plan['archived_logs']
+        console.print(f"{len(plan['datafiles'])} datafiles from SCN {plan['start_scn']}, "
+                      f"{logs['from_backup']} archived logs from backup, {len(logs['on_disk'])} on disk, "
+                      f"{plan['total_gb']} GB to read")
+        for gap in plan['missing']:
+            rprint(f"[red]✗ Missing:[/red] {gap}")
+        if plan['restorable']:
+            rprint("[green]✓[/green] Recoverable from the catalogued backups")
+        return plan
+    
+    def backup_trend(self, days=30):
+        """Show backup volume per day and kind from the local catalog"""
+        from .backupcatalog import BackupCatalog
+        catalog = BackupCatalog(self.client)
+        self._refresh_catalog()
+        trend = catalog.size_trend(days)
+        
+        table = Table(title=f"Backup Volume, last {days} days", show_header=True,
+                      header_style="bold magenta")
+        table.add_column("Day", style="cyan")
+        table.add_column("Kind")
+        table.add_column("Sets", justify="right")
+        table.add_column("GB", justify="right")
+        for entry in trend['daily']:
+            table.add_row(entry['day'], entry['kind'], str(entry['sets']), f"{entry['gb']:.2f}")
+        console.print(table)
+        for kind, t in trend['summary'].items():
+            console.print(f"{kind}: {t['days']} day(s), {t['total_gb']} GB total, "
+                          f"{t['avg_gb']} GB/day, {t['first_gb']} -> {t['last_gb']} GB")
+        return trend
+
+    def _scheduler(self):
+        from .backupscheduler import BackupScheduler
+        return BackupScheduler(client=self.client)
+
+    def show_schedule(self, history=10):
+        """Show backup policies, queued and running runs, and recent results"""
+        status = self._scheduler().status(history)
+        settings = status['settings']
+        console.print(f"\n[bold cyan]Backup Schedule[/bold cyan]  max concurrent: {settings['max_concurrent']}, "
+                      f"I/O windows: {', '.join(settings['windows']) or 'any time'}\n")
+        table = Table(show_header=True, header_style="bold magenta")
+        table.add_column("Policy", style="cyan")
+        table.add_column("Schedule")
+        table.add_column("Next run")
+        table.add_column("Window")
+        table.add_column("Catch-up")
+        table.add_column("Last result")
+        for p in status['policies']:
+            last = p.get('last_result') or {}
+            table.add_row(p['id'] if p.get('enabled', True) else f"{p['id']} (disabled)",
+                          p['schedule'], p['next_run'] or '-', 'yes' if p.get('window') else 'no',
+                          'yes' if p.get('catch_up', True) else 'no',
+                          f"{last['state']} {last['ended']}" if last else '-')
+        console.print(table)
+        for run in status['running']:
+            console.print(f"[green]running[/green] {run['id']} {run['database']} {run['type']} "
+                          f"since {run['started']} (job {run['job_id']})")
+        for run in status['queue']:
+            console.print(f"[yellow]queued[/yellow]  {run['id']} {run['database']} {run['type']} "
+                          f"({run['reason']}) since {run['queued_at']}")
+        for run in status['history']:
+            color = 'green' if run['state'] == 'done' else 'red'
+            console.print(f"[{color}]{run['state']:<9}[/{color}] {run['id']} {run['database']} "
+                          f"{run['type']} ended {run['ended']}")
+        return status
+
+    def add_schedule(self, database, backup_type, schedule, catch_up=True, window=None):
+        """Add or replace the policy for a database and backup type"""
+        try:
+            policy = self._scheduler().add_policy(database, backup_type, schedule,
+                                                  catch_up=catch_up, window=window)
+        except ValueError as e:
+            rprint(f"[red]✗ {e}[/red]")
+            return None
+        rprint(f"[green]✓[/green] Policy {policy['id']}: {backup_type} backup of {policy['database']} "
+               f"at '{schedule}'")
+        return policy
+
+    def remove_schedule(self, policy_id):
+        if self._scheduler().remove_policy(policy_id):
+            rprint(f"[green]✓[/green] Policy {policy_id} removed")
+            return True
+        rprint(f"[red]✗ No policy {policy_id}[/red]")
+        return False
+
+    def configure_scheduler(self, max_concurrent=None, windows=None):
+        """Set the global RMAN job limit and the I/O windows for scheduled runs"""
+        try:
+            settings = self._scheduler().configure(max_concurrent, windows)
+        except ValueError as e:
+            rprint(f"[red]✗ {e}[/red]")
+            return None
+        rprint(f"[green]✓[/green] max concurrent: {settings['max_concurrent']}, "
+               f"I/O windows: {', '.join(settings['windows']) or 'any time'}")
+        return settings
+
+    def run_scheduler(self, interval=None):
+        """Run the scheduler in the foreground until interrupted"""
+        from .backupscheduler import TICK_SECONDS
+        scheduler = self._scheduler()
+        if not scheduler.acquire():
+            rprint("[red]✗ Another backup scheduler is already running (web server or CLI)[/red]")
+            return False
+        rprint(f"[green]✓[/green] Backup scheduler running (state: {scheduler.state_file}); Ctrl+C to stop")
+        try:
+            scheduler.run_forever(interval or TICK_SECONDS)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            scheduler.release()
+        return True
+
+    def schedule_now(self, database, backup_type):
+        """Queue a backup through the scheduler so it respects the concurrency limits"""
+        scheduler = self._scheduler()
+        try:
+            run = scheduler.submit(database, backup_type)
+        except ValueError as e:
+            rprint(f"[red]✗ {e}[/red]")
+            return None
+        if scheduler.acquire():
+            # no scheduler process is running: dispatch this once ourselves
+            try:
+                scheduler.tick()
+            finally:
+                scheduler.release()
+        status = scheduler.status()
+        running = next((r for r in status['running'] if r['id'] == run['id']), None)
+        if running:
+            rprint(f"[green]✓[/green] Run {run['id']} started as job {running['job_id']}")
+        else:
+            rprint(f"[yellow]Run {run['id']} queued[/yellow] (waiting for a free slot)")
+        return run
+
+    def _show_fra(self, snap):
+        table = Table(title=f"FRA {snap['name']}", show_header=True, header_style="bold magenta")
+        table.add_column("File type", style="cyan")
+        table.add_column("Used %", justify="right")
+        table.add_column("Reclaimable %", justify="right")
+        table.add_column("Files", justify="right")
+        for u in snap['usage']:
+            table.add_row(u['file_type'], f"{u['used_pct']:.1f}", f"{u['reclaimable_pct']:.1f}", str(u['files']))
+        console.print(table)
+        color = 'red' if snap['pressure_pct'] >= snap['threshold_pct'] else 'green'
+        eta = snap['seconds_to_threshold']
+        console.print(f"Pressure [{color}]{snap['pressure_pct']}%[/{color}] of {snap['limit_gb']} GB "
+                      f"(threshold {snap['threshold_pct']}%), redo {snap['redo_mbps']} MB/s, "
+                      f"threshold in {_format_eta(eta) if eta else '-'}, next sample in {snap['interval']}s")
+
+    def fra_status(self):
+        """Show FRA usage per file type, unreclaimable pressure and redo rate"""
+        from .frawatcher import FraWatcher
+        try:
+            snap = FraWatcher(self.client).sample()
+        except RuntimeError as e:
+            rprint(f"[red]✗ Cannot read the FRA views:[/red] {e}")
+            return None
+        if not snap['configured']:
+            rprint("[yellow]No Fast Recovery Area configured[/yellow]")
+            return snap
+        self._show_fra(snap)
+        return snap
+
+    def configure_fra_watch(self, threshold=None, dest=None, min_interval=None, max_interval=None):
+        """Save the FRA watcher threshold, relief destination and interval bounds"""
+        from .frawatcher import load_settings, save_settings
+        settings = load_settings()
+        for key, value in (('threshold', threshold), ('dest', dest),
+                           ('min_interval', min_interval), ('max_interval', max_interval)):
+            if value is not None:
+                settings[key] = value
+        if not 0 < settings['threshold'] < 100 or settings['min_interval'] > settings['max_interval']:
+            rprint("[red]✗ Threshold must be 1-99% and min interval at most max interval[/red]")
+            return None
+        save_settings(settings)
+        rprint(f"[green]✓[/green] Relief at {settings['threshold']}% to {settings['dest']}, "
+               f"sampling every {settings['min_interval']}-{settings['max_interval']}s")
+        return settings
+
+    def relieve_fra(self, dest=None):
+        """Queue an urgent archive log backup off the FRA and dispatch it if no scheduler runs"""
+        from .frawatcher import submit_relief
+        scheduler = self._scheduler()
+        run = submit_relief(scheduler, dest)
+        if scheduler.acquire():
+            try:
+                scheduler.tick()
+            finally:
+                scheduler.release()
+        rprint(f"[yellow]FRA relief:[/yellow] archive log backup run {run['id']} queued")
+        return run
+
+    def watch_fra(self, once=False):
+        """Watch FRA pressure and queue relief backups until interrupted"""
+        from .frawatcher import FraWatcher
+        watcher = FraWatcher(self.client, on_pressure=lambda snap: self.relieve_fra())
+        try:
+            while True:
+                try:
+                    snap = watcher.check()
+                except RuntimeError as e:
+                    rprint(f"[red]✗ FRA sample failed:[/red] {e}")
+                    if once:
+                        return None
+                    time.sleep(watcher.settings['max_interval'])
+                    continue
+                self._show_fra(snap)
+                if once:
+                    return snap
+                time.sleep(snap['interval'])
+        except KeyboardInterrupt:
+            return watcher.last
+
     def restore(self, point_in_time=None):
         """Restore database"""
         console.print("\n[bold red]⚠️  WARNING: Database restore operation[/bold red]\n")
@@ -0,0 +1,325 @@
+"""
+RMAN Job Monitor
+Polls V$RMAN_STATUS, V$SESSION_LONGOPS and V$BACKUP_ASYNC_IO while a
+backup runs, in one sqlplus call per poll, and turns them into progress:
+
+- overall percent complete and ETA from the 'RMAN: aggregate input' long
+  operation (or the channels' operations when it is not there yet)
+- per channel (RMAN session SID): percent, MB/s and ETA from its long
+  operation, MB/s from the SOFAR delta between polls or else from
+  V$BACKUP_ASYNC_IO, and the file it is reading
+
+Finished jobs are copied from V$RMAN_BACKUP_JOB_DETAILS to
+~/.oracledba/rman-throughput.jsonl, together with the peak MB/s and
+channel count seen while monitoring. trend() compares each job with the
+median of earlier jobs of the same type, so a slow backup window stands
+out.
+
+Usage (Python):
+    from oracledba.modules.rmanmonitor import RmanMonitor
+    monitor = RmanMonitor()
+    snap = monitor.snapshot()
+    print(snap['percent'], snap['eta_seconds'], [c['mbps'] for c in snap['channels']])
+"""
+
+import json
+import statistics
+import threading
+import time
+from pathlib import Path
+
+HISTORY_FILE = Path.home() / '.oracledba' / 'rman-throughput.jsonl'
+HISTORY_KEEP = 1000
+SLOW_FACTOR = 0.7
+MIN_RUNS_FOR_TREND = 3
+DEFAULT_BLOCK_SIZE = 8192
+
+MONITOR_QUERIES = {
+    'status': (
+        "SELECT SESSION_RECID, SESSION_STAMP, OPERATION, OBJECT_TYPE, STATUS, MBYTES_PROCESSED, "
+        "TO_CHAR(START_TIME,'YYYY-MM-DD HH24:MI:SS') AS START_TIME FROM V$RMAN_STATUS "
+        "WHERE STATUS LIKE 'RUNNING%' AND ROW_TYPE = 'COMMAND' ORDER BY START_TIME"),
+    'longops': (
+        "SELECT SID, SERIAL#, OPNAME, SOFAR, TOTALWORK, ELAPSED_SECONDS, TIME_REMAINING "
+        "FROM V$SESSION_LONGOPS WHERE OPNAME LIKE 'RMAN%' AND TOTALWORK > 0 AND SOFAR < TOTALWORK "
+        "AND (SID, SERIAL#) IN (SELECT SID, SERIAL# FROM V$SESSION WHERE PROGRAM LIKE 'rman%')"),
+    'asyncio': (
+        "SELECT SID, TYPE, FILENAME, EFFECTIVE_BYTES_PER_SECOND, BYTES, TOTAL_BYTES "
+        "FROM V$BACKUP_ASYNC_IO WHERE STATUS = 'IN PROGRESS'"),
+}
+BLOCK_SIZE_QUERY = "SELECT VALUE FROM V$PARAMETER WHERE NAME = 'db_block_size'"
+JOBS_QUERY = (
+    "SELECT SESSION_KEY, SESSION_RECID, SESSION_STAMP, INPUT_TYPE, STATUS, "
+    "TO_CHAR(START_TIME,'YYYY-MM-DD HH24:MI:SS') AS START_TIME, "
+    "TO_CHAR(END_TIME,'YYYY-MM-DD HH24:MI:SS') AS END_TIME, ELAPSED_SECONDS, INPUT_BYTES, "
+    "OUTPUT_BYTES, INPUT_BYTES_PER_SEC, OUTPUT_BYTES_PER_SEC, COMPRESSION_RATIO "
+    "FROM V$RMAN_BACKUP_JOB_DETAILS WHERE STATUS NOT LIKE 'RUNNING%' "
+    "AND START_TIME > SYSDATE - {days} ORDER BY START_TIME")
+
+
+def _num(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def build_snapshot(results, previous=None, block_size=DEFAULT_BLOCK_SIZE, now=None):
+    """Progress dict from one poll's rows ({'status', 'longops', 'asyncio'}).
+
+    ``previous`` is the snapshot of the poll before, used for MB/s deltas.
+    """
+    now = time.time() if now is None else now
+    status = results.get('status') or []
+    longops = results.get('longops') or []
+    asyncio = results.get('asyncio') or []
+
+    aggregate = [r for r in longops if 'aggregate' in r.get('OPNAME', '').lower()]
+    aggregate = ([r for r in aggregate if 'input' in r['OPNAME'].lower()] or aggregate)[:1]
+    prev_channels = {c['sid']: c for c in (previous or {}).get('channels', [])}
+    dt = now - previous['time'] if previous else 0
+
+    io = {}
+    for row in asyncio:
+        entry = io.setdefault(row.get('SID', ''), {'input': 0.0, 'aggregate': None, 'file': None})
+        rate = _num(row.get('EFFECTIVE_BYTES_PER_SECOND'))
+        kind = row.get('TYPE', '').upper()
+        if kind == 'AGGREGATE':
+            entry['aggregate'] = rate
+        elif kind == 'INPUT':
+            entry['input'] += rate
+            entry['file'] = entry['file'] or row.get('FILENAME')
+
+    channels = []
+    for row in longops:
+        if row in aggregate or 'aggregate' in row.get('OPNAME', '').lower():
+            continue
+        sid = row.get('SID', '')
+        sofar, total = _num(row.get('SOFAR')), _num(row.get('TOTALWORK'))
+        elapsed = _num(row.get('ELAPSED_SECONDS'))
+        prev = prev_channels.get(sid)
+        if prev and dt > 0 and sofar >= prev['sofar'] and prev['operation'] == row.get('OPNAME'):
+            mbps = (sofar - prev['sofar']) * block_size / dt / 1048576
+        elif sid in io:
+            mbps = (io[sid]['aggregate'] if io[sid]['aggregate'] is not None
+                    else io[sid]['input']) / 1048576
+        else:
+            mbps = sofar * block_size / elapsed / 1048576 if elapsed else 0.0
+        remaining = row.get('TIME_REMAINING')
+        eta = int(_num(remaining)) if remaining not in (None, '') else (
+            int((total - sofar) * block_size / 1048576 / mbps) if mbps else None)
+        channels.append({
+            'sid': sid,
+            'operation': row.get('OPNAME', ''),
+            'percent': round(sofar / total * 100, 1) if total else 0.0,
+            'sofar': sofar,
+            'totalwork': total,
+            'mbps': round(mbps, 1),
+            'eta_seconds': eta,
+            'file': io.get(sid, {}).get('file'),
+        })
+    channels.sort(key=lambda c: str(c['sid']))
+
+    if aggregate:
+        agg = aggregate[0]
+        sofar, total = _num(agg.get('SOFAR')), _num(agg.get('TOTALWORK'))
+        percent = sofar / total * 100 if total else 0.0
+        eta = int(_num(agg.get('TIME_REMAINING'))) if agg.get('TIME_REMAINING') not in (None, '') else None
+        elapsed = _num(agg.get('ELAPSED_SECONDS'))
+    elif channels:
+        total = sum(c['totalwork'] for c in channels)
+        percent = sum(c['sofar'] for c in channels) / total * 100 if total else 0.0
+        etas = [c['eta_seconds'] for c in channels if c['eta_seconds'] is not None]
+        eta = max(etas) if etas else None
+        elapsed = None
+    else:
+        percent, eta, elapsed = None, None, None
+
+    job = None
+    if status:
+        first = status[0]
+        job = {'session_recid': first.get('SESSION_RECID'),
+               'session_stamp': first.get('SESSION_STAMP'),
+               'operation': first.get('OPERATION'), 'object_type': first.get('OBJECT_TYPE'),
+               'status': first.get('STATUS'), 'start_time': first.get('START_TIME'),
+               'mbytes_processed': _num(first.get('MBYTES_PROCESSED'))}
+    return {
+        'time': now,
+        'running': bool(status or channels),
+        'job': job,
+        'percent': round(percent, 1) if percent is not None else None,
+        'eta_seconds': eta,
+        'elapsed_seconds': elapsed,
+        'mbps': round(sum(c['mbps'] for c in channels), 1),
+        'channels': channels,
+    }
+
+
+def job_record(row):
+    """History entry for one V$RMAN_BACKUP_JOB_DETAILS row"""
+    elapsed = _num(row.get('ELAPSED_SECONDS'))
+    input_bytes = _num(row.get('INPUT_BYTES'))
+    input_rate = _num(row.get('INPUT_BYTES_PER_SEC'), input_bytes / elapsed if elapsed else 0.0)
+    return {
+        'session_key': row.get('SESSION_KEY'),
+        'session_recid': row.get('SESSION_RECID'),
+        'session_stamp': row.get('SESSION_STAMP'),
+        'input_type': row.get('INPUT_TYPE'),
+        'status': row.get('STATUS'),
+        'start_time': row.get('START_TIME'),
+        'end_time': row.get('END_TIME'),
+        'elapsed_seconds': elapsed,
+        'input_gb': round(input_bytes / 1073741824, 3),
+        'output_gb': round(_num(row.get('OUTPUT_BYTES')) / 1073741824, 3),
+        'input_mbps': round(input_rate / 1048576, 1),
+        'output_mbps': round(_num(row.get('OUTPUT_BYTES_PER_SEC')) / 1048576, 1),
+        'compression_ratio': _num(row.get('COMPRESSION_RATIO'), None),
+    }
+
+
+def throughput_trend(records, slow_factor=SLOW_FACTOR):
+    """Per input type: runs, median/last MB/s, and the jobs that were slow.
+
+    A job is slow when its input MB/s is below ``slow_factor`` times the
+    median of the earlier completed jobs of the same type (at least
+    MIN_RUNS_FOR_TREND of them).
+    """
+    by_type = {}
+    for rec in records:
+        by_type.setdefault(rec.get('input_type') or '?', []).append(rec)
+    trend = {}
+    for input_type, recs in sorted(by_type.items()):
+        done = [r for r in recs if str(r.get('status', '')).startswith('COMPLETED')]
+        slow, seen = [], []
+        for rec in done:
+            if len(seen) >= MIN_RUNS_FOR_TREND:
+                baseline = statistics.median(seen)
+                if rec['input_mbps'] < baseline * slow_factor:
+                    slow.append({'session_key': rec['session_key'], 'start_time': rec['start_time'],
+                                 'input_mbps': rec['input_mbps'], 'baseline_mbps': round(baseline, 1)})
+            seen.append(rec['input_mbps'])
+        trend[input_type] = {
+            'runs': len(recs),
+            'failed': len(recs) - len(done),
+            'median_mbps': round(statistics.median(seen), 1) if seen else None,
+            'last_mbps': seen[-1] if seen else None,
+            'slow': slow,
+        }
+    return trend
+
+
+class RmanMonitor:
+    """Polls RMAN progress views and keeps a throughput history"""
+
+    def __init__(self, client=None, history_file=None, clock=time.time):
+        if client is None:
+            from ..utils.oracle_client import OracleClient
+            client = OracleClient()
+        self.client = client
+        self.history_file = Path(history_file) if history_file else HISTORY_FILE
+        self.clock = clock
+        self.block_size = None
+        self.last = None
+        self._seen = {}          # (session_recid, session_stamp) -> peak MB/s, channels
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """Poll once; when a job seen running has ended, record it in the history"""
+        with self._lock:
+            queries = dict(MONITOR_QUERIES)
+            if self.block_size is None:
+                queries['block_size'] = BLOCK_SIZE_QUERY
+            ok, results, errors = self.client.query_many(queries)
+            if not ok:
+                raise RuntimeError(next(iter(errors.values()), 'sqlplus failed'))
+            if 'block_size' in queries:
+                rows = results.get('block_size') or []
+                self.block_size = int(_num(rows[0].get('VALUE'), DEFAULT_BLOCK_SIZE)) if rows \
+                    else DEFAULT_BLOCK_SIZE
+            snap = build_snapshot(results, self.last, self.block_size, self.clock())
+            snap['errors'] = {k: v for k, v in errors.items() if k != 'block_size'}
+            if snap['job']:
+                key = (snap['job']['session_recid'], snap['job']['session_stamp'])
+                seen = self._seen.setdefault(key, {'peak_mbps': 0.0, 'channels': 0})
+                seen['peak_mbps'] = max(seen['peak_mbps'], snap['mbps'])
+                seen['channels'] = max(seen['channels'], len(snap['channels']))
+            ended = self.last is not None and self.last['running'] and not snap['running']
+            self.last = snap
+        if ended:
+            self.record_finished()
+        return snap
+
+    def watch(self, interval=2.0, on_snapshot=None, stop=None, wait_for_start=30):
+        """Poll every ``interval`` seconds until the ``stop`` event is set or,
+        without one, until a running job has finished (or none started within
+        ``wait_for_start`` seconds). Returns the last snapshot."""
+        started = self.clock()
+        seen_running = False
+        while True:
+            snap = self.snapshot()
+            if on_snapshot:
+                on_snapshot(snap)
+            seen_running = seen_running or snap['running']
+            if stop is not None:
+                if stop.wait(interval):
+                    return snap
+                continue
+            if seen_running and not snap['running']:
+                return snap
+            if not seen_running and self.clock() - started >= wait_for_start:
+                return snap
+            time.sleep(interval)
+
+    # --- history ----------------------------------------------------------
+
+    def history(self, limit=None):
+        records = []
+        try:
+            with open(self.history_file) as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+        except OSError:
+            pass
+        return records[-limit:] if limit else records
+
+    def record_finished(self, days=7):
+        """Append jobs finished in the last ``days`` that are not in the history yet"""
+        ok, rows, _ = self.client.query(JOBS_QUERY.format(days=int(days)))
+        if not ok:
+            return []
+        records = self.history()
+        known = {r.get('session_key') for r in records}
+        new = []
+        for row in rows:
+            if not row.get('SESSION_KEY') or row['SESSION_KEY'] in known:
+                continue
+            rec = job_record(row)
+            seen = self._seen.pop((rec['session_recid'], rec['session_stamp']), None)
+            if seen:
+                rec.update(seen)
+            new.append(rec)
+            known.add(rec['session_key'])
+        if new:
+            records.extend(new)
+            self._write(records[-HISTORY_KEEP:], rewrite=len(records) > HISTORY_KEEP, new=new)
+        return new
+
+    def trend(self, limit=None):
+        return throughput_trend(self.history(limit))
+
+    def _write(self, records, rewrite, new):
+        try:
+            self.history_file.parent.mkdir(parents=True, exist_ok=True)
+            if rewrite:
+                tmp = self.history_file.with_suffix('.tmp')
+                with open(tmp, 'w') as f:
+                    f.writelines(json.dumps(r) + '\n' for r in records)
+                tmp.replace(self.history_file)
+            else:
+                with open(self.history_file, 'a') as f:
+                    f.writelines(json.dumps(r) + '\n' for r in new)
+        except OSError:
+            pass
@@ -4,6 +4,7 @@ Performance Tuning Manager
 
 from pathlib import Path
 from rich.console import Console
+from rich.table import Table
 from rich import print as rprint
 import subprocess
 
@@ -11,8 +12,9 @@ console = Console()
 
 
 class TuningManager:
-    def __init__(self):
+    def __init__(self, client=None):
         self.scripts_dir = Path(__file__).parent.parent / "scripts"
+        self.client = client
     
     def analyze(self, deep=False):
         """Analyze performance"""
@@ -27,22 +29,91 @@ class TuningManager:
         rprint("[red]Tuning script not found[/red]")
         return False
     
-    def generate_awr(self, begin_snap=None, end_snap=None):
-        """Generate AWR report"""
-        console.print("\n[bold cyan]Generating AWR Report[/bold cyan]\n")
+    def snapshots(self, limit=10):
+        """List recent AWR snapshots"""
+        from .awrdiff import AwrDiff
+        try:
+            snaps = AwrDiff(self.client).snapshots(limit)
+        except RuntimeError as e:
+            rprint(f"[red]✗ Cannot read AWR snapshots:[/red] {e}")
+            return None
+        table = Table(title="AWR Snapshots", show_header=True, header_style="bold magenta")
+        table.add_column("Snap ID", style="cyan", justify="right")
+        table.add_column("End time")
+        table.add_column("Instance startup", style="dim")
+        table.add_column("Instances", justify="right")
+        for snap in snaps:
+            table.add_row(str(snap['snap_id']), snap['end_time'], snap['startup_time'],
+                          str(snap['instances']))
+        console.print(table)
+        return snaps
+    
+    def generate_awr(self, begin_snap=None, end_snap=None, top=10, as_json=False):
+        """Diff two AWR snapshots (default: the last two) into load profile, top waits, SQL and OS stats"""
+        from .awrdiff import AwrDiff
+        try:
+            report = AwrDiff(self.client).report(begin_snap, end_snap, top)
+        except (RuntimeError, ValueError) as e:
+            rprint(f"[red]✗ AWR diff failed:[/red] {e}")
+            return None
+        if as_json:
+            import json
+            print(json.dumps(report, indent=2))
+            return report
+        self._print_awr_report(report)
+        return report
+    
+    def _print_awr_report(self, report):
+        def num(value, digits=2):
+            return '-' if value is None else f"{value:,.{digits}f}" if isinstance(value, float) else f"{value:,}"
+        
+        console.print(f"\n[bold cyan]AWR Diff: snapshots {report['begin_snap']} → {report['end_snap']}[/bold cyan] "
+                      f"[dim]{report['begin_time']} → {report['end_time']}, "
+                      f"{report['elapsed_seconds'] / 60:.1f} min, {report['instances']} instance(s)[/dim]\n")
+        busy = report['host_cpu_busy_pct']
+        console.print(f"DB time: [bold]{num(report['db_time_seconds'])} s[/bold]   "
+                      f"Average active sessions: [bold]{report['average_active_sessions']}[/bold]   "
+                      f"Host CPU busy: [bold]{'-' if busy is None else f'{busy}%'}[/bold]")
+        
+        table = Table(title="Load Profile", show_header=True, header_style="bold magenta")
+        table.add_column("Statistic", style="cyan")
+        table.add_column("Per second", justify="right")
+        table.add_column("Per transaction", justify="right")
+        table.add_column("Total", justify="right")
+        for row in report['load_profile']:
+            table.add_row(row['name'], num(row['per_second']), num(row['per_transaction']), num(row['total']))
+        console.print(table)
+        
+        table = Table(title="Top Timed Events", show_header=True, header_style="bold magenta")
+        table.add_column("Event", style="cyan")
+        table.add_column("Class")
+        table.add_column("Waits", justify="right")
+        table.add_column("Time (s)", justify="right")
+        table.add_column("Avg (ms)", justify="right")
+        table.add_column("% DB time", justify="right")
+        for row in report['wait_events']:
+            table.add_row(row['event'], row['wait_class'], num(row['waits']), num(row['time_seconds']),
+                          num(row['avg_ms']), num(row['pct_db_time'], 1))
+        console.print(table)
         
-        if not begin_snap or not end_snap:
-            # Get last 2 snapshots
-            sql = "SELECT snap_id FROM dba_hist_snapshot ORDER BY snap_id DESC FETCH FIRST 2 ROWS ONLY;"
-            cmd = f"echo \"{sql}\" | sqlplus -S / as sysdba"
-            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
-            # Parse snap IDs from result
+        table = Table(title="Top SQL by Elapsed Time", show_header=True, header_style="bold magenta")
+        table.add_column("SQL ID", style="cyan", no_wrap=True)
+        for column in ("Elapsed s", "Execs", "ms/exec", "CPU s", "% DB"):
+            table.add_column(column, justify="right", no_wrap=True)
+        table.add_column("Module / text", style="dim")
+        for row in report['sql']:
+            table.add_row(row['sql_id'], num(row['elapsed_seconds']), num(row['executions']),
+                          num(row['elapsed_per_exec_ms']), num(row['cpu_seconds']), num(row['pct_db_time'], 1),
+                          ' | '.join(filter(None, (row['module'], row['text'])))[:60])
+        console.print(table)
         
-        sql = f"""
-        @?/rdbms/admin/awrrpt.sql
-        """
-        # Execute AWR report generation
-        rprint("[green]AWR report generated[/green]")
+        table = Table(title="OS Statistics", show_header=True, header_style="bold magenta")
+        table.add_column("Statistic", style="cyan")
+        table.add_column("Value", justify="right")
+        table.add_column("Per second", justify="right")
+        for row in report['os']:
+            table.add_row(row['name'], num(row['value']), num(row['per_second']))
+        console.print(table)
     
     def generate_addm(self):
         """Generate ADDM report"""
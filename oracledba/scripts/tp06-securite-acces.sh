@@ -195,25 +195,36 @@ echo "✓ Audit configuré (redémarrage requis pour activation complète)"
 echo ""
 echo "[7/7] Configuration tnsnames.ora pour connexions..."
 
-cat > $ORACLE_HOME/network/admin/tnsnames.ora << 'EOF'
-GDCPROD =
+TNSNAMES=$ORACLE_HOME/network/admin/tnsnames.ora
+
+# Remplace uniquement le bloc de l'alias (entre marqueurs) : d'autres TPs
+# peuvent utiliser tnsnames.ora en même temps (oradba labs run --isolate-pdbs)
+set_tns_alias() {
+    local alias=$1 service=$2 tmp
+    (
+        flock 9
+        touch "$TNSNAMES"
+        tmp=$(mktemp "$TNSNAMES.XXXXXX")
+        sed "/^# BEGIN oradba $alias\$/,/^# END oradba $alias\$/d" "$TNSNAMES" > "$tmp"
+        cat >> "$tmp" << EOF
+# BEGIN oradba $alias
+$alias =
   (DESCRIPTION =
     (ADDRESS = (PROTOCOL = TCP)(HOST = localhost)(PORT = 1521))
     (CONNECT_DATA =
       (SERVER = DEDICATED)
-      (SERVICE_NAME = GDCPROD)
-    )
-  )
-
-GDCPDB =
-  (DESCRIPTION =
-    (ADDRESS = (PROTOCOL = TCP)(HOST = localhost)(PORT = 1521))
-    (CONNECT_DATA =
-      (SERVER = DEDICATED)
-      (SERVICE_NAME = gdcpdb)
+      (SERVICE_NAME = $service)
     )
   )
+# END oradba $alias
 EOF
+        chmod 644 "$tmp"
+        mv "$tmp" "$TNSNAMES"
+    ) 9> "$TNSNAMES.lock"
+}
+
+set_tns_alias GDCPROD GDCPROD
+set_tns_alias GDCPDB gdcpdb
 
 # Test tnsping
 tnsping GDCPDB 3
@@ -2,7 +2,13 @@
 Utilities package
 """
 
-from . import logger
-from . import oracle_client
+import importlib
 
-__all__ = ['logger', 'oracle_client']
+__all__ = ['logger', 'oracle_client', 'events', 'perf', 'cache', 'jobs', 'stream', 'sqlsession']
+
+
+def __getattr__(name):
+    # Lazy submodule access: utils.logger configures logging on first use only
+    if name in __all__:
+        return importlib.import_module(f'.{name}', __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
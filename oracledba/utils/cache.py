@@ -0,0 +1,176 @@
+"""
+Result cache
+Keyed TTL cache with LRU eviction, single-flight coalescing and tag-based
+invalidation, used by the web GUI in front of read-only catalog queries.
+
+- Every entry has its own TTL and any number of tags ('tablespaces',
+  'users', ...). Mutating endpoints invalidate by tag.
+- When several requests ask for the same missing key at once, only the
+  first runs the query; the others wait for and share its result.
+- A computation that overlaps an invalidation of one of its tags is
+  returned to its callers but not stored, so a result read before a
+  DROP USER can never be served after it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 30
+DEFAULT_MAX_ENTRIES = 256
+
+
+class _Flight:
+    """An in-progress computation other callers can wait on"""
+
+    __slots__ = ('done', 'value', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class ResultCache:
+    """Thread-safe TTL + LRU cache with single-flight and tags"""
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES, default_ttl=DEFAULT_TTL,
+                 clock=time.monotonic):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self._entries = OrderedDict()   # key -> (expires_at, value, tags)
+        self._tags = {}                 # tag -> set of keys
+        self._epochs = {}               # tag -> invalidation counter
+        self._flights = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Cached value or None (expired entries are dropped)"""
+        with self._lock:
+            return self._lookup(key)
+
+    def get_or_compute(self, key, compute, ttl=None, tags=(), cacheable=None):
+        """Return the cached value for ``key`` or run ``compute()`` once.
+
+        ``cacheable(value)`` may veto storing a result (e.g. error output);
+        the value is still returned to every waiting caller.
+        """
+        tags = tuple(tags)
+        with self._lock:
+            value = self._lookup(key)
+            if value is not None:
+                self.hits += 1
+                return value
+            flight = self._flights.get(key)
+            if flight is None:
+                flight = self._flights[key] = _Flight()
+                leader = True
+                self.misses += 1
+                epochs = {tag: self._epochs.get(tag, 0) for tag in tags}
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = compute()
+        except Exception as e:
+            flight.error = e
+            raise
+        else:
+            flight.value = value
+            with self._lock:
+                fresh = all(self._epochs.get(tag, 0) == n for tag, n in epochs.items())
+                if fresh and (cacheable is None or cacheable(value)):
+                    self._store(key, value, self.default_ttl if ttl is None else ttl, tags)
+            return value
+        finally:
+            with self._lock:
+                self._flights.pop(key, None)
+            flight.done.set()
+
+    def set(self, key, value, ttl=None, tags=()):
+        with self._lock:
+            self._store(key, value, self.default_ttl if ttl is None else ttl, tuple(tags))
+
+    def invalidate(self, key):
+        """Drop one key; returns True if it was cached"""
+        with self._lock:
+            return self._remove(key)
+
+    def invalidate_tags(self, *tags):
+        """Drop every entry carrying any of ``tags``; returns how many"""
+        removed = 0
+        with self._lock:
+            for tag in tags:
+                self._epochs[tag] = self._epochs.get(tag, 0) + 1
+                for key in list(self._tags.get(tag, ())):
+                    removed += self._remove(key)
+        return removed
+
+    def clear(self):
+        with self._lock:
+            for tag in self._tags:
+                self._epochs[tag] = self._epochs.get(tag, 0) + 1
+            self._entries.clear()
+            self._tags.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'hit_ratio': round(self.hits / lookups, 3) if lookups else 0.0,
+                'in_flight': len(self._flights),
+            }
+
+    # --- internals (caller holds the lock) ---------------------------------
+
+    def _lookup(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= self.clock():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def _store(self, key, value, ttl, tags):
+        if ttl <= 0:
+            return
+        self._remove(key)
+        self._entries[key] = (self.clock() + ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+        return True
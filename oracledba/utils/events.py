@@ -0,0 +1,115 @@
+"""
+Structured event stream
+JSON-lines progress events written by long-running operations (install,
+labs) and read incrementally by the web GUI.
+
+Each line is one JSON object with at least ``ts`` (epoch seconds) and
+``event`` (name). Readers keep a byte offset and only consume complete
+lines, so a writer that is mid-line never produces a half-parsed event.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+
+class EventStream:
+    """Append-only JSON-lines event writer"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._handle = open(self.path, 'w')
+
+    def emit(self, event, **fields):
+        """Write a single event and flush it so readers see it immediately"""
+        if self._handle is None:
+            return
+        record = {'ts': round(time.time(), 3), 'event': event}
+        record.update(fields)
+        self._handle.write(json.dumps(record, default=str) + '\n')
+        self._handle.flush()
+
+    def close(self):
+        """Close the underlying file"""
+        if self._handle:
+            self._handle.close()
+            self._handle = None
+
+
+def read_events(path, offset=0):
+    """Read events appended after ``offset``.
+
+    Returns (events, new_offset). Only newline-terminated lines are
+    consumed; a trailing partial line is left for the next call. A stale
+    offset beyond the end of the file (stream was recreated) restarts
+    from the beginning.
+    """
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return [], 0
+    if offset > size:
+        offset = 0
+
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+
+    end = data.rfind(b'\n')
+    if end < 0:
+        return [], offset
+
+    events = []
+    for raw in data[:end].split(b'\n'):
+        if not raw.strip():
+            continue
+        try:
+            events.append(json.loads(raw))
+        except ValueError:
+            continue
+    return events, offset + end + 1
+
+
+def summarize_progress(events, total_steps=4, state=None):
+    """Fold install events into the stepper state shown by the GUI.
+
+    Pass a previous result as ``state`` to fold only the events read since.
+    """
+    if state is None:
+        state = {
+            'current_step': 0,
+            'total_steps': total_steps,
+            'step_statuses': {},
+            'percent': None,
+            'phase': None,
+            'eta': None,
+            'finished': False,
+            'success': None,
+        }
+    else:
+        state = dict(state, step_statuses=dict(state['step_statuses']))
+    for ev in events:
+        kind = ev.get('event')
+        if ev.get('kind', 'step') != 'step':
+            continue
+        if kind == 'step_start':
+            state['current_step'] = ev.get('step', state['current_step'])
+            state['total_steps'] = ev.get('total', state['total_steps'])
+            state['percent'] = state['phase'] = state['eta'] = None
+        elif kind == 'step_end':
+            state['step_statuses'][ev.get('step')] = (
+                'complete' if ev.get('success') else 'failed')
+        elif kind == 'percent':
+            state['percent'] = ev.get('percent')
+        elif kind == 'progress':
+            state['percent'] = ev.get('percent')
+            state['phase'] = ev.get('phase')
+            state['eta'] = ev.get('eta')
+        elif kind == 'install_end':
+            state['finished'] = True
+            state['success'] = bool(ev.get('success'))
+            if state['success']:
+                state['current_step'] = state['total_steps']
+    return state
@@ -0,0 +1,431 @@
+"""
+Background job manager
+Runs long operations (installs, labs, downloads) as tracked child
+processes instead of `nohup ... &` plus `pgrep -f` polling.
+
+Every job gets an ID, its own log file under the jobs directory, and a
+record of state, PID, exit code and start/end times. A watcher thread
+per running job waits on the process, so status queries are a dict
+lookup: no process-table scans. At most ``max_concurrent`` jobs run at
+once; the rest wait in FIFO order. Jobs run in their own session so
+cancel() can signal the whole process group (su, bash and children).
+
+The job index is persisted to jobs.json so the GUI still shows recent
+jobs after a restart. Several processes (the web server, CLI commands)
+may share one jobs directory: the index is re-read and merged under an
+flock before every write and when a job ID is not known here, and jobs
+another process started are attached by PID while alive. Such a job cannot be waited on, so every
+command runs under a small shell that writes its exit status to the
+job's .rc file: the job then ends as succeeded/failed from that file, or
+'lost' if it was killed before writing it. ``on_finish`` is called with
+each job that reaches a final state.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import shutil
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from pathlib import Path
+
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+LOST = 'lost'
+
+ACTIVE_STATES = (QUEUED, RUNNING)
+DEFAULT_MAX_CONCURRENT = 2
+DEFAULT_KEEP = 200
+CANCEL_GRACE = 10
+# $0 is the .rc file, "$@" the job's command
+EXIT_STATUS_WRAPPER = '"$@"; code=$?; echo $code > "$0"; exit $code'
+
+
+class Job:
+    """One tracked background command"""
+
+    def __init__(self, job_id, name, cmd, log_file, tag=None, env=None, cwd=None, meta=None):
+        self.id = job_id
+        self.name = name
+        self.cmd = cmd
+        self.tag = tag
+        self.env = env
+        self.cwd = cwd
+        self.meta = dict(meta or {})
+        self.log_file = str(log_file)
+        self.state = QUEUED
+        self.pid = None
+        self.exit_code = None
+        self.created = time.time()
+        self.started = None
+        self.ended = None
+        self.cancel_requested = False
+        self.detached = False
+        # file fed to the command's stdin (opened by this process, so the
+        # command may run as a user that cannot read it)
+        self.stdin_file = None
+        self._proc = None
+
+    @property
+    def active(self):
+        return self.state in ACTIVE_STATES
+
+    def path(self, suffix):
+        """Sibling file of the log, e.g. job.path('events.jsonl')"""
+        return Path(self.log_file).with_suffix(f'.{suffix}')
+
+    def to_dict(self):
+        end = self.ended or time.time()
+        return {
+            'id': self.id,
+            'name': self.name,
+            'tag': self.tag,
+            'state': self.state,
+            'pid': self.pid,
+            'exit_code': self.exit_code,
+            'created': self.created,
+            'started': self.started,
+            'ended': self.ended,
+            'duration': round(end - self.started, 1) if self.started else None,
+            'log_file': self.log_file,
+            'meta': self.meta,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        job = cls(data['id'], data.get('name', ''), None, data['log_file'],
+                  tag=data.get('tag'), meta=data.get('meta'))
+        job.state = data.get('state', LOST)
+        job.pid = data.get('pid')
+        job.exit_code = data.get('exit_code')
+        job.created = data.get('created') or time.time()
+        job.started = data.get('started')
+        job.ended = data.get('ended')
+        return job
+
+
+class JobManager:
+    """Starts, tracks, queues and cancels background jobs"""
+
+    def __init__(self, jobs_dir, max_concurrent=DEFAULT_MAX_CONCURRENT, keep=DEFAULT_KEEP,
+                 on_finish=None):
+        self.jobs_dir = Path(jobs_dir)
+        self.max_concurrent = max_concurrent
+        self.keep = keep
+        self.on_finish = on_finish
+        self._jobs = {}
+        self._queue = deque()
+        self._lock = threading.RLock()
+        self._loaded = False
+
+    # --- submission -------------------------------------------------------
+
+    def create(self, cmd, name, tag=None, env=None, cwd=None, meta=None):
+        """Allocate a job (ID, log file) without starting it. Useful when the
+        command needs the job's own paths; call enqueue() afterwards."""
+        self._ensure_loaded()
+        job_id = time.strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        job = Job(job_id, name, cmd, self.jobs_dir / f'{job_id}.log',
+                  tag=tag, env=env, cwd=cwd, meta=meta)
+        return job
+
+    def enqueue(self, job):
+        """Queue a created job; it starts immediately if a slot is free"""
+        with self._lock:
+            self._jobs[job.id] = job
+            self._queue.append(job)
+            self._start_queued()
+            self._save()
+        return job
+
+    def submit(self, cmd, name, tag=None, env=None, cwd=None, meta=None):
+        """create() + enqueue()"""
+        return self.enqueue(self.create(cmd, name, tag=tag, env=env, cwd=cwd, meta=meta))
+
+    # --- queries ----------------------------------------------------------
+
+    def get(self, job_id):
+        self._ensure_loaded()
+        with self._lock:
+            job = self._lookup(job_id)
+            if job is not None:
+                self._check_detached(job)
+            return job
+
+    def list(self, tag=None, limit=50):
+        """Most recent first"""
+        self._ensure_loaded()
+        with self._lock:
+            self._reload()
+            jobs = [j for j in self._jobs.values() if tag is None or j.tag == tag]
+            for job in jobs:
+                self._check_detached(job)
+        jobs.sort(key=lambda j: j.created, reverse=True)
+        return jobs[:limit] if limit else jobs
+
+    def latest(self, tag):
+        """Most recent job with ``tag`` or None"""
+        jobs = self.list(tag=tag, limit=1)
+        return jobs[0] if jobs else None
+
+    def running_count(self):
+        with self._lock:
+            return sum(1 for j in self._jobs.values() if j.state == RUNNING)
+
+    def read_log(self, job_id, offset=0):
+        """(content, new_offset, size) of the job log from ``offset``"""
+        job = self.get(job_id)
+        if job is None or not os.path.exists(job.log_file):
+            return '', 0, 0
+        size = os.path.getsize(job.log_file)
+        if offset < 0 or offset > size:
+            offset = 0
+        with open(job.log_file, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        return data.decode('utf-8', errors='replace'), offset + len(data), size
+
+    # --- control ----------------------------------------------------------
+
+    def cancel(self, job_id):
+        """Cancel a queued job or signal a running job's process group.
+        Returns False if the job is unknown or already finished."""
+        self._ensure_loaded()
+        with self._lock:
+            job = self._lookup(job_id)
+            if job is None or not job.active:
+                return False
+            job.cancel_requested = True
+            if job.state == QUEUED:
+                self._queue.remove(job)
+                self._finish(job, CANCELLED, None)
+                return True
+            pid = job.pid
+        self._signal(pid, signal.SIGTERM)
+        threading.Thread(target=self._kill_after_grace, args=(job,), daemon=True).start()
+        return True
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job leaves the active states (tests, CLI)"""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            job = self.get(job_id)
+            if job is None or not job.active:
+                return job
+            if deadline is not None and time.time() > deadline:
+                return job
+            time.sleep(0.05)
+
+    # --- internals --------------------------------------------------------
+
+    def _lookup(self, job_id):
+        # another process may have started it since the index was last read
+        job = self._jobs.get(job_id)
+        if job is None:
+            self._reload()
+            job = self._jobs.get(job_id)
+        return job
+
+    def _start_queued(self):
+        while self._queue and self.running_count() < self.max_concurrent:
+            job = self._queue.popleft()
+            self._launch(job)
+
+    def _launch(self, job):
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            log = open(job.log_file, 'ab')
+            # the wrapper would turn a missing command into exit 127
+            if shutil.which(job.cmd[0], path=(job.env or os.environ).get('PATH')) is None:
+                raise FileNotFoundError(f"No such command: {job.cmd[0]}")
+            stdin = open(job.stdin_file, 'rb') if job.stdin_file else subprocess.DEVNULL
+            cmd = ['/bin/sh', '-c', EXIT_STATUS_WRAPPER, str(job.path('rc')), *job.cmd]
+            try:
+                proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT,
+                                        stdin=stdin, env=job.env, cwd=job.cwd,
+                                        start_new_session=True)
+            finally:
+                log.close()
+                if job.stdin_file:
+                    stdin.close()
+        except Exception as e:
+            with open(job.log_file, 'a') as f:
+                f.write(f"Failed to start job: {e}\n")
+            job.started = time.time()
+            self._finish(job, FAILED, None)
+            return
+        job._proc = proc
+        job.pid = proc.pid
+        job.state = RUNNING
+        job.started = time.time()
+        threading.Thread(target=self._watch, args=(job,), name=f'job-{job.id}',
+                         daemon=True).start()
+
+    def _watch(self, job):
+        code = job._proc.wait()
+        with self._lock:
+            if job.cancel_requested:
+                state = CANCELLED
+            else:
+                state = SUCCEEDED if code == 0 else FAILED
+            self._finish(job, state, code)
+            self._start_queued()
+            self._save()
+
+    def _finish(self, job, state, code):
+        job.state = state
+        job.exit_code = code
+        job.ended = time.time()
+        job._proc = None
+        self._save()
+        self._notify(job)
+
+    def _notify(self, job):
+        if self.on_finish is None:
+            return
+        try:
+            self.on_finish(job)
+        except Exception:
+            pass
+
+    def _kill_after_grace(self, job):
+        deadline = time.time() + CANCEL_GRACE
+        while time.time() < deadline:
+            with self._lock:
+                self._check_detached(job)
+            if not job.active:
+                return
+            time.sleep(0.1)
+        self._signal(job.pid, signal.SIGKILL)
+
+    @staticmethod
+    def _signal(pid, sig):
+        if not pid:
+            return
+        try:
+            os.killpg(pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    @staticmethod
+    def _alive(pid):
+        if not pid:
+            return False
+        try:
+            os.kill(pid, 0)
+            return True
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            return True
+
+    def _check_detached(self, job):
+        # Jobs started by another process cannot be waited on: their exit
+        # status comes from the .rc file
+        if job.detached and job.state == RUNNING and not self._alive(job.pid):
+            job.detached = False
+            self._finish(job, *self._exit_state(job))
+            self._start_queued()
+
+    @staticmethod
+    def _exit_state(job):
+        """(state, exit code) of a job whose process is gone but was not waited on"""
+        try:
+            code = int(job.path('rc').read_text())
+        except (OSError, ValueError):
+            code = None
+        if job.cancel_requested:
+            return CANCELLED, code
+        if code is None:
+            return LOST, None
+        return (SUCCEEDED if code == 0 else FAILED), code
+
+    def _prune(self):
+        finished = sorted((j for j in self._jobs.values() if not j.active),
+                          key=lambda j: j.created)
+        for job in finished[:max(0, len(self._jobs) - self.keep)]:
+            del self._jobs[job.id]
+            for path in (Path(job.log_file), job.path('events.jsonl'), job.path('sh'),
+                         job.path('rc')):
+                try:
+                    path.unlink()
+                except OSError:
+                    pass
+
+    @property
+    def _index_file(self):
+        return self.jobs_dir / 'jobs.json'
+
+    @contextlib.contextmanager
+    def _index_lock(self):
+        """Exclusive flock shared by every process using this jobs directory"""
+        self.jobs_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._index_file.with_suffix('.flock'), 'a') as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _merge(self):
+        """Take in the jobs other processes added to the index, and the final
+        state they recorded for the jobs they ran; caller holds the flock"""
+        try:
+            with open(self._index_file) as f:
+                records = json.load(f)
+        except (OSError, ValueError):
+            return
+        for data in records:
+            job = self._jobs.get(data['id'])
+            if job is None:
+                job = self._jobs[data['id']] = Job.from_dict(data)
+                if job.state == RUNNING:
+                    job.detached = True
+                elif job.state == QUEUED:
+                    # queued in another process: only that one can start it
+                    job.state = LOST
+                    job.ended = job.ended or time.time()
+            elif job.detached and data.get('state') not in ACTIVE_STATES:
+                job.detached = False
+                job.state = data.get('state', LOST)
+                job.exit_code = data.get('exit_code')
+                job.ended = data.get('ended') or time.time()
+
+    def _reload(self):
+        try:
+            with self._index_lock():
+                self._merge()
+        except OSError:
+            return
+        for job in list(self._jobs.values()):
+            self._check_detached(job)
+
+    def _save(self):
+        if not self._loaded:
+            return
+        try:
+            with self._index_lock():
+                self._merge()
+                self._prune()
+                data = [j.to_dict() for j in sorted(self._jobs.values(), key=lambda j: j.created)]
+                tmp = self._index_file.with_suffix('.tmp')
+                with open(tmp, 'w') as f:
+                    json.dump(data, f, indent=1)
+                os.replace(tmp, self._index_file)
+        except OSError:
+            pass
+
+    def _ensure_loaded(self):
+        with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            self._reload()
@@ -1,5 +1,8 @@
 """
 Logger utility
+
+The module-level ``logger`` is created on first access, so importing this
+module does not touch /var/log/oracledba or install handlers.
 """
 
 import logging
@@ -8,21 +11,38 @@ from datetime import datetime
 
 def setup_logger(name='oracledba', log_dir='/var/log/oracledba'):
     """Setup logger"""
-    log_path = Path(log_dir)
-    log_path.mkdir(parents=True, exist_ok=True)
-    
-    log_file = log_path / f"oracledba_{datetime.now().strftime('%Y%m%d')}.log"
+    handlers = [logging.StreamHandler()]
+    try:
+        log_path = Path(log_dir)
+        log_path.mkdir(parents=True, exist_ok=True)
+        log_file = log_path / f"oracledba_{datetime.now().strftime('%Y%m%d')}.log"
+        handlers.insert(0, logging.FileHandler(log_file))
+    except OSError:
+        # not root: log to stderr only rather than fail the caller
+        pass
     
     logging.basicConfig(
         level=logging.INFO,
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler(log_file),
-            logging.StreamHandler()
-        ]
+        handlers=handlers
     )
     
     return logging.getLogger(name)
 
 
-logger = setup_logger()
+_logger = None
+
+
+def get_logger():
+    """Return the package logger, setting it up on first call"""
+    global _logger
+    if _logger is None:
+        _logger = setup_logger()
+    return _logger
+
+
+def __getattr__(name):
+    # Keeps `from oracledba.utils.logger import logger` working, lazily
+    if name == 'logger':
+        return get_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,17 +3,153 @@ Oracle Client utility for database connections
 """
 
 import os
+import shlex
 import subprocess
 
+# sqlplus settings for machine-readable SELECT output (see parse_rows)
+QUERY_SETTINGS = """SET PAGESIZE 50000
+SET LINESIZE 32767
+SET FEEDBACK OFF
+SET HEADING ON
+SET COLSEP '|'
+SET TRIMOUT ON
+SET TRIMSPOOL ON
+WHENEVER SQLERROR EXIT FAILURE"""
+
+# Marker printed (via PROMPT) before each result of query_many()
+SECTION_MARK = '__ORADBA_SECTION__'
+
+
+def parse_rows(output):
+    """Rows (dicts keyed by column heading) from COLSEP '|' sqlplus output"""
+    rows, headers = [], None
+    for line in output.splitlines():
+        line = line.strip()
+        if '|' not in line:
+            continue
+        cells = [c.strip() for c in line.split('|')]
+        if all(not c or set(c) <= {'-'} for c in cells):
+            continue                        # underline
+        if headers is None:
+            headers = cells
+        elif cells != headers and len(cells) >= len(headers):
+            rows.append(dict(zip(headers, cells)))
+    if headers is None:
+        # single-column results have no separator: heading, underline, values
+        lines = [l.strip() for l in output.splitlines() if l.strip()]
+        if len(lines) >= 2 and set(lines[1]) <= {'-'}:
+            rows = [{lines[0]: v} for v in lines[2:] if v != lines[0] and not set(v) <= {'-'}]
+    return rows
+
+
+def sections_script(queries):
+    """One sqlplus script running every query of ``queries`` ({name: sql}),
+    each result preceded by a PROMPT marker line (see split_sections)"""
+    settings = QUERY_SETTINGS.replace('WHENEVER SQLERROR EXIT FAILURE', 'WHENEVER SQLERROR CONTINUE')
+    parts = [settings]
+    for name, sql in queries.items():
+        parts.append(f"PROMPT {SECTION_MARK} {name}")
+        parts.append(f"{sql.strip().rstrip(';')};")
+    return '\n'.join(parts) + '\nEXIT;\n'
+
+
+def split_sections(output):
+    """{name: text} from the output of a sections_script()"""
+    sections, name, lines = {}, None, []
+    for line in output.splitlines():
+        if line.startswith(SECTION_MARK):
+            if name is not None:
+                sections[name] = '\n'.join(lines)
+            name, lines = line[len(SECTION_MARK):].strip(), []
+        elif name is not None:
+            lines.append(line)
+    if name is not None:
+        sections[name] = '\n'.join(lines)
+    return sections
+
 
 class OracleClient:
     """Simple Oracle client wrapper"""
     
-    def __init__(self, oracle_home=None, oracle_sid=None):
+    def __init__(self, oracle_home=None, oracle_sid=None, os_user=None):
+        self.os_user = os_user      # run the binaries as this user when started as root
         self.oracle_home = oracle_home or os.getenv('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
         self.oracle_sid = oracle_sid or os.getenv('ORACLE_SID', 'GDCPROD')
         self.sqlplus = f"{self.oracle_home}/bin/sqlplus"
-    
+        self.rman = f"{self.oracle_home}/bin/rman"
+
+    def _env(self):
+        return {**os.environ, 'ORACLE_HOME': self.oracle_home, 'ORACLE_SID': self.oracle_sid}
+
+    def wrap(self, cmd):
+        """argv running ``cmd`` as ``os_user`` (with this ORACLE_HOME/SID) when started as root"""
+        if self.os_user and hasattr(os, 'getuid') and os.getuid() == 0:
+            return ['su', '-', self.os_user, '-c',
+                    f"export ORACLE_HOME={shlex.quote(self.oracle_home)} "
+                    f"ORACLE_SID={shlex.quote(self.oracle_sid)}; exec {shlex.join(cmd)}"]
+        return cmd
+
+    def run_stdin(self, cmd, script, timeout=None):
+        """Run ``cmd`` (argv list, no shell) with ``script`` on stdin.
+
+        Nothing goes through a shell, so V$ names, quotes and newlines in
+        the script reach sqlplus/rman unchanged.
+        """
+        cmd = self.wrap(cmd)
+        try:
+            result = subprocess.run(cmd, input=script, capture_output=True, text=True,
+                                    env=self._env(), timeout=timeout)
+            return result.returncode == 0, result.stdout, result.stderr
+        except (OSError, subprocess.TimeoutExpired) as e:
+            return False, "", str(e)
+
+    def query(self, sql, as_sysdba=True, timeout=120):
+        """Run one SELECT; returns (success, rows, error) with rows as dicts"""
+        connect_str = "/ as sysdba" if as_sysdba else "/"
+        script = f"{QUERY_SETTINGS}\n{sql.strip().rstrip(';')};\nEXIT;\n"
+        ok, stdout, stderr = self.run_stdin([self.sqlplus, '-s', connect_str], script, timeout)
+        if not ok or 'ORA-' in stdout or 'SP2-' in stdout:
+            return False, [], (stderr.strip() or stdout.strip())
+        return True, parse_rows(stdout), ""
+
+    def query_many(self, queries, as_sysdba=True, timeout=120):
+        """Run several SELECTs over one connection.
+
+        ``queries`` is {name: sql}. Returns (success, {name: rows}, {name: error});
+        success is False only when sqlplus itself could not run.
+        """
+        connect_str = "/ as sysdba" if as_sysdba else "/"
+        ok, stdout, stderr = self.run_stdin([self.sqlplus, '-s', connect_str],
+                                            sections_script(queries), timeout)
+        sections = split_sections(stdout)
+        if not sections:
+            return False, {}, {name: (stderr.strip() or stdout.strip()) for name in queries}
+        results, errors = {}, {}
+        for name in queries:
+            text = sections.get(name, '')
+            if 'ORA-' in text or 'SP2-' in text:
+                errors[name] = next((l.strip() for l in text.splitlines()
+                                     if 'ORA-' in l or 'SP2-' in l), text.strip())
+                results[name] = []
+            else:
+                results[name] = parse_rows(text)
+        return True, results, errors
+
+    def run_rman(self, commands, timeout=None):
+        """Run an RMAN script against the local target; returns (success, stdout, stderr)"""
+        ok, stdout, stderr = self.run_stdin([self.rman, 'target', '/'], f"{commands}\nEXIT;\n",
+                                            timeout)
+        return ok and 'RMAN-00569' not in stdout, stdout, stderr
+
+    def run_sql(self, statements, as_sysdba=True, timeout=None):
+        """Run SQL statements (ALTER ...) in one session, stopping at the first error;
+        returns (success, stdout, stderr)"""
+        connect_str = "/ as sysdba" if as_sysdba else "/"
+        script = "WHENEVER SQLERROR EXIT FAILURE\n" + ''.join(
+            f"{sql.strip().rstrip(';')};\n" for sql in statements) + "EXIT;\n"
+        ok, stdout, stderr = self.run_stdin([self.sqlplus, '-s', connect_str], script, timeout)
+        return ok and 'ORA-' not in stdout and 'SP2-' not in stdout, stdout, stderr
+
     def execute_sql(self, sql, as_sysdba=True):
         """Execute SQL command"""
         connect_str = "/ as sysdba" if as_sysdba else "/"
@@ -0,0 +1,241 @@
+"""
+Latency instrumentation
+Per-operation timing for the web server: request totals per route and
+time spent in sqlplus, shell and CLI subprocesses, keyed by a normalized
+fingerprint so ``WHERE NAME='A'`` and ``WHERE NAME='B'`` share one entry.
+
+Each key keeps a bounded reservoir sample, so percentiles stay cheap and
+memory stays flat however long the server runs. Operations slower than
+the threshold are appended to a JSON-lines slow log.
+"""
+
+import json
+import math
+import os
+import random
+import re
+import threading
+import time
+from functools import wraps
+from pathlib import Path
+
+DEFAULT_RESERVOIR = 512
+DEFAULT_SLOW_MS = 1000.0
+SLOW_LOG_MAX_BYTES = 5 * 1024 * 1024
+PERCENTILES = (50, 95, 99)
+
+_COMMENT_RE = re.compile(r'--[^\n]*|/\*.*?\*/', re.S)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST_RE = re.compile(r'\(\?(?:,\?)+\)')
+_SPACE_RE = re.compile(r'\s+')
+_OP_SPACE_RE = re.compile(r'\s*([=<>!,()|+*/]+)\s*')
+_SQLPLUS_CMD_RE = re.compile(r'^\s*(SET|COL|COLUMN|PROMPT|SPOOL|WHENEVER|EXIT)\b.*$',
+                             re.I | re.M)
+
+
+def fingerprint_sql(sql, max_len=200):
+    """Normalize a SQL script to a stable key: literals become ?, case and
+    whitespace are folded and SQL*Plus formatting commands are dropped"""
+    text = _COMMENT_RE.sub(' ', sql or '')
+    text = _SQLPLUS_CMD_RE.sub(' ', text)
+    text = _STRING_RE.sub('?', text)
+    text = _NUMBER_RE.sub('?', text)
+    text = _OP_SPACE_RE.sub(r'\1', text)
+    text = _IN_LIST_RE.sub('(?+)', text)
+    text = _SPACE_RE.sub(' ', text).strip().rstrip(';').strip().upper()
+    return text[:max_len] or '(empty)'
+
+
+def fingerprint_command(command, max_len=120):
+    """Normalize a shell command or argv list to its program name and first
+    two arguments, with numbers and quoted strings replaced by ?"""
+    if isinstance(command, (list, tuple)):
+        command = ' '.join(str(c) for c in command)
+    words = (command or '').split()
+    head = [os.path.basename(w) if i == 0 else w for i, w in enumerate(words[:3])]
+    text = _NUMBER_RE.sub('?', _STRING_RE.sub('?', ' '.join(head)))
+    return text[:max_len] or '(empty)'
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_samples)))
+    return sorted_samples[min(rank, len(sorted_samples)) - 1]
+
+
+class _Series:
+    """Count/total/max plus a reservoir sample of one key"""
+
+    __slots__ = ('count', 'total', 'max', 'samples', 'last')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = []
+        self.last = 0.0
+
+    def add(self, ms, capacity, rng):
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        self.last = time.time()
+        if len(self.samples) < capacity:
+            self.samples.append(ms)
+        else:
+            # Algorithm R: every observation has equal odds of being kept
+            slot = rng.randrange(self.count)
+            if slot < capacity:
+                self.samples[slot] = ms
+
+    def summary(self):
+        ordered = sorted(self.samples)
+        data = {
+            'count': self.count,
+            'total_ms': round(self.total, 1),
+            'avg_ms': round(self.total / self.count, 1) if self.count else 0.0,
+            'max_ms': round(self.max, 1),
+        }
+        for pct in PERCENTILES:
+            value = percentile(ordered, pct)
+            data[f'p{pct}_ms'] = round(value, 1) if value is not None else None
+        return data
+
+
+class PerfRecorder:
+    """Thread-safe latency recorder with request-scoped attribution"""
+
+    def __init__(self, slow_log=None, slow_ms=None, reservoir=DEFAULT_RESERVOIR):
+        self.slow_log = Path(slow_log) if slow_log else None
+        if slow_ms is None:
+            try:
+                slow_ms = float(os.environ.get('ORADBA_SLOW_MS', DEFAULT_SLOW_MS))
+            except ValueError:
+                slow_ms = DEFAULT_SLOW_MS
+        self.slow_ms = slow_ms
+        self.reservoir = reservoir
+        self._series = {}
+        self._lock = threading.Lock()
+        self._rng = random.Random(0)
+        self._local = threading.local()
+        self.started = time.time()
+
+    # --- request scope ----------------------------------------------------
+
+    def begin_request(self):
+        """Start timing the current thread's request"""
+        self._local.start = time.perf_counter()
+        self._local.spans = {}
+
+    def end_request(self, route):
+        """Record the request total under ``route``; returns (total_ms, spans)
+        where spans maps operation kind to the ms spent in it"""
+        start = getattr(self._local, 'start', None)
+        if start is None:
+            return None, {}
+        total = (time.perf_counter() - start) * 1000
+        spans = self._local.spans
+        self._local.start = None
+        self._local.spans = {}
+        self.record('route', route, total, spans={k: round(v, 1) for k, v in spans.items()})
+        return total, spans
+
+    # --- recording --------------------------------------------------------
+
+    def record(self, kind, key, ms, **extra):
+        """Add one observation; attributes it to the active request"""
+        with self._lock:
+            series = self._series.get((kind, key))
+            if series is None:
+                series = self._series[(kind, key)] = _Series()
+            series.add(ms, self.reservoir, self._rng)
+        spans = getattr(self._local, 'spans', None)
+        if spans is not None and kind != 'route':
+            spans[kind] = spans.get(kind, 0.0) + ms
+        if ms >= self.slow_ms:
+            self._log_slow(kind, key, ms, extra)
+
+    def timed(self, kind, key_func):
+        """Decorator timing each call; ``key_func`` gets the call's arguments"""
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    try:
+                        key = key_func(*args, **kwargs)
+                    except Exception:
+                        key = func.__name__
+                    self.record(kind, key, (time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorator
+
+    def _log_slow(self, kind, key, ms, extra):
+        if not self.slow_log:
+            return
+        entry = {'ts': round(time.time(), 3), 'kind': kind, 'key': key, 'ms': round(ms, 1)}
+        entry.update(extra)
+        try:
+            self.slow_log.parent.mkdir(parents=True, exist_ok=True)
+            if self.slow_log.exists() and self.slow_log.stat().st_size > SLOW_LOG_MAX_BYTES:
+                self.slow_log.replace(self.slow_log.with_suffix(self.slow_log.suffix + '.1'))
+            with open(self.slow_log, 'a') as f:
+                f.write(json.dumps(entry, default=str) + '\n')
+        except OSError:
+            pass
+
+    # --- reporting --------------------------------------------------------
+
+    def summary(self, kind=None, limit=None):
+        """Per-key stats, slowest total first: {kind: [{key, count, p50_ms...}]}"""
+        with self._lock:
+            items = [(k, s.summary()) for k, s in self._series.items()
+                     if kind is None or k[0] == kind]
+        grouped = {}
+        for (series_kind, key), stats in items:
+            grouped.setdefault(series_kind, []).append({'key': key, **stats})
+        for rows in grouped.values():
+            rows.sort(key=lambda r: r['total_ms'], reverse=True)
+            if limit:
+                del rows[limit:]
+        return grouped
+
+    def recent_slow(self, limit=50):
+        """Last ``limit`` slow-log entries, newest first"""
+        if not self.slow_log or not self.slow_log.exists():
+            return []
+        try:
+            with open(self.slow_log, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                size = f.tell()
+                f.seek(max(0, size - 256 * limit))
+                lines = f.read().decode('utf-8', 'replace').splitlines()
+        except OSError:
+            return []
+        entries = []
+        for line in reversed(lines):
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue
+            if len(entries) >= limit:
+                break
+        return entries
+
+    def reset(self):
+        """Drop all collected stats (the slow log is kept)"""
+        with self._lock:
+            self._series.clear()
+        self.started = time.time()
+
+
+def server_timing(total_ms, spans):
+    """Format a Server-Timing header value from end_request() output"""
+    parts = [f'{kind};dur={ms:.1f}' for kind, ms in sorted(spans.items())]
+    parts.append(f'total;dur={total_ms:.1f}')
+    return ', '.join(parts)
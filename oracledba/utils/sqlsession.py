@@ -0,0 +1,280 @@
+"""
+Persistent sqlplus sessions
+Keeps one `sqlplus -s -L` process alive per terminal session so follow-up
+statements skip the connect cost and keep session state (ALTER SESSION SET
+CONTAINER, NLS settings, SET options, uncommitted transactions).
+
+Each statement is written to the process's stdin followed by a PROMPT
+with a random sentinel; its output is everything sqlplus prints before
+the sentinel line. A SqlSessionManager bounds sessions per user and in
+total, and a reaper thread closes sessions idle for longer than
+``idle_timeout``.
+"""
+
+import os
+import queue
+import re
+import signal
+import subprocess
+import threading
+import time
+import uuid
+
+DEFAULT_IDLE_TIMEOUT = 600
+DEFAULT_MAX_PER_USER = 2
+DEFAULT_MAX_TOTAL = 20
+STATEMENT_TIMEOUT = 120
+
+# Terminal-friendly defaults applied after connecting
+SESSION_SETUP = "SET LINESIZE 200\nSET PAGESIZE 100\nSET TRIMOUT ON\nSET SQLBLANKLINES OFF"
+
+_SQL_START_RE = re.compile(
+    r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE|MERGE|ALTER|CREATE|DROP|GRANT|REVOKE|'
+    r'TRUNCATE|COMMENT|RENAME|COMMIT|ROLLBACK|SAVEPOINT|LOCK|AUDIT|NOAUDIT|PURGE|FLASHBACK)\b',
+    re.IGNORECASE)
+_PLSQL_START_RE = re.compile(
+    r'^\s*(DECLARE|BEGIN|CREATE\s+(OR\s+REPLACE\s+)?'
+    r'(PROCEDURE|FUNCTION|PACKAGE|TRIGGER|TYPE)\b)', re.IGNORECASE)
+_EXIT_RE = re.compile(r'^\s*(EXIT|QUIT)\b', re.IGNORECASE)
+# sqlplus commands that escape to the OS shell or an editor, with their
+# abbreviations (HO/HOS/HOST, ED/EDI/EDIT), and the ones that run or write
+# script files (@, @@, STA[RT], SPO[OL] <file>), which could carry a HOST
+_SHELL_ESCAPE_RE = re.compile(
+    r'^\s*(?:(?:HO(?:ST?)?|ED(?:IT?)?|STA(?:RT?)?)\b|[!$@]|SPO(?:OL?)?\b(?!\s*(?:OFF\s*;?\s*)?$))',
+    re.IGNORECASE | re.MULTILINE)
+
+
+class SessionError(Exception):
+    """The sqlplus process is gone or did not answer in time"""
+
+
+class SessionLimitError(Exception):
+    """Opening another session would exceed a per-user or global limit"""
+
+
+def check_sql_input(sql):
+    """Error message if ``sql`` would leave sqlplus for the OS, else None.
+    The terminal allowlist applies to shell commands; HOST/!/$ would bypass it,
+    and so would a script run with @/START or written with SPOOL."""
+    if _SHELL_ESCAPE_RE.search(sql):
+        return 'HOST, !, $, EDIT, @, START and SPOOL are not allowed in terminal sessions.'
+    return None
+
+
+def terminate_statement(sql):
+    """Make sure ``sql`` is complete so the sentinel PROMPT is not swallowed
+    into an unfinished statement: SQL gets a ';', PL/SQL a '/' line."""
+    text = sql.strip()
+    if not text:
+        return text
+    if _PLSQL_START_RE.match(text):
+        lines = text.splitlines()
+        return text if lines[-1].strip() == '/' else text + '\n/'
+    if _SQL_START_RE.match(text) and not text.endswith((';', '/')):
+        return text + ';'
+    return text
+
+
+class SqlSession:
+    """One long-lived sqlplus process driven through stdin/stdout"""
+
+    def __init__(self, cmd, env=None, owner=None, clock=time.monotonic):
+        self.id = uuid.uuid4().hex[:12]
+        self.cmd = cmd
+        self.env = env
+        self.owner = owner
+        self.clock = clock
+        self.created = time.time()
+        self.last_used = clock()
+        self.statements = 0
+        self._lines = queue.Queue()
+        self._lock = threading.Lock()
+        self._proc = None
+
+    @property
+    def alive(self):
+        return self._proc is not None and self._proc.poll() is None
+
+    def start(self, timeout=STATEMENT_TIMEOUT):
+        """Spawn sqlplus and wait until it answers; returns the login banner/errors"""
+        self._proc = subprocess.Popen(self.cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT, env=self.env,
+                                      start_new_session=True)
+        threading.Thread(target=self._read, daemon=True).start()
+        output = self.execute(SESSION_SETUP, timeout=timeout)
+        if not self.alive:
+            raise SessionError(output.strip() or 'sqlplus exited during logon')
+        self.statements = 0
+        return output
+
+    def execute(self, sql, timeout=STATEMENT_TIMEOUT):
+        """Run one statement/command and return its output.
+
+        EXIT/QUIT ends the session and returns what sqlplus printed. A
+        timeout kills the process (its state is unknown afterwards).
+        """
+        with self._lock:
+            if not self.alive:
+                raise SessionError('Session is closed')
+            self.last_used = self.clock()
+            self.statements += 1
+            sentinel = f'__ORADBA_{uuid.uuid4().hex}__'
+            exiting = bool(_EXIT_RE.match(sql))
+            script = terminate_statement(sql) + '\n'
+            if not exiting:
+                script += f'PROMPT {sentinel}\n'
+            try:
+                self._proc.stdin.write(script.encode())
+                self._proc.stdin.flush()
+            except (BrokenPipeError, OSError) as e:
+                raise SessionError(f'sqlplus is not running: {e}')
+
+            output = []
+            deadline = time.monotonic() + timeout
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.close()
+                    raise SessionError(f'No answer within {timeout}s; session closed')
+                try:
+                    line = self._lines.get(timeout=min(remaining, 1.0))
+                except queue.Empty:
+                    continue
+                if line is None:                 # EOF: sqlplus exited
+                    self._proc.wait()
+                    break
+                if line.rstrip('\r\n') == sentinel:
+                    break
+                output.append(line)
+            self.last_used = self.clock()
+            return ''.join(output)
+
+    def idle_for(self):
+        return self.clock() - self.last_used
+
+    def close(self):
+        """Terminate the sqlplus process (its process group, for su wrappers)"""
+        if self._proc is None or self._proc.poll() is not None:
+            return
+        try:
+            self._proc.stdin.close()
+        except OSError:
+            pass
+        try:
+            os.killpg(self._proc.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            self._proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(self._proc.pid, signal.SIGKILL)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'owner': self.owner,
+            'alive': self.alive,
+            'created': self.created,
+            'idle_seconds': round(self.idle_for(), 1),
+            'statements': self.statements,
+        }
+
+    def _read(self):
+        for raw in self._proc.stdout:
+            self._lines.put(raw.decode('utf-8', errors='replace'))
+        self._lines.put(None)
+
+
+class SqlSessionManager:
+    """Per-user registry of SqlSessions with limits and an idle reaper"""
+
+    def __init__(self, factory, max_per_user=DEFAULT_MAX_PER_USER, max_total=DEFAULT_MAX_TOTAL,
+                 idle_timeout=DEFAULT_IDLE_TIMEOUT):
+        self.factory = factory            # callable(connect, owner) -> SqlSession (not started)
+        self.max_per_user = max_per_user
+        self.max_total = max_total
+        self.idle_timeout = idle_timeout
+        self._sessions = {}
+        self._lock = threading.Lock()
+        self._reaper = None
+        self._stop = threading.Event()
+
+    def open(self, owner, connect='/ as sysdba'):
+        """Start a new session for ``owner``; raises SessionLimitError/SessionError"""
+        self.reap()
+        with self._lock:
+            mine = [s for s in self._sessions.values() if s.owner == owner]
+            if len(mine) >= self.max_per_user:
+                raise SessionLimitError(
+                    f'At most {self.max_per_user} sqlplus sessions per user; close one first')
+            if len(self._sessions) >= self.max_total:
+                raise SessionLimitError('Too many sqlplus sessions open on this server')
+            session = self.factory(connect, owner)
+            self._sessions[session.id] = session   # reserve the slot while connecting
+        try:
+            banner = session.start()
+        except Exception:
+            with self._lock:
+                self._sessions.pop(session.id, None)
+            session.close()
+            raise
+        self._start_reaper()
+        return session, banner
+
+    def get(self, session_id, owner):
+        """The owner's live session or None"""
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None or session.owner != owner:
+            return None
+        if not session.alive:
+            self.close(session_id)
+            return None
+        return session
+
+    def list(self, owner=None):
+        with self._lock:
+            return [s for s in self._sessions.values() if owner is None or s.owner == owner]
+
+    def close(self, session_id):
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+        if session is not None:
+            session.close()
+        return session is not None
+
+    def close_owner(self, owner):
+        """Close every session of ``owner`` (on logout)"""
+        closed = 0
+        for session in self.list(owner):
+            closed += self.close(session.id)
+        return closed
+
+    def reap(self):
+        """Close sessions idle for longer than idle_timeout or already dead"""
+        with self._lock:
+            stale = [s.id for s in self._sessions.values()
+                     if not s._lock.locked() and (not s.alive or s.idle_for() > self.idle_timeout)]
+        for session_id in stale:
+            self.close(session_id)
+        return len(stale)
+
+    def shutdown(self):
+        self._stop.set()
+        for session in self.list():
+            self.close(session.id)
+
+    def _start_reaper(self):
+        if self._reaper and self._reaper.is_alive():
+            return
+        self._reaper = threading.Thread(target=self._reap_loop, name='oradba-sql-reaper',
+                                        daemon=True)
+        self._reaper.start()
+
+    def _reap_loop(self):
+        interval = max(1, min(60, self.idle_timeout / 4))
+        while not self._stop.wait(interval):
+            self.reap()
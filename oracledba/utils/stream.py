@@ -0,0 +1,171 @@
+"""
+Streaming command execution
+Runs a command and hands its stdout/stderr to a consumer line by line, for
+the web terminal's Server-Sent Events channel.
+
+- Lines go through a bounded queue. When the consumer (a slow browser)
+  falls behind, the reader threads block, the pipe fills and the child
+  blocks on write: backpressure all the way down instead of buffering
+  unbounded output in the server.
+- A consumer that stops reading entirely (closed tab behind a proxy that
+  never reports the disconnect) is detected by the queue staying full for
+  ``stall_timeout`` seconds and the command is cancelled.
+- cancel() signals the whole process group (su, bash, sqlplus...), first
+  SIGTERM then SIGKILL after a grace period.
+- ``max_runtime`` is enforced by a watchdog thread, so it holds even when
+  no consumer ever reads the stream.
+"""
+
+import os
+import queue
+import signal
+import subprocess
+import threading
+import time
+import uuid
+
+DEFAULT_QUEUE_LINES = 256
+MAX_LINE_BYTES = 64 * 1024
+STALL_TIMEOUT = 60
+KILL_GRACE = 5
+
+
+class CommandStream:
+    """One running command whose output is consumed as a stream of events"""
+
+    def __init__(self, cmd, env=None, owner=None, max_queue=DEFAULT_QUEUE_LINES,
+                 max_runtime=None, stall_timeout=STALL_TIMEOUT):
+        self.id = uuid.uuid4().hex[:12]
+        self.cmd = cmd
+        self.env = env
+        self.owner = owner
+        self.max_runtime = max_runtime
+        self.stall_timeout = stall_timeout
+        self.started = None
+        self.attached = None
+        self.finished_at = None
+        self.exit_code = None
+        self.cancel_reason = None
+        self.stalls = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._cancelled = threading.Event()
+        self._finished = threading.Event()
+        self._proc = None
+
+    @property
+    def finished(self):
+        return self._finished.is_set()
+
+    def start(self):
+        """Spawn the command and its reader/waiter threads"""
+        self._proc = subprocess.Popen(self.cmd, stdin=subprocess.DEVNULL,
+                                      stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                      env=self.env, start_new_session=True)
+        self.started = time.time()
+        readers = [threading.Thread(target=self._read, args=(self._proc.stdout, 'stdout'),
+                                    daemon=True),
+                   threading.Thread(target=self._read, args=(self._proc.stderr, 'stderr'),
+                                    daemon=True)]
+        for t in readers:
+            t.start()
+        threading.Thread(target=self._wait, args=(readers,), daemon=True).start()
+        if self.max_runtime:
+            threading.Thread(target=self._watchdog, daemon=True).start()
+        return self
+
+    def cancel(self, reason='cancelled'):
+        """Stop the command (idempotent); the stream then ends with an exit event"""
+        if self._finished.is_set() or self._cancelled.is_set():
+            return False
+        self.cancel_reason = reason
+        self._cancelled.set()
+        self._signal(signal.SIGTERM)
+        threading.Thread(target=self._kill_after_grace, daemon=True).start()
+        return True
+
+    def events(self, heartbeat=15):
+        """Yield (kind, data) until the command exits.
+
+        kind is 'stdout' / 'stderr' (data: the line), 'heartbeat' (data: None)
+        when nothing arrived for ``heartbeat`` seconds, and finally 'exit'
+        (data: {'code', 'cancelled', 'reason', 'duration'}).
+        """
+        self.attached = self.attached or time.time()
+        while True:
+            try:
+                kind, data = self._queue.get(timeout=heartbeat)
+            except queue.Empty:
+                yield 'heartbeat', None
+                continue
+            yield kind, data
+            if kind == 'exit':
+                return
+
+    # --- internals --------------------------------------------------------
+
+    def _read(self, pipe, name):
+        try:
+            while True:
+                raw = pipe.readline(MAX_LINE_BYTES)
+                if not raw:
+                    break
+                if not self._put((name, raw.decode('utf-8', errors='replace'))):
+                    break
+        finally:
+            pipe.close()
+
+    def _put(self, item):
+        """Blocking put that gives up on cancellation or a stalled consumer"""
+        stalled_since = None
+        while not self._cancelled.is_set():
+            try:
+                self._queue.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                self.stalls += 1
+                stalled_since = stalled_since or time.monotonic()
+                if time.monotonic() - stalled_since > self.stall_timeout:
+                    self.cancel('consumer stalled')
+        return False
+
+    def _wait(self, readers):
+        for t in readers:
+            t.join()
+        code = self._proc.wait()
+        self.exit_code = code
+        final = ('exit', {
+            'code': code,
+            'cancelled': self._cancelled.is_set(),
+            'reason': self.cancel_reason,
+            'duration': round(time.time() - self.started, 3),
+        })
+        # the exit event must always get through: wait for a slow consumer,
+        # but once cancelled make room by dropping unread output
+        while not self._put(final):
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(final)
+                break
+            except queue.Full:
+                pass
+        self.finished_at = time.time()
+        self._finished.set()
+
+    def _watchdog(self):
+        if not self._finished.wait(self.max_runtime):
+            self.cancel(f'exceeded {self.max_runtime}s')
+
+    def _kill_after_grace(self):
+        if not self._finished.wait(KILL_GRACE):
+            self._signal(signal.SIGKILL)
+
+    def _signal(self, sig):
+        if self._proc is None:
+            return
+        try:
+            os.killpg(self._proc.pid, sig)
+        except (ProcessLookupError, PermissionError):
+            pass
@@ -11,6 +11,10 @@ import subprocess
 import hashlib
 import hmac
 import secrets
+import shlex
+import sqlite3
+import threading
+import time
 import uuid
 import re as _re_mod
 import yaml
@@ -18,310 +22,34 @@ from datetime import datetime, timedelta
 from functools import wraps
 from pathlib import Path
 
-from flask import Flask, render_template, request, jsonify, session, redirect, url_for, flash
+from flask import Flask, Response, render_template, request, jsonify, session, redirect, url_for, flash
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
 
 # Import our CLI modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# Simple system detector stub (replace with full implementation later if needed)
-class SystemDetector:
-    """Basic system detection for Oracle environment"""
-    
-    def __init__(self):
-        self.oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
-        self.oracle_base = os.environ.get('ORACLE_BASE', '/u01/app/oracle')
-    
-    def is_oracle_installed(self):
-        """Check if Oracle is installed"""
-        return os.path.exists(self.oracle_home)
-    
-    def get_running_databases(self):
-        """Get list of running database instances"""
-        try:
-            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
-            pmon_lines = [line for line in result.stdout.split('\n') if 'ora_pmon_' in line]
-            return [line.split('ora_pmon_')[1].strip() for line in pmon_lines]
-        except:
-            return []
-    
-    def detect_all(self):
-        """Detect all Oracle components and their status"""
-        oracle_installed = self.is_oracle_installed()
-        running_dbs = self.get_running_databases()
-        
-        # Check Oracle version
-        oracle_version = 'Unknown'
-        if oracle_installed:
-            try:
-                version_file = os.path.join(self.oracle_home, 'inventory', 'ContentsXML', 'oraclehomeproperties.xml')
-                if os.path.exists(version_file):
-                    with open(version_file, 'r') as f:
-                        content = f.read()
-                        if '19' in content:
-                            oracle_version = '19c'
-            except:
-                oracle_version = '19c'
-        
-        # Check listener
-        listener_running = False
-        listener_ports = []
-        listeners = []
-        try:
-            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
-            listener_running = 'tnslsnr' in result.stdout
-            if listener_running:
-                listeners = ['LISTENER']
-                listener_ports = [1521]
-        except:
-            pass
-        
-        # Check ASM
-        asm_running = False
-        asm_installed = False
-        try:
-            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
-            asm_running = 'asm_pmon_' in result.stdout
-            asm_installed = os.path.exists('/u01/app/grid') or os.path.exists('/u01/app/19.3.0/grid')
-        except:
-            pass
-        
-        # Check Grid/Cluster
-        grid_installed = os.path.exists('/u01/app/grid') or os.path.exists('/u01/app/19.3.0/grid')
-        grid_running = False
-        cluster_configured = False
-        try:
-            if os.path.exists('/etc/oracle/olr.loc'):
-                cluster_configured = True
-            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
-            grid_running = 'ohasd' in result.stdout or 'crsd' in result.stdout
-        except:
-            pass
-        
-        # Get current SID from environment
-        current_sid = os.environ.get('ORACLE_SID', running_dbs[0] if running_dbs else 'Not Set')
-        
-        # Count individual background processes
-        db_processes = {'pmon': 0, 'smon': 0, 'dbwr': 0, 'lgwr': 0, 'ckpt': 0, 'arch': 0, 'reco': 0}
-        try:
-            result = subprocess.run(['ps', '-ef'], capture_output=True, text=True)
-            ps_lines = result.stdout.split('\n')
-            for line in ps_lines:
-                if 'ora_pmon_' in line: db_processes['pmon'] += 1
-                if 'ora_smon_' in line: db_processes['smon'] += 1
-                if 'ora_dbw' in line: db_processes['dbwr'] += 1
-                if 'ora_lgwr_' in line: db_processes['lgwr'] += 1
-                if 'ora_ckpt_' in line: db_processes['ckpt'] += 1
-                if 'ora_arc' in line and 'grep' not in line: db_processes['arch'] += 1
-                if 'ora_reco_' in line: db_processes['reco'] += 1
-        except:
-            pass
-        
-        return {
-            'oracle': {
-                'installed': oracle_installed,
-                'version': oracle_version,
-                'oracle_home': self.oracle_home,
-                'oracle_base': self.oracle_base,
-                'binaries': oracle_installed
-            },
-            'database': {
-                'running': len(running_dbs) > 0,
-                'instances': running_dbs,
-                'count': len(running_dbs),
-                'current_sid': current_sid,
-                'processes': db_processes
-            },
-            'listener': {
-                'running': listener_running,
-                'status': 'Running' if listener_running else 'Stopped',
-                'listeners': listeners,
-                'ports': listener_ports
-            },
-            'cluster': {
-                'configured': cluster_configured,
-                'type': 'RAC' if cluster_configured else 'Single Instance',
-                'nodes': []
-            },
-            'grid': {
-                'installed': grid_installed,
-                'running': grid_running,
-                'status': 'Running' if grid_running else ('Installed' if grid_installed else 'Not Installed'),
-                'grid_home': '/u01/app/19.3.0/grid' if grid_installed else ''
-            },
-            'asm': {
-                'running': asm_running,
-                'installed': asm_installed,
-                'status': 'Running' if asm_running else 'Not Running',
-                'disk_groups': []
-            },
-            'features': {
-                'archivelog': False,
-                'flashback': False,
-                'dataguard': False,
-                'rman': oracle_installed
-            }
-        }
-    
-    def _run_sql(self, sql, timeout=30):
-        """Run SQL via sqlplus and return raw output (uses stdin pipe to preserve $ in view names)"""
-        full_sql = f"SET PAGESIZE 1000\nSET LINESIZE 1000\nSET FEEDBACK OFF\nSET HEADING ON\nSET COLSEP '|'\nSET TRIMSPOOL ON\nSET TRIMOUT ON\n{sql}\nEXIT;\n"
-        try:
-            uid = os.getuid() if hasattr(os, 'getuid') else -1
-            if uid == 0:
-                cmd = ['su', '-', 'oracle', '-c',
-                       f'{self.oracle_home}/bin/sqlplus -s "/ as sysdba"']
-            else:
-                cmd = [f'{self.oracle_home}/bin/sqlplus', '-s', '/ as sysdba']
-            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE,
-                                    stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-            stdout, _ = proc.communicate(input=full_sql, timeout=timeout)
-            return stdout.strip()
-        except Exception as e:
-            return f"SQL Error: {e}"
-
-    def _parse_sql_rows(self, output):
-        """Parse pipe-delimited sqlplus output into list of dicts.
-        Finds header line by looking for first line with '|' separators."""
-        rows = []
-        lines = [l.strip() for l in output.split('\n') if l.strip()]
-        # Find header line: first line with '|' that isn't all dashes
-        header_idx = -1
-        for i, line in enumerate(lines):
-            if '|' in line:
-                stripped = line.replace(' ', '').replace('|', '')
-                if stripped and not set(stripped) <= {'-'}:
-                    header_idx = i
-                    break
-        if header_idx < 0:
-            return rows
-        headers = [h.strip() for h in lines[header_idx].split('|')]
-        for line in lines[header_idx + 1:]:
-            if '|' not in line:
-                continue
-            stripped = line.replace(' ', '').replace('|', '')
-            if not stripped or set(stripped) <= {'-'}:
-                continue
-            vals = [v.strip() for v in line.split('|')]
-            if len(vals) >= len(headers):
-                rows.append(dict(zip(headers, vals[:len(headers)])))
-        return rows
-
-    def get_oracle_metrics(self):
-        """Get Oracle performance metrics — SGA, PGA, sessions, tablespaces"""
-        metrics = {
-            'sga': {},
-            'pga': {},
-            'memory': {'total_sga_mb': 0, 'total_pga_mb': 0},
-            'processes': {'count': 0},
-            'sessions': {'count': 0},
-            'datafiles': 0,
-            'tempfiles': 0,
-            'tablespaces': []
-        }
-
-        # Check if Oracle is running first
-        running_dbs = self.get_running_databases()
-        if not running_dbs:
-            return metrics
-
-        try:
-            # SGA components
-            sga_out = self._run_sql(
-                "COL COMPONENT FORMAT A40\n"
-                "SELECT component, ROUND(current_size/1024/1024, 2) AS size_mb "
-                "FROM v$sga_dynamic_components WHERE current_size > 0;"
-            )
-            for row in self._parse_sql_rows(sga_out):
-                try:
-                    name = row.get('COMPONENT', '')
-                    size = float(row.get('SIZE_MB', 0))
-                    if name:
-                        metrics['sga'][name] = size
-                        metrics['memory']['total_sga_mb'] += size
-                except (ValueError, TypeError):
-                    pass
-        except Exception:
-            pass
-
-        try:
-            # PGA stats
-            pga_out = self._run_sql(
-                "COL NAME FORMAT A40\n"
-                "SELECT name, ROUND(value/1024/1024, 2) AS size_mb FROM v$pgastat "
-                "WHERE name IN ('total PGA allocated','total PGA inuse','maximum PGA allocated');"
-            )
-            for row in self._parse_sql_rows(pga_out):
-                try:
-                    name = row.get('NAME', '')
-                    size = float(row.get('SIZE_MB', 0))
-                    if name:
-                        metrics['pga'][name] = size
-                        if 'allocated' in name.lower() and 'max' not in name.lower():
-                            metrics['memory']['total_pga_mb'] = size
-                except (ValueError, TypeError):
-                    pass
-        except Exception:
-            pass
-
-        try:
-            # Processes, sessions, datafiles, tempfiles — combined UNION ALL
-            # to guarantee 2+ columns so COLSEP '|' adds pipe separators.
-            # Single-column COUNT(*) queries produce no pipes → _parse_sql_rows finds nothing.
-            # Note: sqlplus truncates column alias to data width, so 'METRIC' becomes 'METRI'
-            # for 4-char values like 'proc'. Use startswith match or direct value inspection.
-            counts_out = self._run_sql(
-                "SELECT 'proc' AS metric, COUNT(*) AS cnt FROM v$process\n"
-                "UNION ALL SELECT 'sess', COUNT(*) FROM v$session\n"
-                "UNION ALL SELECT 'dfile', COUNT(*) FROM v$datafile\n"
-                "UNION ALL SELECT 'tfile', COUNT(*) FROM v$tempfile;"
-            )
-            for row in self._parse_sql_rows(counts_out):
-                try:
-                    v = int(row.get('CNT', 0))
-                    # Header alias may be truncated (METRIC→METRI). Try both.
-                    m = (row.get('METRIC') or row.get('METRI') or '').strip().lower()
-                    if m == 'proc':
-                        metrics['processes']['count'] = v
-                    elif m == 'sess':
-                        metrics['sessions']['count'] = v
-                    elif m == 'dfile':
-                        metrics['datafiles'] = v
-                    elif m == 'tfile':
-                        metrics['tempfiles'] = v
-                except (ValueError, TypeError):
-                    pass
-        except Exception:
-            pass
-
-        try:
-            # Tablespace usage
-            ts_out = self._run_sql(
-                "COL NAME FORMAT A30\n"
-                "SELECT df.tablespace_name AS name, "
-                "ROUND(df.bytes/1024/1024,2) AS total_mb, "
-                "ROUND((df.bytes - NVL(fs.bytes,0))/1024/1024,2) AS used_mb, "
-                "ROUND(NVL(fs.bytes,0)/1024/1024,2) AS free_mb, "
-                "ROUND((df.bytes - NVL(fs.bytes,0))/df.bytes * 100, 1) AS pct_used "
-                "FROM (SELECT tablespace_name, SUM(bytes) bytes FROM dba_data_files GROUP BY tablespace_name) df "
-                "LEFT JOIN (SELECT tablespace_name, SUM(bytes) bytes FROM dba_free_space GROUP BY tablespace_name) fs "
-                "ON df.tablespace_name = fs.tablespace_name ORDER BY df.tablespace_name;"
-            )
-            for row in self._parse_sql_rows(ts_out):
-                try:
-                    metrics['tablespaces'].append({
-                        'name': row.get('NAME', ''),
-                        'total_mb': float(row.get('TOTAL_MB', 0)),
-                        'used_mb': float(row.get('USED_MB', 0)),
-                        'free_mb': float(row.get('FREE_MB', 0)),
-                        'pct_used': float(row.get('PCT_USED', 0))
-                    })
-                except (ValueError, TypeError):
-                    pass
-        except Exception:
-            pass
+from oracledba.utils.events import read_events, summarize_progress
+from oracledba.utils.perf import PerfRecorder, fingerprint_command, fingerprint_sql, server_timing
+from oracledba.utils.cache import ResultCache
+from oracledba.utils.jobs import JobManager
+from oracledba.utils.stream import CommandStream
+from oracledba.utils.sqlsession import (SessionError, SessionLimitError, SqlSession,
+                                        SqlSessionManager, check_sql_input)
+from oracledba.modules.alertlog import AlertLog, find_alert_log, parse_time
+from oracledba.modules.ashsampler import AshSampler
+from oracledba.modules.awrdiff import AwrDiff
+from oracledba.modules.backupcatalog import BackupCatalog
+from oracledba.modules.backupscheduler import BackupScheduler
+from oracledba.modules.detector import SystemDetector
+from oracledba.modules.dgmonitor import DgLagMonitor, public as public_lag_sample
+from oracledba.modules.frawatcher import FraWatcher, submit_relief
+from oracledba.modules.listenerlog import ListenerLogAnalyzer, find_listener_log
+from oracledba.modules.rman import RMANManager
+from oracledba.modules.rmanmonitor import RmanMonitor
+from oracledba.utils.oracle_client import OracleClient
+from oracledba.modules.exporter import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsSampler, render_metrics
 
-        return metrics
 
 app = Flask(__name__, 
            template_folder='web/templates',
@@ -334,8 +62,30 @@ CONFIG_DIR = Path.home() / '.oracledba'
 CONFIG_FILE = CONFIG_DIR / 'gui_config.json'
 USERS_FILE = CONFIG_DIR / 'gui_users.json'
 
-# Create system detector instance
+# Latency instrumentation (routes, sqlplus, shell, CLI, JSON) — see /api/admin/perf
+perf = PerfRecorder(slow_log=CONFIG_DIR / 'perf-slow.jsonl')
+
+
+
+def _job_finished(job):
+    """Drop the cached results a finished job may have changed (meta 'invalidates')"""
+    tags = job.meta.get('invalidates')
+    if tags:
+        invalidate_cached(*tags)
+
+
+# Long-running installs/labs/downloads run as tracked jobs — see /api/jobs
+jobs = JobManager(CONFIG_DIR / 'jobs',
+                  max_concurrent=int(os.environ.get('ORADBA_MAX_JOBS', '2')),
+                  on_finish=_job_finished)
+
+# Create system detector instance; only this instance's queries are timed
 detector = SystemDetector()
+detector._run_sql = perf.timed('sql', lambda sql, *a, **k: fingerprint_sql(sql))(detector._run_sql)
+
+# Prometheus /metrics is served from this cache, sampled in the background
+metrics_sampler = MetricsSampler(
+    detector, interval=int(os.environ.get('ORADBA_METRICS_INTERVAL', '30')))
 
 
 def hash_password(password: str, salt: str = None) -> tuple:
@@ -633,6 +383,147 @@ def admin_required(f):
     return decorated_function
 
 
+# ============================================================================
+# PERFORMANCE INSTRUMENTATION
+# ============================================================================
+
+def _route_key():
+    """Route template of the current request, e.g. 'GET /api/databases/<name>/detail'"""
+    rule = request.url_rule.rule if request.url_rule else '(unmatched)'
+    return f"{request.method} {rule}"
+
+
+class TimedJSONProvider(DefaultJSONProvider):
+    """JSON provider that records serialization time per route"""
+
+    def response(self, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().response(*args, **kwargs)
+        finally:
+            perf.record('json', _route_key(), (time.perf_counter() - start) * 1000)
+
+
+app.json = TimedJSONProvider(app)
+
+
+@app.before_request
+def _perf_begin():
+    perf.begin_request()
+
+
+@app.after_request
+def _perf_end(response):
+    if request.endpoint == 'static':
+        return response
+    total, spans = perf.end_request(_route_key())
+    if total is not None:
+        response.headers['Server-Timing'] = server_timing(total, spans)
+    return response
+
+
+@app.route('/metrics')
+def prometheus_metrics():
+    """Prometheus scrape endpoint (optional bearer token: ORADBA_METRICS_TOKEN)"""
+    token = os.environ.get('ORADBA_METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''),
+                                         f'Bearer {token}'):
+        return Response('unauthorized\n', status=401, mimetype='text/plain')
+    metrics_sampler.start()
+    return Response(render_metrics(metrics_sampler.snapshot()),
+                    content_type=METRICS_CONTENT_TYPE)
+
+
+@app.route('/api/admin/perf')
+@login_required
+@admin_required
+def api_admin_perf():
+    """API: p50/p95/p99 latency per route, SQL statement and command"""
+    if request.args.get('reset') == '1':
+        perf.reset()
+    limit = request.args.get('limit', 50, type=int)
+    stats = perf.summary(limit=limit)
+    return jsonify({
+        'success': True,
+        'since': datetime.fromtimestamp(perf.started).isoformat(timespec='seconds'),
+        'slow_threshold_ms': perf.slow_ms,
+        'routes': stats.get('route', []),
+        'statements': stats.get('sql', []),
+        'commands': stats.get('shell', []) + stats.get('cli', []),
+        'serialization': stats.get('json', []),
+        'slow': perf.recent_slow(limit),
+    })
+
+
+# ============================================================================
+# QUERY RESULT CACHE
+# ============================================================================
+
+# Read-only catalog queries are served from here; mutating routes drop the
+# affected tags with @invalidates, background jobs (TP scripts) when they
+# finish. TTLs are seconds per tag family.
+sql_cache = ResultCache(max_entries=int(os.environ.get('ORADBA_CACHE_ENTRIES', '256')))
+CACHE_TTLS = {
+    'tablespaces': 30,
+    'users': 60,
+    'controlfiles': 300,
+    'redologs': 15,
+}
+
+# Dashboard status: however many viewers poll /api/system-status, detect_all
+# and get_oracle_metrics run at most once per freshness window
+STATUS_TTL = float(os.environ.get('ORADBA_STATUS_TTL', '5'))
+status_cache = ResultCache(max_entries=8, default_ttl=STATUS_TTL)
+# Everything cached: for free-form SQL/commands and lab scripts
+ALL_CACHE_TAGS = (*CACHE_TTLS, 'status')
+
+_SQL_ERROR_RE = _re_mod.compile(r'^(ORA|SP2|TNS)-\d{4,5}:|^ERROR at line|^SQL Error:', _re_mod.M)
+
+
+def _sqlplus_output_ok(output):
+    """Only clean sqlplus output is worth caching"""
+    return bool(output) and not _SQL_ERROR_RE.search(output)
+
+
+def cached_sqlplus(sql, tag, extra_tags=()):
+    """run_sqlplus through sql_cache (?refresh=1 on the request bypasses it)"""
+    key = ('sqlplus', sql)
+    if request.args.get('refresh') == '1':
+        sql_cache.invalidate(key)
+    return sql_cache.get_or_compute(key, lambda: run_sqlplus(sql), ttl=CACHE_TTLS[tag],
+                                    tags=(tag, *extra_tags), cacheable=_sqlplus_output_ok)
+
+
+def invalidate_cached(*tags):
+    sql_cache.invalidate_tags(*tags)
+    status_cache.invalidate_tags(*tags)
+
+
+def invalidates(*tags):
+    """Decorator for mutating routes: drop cached results for ``tags``"""
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            try:
+                return f(*args, **kwargs)
+            finally:
+                invalidate_cached(*tags)
+        return decorated_function
+    return decorator
+
+
+@app.route('/api/admin/cache', methods=['GET', 'DELETE'])
+@login_required
+@admin_required
+def api_admin_cache():
+    """API: Query and status cache statistics (DELETE clears them)"""
+    if request.method == 'DELETE':
+        sql_cache.clear()
+        status_cache.clear()
+    return jsonify({'success': True, 'cache': sql_cache.stats(), 'ttls': CACHE_TTLS,
+                    'status_cache': status_cache.stats(), 'status_ttl': STATUS_TTL})
+
+
 # ============================================================================
 # AUTHENTICATION ROUTES
 # ============================================================================
@@ -692,6 +583,8 @@ def login():
 @app.route('/logout')
 def logout():
     """Logout"""
+    if session.get('user'):
+        sql_sessions.close_owner(session['user'])
     session.clear()
     flash('Logged out successfully', 'success')
     return redirect(url_for('login'))
@@ -779,7 +672,7 @@ def api_system_status():
 @login_required
 def api_oracle_metrics():
     """API: Get detailed Oracle metrics (SGA, PGA, processes, tablespaces)"""
-    metrics = detector.get_oracle_metrics()
+    metrics = shared_metrics()
     # Return metrics at top level so JS can access metrics.sga, metrics.processes, etc.
     return jsonify(metrics)
 
@@ -789,7 +682,7 @@ def api_oracle_metrics():
 def api_installation_status():
     """API: Get what's installed and what can be activated"""
     try:
-        detection = detector.detect_all()
+        detection = shared_detection()
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
     
@@ -868,6 +761,7 @@ def profile():
 @app.route('/api/features/toggle', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('status')
 def api_features_toggle():
     """API: Enable/disable Oracle features"""
     data = request.json
@@ -908,11 +802,27 @@ def api_features_toggle():
         return jsonify({'success': False, 'error': str(e)})
 
 
+def shared_detection():
+    """detector.detect_all(), coalesced across concurrent requests"""
+    return status_cache.get_or_compute('detect_all', detector.detect_all, tags=('status',))
+
+
+def shared_metrics():
+    """detector.get_oracle_metrics(), coalesced across concurrent requests"""
+    return status_cache.get_or_compute('oracle_metrics', detector.get_oracle_metrics,
+                                       tags=('status',))
+
+
 def get_system_status():
+    """Get comprehensive system status (shared by all callers within STATUS_TTL)"""
+    return status_cache.get_or_compute('system_status', _build_system_status, tags=('status',))
+
+
+def _build_system_status():
     """Get comprehensive system status using SystemDetector"""
     # Use system detector for comprehensive information
-    detection = detector.detect_all()
-    metrics = detector.get_oracle_metrics()
+    detection = shared_detection()
+    metrics = shared_metrics()
     
     status = {
         'hostname': subprocess.getoutput('hostname'),
@@ -1191,17 +1101,17 @@ FROM DBA_USERS WHERE ORACLE_MAINTAINED='N' ORDER BY USERNAME;"""
                 'flashback': prot_rows[0].get('FLASHBACK_ON', '') == 'YES'
             }
 
-        # RMAN backup info
-        rman_sql = f"SELECT RECID, TO_CHAR(START_TIME,'YYYY-MM-DD HH24:MI') AS START_TIME, TO_CHAR(COMPLETION_TIME,'YYYY-MM-DD HH24:MI') AS END_TIME, STATUS, INPUT_TYPE FROM V$RMAN_BACKUP_JOB_DETAILS WHERE ROWNUM <= 10 ORDER BY START_TIME DESC;"
-        rman_result = run_sqlplus(rman_sql)
-        rman_rows = parse_sql_rows(rman_result)
-        for r in rman_rows:
+        # RMAN backup info from the local catalog (synced at most once a minute)
+        _refresh_backup_catalog()
+        for b in backup_catalog.recent_backups(10):
             result['backups'].append({
-                'id': r.get('RECID', ''),
-                'start_time': r.get('START_TIME', ''),
-                'end_time': r.get('END_TIME', ''),
-                'status': r.get('STATUS', ''),
-                'type': r.get('INPUT_TYPE', '')
+                'id': b['recid'],
+                'start_time': (b['start_time'] or '')[:16],
+                'end_time': (b['completion_time'] or '')[:16],
+                'status': b['status'],
+                'type': b['kind'],
+                'tag': b['tag'],
+                'gb': b['gb']
             })
 
         # Node and storage info
@@ -1237,7 +1147,7 @@ LEFT JOIN DBA_ROLE_PRIVS r ON u.USERNAME = r.GRANTEE
 WHERE u.ORACLE_MAINTAINED='N'
 GROUP BY u.USERNAME, u.ACCOUNT_STATUS
 ORDER BY u.USERNAME;"""
-        result = run_sqlplus(sql)
+        result = cached_sqlplus(sql, 'users')
         rows = parse_sql_rows(result)
         users = []
         for r in rows:
@@ -1255,42 +1165,12 @@ ORDER BY u.USERNAME;"""
 @login_required
 @admin_required
 def api_database_backup(name):
-    """API: Run RMAN backup for a specific PDB"""
+    """API: Queue an RMAN backup of a specific PDB through the backup scheduler"""
     import re as _re
     if not _re.match(r'^[A-Za-z][A-Za-z0-9_$#]{0,29}$', name):
         return jsonify({'success': False, 'error': 'Invalid PDB name'})
-    name = name.upper()
     backup_type = request.json.get('type', 'full') if request.json else 'full'
-    try:
-        oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
-        oracle_sid = os.environ.get('ORACLE_SID', 'GDCPROD')
-        env = os.environ.copy()
-        env['ORACLE_HOME'] = oracle_home
-        env['ORACLE_SID'] = oracle_sid
-        env['PATH'] = f"{oracle_home}/bin:{env.get('PATH', '')}"
-
-        if backup_type == 'incremental':
-            rman_cmd = f"BACKUP INCREMENTAL LEVEL 1 PLUGGABLE DATABASE {name};"
-        else:
-            rman_cmd = f"BACKUP PLUGGABLE DATABASE {name} PLUS ARCHIVELOG;"
-
-        rman_script = f"""connect target /
-{rman_cmd}
-exit;"""
-        result = subprocess.run(
-            [f'{oracle_home}/bin/rman'],
-            input=rman_script, capture_output=True, text=True,
-            timeout=600, env=env
-        )
-        output = result.stdout + result.stderr
-        success = 'completed' in output.lower() or result.returncode == 0
-        return jsonify({
-            'success': success,
-            'output': output[:2000],
-            'message': f'RMAN {backup_type} backup {"completed" if success else "failed"} for {name}'
-        })
-    except Exception as e:
-        return jsonify({'success': False, 'error': str(e)})
+    return _submit_backup(name.upper(), backup_type)
 
 
 @app.route('/api/databases/<name>/restore-point', methods=['POST'])
@@ -1477,6 +1357,7 @@ FROM DBA_USERS u WHERE u.ORACLE_MAINTAINED='N' ORDER BY u.USERNAME;"""
 
 @app.route('/api/databases/create', methods=['POST'])
 @login_required
+@invalidates('tablespaces', 'users', 'status')
 def api_databases_create():
     """API: Create a new Pluggable Database (simple or from YAML)"""
     data = request.json
@@ -1595,6 +1476,7 @@ ALTER PLUGGABLE DATABASE {sid} SAVE STATE;"""
 @app.route('/api/databases/pdb/<name>/open', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('status')
 def api_databases_pdb_open(name):
     """API: Open a PDB"""
     import re as _re
@@ -1607,6 +1489,7 @@ def api_databases_pdb_open(name):
 @app.route('/api/databases/pdb/<name>/close', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('status')
 def api_databases_pdb_close(name):
     """API: Close a PDB"""
     import re as _re
@@ -1619,6 +1502,7 @@ def api_databases_pdb_close(name):
 @app.route('/api/databases/pdb/<name>/drop', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('tablespaces', 'users', 'status')
 def api_databases_pdb_drop(name):
     """API: Drop a PDB"""
     import re as _re
@@ -1628,6 +1512,101 @@ def api_databases_pdb_drop(name):
     return jsonify({'success': True, 'output': result})
 
 
+# ============================================================================
+# LOG ROUTES
+# ============================================================================
+
+# One AlertLog per file so its offset index stays in memory between requests
+alert_logs = {}
+
+
+def _alert_log():
+    """AlertLog for the local instance, or None if no alert log was found"""
+    path = find_alert_log(os.environ.get('ORACLE_SID', 'GDCPROD'),
+                          oracle_home=os.environ.get('ORACLE_HOME'))
+    if path is None:
+        return None
+    if path not in alert_logs:
+        alert_logs[path] = AlertLog(path, index_dir=CONFIG_DIR / 'alertlog')
+    return alert_logs[path]
+
+
+@app.route('/api/logs/alert')
+@login_required
+def api_logs_alert():
+    """API: Alert log entries, newest first.
+
+    Query: since/until (30m, 2h, 7d or ISO time), grep (regex), ora (code),
+    limit (max 500), before (the next_before cursor of the previous page).
+    """
+    log = _alert_log()
+    if log is None:
+        return jsonify({'success': False, 'error': 'Alert log not found'}), 404
+    try:
+        before = request.args.get('before')
+        page = log.search(since=parse_time(request.args.get('since')),
+                          until=parse_time(request.args.get('until')),
+                          grep=request.args.get('grep') or None,
+                          ora=request.args.get('ora') or None,
+                          limit=int(request.args.get('limit', 100)),
+                          before=int(before) if before else None)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    return jsonify({
+        'success': True,
+        'file': str(log.path),
+        'records': [r.to_dict() for r in page['records']],
+        'next_before': page['next_before'],
+        'scanned_bytes': page['scanned_bytes'],
+        'size': page['size'],
+    })
+
+
+# One analyzer per listener.log; its checkpoint makes each request incremental
+listener_analyzers = {}
+
+
+def _listener_analyzer():
+    """ListenerLogAnalyzer for the local listener, or None if no log was found"""
+    path = find_listener_log(oracle_home=os.environ.get('ORACLE_HOME'))
+    if path is None:
+        return None
+    if path not in listener_analyzers:
+        listener_analyzers[path] = ListenerLogAnalyzer(path, state_dir=CONFIG_DIR / 'listener')
+    return listener_analyzers[path]
+
+
+@app.route('/api/logs/listener')
+@login_required
+def api_logs_listener():
+    """API: Listener log report (connect rates, top services/hosts/programs, TNS errors).
+
+    Reads only what was appended since the previous call. Query: top, minutes.
+    """
+    analyzer = _listener_analyzer()
+    if analyzer is None:
+        return jsonify({'success': False, 'error': 'Listener log not found'}), 404
+    try:
+        top = min(int(request.args.get('top', 10)), 100)
+        minutes = min(int(request.args.get('minutes', 60)), 1440)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'top and minutes must be integers'}), 400
+    analyzer.update()
+    return jsonify({'success': True, 'report': analyzer.report(top=top, minutes=minutes)})
+
+
+@app.route('/api/logs/listener/reset', methods=['POST'])
+@login_required
+@admin_required
+def api_logs_listener_reset():
+    """API: Discard the listener log checkpoint so the next report starts over"""
+    analyzer = _listener_analyzer()
+    if analyzer is None:
+        return jsonify({'success': False, 'error': 'Listener log not found'}), 404
+    analyzer.reset()
+    return jsonify({'success': True})
+
+
 # ============================================================================
 # STORAGE MANAGEMENT ROUTES
 # ============================================================================
@@ -1661,7 +1640,7 @@ LEFT JOIN (SELECT tablespace_name, SUM(bytes) bytes
       FROM dba_free_space GROUP BY tablespace_name) fs
   ON df.tablespace_name = fs.tablespace_name
 ORDER BY df.tablespace_name;"""
-        result = run_sqlplus(sql)
+        result = cached_sqlplus(sql, 'tablespaces')
         rows = parse_sql_rows(result)
         tablespaces = []
         for row in rows:
@@ -1684,6 +1663,7 @@ ORDER BY df.tablespace_name;"""
 
 @app.route('/api/storage/tablespace/create', methods=['POST'])
 @login_required
+@invalidates('tablespaces')
 def api_storage_tablespace_create():
     """API: Create tablespace (supports pdb field for PDB-level creation)"""
     data = request.json
@@ -1746,27 +1726,283 @@ def api_protection_archivelog_enable():
         return jsonify({'success': False, 'error': str(e)})
 
 
+# RMAN runs as oracle; backups are background jobs, progress comes from
+# V$RMAN_STATUS / V$SESSION_LONGOPS / V$BACKUP_ASYNC_IO and finished jobs go
+# to the throughput history used for trend analysis
+rman_client = OracleClient(os_user='oracle')
+rman_monitor = RmanMonitor(rman_client, history_file=CONFIG_DIR / 'rman-throughput.jsonl')
+# Local SQLite index of control file backup records, refreshed incrementally
+backup_catalog = BackupCatalog(rman_client, path=CONFIG_DIR / 'backup-catalog.db')
+CATALOG_REFRESH_SECONDS = 60
+# All RMAN backups (manual and scheduled) go through one queue with a global
+# job limit; the web server dispatches it unless `oradba rman schedule run`
+# already does (state and jobs are shared through ~/.oracledba)
+backup_scheduler = BackupScheduler(client=rman_client, state_file=CONFIG_DIR / 'backup-schedule.json')
+# Queues an urgent archive log backup when unreclaimable FRA usage passes
+# the threshold (`oradba rman fra config`); samples faster as redo speeds up
+fra_watcher = FraWatcher(rman_client, on_pressure=lambda snap: submit_relief(backup_scheduler))
+
+
+def _refresh_backup_catalog(min_interval=CATALOG_REFRESH_SECONDS):
+    """backup_catalog.refresh() unless synced recently; returns an error string or None"""
+    try:
+        backup_catalog.refresh(min_interval=min_interval)
+    except (RuntimeError, sqlite3.Error) as e:
+        return str(e)
+    return None
+
+
+def _submit_backup(database, backup_type):
+    """Queue a backup run; it starts at once when the concurrency limits allow"""
+    try:
+        run = backup_scheduler.submit(database, backup_type)
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
+    running = next((r for r in backup_scheduler.status()['running'] if r['id'] == run['id']), None)
+    state = f"started (job {running['job_id']})" if running else 'queued'
+    return jsonify({'success': True, 'run_id': run['id'], 'job_id': running and running['job_id'],
+                    'message': f'RMAN {backup_type} backup of {database} {state}',
+                    'output': f'RMAN {backup_type} backup {state}'})
+
+
 @app.route('/api/rman/backup', methods=['POST'])
 @login_required
 def api_rman_backup():
-    """API: RMAN backup"""
-    data = request.json
-    backup_type = data.get('type', 'full')
-    
+    """API: Queue an RMAN backup of the CDB (incremental follows the saved strategy)"""
+    data = request.json or {}
+    return _submit_backup('CDB', data.get('type', 'full'))
+
+
+@app.route('/api/rman/schedule')
+@login_required
+def api_rman_schedule():
+    """API: Backup policies with next run, queue, running jobs and recent history"""
+    return jsonify({'success': True, 'scheduler_active': backup_scheduler.active,
+                    **backup_scheduler.status(request.args.get('history', 20, type=int))})
+
+
+@app.route('/api/rman/schedule/policies', methods=['POST'])
+@login_required
+@admin_required
+def api_rman_schedule_add():
+    """API: Add or replace the policy for a database and backup type"""
+    data = request.json or {}
     try:
-        oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
-        if backup_type == 'incremental':
-            rman_cmd = "BACKUP INCREMENTAL LEVEL 1 DATABASE PLUS ARCHIVELOG;"
-        else:
-            rman_cmd = "BACKUP DATABASE PLUS ARCHIVELOG;"
-        
-        # Run RMAN in background since backups take time
-        log_file = '/tmp/rman-backup.log'
-        cmd = f'source ~/.bash_profile 2>/dev/null; echo "{rman_cmd}" | {oracle_home}/bin/rman target / > {log_file} 2>&1'
-        run_shell_command(f'nohup bash -c \'{cmd}\' &', as_oracle=True, timeout=10)
-        return jsonify({'success': True, 'output': f'RMAN {backup_type} backup started. Check log: {log_file}'})
-    except Exception as e:
+        policy = backup_scheduler.add_policy(data.get('database') or 'CDB', data.get('type', 'full'),
+                                             data.get('schedule', ''),
+                                             catch_up=bool(data.get('catch_up', True)),
+                                             window=data.get('window'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
+    return jsonify({'success': True, 'policy': policy})
+
+
+@app.route('/api/rman/schedule/policies/<policy_id>', methods=['DELETE'])
+@login_required
+@admin_required
+def api_rman_schedule_remove(policy_id):
+    """API: Remove a backup policy"""
+    if not backup_scheduler.remove_policy(policy_id):
+        return jsonify({'success': False, 'error': f'No policy {policy_id}'}), 404
+    return jsonify({'success': True})
+
+
+@app.route('/api/rman/schedule/settings', methods=['POST'])
+@login_required
+@admin_required
+def api_rman_schedule_settings():
+    """API: Set the global RMAN job limit and the I/O windows"""
+    data = request.json or {}
+    try:
+        settings = backup_scheduler.configure(data.get('max_concurrent'), data.get('windows'))
+    except (TypeError, ValueError) as e:
         return jsonify({'success': False, 'error': str(e)})
+    return jsonify({'success': True, 'settings': settings})
+
+
+@app.route('/api/rman/schedule/runs/<run_id>/cancel', methods=['POST'])
+@login_required
+@admin_required
+def api_rman_schedule_cancel(run_id):
+    """API: Drop a queued backup run or cancel a running one"""
+    if not backup_scheduler.cancel(run_id):
+        return jsonify({'success': False, 'error': 'Run not found or already finished'})
+    return jsonify({'success': True, 'message': f'Run {run_id} cancelled'})
+
+
+@app.route('/api/rman/schedule/jobs/<job_id>/log')
+@login_required
+def api_rman_schedule_log(job_id):
+    """API: Log of a scheduled backup job from ?offset= (bytes) onwards"""
+    job = backup_scheduler.jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    content, new_offset, size = backup_scheduler.jobs.read_log(job_id, request.args.get('offset', 0, type=int))
+    return jsonify({'success': True, 'logs': content, 'offset': new_offset, 'size': size,
+                    'is_running': job.active, 'state': job.state})
+
+
+@app.route('/api/rman/strategy')
+@login_required
+def api_rman_strategy():
+    """API: Incremental strategy with block change tracking, FRA and image copy state"""
+    return jsonify({'success': True, **RMANManager(rman_client).strategy_status()})
+
+
+@app.route('/api/rman/strategy', methods=['POST'])
+@login_required
+@admin_required
+def api_rman_strategy_set():
+    """API: Set the incremental strategy (incremental-forever enables BCT)"""
+    data = request.json or {}
+    mgr = RMANManager(rman_client)
+    try:
+        mgr.apply_strategy(data.get('mode', ''), int(data.get('window_days') or 0),
+                           data.get('bct_file') or None)
+    except (RuntimeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)})
+    return jsonify({'success': True, **mgr.strategy_status()})
+
+
+@app.route('/api/rman/catalog')
+@login_required
+def api_rman_catalog():
+    """API: Newest backup sets from the local catalog"""
+    error = _refresh_backup_catalog(0 if request.args.get('refresh') else CATALOG_REFRESH_SECONDS)
+    return jsonify({'success': True, 'sync_error': error, 'last_synced': backup_catalog.last_synced(),
+                    'backups': backup_catalog.recent_backups(request.args.get('limit', 20, type=int))})
+
+
+@app.route('/api/rman/catalog/restore-plan')
+@login_required
+def api_rman_restore_plan():
+    """API: Pieces and archived logs needed to recover to ?until= (default now)"""
+    try:
+        until = parse_time(request.args.get('until'))
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
+    error = _refresh_backup_catalog()
+    return jsonify({'success': True, 'sync_error': error, **backup_catalog.restore_plan(until)})
+
+
+@app.route('/api/rman/catalog/trend')
+@login_required
+def api_rman_catalog_trend():
+    """API: Backup volume per day and kind"""
+    error = _refresh_backup_catalog()
+    return jsonify({'success': True, 'sync_error': error,
+                    **backup_catalog.size_trend(request.args.get('days', 30, type=int))})
+
+
+@app.route('/api/rman/progress')
+@login_required
+def api_rman_progress():
+    """API: Progress of the running RMAN job: percent, ETA, per-channel MB/s"""
+    try:
+        snap = rman_monitor.snapshot()
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)})
+    return jsonify({'success': True, **snap})
+
+
+@app.route('/api/rman/throughput')
+@login_required
+def api_rman_throughput():
+    """API: Throughput history of finished backup jobs with per-type trend"""
+    limit = request.args.get('limit', 50, type=int)
+    rman_monitor.record_finished(days=request.args.get('days', 7, type=int))
+    return jsonify({'success': True, 'jobs': rman_monitor.history(limit),
+                    'trend': rman_monitor.trend()})
+
+
+# ============================================================================
+# DATA GUARD LAG
+# ============================================================================
+
+# Transport/apply lag of the configured primary and standby instances
+# (`oradba dataguard monitor-config`), kept in struct ring files for
+# percentile queries; sampled in the background once targets are set
+dg_monitor = DgLagMonitor(store_dir=CONFIG_DIR / 'dglag')
+
+
+@app.route('/api/dataguard/lag')
+@login_required
+def api_dataguard_lag():
+    """API: Latest lag sample, lag percentiles since ?since= (default 1h) and alerts;
+    ?series=<target> adds that target's samples for charting"""
+    try:
+        since = parse_time(request.args.get('since') or '1h')
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
+    if not dg_monitor.last:
+        dg_monitor.sample_all()
+    stats = dg_monitor.percentiles(since=since)
+    targets = {name: {'last': public_lag_sample(dg_monitor.last[name]) if name in dg_monitor.last else None,
+                      'levels': dg_monitor.levels.get(name, {}),
+                      'percentiles': stats[name]}
+               for name in dg_monitor.targets}
+    data = {'success': True, 'targets': targets, 'alerts': dg_monitor.active_alerts(),
+            'alert_history': dg_monitor.alert_history(20), 'errors': dg_monitor.errors,
+            'thresholds': dg_monitor.settings['thresholds']}
+    series = request.args.get('series')
+    if series in dg_monitor.targets:
+        data['series'] = dg_monitor.series(series, since=since,
+                                           points=request.args.get('points', 300, type=int))
+    return jsonify(data)
+
+
+# ============================================================================
+# AWR DIFF
+# ============================================================================
+
+awr_diff = AwrDiff(OracleClient(os_user='oracle'))
+
+
+@app.route('/api/tuning/awr')
+@login_required
+def api_tuning_awr():
+    """API: Load profile, top waits, top SQL and OS stats between ?begin= and ?end=
+    snapshot IDs (default: the last two); ?top= rows per ranking"""
+    try:
+        report = awr_diff.report(request.args.get('begin', type=int), request.args.get('end', type=int),
+                                 request.args.get('top', 10, type=int))
+    except (RuntimeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)})
+    return jsonify({'success': True, **report})
+
+
+@app.route('/api/tuning/awr/snapshots')
+@login_required
+def api_tuning_awr_snapshots():
+    """API: Recent AWR snapshots (?limit=, default 20)"""
+    try:
+        return jsonify({'success': True,
+                        'snapshots': awr_diff.snapshots(request.args.get('limit', 20, type=int))})
+    except RuntimeError as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
+# ============================================================================
+# ACTIVE SESSION SAMPLES
+# ============================================================================
+
+# ASH-style V$SESSION samples in a columnar ring (about 11 hours at five
+# active sessions); polling starts with the first request
+ash_sampler = AshSampler(OracleClient(os_user='oracle'))
+
+
+@app.route('/api/monitor/ash')
+@login_required
+def api_monitor_ash():
+    """API: Top events, SQL IDs, modules, users and blockers between ?since=
+    (default 5m) and ?until=; ?top= rows per ranking"""
+    try:
+        since = parse_time(request.args.get('since') or '5m')
+        until = parse_time(request.args['until']) if request.args.get('until') else None
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)})
+    ash_sampler.start()
+    return jsonify({'success': True, **ash_sampler.report(since, until, request.args.get('top', 10, type=int))})
 
 
 # ============================================================================
@@ -1798,7 +2034,7 @@ SELECT username AS "USERNAME", account_status AS "ACCOUNT_STATUS",
        default_tablespace AS "DEFAULT_TABLESPACE", profile AS "PROFILE",
        TO_CHAR(created, 'YYYY-MM-DD') AS "CREATED"
 FROM dba_users WHERE ORACLE_MAINTAINED='N' ORDER BY username FETCH FIRST 50 ROWS ONLY;"""
-        result = run_sqlplus(sql)
+        result = cached_sqlplus(sql, 'users')
         rows = parse_sql_rows(result)
         users = []
         for row in rows:
@@ -1816,6 +2052,7 @@ FROM dba_users WHERE ORACLE_MAINTAINED='N' ORDER BY username FETCH FIRST 50 ROWS
 
 @app.route('/api/security/user/create', methods=['POST'])
 @login_required
+@invalidates('users')
 def api_security_user_create():
     """API: Create database user (supports pdb field for PDB-level creation)"""
     data = request.json
@@ -1851,6 +2088,7 @@ ALTER USER {username} QUOTA UNLIMITED ON {default_ts};"""
 @app.route('/api/security/user/<name>/lock', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('users')
 def api_security_user_lock(name):
     """API: Lock a database user"""
     pdb = request.args.get('pdb', '').strip().upper()
@@ -1865,6 +2103,7 @@ def api_security_user_lock(name):
 @app.route('/api/security/user/<name>/unlock', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('users')
 def api_security_user_unlock(name):
     """API: Unlock a database user"""
     pdb = request.args.get('pdb', '').strip().upper()
@@ -1879,6 +2118,7 @@ def api_security_user_unlock(name):
 @app.route('/api/security/user/<name>/drop', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('users')
 def api_security_user_drop(name):
     """API: Drop a database user"""
     pdb = request.args.get('pdb', '').strip().upper()
@@ -2239,6 +2479,7 @@ def api_infra_configs_delete(filename):
 @app.route('/api/infrastructure/configs/deploy', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('tablespaces', 'users')
 def api_infra_configs_deploy():
     """API: Deploy a database config — creates PDB, tablespaces, users, protection"""
     data = request.json or {}
@@ -2433,6 +2674,7 @@ def sample():
 
 @app.route('/api/sample/create', methods=['POST'])
 @login_required
+@invalidates('tablespaces', 'users')
 def api_sample_create():
     """API: Create sample HR schema"""
     try:
@@ -2512,8 +2754,66 @@ def terminal():
     return render_template('terminal.html')
 
 
+# Whitelist of allowed command prefixes for DBA operations
+TERMINAL_ALLOWED_PREFIXES = [
+    'oradba ',       # Our CLI tool
+    'sqlplus ',      # SQL*Plus
+    'lsnrctl ',      # Listener control
+    'rman ',         # RMAN backup/recovery
+    'asmcmd ',       # ASM commands
+    'srvctl ',       # Server control for RAC
+    'crsctl ',       # Cluster control
+    'dbca ',         # Database Configuration Assistant
+    'emctl ',        # Enterprise Manager
+    'expdp ',        # Data Pump Export
+    'impdp ',        # Data Pump Import
+    'adrci ',        # ADR Command Interpreter
+    'opatch ',       # Oracle patch utility
+    'datapatch ',    # SQL patch utility
+]
+
+# Also allow these exact commands (no prefix)
+TERMINAL_ALLOWED_EXACT = [
+    'id oracle', 'hostname', 'uname -a', 'df -h', 'free -h',
+    'uptime', 'nproc', 'cat /etc/os-release', 'cat /etc/oratab',
+    'ps aux | grep ora_', 'ps aux | grep tnslsnr',
+    'echo $ORACLE_HOME', 'echo $ORACLE_SID', 'echo $ORACLE_BASE',
+    'ls $ORACLE_HOME', 'ls /u01/app/oracle/oradata',
+]
+
+# Reject shell metacharacters to prevent command injection
+# Allow pipes only in pre-approved TERMINAL_ALLOWED_EXACT commands
+TERMINAL_DANGEROUS_CHARS = [';', '&&', '||', '$(', '`', '>', '<', '\n', '\r']
+
+# Allow commands starting with common safe utilities
+TERMINAL_SAFE_STARTS = ['cat /etc/', 'ls /u01/', 'ls /home/oracle', 'tail ', 'head ', 'grep ']
+
+TERMINAL_ENV_SETUP = 'source ~/.bash_profile 2>/dev/null; export CV_ASSUME_DISTID=OEL7.8;'
+
+
+def check_terminal_command(command):
+    """Return an error message if the terminal may not run ``command``, else None"""
+    is_exact = command.strip() in TERMINAL_ALLOWED_EXACT
+    if not is_exact:
+        # For non-exact commands, reject ALL shell metacharacters including pipes
+        if '|' in command or any(ch in command for ch in TERMINAL_DANGEROUS_CHARS):
+            return 'Shell metacharacters (;, &&, ||, |, $(), `, >, <) are not allowed in commands.'
+    
+    allowed = any(command.startswith(prefix) for prefix in TERMINAL_ALLOWED_PREFIXES)
+    if not allowed:
+        allowed = is_exact
+    if not allowed:
+        allowed = any(command.startswith(s) for s in TERMINAL_SAFE_STARTS)
+    
+    if not allowed:
+        return ('Command not allowed. Allowed: oradba, sqlplus, lsnrctl, rman, asmcmd, srvctl, '
+                'crsctl, dbca, expdp, impdp, opatch, and basic system commands.')
+    return None
+
+
 @app.route('/api/terminal/execute', methods=['POST'])
 @login_required
+@invalidates(*ALL_CACHE_TAGS)
 def api_terminal_execute():
     """API: Execute command in terminal - supports oradba, sqlplus, lsnrctl, rman, and basic shell"""
     data = request.json
@@ -2522,61 +2822,9 @@ def api_terminal_execute():
     if not command:
         return jsonify({'success': False, 'error': 'No command provided'})
     
-    # Whitelist of allowed command prefixes for DBA operations
-    ALLOWED_PREFIXES = [
-        'oradba ',       # Our CLI tool
-        'sqlplus ',      # SQL*Plus
-        'lsnrctl ',      # Listener control
-        'rman ',         # RMAN backup/recovery
-        'asmcmd ',       # ASM commands
-        'srvctl ',       # Server control for RAC
-        'crsctl ',       # Cluster control
-        'dbca ',         # Database Configuration Assistant
-        'emctl ',        # Enterprise Manager
-        'expdp ',        # Data Pump Export
-        'impdp ',        # Data Pump Import
-        'adrci ',        # ADR Command Interpreter
-        'opatch ',       # Oracle patch utility
-        'datapatch ',    # SQL patch utility
-    ]
-    
-    # Also allow these exact commands (no prefix)
-    ALLOWED_EXACT = [
-        'id oracle', 'hostname', 'uname -a', 'df -h', 'free -h',
-        'uptime', 'nproc', 'cat /etc/os-release', 'cat /etc/oratab',
-        'ps aux | grep ora_', 'ps aux | grep tnslsnr',
-        'echo $ORACLE_HOME', 'echo $ORACLE_SID', 'echo $ORACLE_BASE',
-        'ls $ORACLE_HOME', 'ls /u01/app/oracle/oradata',
-    ]
-    
-    # Reject shell metacharacters to prevent command injection
-    # Allow pipes only in pre-approved ALLOWED_EXACT commands
-    DANGEROUS_CHARS = [';', '&&', '||', '$(', '`', '>', '<', '\n', '\r']
-    has_pipe = '|' in command
-    
-    # Security check
-    is_exact = command.strip() in ALLOWED_EXACT
-    if not is_exact:
-        # For non-exact commands, reject ALL shell metacharacters including pipes
-        if has_pipe or any(ch in command for ch in DANGEROUS_CHARS):
-            return jsonify({
-                'success': False,
-                'error': 'Shell metacharacters (;, &&, ||, |, $(), `, >, <) are not allowed in commands.'
-            })
-    
-    allowed = any(command.startswith(prefix) for prefix in ALLOWED_PREFIXES)
-    if not allowed:
-        allowed = is_exact
-    if not allowed:
-        # Allow commands starting with common safe utilities
-        SAFE_STARTS = ['cat /etc/', 'ls /u01/', 'ls /home/oracle', 'tail ', 'head ', 'grep ']
-        allowed = any(command.startswith(s) for s in SAFE_STARTS)
-    
-    if not allowed:
-        return jsonify({
-            'success': False, 
-            'error': 'Command not allowed. Allowed: oradba, sqlplus, lsnrctl, rman, asmcmd, srvctl, crsctl, dbca, expdp, impdp, opatch, and basic system commands.'
-        })
+    error = check_terminal_command(command)
+    if error:
+        return jsonify({'success': False, 'error': error})
     
     try:
         if command.startswith('oradba '):
@@ -2584,7 +2832,7 @@ def api_terminal_execute():
         else:
             # Run as oracle user with Oracle environment
             result = run_shell_command(
-                f'source ~/.bash_profile 2>/dev/null; export CV_ASSUME_DISTID=OEL7.8; {command}',
+                f'{TERMINAL_ENV_SETUP} {command}',
                 as_oracle=True,
                 timeout=120
             )
@@ -2593,6 +2841,208 @@ def api_terminal_execute():
         return jsonify({'success': False, 'error': str(e)})
 
 
+# Streaming terminal (Server-Sent Events): POST starts the command, the
+# browser's EventSource then reads its output line by line.
+terminal_streams = {}
+terminal_streams_lock = threading.Lock()
+TERMINAL_MAX_STREAMS = int(os.environ.get('ORADBA_TERMINAL_MAX_STREAMS', '3'))
+TERMINAL_MAX_SECONDS = int(os.environ.get('ORADBA_TERMINAL_MAX_SECONDS', '3600'))
+TERMINAL_ATTACH_GRACE = 60
+
+
+def _terminal_argv(command):
+    """argv + env for a validated terminal command (same paths as execute)"""
+    env = cli_environment()
+    env['PYTHONUNBUFFERED'] = '1'
+    if command.startswith('oradba '):
+        return command.split(), env
+    uid = os.getuid() if hasattr(os, 'getuid') else -1
+    if uid == 0:
+        return ['su', '-', 'oracle', '-c', f'{TERMINAL_ENV_SETUP} {command}'], env
+    return ['bash', '-c', f'{TERMINAL_ENV_SETUP} {command}'], env
+
+
+def _reap_terminal_streams(now=None):
+    """Forget streams no EventSource attached to within TERMINAL_ATTACH_GRACE
+    (cancelling them if still running) and attached ones that finished that
+    long ago; normally the SSE generator removes its own stream"""
+    now = now or time.time()
+    with terminal_streams_lock:
+        for stream_id, stream in list(terminal_streams.items()):
+            if stream.attached is None and now - stream.started > TERMINAL_ATTACH_GRACE:
+                stream.cancel('client never attached')
+            elif not (stream.finished and now - stream.finished_at > TERMINAL_ATTACH_GRACE):
+                continue
+            del terminal_streams[stream_id]
+
+
+def _own_stream(stream_id):
+    with terminal_streams_lock:
+        stream = terminal_streams.get(stream_id)
+    if stream is None or stream.owner != session.get('user'):
+        return None
+    return stream
+
+
+@app.route('/api/terminal/stream', methods=['POST'])
+@login_required
+def api_terminal_stream_start():
+    """API: Start a terminal command whose output is read from /api/terminal/stream/<id>"""
+    data = request.json or {}
+    command = data.get('command', '')
+    if not command:
+        return jsonify({'success': False, 'error': 'No command provided'})
+    error = check_terminal_command(command)
+    if error:
+        return jsonify({'success': False, 'error': error})
+    
+    user = session.get('user')
+    _reap_terminal_streams()
+    with terminal_streams_lock:
+        active = [s for s in terminal_streams.values() if s.owner == user and not s.finished]
+        if len(active) >= TERMINAL_MAX_STREAMS:
+            return jsonify({'success': False,
+                            'error': f'Too many running commands (max {TERMINAL_MAX_STREAMS}). '
+                                     f'Cancel one first.'}), 429
+        argv, env = _terminal_argv(command)
+        stream = CommandStream(argv, env=env, owner=user, max_runtime=TERMINAL_MAX_SECONDS)
+        try:
+            stream.start()
+        except OSError as e:
+            return jsonify({'success': False, 'error': str(e)})
+        terminal_streams[stream.id] = stream
+    # reap it even if no further command is ever started
+    reaper = threading.Timer(TERMINAL_ATTACH_GRACE + 1, _reap_terminal_streams)
+    reaper.daemon = True
+    reaper.start()
+    return jsonify({'success': True, 'stream_id': stream.id})
+
+
+@app.route('/api/terminal/stream/<stream_id>')
+@login_required
+def api_terminal_stream(stream_id):
+    """API: Server-Sent Events with the command's stdout/stderr lines and exit code"""
+    stream = _own_stream(stream_id)
+    if stream is None:
+        return jsonify({'success': False, 'error': 'Stream not found'}), 404
+    
+    def generate():
+        try:
+            yield ': connected\n\n'
+            for kind, data in stream.events():
+                if kind == 'heartbeat':
+                    yield ': keepalive\n\n'
+                else:
+                    yield f'event: {kind}\ndata: {json.dumps(data)}\n\n'
+        finally:
+            # finished, or the browser went away: never leave it running
+            stream.cancel('client disconnected')
+            with terminal_streams_lock:
+                terminal_streams.pop(stream.id, None)
+    
+    return Response(generate(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+
+@app.route('/api/terminal/stream/<stream_id>/cancel', methods=['POST'])
+@login_required
+def api_terminal_stream_cancel(stream_id):
+    """API: Stop a streaming terminal command"""
+    stream = _own_stream(stream_id)
+    if stream is None:
+        return jsonify({'success': False, 'error': 'Stream not found'}), 404
+    return jsonify({'success': True, 'cancelled': stream.cancel()})
+
+
+# Persistent sqlplus sessions: `sqlplus <connect>` in the terminal keeps one
+# process per user session, so follow-up statements skip the logon and keep
+# session state (ALTER SESSION SET CONTAINER, NLS, open transactions).
+SQLPLUS_SESSION_RE = _re_mod.compile(r'^sqlplus\s+((?:-[A-Za-z]+\s+)*)([^@\s-]\S*(?:\s+as\s+sys\w+)?)\s*$',
+                                     _re_mod.IGNORECASE)
+
+
+def _sql_session_factory(connect, owner):
+    oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
+    uid = os.getuid() if hasattr(os, 'getuid') else -1
+    if uid == 0:
+        cmd = ['su', '-', 'oracle', '-c',
+               f'{oracle_home}/bin/sqlplus -s -L {shlex.quote(connect)}']
+    else:
+        cmd = [f'{oracle_home}/bin/sqlplus', '-s', '-L', connect]
+    return SqlSession(cmd, env=cli_environment(), owner=owner)
+
+
+sql_sessions = SqlSessionManager(
+    _sql_session_factory,
+    max_per_user=int(os.environ.get('ORADBA_SQL_SESSIONS_PER_USER', '2')),
+    idle_timeout=int(os.environ.get('ORADBA_SQL_IDLE_TIMEOUT', '600')))
+
+
+@app.route('/api/terminal/sql', methods=['GET'])
+@login_required
+def api_terminal_sql_list():
+    """API: The current user's open sqlplus sessions"""
+    return jsonify({'success': True,
+                    'sessions': [s.to_dict() for s in sql_sessions.list(session.get('user'))],
+                    'idle_timeout': sql_sessions.idle_timeout})
+
+
+@app.route('/api/terminal/sql', methods=['POST'])
+@login_required
+def api_terminal_sql_open():
+    """API: Open a persistent session from a terminal `sqlplus <connect>` command"""
+    data = request.json or {}
+    command = data.get('command', 'sqlplus / as sysdba').strip()
+    error = check_terminal_command(command)
+    match = SQLPLUS_SESSION_RE.match(command)
+    if error or not match:
+        return jsonify({'success': False,
+                        'error': error or 'Use: sqlplus <connect> (no @script) for a session'})
+    try:
+        sql_session, banner = sql_sessions.open(session.get('user'), match.group(2))
+    except SessionLimitError as e:
+        return jsonify({'success': False, 'error': str(e)}), 429
+    except (SessionError, OSError) as e:
+        return jsonify({'success': False, 'error': str(e)})
+    return jsonify({'success': True, 'session_id': sql_session.id, 'output': banner})
+
+
+@app.route('/api/terminal/sql/<session_id>', methods=['POST'])
+@login_required
+@invalidates(*ALL_CACHE_TAGS)
+def api_terminal_sql_execute(session_id):
+    """API: Run a statement in an open session (EXIT closes it)"""
+    sql_session = sql_sessions.get(session_id, session.get('user'))
+    if sql_session is None:
+        return jsonify({'success': False, 'error': 'Session not found or expired',
+                        'closed': True}), 404
+    sql = (request.json or {}).get('sql', '')
+    error = check_sql_input(sql)
+    if error:
+        return jsonify({'success': False, 'error': error})
+    started = time.perf_counter()
+    try:
+        output = sql_session.execute(sql)
+    except SessionError as e:
+        sql_sessions.close(session_id)
+        return jsonify({'success': False, 'error': str(e), 'closed': True})
+    closed = not sql_session.alive
+    if closed:
+        sql_sessions.close(session_id)
+    return jsonify({'success': True, 'output': output, 'closed': closed,
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 1)})
+
+
+@app.route('/api/terminal/sql/<session_id>', methods=['DELETE'])
+@login_required
+def api_terminal_sql_close(session_id):
+    """API: Close a sqlplus session"""
+    if sql_sessions.get(session_id, session.get('user')) is None:
+        return jsonify({'success': False, 'error': 'Session not found'}), 404
+    sql_sessions.close(session_id)
+    return jsonify({'success': True})
+
+
 # ============================================================================
 # INSTALLATION ROUTES
 # ============================================================================
@@ -2723,7 +3173,6 @@ def api_installation_detect():
 @admin_required
 def api_installation_download():
     """Download Oracle software"""
-    import subprocess
     data = request.json or {}
     source = data.get('source', 'google_drive')
     
@@ -2789,21 +3238,23 @@ else
 fi
 """
             
-            # Write script
-            script_path = '/tmp/oracle-download.sh'
+            # Write script next to the job log and run it as a background job
+            job = jobs.create(None, name='Download Oracle 19c', tag='download',
+                              meta={'download_path': download_path})
+            script_path = job.path('sh')
+            script_path.parent.mkdir(parents=True, exist_ok=True)
             with open(script_path, 'w') as f:
                 f.write(script_content)
             
             os.chmod(script_path, 0o755)
-            
-            # Execute script in background
-            cmd = f"nohup bash {script_path} > /tmp/oracle-download.log 2>&1 &"
-            subprocess.Popen(cmd, shell=True)
+            job.cmd = ['bash', str(script_path)]
+            jobs.enqueue(job)
             
             return jsonify({
                 'success': True,
                 'message': 'Download started in background',
-                'log_file': '/tmp/oracle-download.log',
+                'job_id': job.id,
+                'log_file': job.log_file,
                 'download_path': download_path
             })
         else:
@@ -2858,7 +3309,6 @@ def api_installation_system():
         result = run_tp_script('01', background=True, as_user='root')
         if result.get('success'):
             result['message'] = 'System prerequisites installation started (TP01)'
-            result['log_file'] = '/tmp/tp01.log'
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -2873,7 +3323,6 @@ def api_installation_binaries():
         result = run_tp_script('02', background=True, as_user='oracle')
         if result.get('success'):
             result['message'] = 'Oracle binaries installation started (TP02)'
-            result['log_file'] = '/tmp/tp02.log'
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -2888,7 +3337,6 @@ def api_installation_database():
         result = run_tp_script('03', background=True, as_user='oracle')
         if result.get('success'):
             result['message'] = 'Database creation started (TP03)'
-            result['log_file'] = '/tmp/tp03.log'
         return jsonify(result)
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
@@ -2900,19 +3348,23 @@ def api_installation_database():
 def api_installation_quick():
     """One-click installation — runs oradba install --yes (same code path as CLI)"""
     try:
-        log_file = '/tmp/oracle-install-all.log'
-
         # Use the unified CLI command so both CLI and GUI share identical logic.
         # oradba install --yes  →  InstallManager.install_all(auto_yes=True)
-        # stdout is redirected to the log file; install.py also writes its own
-        # log under /var/log/oracledba/install-all.log.
-        cmd = f"nohup oradba install --yes > {log_file} 2>&1 &"
-        subprocess.Popen(cmd, shell=True)
+        # stdout goes to the job log; install.py also writes its own log
+        # under /var/log/oracledba/install-all.log and the structured
+        # progress stream to ORADBA_EVENTS_FILE (one file per job).
+        env = os.environ.copy()
+        job = jobs.create(['oradba', 'install', '--yes'], name='Quick install',
+                          tag=INSTALL_JOB_TAGS['quick'], env=env)
+        job.meta['events_file'] = str(job.path('events.jsonl'))
+        env['ORADBA_EVENTS_FILE'] = job.meta['events_file']
+        jobs.enqueue(job)
 
         return jsonify({
             'success': True,
             'message': 'Automated installation started (oradba install --yes). This will take 30-60 minutes.',
-            'log_file': log_file,
+            'job_id': job.id,
+            'log_file': job.log_file,
             'steps': [
                 {'step': 1, 'name': 'System Readiness', 'status': 'running'},
                 {'step': 2, 'name': 'Download & Extract Binaries', 'status': 'pending'},
@@ -2924,87 +3376,176 @@ def api_installation_quick():
         return jsonify({'success': False, 'error': str(e)})
 
 
+# Installation log type -> job tag; the latest job with that tag owns the log
+INSTALL_JOB_TAGS = {
+    'download': 'download',
+    'system': 'tp01',
+    'binaries': 'tp02',
+    'database': 'tp03',
+    'quick': 'install-quick'
+}
+
+
+def _job_events_file(job):
+    """JSON-lines progress stream written by InstallManager (see utils/events.py)"""
+    return job.meta.get('events_file') if job else None
+
+
+# Step progress of the latest job per install tag, folded from what each
+# poll appended to its event stream or log
+install_progress = {}
+install_progress_lock = threading.Lock()
+
+# Step markers from install.py _step_header() / _step_result()
+_STEP_HEADER_RE = _re_mod.compile(r'Step (\d+)/(\d+)')
+_STEP_DONE_RE = _re_mod.compile(r'[✓✓] Step (\d+) complete')
+_STEP_FAILED_RE = _re_mod.compile(r'[✗✗] Step (\d+) FAILED')
+
+
+def _read_new_lines(path, offset):
+    """(text, new_offset) of the complete lines appended after ``offset``"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        data = f.read()
+    end = data.rfind(b'\n') + 1
+    return data[:end].decode('utf-8', errors='replace'), offset + end
+
+
+def _scan_step_markers(content, state):
+    """Fold the step markers found in ``content`` into a summarize_progress() state"""
+    state = dict(state, step_statuses=dict(state['step_statuses']))
+    headers = _STEP_HEADER_RE.findall(content)
+    if headers:
+        state['current_step'] = int(headers[-1][0])
+        state['total_steps'] = int(headers[-1][1])
+    for s in _STEP_DONE_RE.findall(content):
+        state['step_statuses'][int(s)] = 'complete'
+    for s in _STEP_FAILED_RE.findall(content):
+        state['step_statuses'][int(s)] = 'failed'
+    if 'Installation Complete' in content:
+        state['current_step'] = state['total_steps']
+    return state
+
+
+def _install_progress(tag, job):
+    """summarize_progress() state of an install job.
+
+    Prefers the structured event stream and falls back to the log's step
+    markers while the stream has no events. Each file is read from the
+    offset where the previous poll stopped.
+    """
+    with install_progress_lock:
+        entry = install_progress.get(tag)
+        if entry is None or entry['job'] != job.id:
+            entry = install_progress[tag] = {'job': job.id, 'has_events': False,
+                                             'events': (0, summarize_progress([])),
+                                             'log': (0, summarize_progress([]))}
+        events_file = _job_events_file(job)
+        if events_file and os.path.exists(events_file):
+            offset, state = entry['events']
+            if offset > os.path.getsize(events_file):
+                # the stream was recreated
+                offset, state = 0, summarize_progress([])
+            events, offset = read_events(events_file, offset)
+            entry['events'] = offset, summarize_progress(events, state=state)
+            entry['has_events'] = entry['has_events'] or bool(events)
+        if entry['has_events']:
+            return entry['events'][1]
+        offset, state = entry['log']
+        if offset > os.path.getsize(job.log_file):
+            offset, state = 0, summarize_progress([])
+        content, offset = _read_new_lines(job.log_file, offset)
+        entry['log'] = offset, _scan_step_markers(content, state) if content else state
+        return entry['log'][1]
+
+
+@app.route('/api/installation/events/<log_type>')
+@login_required
+@admin_required
+def api_installation_events(log_type):
+    """Read structured progress events incrementally.
+
+    Pass ?offset= from the previous response to receive only new events.
+    """
+    if log_type != 'quick':
+        return jsonify({'success': False, 'error': 'No event stream for this log type'})
+    events_file = _job_events_file(jobs.latest(INSTALL_JOB_TAGS[log_type]))
+    if not events_file:
+        return jsonify({'success': True, 'events': [], 'offset': 0, 'available': False})
+    try:
+        offset = max(0, request.args.get('offset', 0, type=int))
+        events, new_offset = read_events(events_file, offset)
+        return jsonify({
+            'success': True,
+            'events': events,
+            'offset': new_offset,
+            'available': os.path.exists(events_file)
+        })
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)})
+
+
 @app.route('/api/installation/logs/<log_type>')
 @login_required
 @admin_required
 def api_installation_logs(log_type):
-    """Get installation logs with step-progress detection"""
-    import subprocess
+    """Get installation logs with step-progress detection.
+
+    With ?offset= only the bytes appended since that offset are returned
+    (in 'logs', with 'append': true) instead of the whole file.
+    """
     try:
-        log_files = {
-            'download': '/tmp/oracle-download.log',
-            'system': '/tmp/tp01.log',
-            'binaries': '/tmp/tp02.log',
-            'database': '/tmp/tp03.log',
-            'quick': '/tmp/oracle-install-all.log'
-        }
-        
-        log_file = log_files.get(log_type)
-        if not log_file:
+        tag = INSTALL_JOB_TAGS.get(log_type)
+        if not tag:
             return jsonify({
                 'success': False,
                 'error': 'Invalid log type'
             })
         
-        if not os.path.exists(log_file):
+        job = jobs.latest(tag)
+        log_file = job.log_file if job else None
+        if not log_file or not os.path.exists(log_file):
             return jsonify({
                 'success': True,
                 'logs': f'Waiting for {log_type} to start...\n',
                 'size': 0,
-                'is_running': True,
+                'is_running': bool(job and job.active),
+                'job': job.to_dict() if job else None,
                 'current_step': 0
             })
         
         # Get file size
         file_size = os.path.getsize(log_file)
         
-        # Read all content
-        with open(log_file, 'r', errors='replace') as f:
-            content = f.read()
-        
-        # Check if process is still running
-        is_running = False
-        if log_type == 'quick':
-            # For unified install, check for the oradba install process
-            proc = subprocess.run(['pgrep', '-f', 'oradba install'], capture_output=True)
-            is_running = proc.returncode == 0
+        offset = request.args.get('offset', type=int)
+        if offset is not None and 0 <= offset <= file_size:
+            with open(log_file, 'rb') as f:
+                f.seek(offset)
+                content = f.read().decode('utf-8', errors='replace')
         else:
-            script_file = log_file.replace('.log', '.sh')
-            if os.path.exists(script_file):
-                proc = subprocess.run(['pgrep', '-f', script_file], capture_output=True)
-                is_running = proc.returncode == 0
+            offset = None
+            with open(log_file, 'r', errors='replace') as f:
+                content = f.read()
+        
+        # Job state is tracked in-process: no process-table scan needed
+        is_running = job.active
         
-        # Parse step progress from log content (from InstallManager step markers)
-        current_step = 0
-        total_steps = 4
-        step_statuses = {}
-        if content:
-            import re
-            # Detect "Step X/Y" headers from install.py _step_header()
-            step_matches = re.findall(r'Step (\d+)/(\d+)', content)
-            if step_matches:
-                current_step = int(step_matches[-1][0])
-                total_steps = int(step_matches[-1][1])
-            # Detect completed steps from _step_result()
-            completed = re.findall(r'[✓✓] Step (\d+) complete', content)
-            for s in completed:
-                step_statuses[int(s)] = 'complete'
-            # Detect failed steps
-            failed = re.findall(r'[✗✗] Step (\d+) FAILED', content)
-            for s in failed:
-                step_statuses[int(s)] = 'failed'
-            # Detect overall completion
-            if 'Installation Complete' in content:
-                current_step = total_steps
+        # Step progress: the event stream, or the log's step markers
+        progress = _install_progress(tag, job)
         
         return jsonify({
             'success': True,
             'logs': content,
+            'append': offset is not None,
             'size': file_size,
             'is_running': is_running,
-            'current_step': current_step,
-            'total_steps': total_steps,
-            'step_statuses': step_statuses
+            'job': job.to_dict(),
+            'current_step': progress['current_step'],
+            'total_steps': progress['total_steps'],
+            'step_statuses': progress['step_statuses'],
+            'percent': progress['percent'],
+            'phase': progress['phase'],
+            'eta': progress['eta']
         })
     except Exception as e:
         return jsonify({
@@ -3017,14 +3558,21 @@ def api_installation_logs(log_type):
 # HELPER FUNCTIONS
 # ============================================================================
 
-def execute_cli_command(args, timeout=300):
-    """Execute OracleDBA CLI command with proper PATH"""
+def cli_environment():
+    """Environment for oradba/Oracle tools: ORACLE_HOME/bin first on PATH"""
     oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
     env = os.environ.copy()
     env['PATH'] = f"{oracle_home}/bin:/usr/local/bin:/usr/bin:/bin:" + env.get('PATH', '')
     env['ORACLE_HOME'] = oracle_home
     env['ORACLE_SID'] = os.environ.get('ORACLE_SID', 'GDCPROD')
     env['CV_ASSUME_DISTID'] = 'OEL7.8'
+    return env
+
+
+@perf.timed('cli', lambda args, *a, **k: fingerprint_command(args))
+def execute_cli_command(args, timeout=300):
+    """Execute OracleDBA CLI command with proper PATH"""
+    env = cli_environment()
     
     try:
         result = subprocess.run(
@@ -3048,6 +3596,7 @@ def execute_cli_command(args, timeout=300):
         return f"Error executing command: {str(e)}"
 
 
+@perf.timed('sql', lambda sql, *a, **k: fingerprint_sql(sql))
 def run_sqlplus(sql, as_sysdba=True, timeout=60):
     """Run SQL command via sqlplus and return output (uses stdin pipe to preserve $ in V$ view names)"""
     oracle_home = os.environ.get('ORACLE_HOME', '/u01/app/oracle/product/19.3.0/dbhome_1')
@@ -3096,13 +3645,16 @@ def parse_sql_rows(output):
         if not stripped or set(stripped) <= {'-'}:
             continue
         vals = [v.strip() for v in line.split('|')]
+        if vals == headers:
+            continue  # heading repeated at each page break
         if len(vals) >= len(headers):
             rows.append(dict(zip(headers, vals[:len(headers)])))
     return rows
 
 
-def run_tp_script(tp_number, background=True, as_user='oracle'):
-    """Run a TP script from the scripts directory"""
+def run_tp_script(tp_number, background=True, as_user='oracle', invalidates=ALL_CACHE_TAGS):
+    """Run a TP script from the scripts directory; cached results for
+    ``invalidates`` are dropped once it has finished"""
     scripts_dir = Path(__file__).parent / 'scripts'
     
     tp_map = {
@@ -3145,15 +3697,18 @@ def run_tp_script(tp_number, background=True, as_user='oracle'):
     
     if background:
         if run_user == 'oracle' and is_root:
-            cmd = f'nohup su - oracle -c "{env_setup} bash {script_path}" > {log_file} 2>&1 &'
+            cmd = ['su', '-', 'oracle', '-c', f'{env_setup} bash {script_path}']
         else:
-            cmd = f'nohup bash {script_path} > {log_file} 2>&1 &'
+            cmd = ['bash', str(script_path)]
         
-        subprocess.Popen(cmd, shell=True)
+        job = jobs.submit(cmd, name=f'TP{tp_number} {script_name}', tag=f'tp{tp_number}',
+                          meta={'invalidates': list(invalidates)})
         return {
             'success': True,
-            'message': f'TP{tp_number} ({script_name}) started in background',
-            'log_file': log_file,
+            'message': f'TP{tp_number} ({script_name}) {"started in background" if job.state == "running" else "queued"}',
+            'job_id': job.id,
+            'state': job.state,
+            'log_file': job.log_file,
             'script': script_name
         }
     else:
@@ -3164,6 +3719,7 @@ def run_tp_script(tp_number, background=True, as_user='oracle'):
                 cmd = ['bash', str(script_path)]
             
             result = subprocess.run(cmd, capture_output=True, text=True, timeout=3600)
+            invalidate_cached(*invalidates)
             
             # Also write to log file
             with open(log_file, 'w') as f:
@@ -3183,6 +3739,7 @@ def run_tp_script(tp_number, background=True, as_user='oracle'):
             return {'success': False, 'error': str(e)}
 
 
+@perf.timed('shell', lambda command, *a, **k: fingerprint_command(command))
 def run_shell_command(command, as_oracle=True, timeout=120):
     """Run a shell command and return output"""
     try:
@@ -3253,9 +3810,10 @@ def api_labs_list():
         lab['script'] = script_file
         lab['exists'] = (scripts_dir / script_file).exists() if script_file else False
         
-        # Check if log exists
-        log_file = f"/tmp/tp{lab['number']}.log"
-        lab['has_log'] = os.path.exists(log_file)
+        # Latest job for this lab, if any
+        job = jobs.latest(f"tp{lab['number']}")
+        lab['has_log'] = bool(job and os.path.exists(job.log_file)) or os.path.exists(f"/tmp/tp{lab['number']}.log")
+        lab['state'] = job.state if job else None
     
     return jsonify({'success': True, 'labs': labs_info})
 
@@ -3280,26 +3838,22 @@ def api_labs_run():
 @login_required
 def api_labs_log(tp_number):
     """API: Get TP lab log"""
-    log_file = f'/tmp/tp{tp_number}.log'
+    job = jobs.latest(f'tp{tp_number}')
+    # Foreground runs (background=False) still write the legacy /tmp log
+    log_file = job.log_file if job else f'/tmp/tp{tp_number}.log'
     
     if not os.path.exists(log_file):
-        return jsonify({'success': True, 'logs': f'No log yet for TP{tp_number}. Run the lab first.\n', 'size': 0, 'is_running': False})
+        return jsonify({'success': True, 'logs': f'No log yet for TP{tp_number}. Run the lab first.\n', 'size': 0,
+                        'is_running': bool(job and job.active)})
     
     try:
         file_size = os.path.getsize(log_file)
         with open(log_file, 'r') as f:
             content = f.read()
         
-        # Check if script is still running
-        is_running = False
-        scripts_dir = Path(__file__).parent / 'scripts'
-        try:
-            proc = subprocess.run(['pgrep', '-f', f'tp{tp_number}'], capture_output=True)
-            is_running = proc.returncode == 0
-        except:
-            pass
-        
-        return jsonify({'success': True, 'logs': content, 'size': file_size, 'is_running': is_running})
+        return jsonify({'success': True, 'logs': content, 'size': file_size,
+                        'is_running': bool(job and job.active),
+                        'job': job.to_dict() if job else None})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
@@ -3321,10 +3875,29 @@ def api_labs_run_sequence():
         tps_to_run = all_tps[start_idx:end_idx]
     except ValueError:
         return jsonify({'success': False, 'error': f'Invalid range: {start_tp} to {end_tp}'})
-    
+
+    # Parallel: the dependency-aware lab runner (oradba labs run --parallel N)
+    try:
+        parallel = max(1, min(8, int(data.get('parallel') or 1)))
+    except (TypeError, ValueError):
+        parallel = 1
+    if parallel > 1:
+        cmd = ['oradba', 'labs', 'run', '--from', start_tp, '--to', end_tp,
+               '--parallel', str(parallel)]
+        if data.get('isolate_pdbs'):
+            cmd.append('--isolate-pdbs')
+        job = jobs.submit(cmd, name=f'TP labs {start_tp}-{end_tp} (parallel {parallel})',
+                          tag='tp-sequence', meta={'tps': tps_to_run, 'parallel': parallel})
+        return jsonify({
+            'success': True,
+            'message': f'Running TPs {start_tp} to {end_tp} with up to {parallel} labs at once',
+            'tps': tps_to_run,
+            'job_id': job.id,
+            'log_file': job.log_file
+        })
+
     # Create a master script that runs all TPs in sequence
     scripts_dir = Path(__file__).parent / 'scripts'
-    log_file = f'/tmp/tp-sequence-{start_tp}-{end_tp}.log'
     
     tp_map = {
         '01': 'tp01-system-readiness.sh', '02': 'tp02-installation-binaire.sh',
@@ -3355,20 +3928,23 @@ def api_labs_run_sequence():
     script_lines.append(f'echo "=== All TPs {start_tp} to {end_tp} completed ==="')
     script_lines.append(f'echo "Finished: $(date)"')
     
-    master_script = '/tmp/tp-sequence.sh'
+    job = jobs.create(None, name=f'TP sequence {start_tp}-{end_tp}', tag='tp-sequence',
+                      meta={'tps': tps_to_run})
+    master_script = job.path('sh')
+    master_script.parent.mkdir(parents=True, exist_ok=True)
     with open(master_script, 'w') as f:
         f.write('\n'.join(script_lines))
     
     os.chmod(master_script, 0o755)
-    
-    cmd = f'nohup bash {master_script} > {log_file} 2>&1 &'
-    subprocess.Popen(cmd, shell=True)
+    job.cmd = ['bash', str(master_script)]
+    jobs.enqueue(job)
     
     return jsonify({
         'success': True,
         'message': f'Running TPs {start_tp} to {end_tp} in sequence',
         'tps': tps_to_run,
-        'log_file': log_file
+        'job_id': job.id,
+        'log_file': job.log_file
     })
 
 
@@ -3376,32 +3952,82 @@ def api_labs_run_sequence():
 @login_required
 def api_labs_sequence_log():
     """API: Get the sequence run log"""
-    # Find the most recent sequence log
-    import glob
-    log_files = glob.glob('/tmp/tp-sequence-*.log')
-    
-    if not log_files:
-        return jsonify({'success': True, 'logs': 'No sequence log found.\n', 'size': 0, 'is_running': False})
+    job = jobs.latest('tp-sequence')
     
-    log_file = max(log_files, key=os.path.getmtime)
+    if not job or not os.path.exists(job.log_file):
+        return jsonify({'success': True, 'logs': 'No sequence log found.\n', 'size': 0,
+                        'is_running': bool(job and job.active)})
     
     try:
-        file_size = os.path.getsize(log_file)
-        with open(log_file, 'r') as f:
+        file_size = os.path.getsize(job.log_file)
+        with open(job.log_file, 'r') as f:
             content = f.read()
         
-        is_running = False
-        try:
-            proc = subprocess.run(['pgrep', '-f', 'tp-sequence.sh'], capture_output=True)
-            is_running = proc.returncode == 0
-        except:
-            pass
-        
-        return jsonify({'success': True, 'logs': content, 'size': file_size, 'is_running': is_running})
+        return jsonify({'success': True, 'logs': content, 'size': file_size,
+                        'is_running': job.active, 'job': job.to_dict()})
     except Exception as e:
         return jsonify({'success': False, 'error': str(e)})
 
 
+# ============================================================================
+# BACKGROUND JOBS
+# ============================================================================
+
+@app.route('/api/jobs')
+@login_required
+def api_jobs_list():
+    """API: Recent background jobs (?tag= to filter, ?limit=)"""
+    tag = request.args.get('tag') or None
+    limit = request.args.get('limit', 50, type=int)
+    return jsonify({
+        'success': True,
+        'jobs': [job.to_dict() for job in jobs.list(tag=tag, limit=limit)],
+        'running': jobs.running_count(),
+        'max_concurrent': jobs.max_concurrent,
+    })
+
+
+@app.route('/api/jobs/<job_id>')
+@login_required
+def api_jobs_get(job_id):
+    """API: State of one background job"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    return jsonify({'success': True, 'job': job.to_dict()})
+
+
+@app.route('/api/jobs/<job_id>/log')
+@login_required
+def api_jobs_log(job_id):
+    """API: Job log from ?offset= (bytes) onwards"""
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    offset = request.args.get('offset', 0, type=int)
+    content, new_offset, size = jobs.read_log(job_id, offset)
+    return jsonify({
+        'success': True,
+        'logs': content,
+        'offset': new_offset,
+        'size': size,
+        'is_running': job.active,
+        'state': job.state,
+    })
+
+
+@app.route('/api/jobs/<job_id>/cancel', methods=['POST'])
+@login_required
+@admin_required
+def api_jobs_cancel(job_id):
+    """API: Cancel a queued or running job (SIGTERM to its process group)"""
+    if jobs.get(job_id) is None:
+        return jsonify({'success': False, 'error': 'Job not found'}), 404
+    if not jobs.cancel(job_id):
+        return jsonify({'success': False, 'error': 'Job already finished'})
+    return jsonify({'success': True, 'message': f'Cancellation requested for job {job_id}'})
+
+
 # ============================================================================
 # MISSING STORAGE API ROUTES (referenced by storage.html)
 # ============================================================================
@@ -3410,8 +4036,8 @@ def api_labs_sequence_log():
 @login_required
 @admin_required
 def api_storage_controlfile_multiplex():
-    """API: Multiplex control files (runs TP04)"""
-    result = run_tp_script('04', background=True)
+    """API: Multiplex control files (runs TP04; caches drop when it finishes)"""
+    result = run_tp_script('04', background=True, invalidates=('controlfiles', 'redologs'))
     return jsonify(result)
 
 
@@ -3421,7 +4047,7 @@ def api_storage_controlfile_list():
     """API: List control files as structured JSON"""
     sql = """COL \"NAME\" FORMAT A100
 SELECT name AS \"NAME\", NVL(status, 'OK') AS \"STATUS\" FROM v$controlfile;"""
-    output = run_sqlplus(sql)
+    output = cached_sqlplus(sql, 'controlfiles')
     rows = parse_sql_rows(output)
     controlfiles = [{'name': r.get('NAME', ''), 'status': r.get('STATUS', '')} for r in rows]
     return jsonify({'success': True, 'controlfiles': controlfiles})
@@ -3431,8 +4057,8 @@ SELECT name AS \"NAME\", NVL(status, 'OK') AS \"STATUS\" FROM v$controlfile;"""
 @login_required
 @admin_required
 def api_storage_redolog_multiplex():
-    """API: Multiplex redo logs (runs TP04)"""
-    result = run_tp_script('04', background=True)
+    """API: Multiplex redo logs (runs TP04; caches drop when it finishes)"""
+    result = run_tp_script('04', background=True, invalidates=('controlfiles', 'redologs'))
     return jsonify(result)
 
 
@@ -3445,7 +4071,7 @@ SELECT f.group# AS "GROUP#", f.member AS "MEMBER", f.type AS "TYPE",
        l.status AS "STATUS", ROUND(l.bytes/1024/1024) AS "SIZE_MB", l.members AS "MEMBERS"
 FROM v$logfile f JOIN v$log l ON f.group# = l.group#
 ORDER BY f.group#, f.member;"""
-    output = run_sqlplus(sql)
+    output = cached_sqlplus(sql, 'redologs')
     rows = parse_sql_rows(output)
     redologs = []
     for r in rows:
@@ -3460,6 +4086,7 @@ ORDER BY f.group#, f.member;"""
 @app.route('/api/storage/redolog/add', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('redologs')
 def api_storage_redolog_add():
     """API: Add a new redo log group"""
     data = request.json or {}
@@ -3471,6 +4098,7 @@ def api_storage_redolog_add():
 @app.route('/api/storage/tablespace/<name>/drop', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('tablespaces')
 def api_storage_tablespace_drop(name):
     """API: Drop tablespace"""
     result = run_sqlplus(f"DROP TABLESPACE {name.upper()} INCLUDING CONTENTS AND DATAFILES;")
@@ -3496,6 +4124,19 @@ def api_protection_fra_status():
     return jsonify({'success': True, 'configured': False, 'name': '', 'size_mb': 0, 'used_mb': 0})
 
 
+@app.route('/api/protection/fra/pressure')
+@login_required
+def api_protection_fra_pressure():
+    """API: Latest FRA watcher sample (usage per file type, pressure, redo rate)"""
+    snap = fra_watcher.last
+    if snap is None or time.time() - snap['timestamp'] > snap['interval']:
+        try:
+            snap = fra_watcher.check()
+        except RuntimeError as e:
+            return jsonify({'success': False, 'error': str(e)})
+    return jsonify({'success': True, **snap})
+
+
 @app.route('/api/protection/fra/enable', methods=['POST'])
 @login_required
 @admin_required
@@ -3556,6 +4197,7 @@ CONFIGURE BACKUP OPTIMIZATION ON;
 @app.route('/api/flashback/database', methods=['POST'])
 @login_required
 @admin_required
+@invalidates(*ALL_CACHE_TAGS)
 def api_flashback_database():
     """API: Flashback Database"""
     data = request.json or {}
@@ -3600,6 +4242,7 @@ FLASHBACK TABLE {table_name} TO TIMESTAMP TO_TIMESTAMP('{timestamp}', 'YYYY-MM-D
 @app.route('/api/security/grant', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('users')
 def api_security_grant():
     """API: Grant privileges"""
     data = request.json or {}
@@ -3616,6 +4259,7 @@ def api_security_grant():
 @app.route('/api/security/profile/create', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('users')
 def api_security_profile_create():
     """API: Create password profile"""
     data = request.json or {}
@@ -3722,16 +4366,17 @@ echo "NFS server configured: {export_path}"
 echo "Clients can mount with: mount {server_ip}:{export_path} {mount_point}"
 """
     
-    script_path = '/tmp/nfs-setup.sh'
+    job = jobs.create(None, name='NFS setup', tag='nfs-setup')
+    script_path = job.path('sh')
+    script_path.parent.mkdir(parents=True, exist_ok=True)
     with open(script_path, 'w') as f:
         f.write(script)
     os.chmod(script_path, 0o755)
+    job.cmd = ['bash', str(script_path)]
+    jobs.enqueue(job)
     
-    log_file = '/tmp/nfs-setup.log'
-    cmd = f'nohup bash {script_path} > {log_file} 2>&1 &'
-    subprocess.Popen(cmd, shell=True)
-    
-    return jsonify({'success': True, 'message': 'NFS configuration started', 'log_file': log_file})
+    return jsonify({'success': True, 'message': 'NFS configuration started',
+                    'job_id': job.id, 'log_file': job.log_file})
 
 
 @app.route('/api/cluster/nfs/test')
@@ -3779,6 +4424,7 @@ def api_cluster_asm_status():
 @app.route('/api/cluster/start', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('status')
 def api_cluster_start():
     """API: Start cluster services"""
     output = run_shell_command('crsctl start has 2>/dev/null || echo "Grid not installed"', as_oracle=False)
@@ -3788,6 +4434,7 @@ def api_cluster_start():
 @app.route('/api/cluster/stop', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('status')
 def api_cluster_stop():
     """API: Stop cluster services"""
     output = run_shell_command('crsctl stop has 2>/dev/null || echo "Grid not installed"', as_oracle=False)
@@ -3871,6 +4518,7 @@ def api_sample_status():
 @app.route('/api/sample/remove', methods=['POST'])
 @login_required
 @admin_required
+@invalidates('tablespaces', 'users')
 def api_sample_remove():
     """API: Remove sample database objects"""
     sql = """
@@ -3884,6 +4532,34 @@ DROP USER hr CASCADE;
 # MAIN
 # ============================================================================
 
+# Background daemons start with the server, or on the first request when a
+# WSGI server (gunicorn, waitress) imports the app without start_gui_server().
+# ORADBA_DAEMONS=0 keeps them all off in this process (tests);
+# ORADBA_SCHEDULER=0 only the backup dispatcher and the FRA watcher.
+_daemons_started = False
+_daemons_lock = threading.Lock()
+
+
+def start_daemons():
+    """Start the backup scheduler, FRA watcher and Data Guard lag monitor (once)"""
+    global _daemons_started
+    with _daemons_lock:
+        if _daemons_started or os.environ.get('ORADBA_DAEMONS', '1') == '0':
+            return
+        _daemons_started = True
+    if os.environ.get('ORADBA_SCHEDULER', '1') != '0':
+        backup_scheduler.start()
+        fra_watcher.start()
+    if dg_monitor.settings['targets']:
+        dg_monitor.start()
+
+
+@app.before_request
+def _start_daemons_on_first_request():
+    if not _daemons_started:
+        start_daemons()
+
+
 def start_gui_server(port=5000, host='0.0.0.0', debug=False):
     """Start the GUI server"""
     print(f"""
@@ -3902,6 +4578,7 @@ def start_gui_server(port=5000, host='0.0.0.0', debug=False):
 ╚══════════════════════════════════════════════════════════╝
 """)
     
+    start_daemons()
     app.run(host=host, port=port, debug=debug)
 
 
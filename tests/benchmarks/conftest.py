@@ -0,0 +1,208 @@
+"""
+Benchmark fixtures: fake ORACLE_HOME, timing helpers and JSON baselines
+
+The fake ORACLE_HOME runs the tests/fakeoracle sqlplus/rman simulators,
+so Oracle-facing code paths can be timed without a database.
+
+Benchmarks only run with --benchmark (compare) or --update-baselines
+(rewrite baselines.json with the measured values). Measurements are
+compared in "floors": multiples of a bare interpreter start
+(``python -c pass``) timed in the same run. A measurement passes when it
+is within ``tolerance`` x baseline + ``slack_floors``, so a faster or
+slower machine moves the floor and the limits together while real
+regressions still show.
+"""
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+import fakeoracle
+
+BASELINE_FILE = Path(__file__).parent / "baselines.json"
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+DEFAULT_META = {
+    'tolerance': 1.5,
+    'slack_floors': 0.5,
+}
+
+
+def _load_baselines():
+    if BASELINE_FILE.exists():
+        with open(BASELINE_FILE) as f:
+            return json.load(f)
+    return {'_meta': dict(DEFAULT_META)}
+
+
+class BaselineRecorder:
+    """Compares measurements with stored baselines (or records new ones)
+
+    ``floor_timer()`` returns the interpreter start time (ms); it runs once,
+    on the first check.
+    """
+
+    def __init__(self, update, floor_timer):
+        self.update = update
+        self.floor_timer = floor_timer
+        self.data = _load_baselines()
+        self.meta = {**DEFAULT_META, **self.data.get('_meta', {})}
+        self.measured = {}
+        self._floor_ms = None
+
+    @property
+    def floor_ms(self):
+        if self._floor_ms is None:
+            self._floor_ms = self.floor_timer()
+        return self._floor_ms
+
+    def check(self, name, value_ms):
+        floors = value_ms / self.floor_ms
+        self.measured[name] = {'ms': round(value_ms, 2), 'floors': round(floors, 3)}
+        if self.update:
+            return
+        baseline = self.data.get(name)
+        if baseline is None or 'floors' not in baseline:
+            pytest.skip(f"no baseline for {name} (run with --update-baselines)")
+        limit = baseline['floors'] * self.meta['tolerance'] + self.meta['slack_floors']
+        assert floors <= limit, (
+            f"{name}: {value_ms:.1f} ms is {floors:.2f} interpreter starts "
+            f"({self.floor_ms:.1f} ms each), baseline {baseline['floors']:.2f} "
+            f"(limit {limit:.2f})")
+
+    def save(self):
+        data = {'_meta': {**self.meta, 'floor_ms': round(self.floor_ms, 2)}}
+        for name, entry in self.data.items():
+            if name != '_meta':
+                data[name] = entry
+        data.update(self.measured)
+        data = {'_meta': data.pop('_meta'), **dict(sorted(data.items()))}
+        with open(BASELINE_FILE, 'w') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+
+
+@pytest.fixture(scope='session')
+def baseline(request):
+    env = {**os.environ, 'PYTHONDONTWRITEBYTECODE': '1'}
+    recorder = BaselineRecorder(request.config.getoption('--update-baselines'),
+                                lambda: time_command(['-c', 'pass'], env, repeat=10))
+    yield recorder
+    if recorder.update and recorder.measured:
+        recorder.save()
+
+
+@pytest.fixture
+def fake_oracle_home(temp_oracle_home):
+    """temp_oracle_home with sqlplus/rman replaced by the fakeoracle simulators"""
+    fakeoracle.install(Path(temp_oracle_home) / 'bin')
+    return temp_oracle_home
+
+
+@pytest.fixture
+def bench_env(fake_oracle_home, tmp_path):
+    """Environment for CLI subprocesses: fake Oracle, throwaway HOME"""
+    home = tmp_path / 'home'
+    home.mkdir()
+    env = os.environ.copy()
+    env.update({
+        'HOME': str(home),
+        'ORACLE_HOME': fake_oracle_home,
+        'ORACLE_SID': 'GDCPROD',
+        'PATH': f"{fake_oracle_home}/bin:{env.get('PATH', '')}",
+        'PYTHONPATH': str(REPO_ROOT),
+        'PYTHONDONTWRITEBYTECODE': '1',
+        'COLUMNS': '100',
+    })
+    return env
+
+
+def time_command(args, env, repeat=5):
+    """Median wall time (ms) of running ``python <args>``"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], env=env, cwd=REPO_ROOT,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def time_call(func, repeat=5):
+    """Median wall time (ms) of calling ``func()`` in-process"""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def import_time(module, env, repeat=5):
+    """Best cumulative import time (ms) of ``module`` from -X importtime"""
+    best = None
+    for _ in range(repeat):
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            env=env, cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        cumulative = None
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            parts = line.split('|')
+            if len(parts) == 3 and parts[2].strip() == module:
+                cumulative = int(parts[1]) / 1000
+        assert cumulative is not None, f"{module} not in importtime output"
+        best = cumulative if best is None else min(best, cumulative)
+    return best
+
+
+@pytest.fixture
+def command_timer(bench_env):
+    """time_command bound to the benchmark environment"""
+    return lambda args, repeat=5: time_command(args, bench_env, repeat)
+
+
+@pytest.fixture
+def import_timer(bench_env):
+    """import_time bound to the benchmark environment"""
+    return lambda module, repeat=5: import_time(module, bench_env, repeat)
+
+
+@pytest.fixture
+def call_timer():
+    """time_call, for in-process benchmarks"""
+    return time_call
+
+
+@pytest.fixture
+def oracle_env(fake_oracle_home, bench_env, monkeypatch):
+    """In-process variant of bench_env: fake Oracle on PATH, non-root uid
+
+    run_sqlplus switches to ``su - oracle`` when running as root, so the
+    uid is faked to take the direct sqlplus path.
+    """
+    for key in ('HOME', 'ORACLE_HOME', 'ORACLE_SID', 'PATH'):
+        monkeypatch.setenv(key, bench_env[key])
+    monkeypatch.setattr(os, 'getuid', lambda: 1000)
+    return fake_oracle_home
+
+
+@pytest.fixture
+def web_server(oracle_env, tmp_path, monkeypatch):
+    """oracledba.web_server with its state files redirected under tmp_path"""
+    from oracledba import web_server as module
+
+    config_dir = tmp_path / 'home' / '.oracledba'
+    monkeypatch.setattr(module, 'CONFIG_DIR', config_dir)
+    monkeypatch.setattr(module, 'CONFIG_FILE', config_dir / 'gui_config.json')
+    monkeypatch.setattr(module, 'USERS_FILE', config_dir / 'gui_users.json')
+    monkeypatch.setattr(module, 'NODES_FILE', config_dir / 'nodes.json')
+    monkeypatch.setattr(module, 'DB_CONFIGS_DIR', config_dir / 'db-configs')
+    return module
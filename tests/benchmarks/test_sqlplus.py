@@ -0,0 +1,57 @@
+"""
+Oracle-facing benchmarks against the fakeoracle sqlplus simulator
+
+These time the process and parsing overhead oradba adds around sqlplus:
+one round trip, parsing a large result set, and the dashboard endpoints
+that issue several queries per request.
+"""
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+
+class TestSqlplusRoundTrip:
+    """run_sqlplus / parse_sql_rows cost"""
+
+    def test_run_sqlplus(self, web_server, baseline, call_timer):
+        output = web_server.run_sqlplus("SELECT INSTANCE_NAME, STATUS FROM V$INSTANCE;")
+        assert web_server.parse_sql_rows(output)[0]['INSTANCE_NAME'] == 'GDCPROD'
+        baseline.check('sqlplus.run_sqlplus',
+                       call_timer(lambda: web_server.run_sqlplus(
+                           "SELECT INSTANCE_NAME, STATUS FROM V$INSTANCE;"), repeat=10))
+
+    def test_parse_large_result(self, web_server, baseline, call_timer, monkeypatch):
+        monkeypatch.setenv('FAKEORACLE_ROWS', '5000')
+        output = web_server.run_sqlplus(
+            "SELECT USERNAME, ACCOUNT_STATUS, DEFAULT_TABLESPACE, CREATED FROM DBA_USERS;")
+        assert len(web_server.parse_sql_rows(output)) == 5000
+        baseline.check('sqlplus.parse_sql_rows_5000',
+                       call_timer(lambda: web_server.parse_sql_rows(output)))
+
+
+class TestDashboardEndpoints:
+    """Endpoints that fan out into several sqlplus calls"""
+
+    def test_databases_list(self, web_server, baseline, call_timer):
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+
+        def request():
+            data = client.get('/api/databases/list').get_json()
+            assert data['success'], data
+            return data
+
+        assert [p['name'] for p in request()['pdbs']] == ['PDB$SEED', 'GDCPDB']
+        baseline.check('api.databases_list', call_timer(request))
+
+    def test_oracle_metrics(self, web_server, baseline, call_timer, monkeypatch):
+        detector = web_server.SystemDetector()
+        monkeypatch.setattr(detector, 'get_running_databases', lambda: ['GDCPROD'])
+        metrics = detector.get_oracle_metrics()
+        assert metrics['sessions']['count'] > 0
+        assert metrics['tablespaces']
+        baseline.check('detector.get_oracle_metrics',
+                       call_timer(detector.get_oracle_metrics))
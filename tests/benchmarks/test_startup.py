@@ -0,0 +1,30 @@
+"""
+Startup benchmarks: import time and per-command latency of the CLI
+"""
+
+import pytest
+
+pytestmark = pytest.mark.benchmark
+
+
+class TestImportTime:
+    """python -X importtime cumulative time for entry-point modules"""
+
+    @pytest.mark.parametrize('module', ['oracledba.cli', 'oracledba.web_server'])
+    def test_import_time(self, module, import_timer, baseline):
+        baseline.check(f'import.{module}', import_timer(module))
+
+
+class TestCommandLatency:
+    """Wall time of common oradba invocations against the fake ORACLE_HOME"""
+
+    @pytest.mark.parametrize('args', [
+        ['--help'],
+        ['--version'],
+        ['status'],
+        ['labs'],
+        ['rman', '--help'],
+    ], ids=lambda args: ' '.join(args))
+    def test_command_latency(self, args, command_timer, baseline):
+        elapsed = command_timer(['-m', 'oracledba.cli', *args])
+        baseline.check(f"cmd.oradba {' '.join(args)}", elapsed)
@@ -145,8 +145,67 @@ def console_capture(monkeypatch):
     sys.stdout = sys.__stdout__
 
 
+class ManualClock:
+    """Stand-in for ``clock=`` parameters: returns ``now``, which the test
+    moves by hand, or which advances by ``step`` on every read"""
+
+    def __init__(self, now=0.0, step=0):
+        self.now = now
+        self.step = step
+
+    def __call__(self):
+        if self.step:
+            self.now += self.step
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    """ManualClock starting at 0"""
+    return ManualClock()
+
+
+class CannedClient:
+    """OracleClient stand-in replaying canned results.
+
+    Each query_many() call returns the next {query name: rows} dict of
+    ``polls``, repeating the last one; query() returns ``rows``.
+    """
+
+    rman = '/u01/app/oracle/product/19.3.0/dbhome_1/bin/rman'
+
+    def __init__(self, polls=({},), rows=(), oracle_sid='GDCPROD'):
+        self.polls = list(polls)
+        self.rows = list(rows)
+        self.oracle_sid = oracle_sid
+        self.queries = None
+        self.calls = 0
+
+    def query_many(self, queries):
+        self.queries = queries
+        self.calls += 1
+        return True, dict(self.polls.pop(0) if len(self.polls) > 1 else self.polls[0]), {}
+
+    def query(self, sql):
+        return True, list(self.rows), ''
+
+    def wrap(self, cmd):
+        return cmd
+
+
+@pytest.fixture
+def canned_client():
+    """CannedClient factory: canned_client(polls, rows=(), oracle_sid='GDCPROD')"""
+    return CannedClient
+
+
 def pytest_configure(config):
     """Configure pytest"""
+    # no backup dispatcher, FRA watcher or lag monitor behind the web tests
+    os.environ['ORADBA_DAEMONS'] = '0'
     config.addinivalue_line(
         "markers", "slow: marks tests as slow (deselect with '-m \"not slow\"')"
     )
@@ -156,14 +215,22 @@ def pytest_configure(config):
     config.addinivalue_line(
         "markers", "requires_oracle: marks tests that require Oracle installation"
     )
+    config.addinivalue_line(
+        "markers", "benchmark: performance benchmarks compared to tests/benchmarks/baselines.json"
+    )
 
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection"""
     skip_slow = pytest.mark.skip(reason="use --runslow option to run")
     skip_integration = pytest.mark.skip(reason="integration tests not enabled")
+    skip_benchmark = pytest.mark.skip(reason="use --benchmark option to run")
+    run_benchmarks = (config.getoption("--benchmark", default=False)
+                      or config.getoption("--update-baselines", default=False))
     
     for item in items:
+        if "benchmark" in item.keywords and not run_benchmarks:
+            item.add_marker(skip_benchmark)
         if "slow" in item.keywords and not config.getoption("--runslow", default=False):
             item.add_marker(skip_slow)
         if "integration" in item.keywords and not config.getoption("--integration", default=False):
@@ -178,3 +245,10 @@ def pytest_addoption(parser):
     parser.addoption(
         "--integration", action="store_true", default=False, help="run integration tests"
     )
+    parser.addoption(
+        "--benchmark", action="store_true", default=False, help="run performance benchmarks"
+    )
+    parser.addoption(
+        "--update-baselines", action="store_true", default=False,
+        help="run benchmarks and rewrite tests/benchmarks/baselines.json"
+    )
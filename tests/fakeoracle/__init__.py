@@ -0,0 +1,36 @@
+"""
+Fake Oracle client binaries for tests and benchmarks
+
+``install(bin_dir)`` drops executable ``sqlplus`` and ``rman`` scripts into
+``bin_dir`` that run the simulators in this package with the current
+interpreter. Output follows the real tools closely enough for oradba's
+parsers (COLSEP/PAGESIZE/FEEDBACK/MARKUP, ORA- errors, RMAN> echo), and
+is deterministic so benchmark timings and parsed results are stable.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+TESTS_DIR = Path(__file__).resolve().parent.parent
+
+WRAPPER = """#!{python}
+import sys
+sys.path.insert(0, {tests_dir!r})
+from fakeoracle.{module} import main
+sys.exit(main())
+"""
+
+
+def install(bin_dir):
+    """Write sqlplus and rman wrappers into bin_dir; returns their paths"""
+    bin_dir = Path(bin_dir)
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for name in ('sqlplus', 'rman'):
+        path = bin_dir / name
+        path.write_text(WRAPPER.format(python=sys.executable,
+                                       tests_dir=str(TESTS_DIR), module=name))
+        os.chmod(path, 0o755)
+        paths[name] = str(path)
+    return paths
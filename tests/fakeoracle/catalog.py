@@ -0,0 +1,288 @@
+"""
+Canned and generated dictionary data for the fake sqlplus
+
+Each view is a factory returning a list of row dicts. Views with a
+natural size (tablespaces, users, sessions, ...) honour FAKEORACLE_ROWS so
+benchmarks can scale result sets; fixed views (V$INSTANCE, V$DATABASE)
+always return their canned rows. Any other V$/GV$/DBA_/CDB_/ALL_/USER_
+name gets generic generated rows rather than ORA-00942.
+"""
+
+import os
+import random
+import zlib
+
+DICTIONARY_PREFIXES = ('V$', 'GV$', 'DBA_', 'CDB_', 'ALL_', 'USER_')
+
+BASE_TABLESPACES = ['SYSTEM', 'SYSAUX', 'UNDOTBS1', 'USERS', 'TEMP']
+PDBS = [(2, 'PDB$SEED', 'READ ONLY'), (3, 'GDCPDB', 'READ WRITE')]
+SGA_COMPONENTS = [
+    ('shared pool', 352.0), ('large pool', 16.0), ('java pool', 16.0),
+    ('streams pool', 0.0), ('DEFAULT buffer cache', 1120.0),
+    ('Shared IO Pool', 64.0), ('In-Memory Area', 0.0),
+]
+
+
+def row_count(default):
+    """Rows for a scalable view: FAKEORACLE_ROWS overrides the default"""
+    try:
+        return max(0, int(os.environ.get('FAKEORACLE_ROWS', default)))
+    except ValueError:
+        return default
+
+
+def _rng(view):
+    return random.Random(zlib.crc32(view.encode()))
+
+
+def rng_for(view):
+    """Deterministic RNG per view, so generated values are stable"""
+    return _rng(view.upper())
+
+
+def _tablespace_names(n):
+    names = list(BASE_TABLESPACES)
+    i = 1
+    while len(names) < n:
+        names.append(f'APP_DATA{i:03d}')
+        i += 1
+    return names[:n]
+
+
+def _instance():
+    return [{'INSTANCE_NAME': 'GDCPROD', 'STATUS': 'OPEN', 'DATABASE_STATUS': 'ACTIVE',
+             'HOST_NAME': 'oracle-lab', 'VERSION': '19.0.0.0.0',
+             'STARTUP_TIME': '2026-01-01 08:00:00', 'INSTANCE_ROLE': 'PRIMARY_INSTANCE'}]
+
+
+def _database():
+    return [{'NAME': 'GDCPROD', 'DBID': '1234567890', 'OPEN_MODE': 'READ WRITE',
+             'LOG_MODE': 'ARCHIVELOG', 'FLASHBACK_ON': 'YES', 'CDB': 'YES',
+             'DATABASE_ROLE': 'PRIMARY', 'PROTECTION_MODE': 'MAXIMUM PERFORMANCE',
+             'FORCE_LOGGING': 'NO', 'CURRENT_SCN': '2451187', 'DB_UNIQUE_NAME': 'GDCPROD'}]
+
+
+def _pdbs():
+    rows = [{'CON_ID': str(con_id), 'NAME': name, 'OPEN_MODE': mode,
+             'CREATION_TIME': '2026-01-01 08:05', 'TOTAL_SIZE': str(1073741824 * con_id)}
+            for con_id, name, mode in PDBS]
+    for i in range(len(PDBS), row_count(len(PDBS))):
+        rows.append({'CON_ID': str(i + 2), 'NAME': f'LABPDB{i:02d}', 'OPEN_MODE': 'MOUNTED',
+                     'CREATION_TIME': '2026-01-02 09:00', 'TOTAL_SIZE': '0'})
+    return rows
+
+
+def _tablespaces(cdb=False):
+    rng = _rng('tablespaces')
+    rows = []
+    names = _tablespace_names(row_count(len(BASE_TABLESPACES)))
+    con_ids = [1, 3] if cdb else [None]
+    for con_id in con_ids:
+        for name in names:
+            row = {'TABLESPACE_NAME': name, 'STATUS': 'ONLINE',
+                   'CONTENTS': 'TEMPORARY' if name == 'TEMP' else
+                   'UNDO' if name.startswith('UNDO') else 'PERMANENT',
+                   'BLOCK_SIZE': '8192', 'EXTENT_MANAGEMENT': 'LOCAL',
+                   'BIGFILE': 'NO', 'LOGGING': 'LOGGING',
+                   'BYTES': str(rng.randint(100, 4000) * 1048576)}
+            if cdb:
+                row['CON_ID'] = str(con_id)
+            rows.append(row)
+    return rows
+
+
+def _data_files(cdb=False):
+    rows = []
+    for i, ts in enumerate(t for t in _tablespaces(cdb) if t['TABLESPACE_NAME'] != 'TEMP'):
+        row = {'FILE_ID': str(i + 1), 'FILE_NAME':
+               f"/u01/app/oracle/oradata/GDCPROD/{ts['TABLESPACE_NAME'].lower()}01.dbf",
+               'TABLESPACE_NAME': ts['TABLESPACE_NAME'], 'BYTES': ts['BYTES'],
+               'STATUS': 'AVAILABLE', 'AUTOEXTENSIBLE': 'YES',
+               'MAXBYTES': '34359721984'}
+        if cdb:
+            row['CON_ID'] = ts['CON_ID']
+        rows.append(row)
+    return rows
+
+
+def _free_space():
+    rng = _rng('free')
+    return [{'TABLESPACE_NAME': df['TABLESPACE_NAME'],
+             'BYTES': str(int(int(df['BYTES']) * rng.uniform(0.05, 0.6)))}
+            for df in _data_files()]
+
+
+def _users(cdb=False):
+    system = ['SYS', 'SYSTEM', 'DBSNMP', 'XDB', 'OUTLN']
+    n = row_count(12)
+    rows = []
+    con_ids = [1, 3] if cdb else [None]
+    for con_id in con_ids:
+        for i in range(n):
+            maintained = i < len(system)
+            name = system[i] if maintained else f'APPUSER{i:03d}'
+            row = {'USERNAME': name, 'ACCOUNT_STATUS': 'OPEN' if i % 7 else 'LOCKED',
+                   'DEFAULT_TABLESPACE': 'SYSTEM' if maintained else 'USERS',
+                   'TEMPORARY_TABLESPACE': 'TEMP', 'PROFILE': 'DEFAULT',
+                   'CREATED': '2026-01-01', 'ORACLE_MAINTAINED': 'Y' if maintained else 'N',
+                   'COMMON': 'YES' if maintained else 'NO'}
+            if cdb:
+                row['CON_ID'] = str(con_id)
+            rows.append(row)
+    return rows
+
+
+def _sessions():
+    rng = _rng('sessions')
+    rows = []
+    for i in range(row_count(40)):
+        background = i < 20
+        rows.append({'SID': str(i + 1), 'SERIAL#': str(rng.randint(1, 60000)),
+                     'USERNAME': '' if background else f'APPUSER{i % 5:03d}',
+                     'STATUS': 'ACTIVE' if background or i % 4 == 0 else 'INACTIVE',
+                     'TYPE': 'BACKGROUND' if background else 'USER',
+                     'PROGRAM': f'oracle@oracle-lab (P{i:03d})' if background else 'sqlplus@oracle-lab',
+                     'MACHINE': 'oracle-lab', 'EVENT': 'rdbms ipc message' if background
+                     else 'SQL*Net message from client',
+                     'SQL_ID': '' if background else f'{rng.getrandbits(52):013x}'[:13],
+                     'WAIT_CLASS': 'Idle', 'LOGON_TIME': '2026-01-01 08:00:00'})
+    return rows
+
+
+def _processes():
+    return [{'PID': str(i + 1), 'SPID': str(4000 + i), 'PROGRAM': s['PROGRAM']}
+            for i, s in enumerate(_sessions())]
+
+
+def _sga_components():
+    return [{'COMPONENT': name, 'CURRENT_SIZE': str(int(mb * 1048576))}
+            for name, mb in SGA_COMPONENTS]
+
+
+def _pgastat():
+    return [{'NAME': 'total PGA allocated', 'VALUE': str(212 * 1048576)},
+            {'NAME': 'total PGA inuse', 'VALUE': str(178 * 1048576)},
+            {'NAME': 'maximum PGA allocated', 'VALUE': str(301 * 1048576)},
+            {'NAME': 'aggregate PGA target parameter', 'VALUE': str(512 * 1048576)}]
+
+
+def _datafile():
+    return [{'FILE#': df['FILE_ID'], 'NAME': df['FILE_NAME'], 'BYTES': df['BYTES'],
+             'STATUS': 'ONLINE'} for df in _data_files()]
+
+
+def _tempfile():
+    return [{'FILE#': '1', 'NAME': '/u01/app/oracle/oradata/GDCPROD/temp01.dbf',
+             'BYTES': str(32 * 1048576), 'STATUS': 'ONLINE'}]
+
+
+def _controlfile():
+    return [{'NAME': f'/u01/app/oracle/oradata/GDCPROD/control0{i}.ctl', 'STATUS': '',
+             'IS_RECOVERY_DEST_FILE': 'NO', 'BLOCK_SIZE': '16384', 'FILE_SIZE_BLKS': '646'}
+            for i in (1, 2)]
+
+
+def _log():
+    return [{'GROUP#': str(g), 'THREAD#': '1', 'SEQUENCE#': str(40 + g), 'BYTES': '209715200',
+             'MEMBERS': '1', 'ARCHIVED': 'YES' if g != 3 else 'NO',
+             'STATUS': 'CURRENT' if g == 3 else 'INACTIVE'} for g in (1, 2, 3)]
+
+
+def _logfile():
+    return [{'GROUP#': str(g), 'STATUS': '', 'TYPE': 'ONLINE',
+             'MEMBER': f'/u01/app/oracle/oradata/GDCPROD/redo0{g}.log'} for g in (1, 2, 3)]
+
+
+def _recovery_file_dest():
+    return [{'NAME': '/u01/app/oracle/fast_recovery_area', 'SPACE_LIMIT': str(10 * 1073741824),
+             'SPACE_USED': str(3 * 1073741824), 'SPACE_RECLAIMABLE': str(512 * 1048576),
+             'NUMBER_OF_FILES': '42'}]
+
+
+def _rman_jobs():
+    rows = []
+    for i in range(row_count(10)):
+        day = 28 - (i % 28)
+        rows.append({'SESSION_KEY': str(100 + i), 'INPUT_TYPE': 'DB FULL' if i % 3 == 0 else 'ARCHIVELOG',
+                     'STATUS': 'COMPLETED' if i % 9 else 'FAILED',
+                     'START_TIME': f'2026-01-{day:02d} 01:00', 'END_TIME': f'2026-01-{day:02d} 01:12',
+                     'ELAPSED_SECONDS': str(720 + i), 'INPUT_BYTES': str(2 * 1073741824),
+                     'OUTPUT_BYTES': str(700 * 1048576), 'OUTPUT_DEVICE_TYPE': 'DISK',
+                     'TIME_TAKEN_DISPLAY': '00:12:00', 'COMPRESSION_RATIO': '2.9'})
+    return rows
+
+
+def _restore_points():
+    return [{'NAME': 'BEFORE_UPGRADE', 'SCN': '2400000', 'TIME': '2026-01-10 10:00:00',
+             'GUARANTEE_FLASHBACK_DATABASE': 'YES', 'STORAGE_SIZE': '52428800'}]
+
+
+def _dual():
+    return [{'DUMMY': 'X'}]
+
+
+VIEWS = {
+    'V$INSTANCE': _instance,
+    'GV$INSTANCE': _instance,
+    'V$DATABASE': _database,
+    'V$PDBS': _pdbs,
+    'V$CONTAINERS': _pdbs,
+    'DBA_PDBS': _pdbs,
+    'DBA_TABLESPACES': _tablespaces,
+    'CDB_TABLESPACES': lambda: _tablespaces(cdb=True),
+    'DBA_DATA_FILES': _data_files,
+    'CDB_DATA_FILES': lambda: _data_files(cdb=True),
+    'DBA_FREE_SPACE': _free_space,
+    'DBA_USERS': _users,
+    'CDB_USERS': lambda: _users(cdb=True),
+    'V$SESSION': _sessions,
+    'GV$SESSION': _sessions,
+    'V$PROCESS': _processes,
+    'V$SGA_DYNAMIC_COMPONENTS': _sga_components,
+    'V$PGASTAT': _pgastat,
+    'V$DATAFILE': _datafile,
+    'V$TEMPFILE': _tempfile,
+    'V$CONTROLFILE': _controlfile,
+    'V$LOG': _log,
+    'V$LOGFILE': _logfile,
+    'V$RECOVERY_FILE_DEST': _recovery_file_dest,
+    'V$RMAN_BACKUP_JOB_DETAILS': _rman_jobs,
+    'V$RESTORE_POINT': _restore_points,
+    'DUAL': _dual,
+}
+
+
+def generate_value(column, rng, index=0):
+    """Plausible value for an unknown column, guessed from its name"""
+    col = column.upper()
+    if col.endswith(('_ID', 'ID', '#', 'COUNT', 'CNT', 'NUM', 'BYTES', 'BLOCKS', 'SIZE',
+                     '_MB', '_GB', '_KB', 'SECONDS', 'TOTAL', 'USED', 'FREE', 'VALUE')):
+        return str(rng.randint(1, 5000))
+    if col.startswith(('PCT', 'PERCENT')) or col.endswith(('PCT', 'RATIO')):
+        return f'{rng.uniform(0, 100):.1f}'
+    if 'TIME' in col or 'DATE' in col or col in ('CREATED', 'STARTED'):
+        return f'2026-01-{(index % 28) + 1:02d} 08:00:00'
+    if col.endswith(('STATUS', 'MODE')):
+        return 'VALID'
+    return f'{col[:12]}_{index + 1}'
+
+
+def lookup(view):
+    """Rows for a known or dictionary view, or None (ORA-00942).
+
+    Dictionary views the catalog does not model return FAKEORACLE_ROWS
+    empty rows; their columns are generated on access from the names the
+    query asks for.
+    """
+    view = view.upper()
+    factory = VIEWS.get(view)
+    if factory:
+        return factory()
+    if view.startswith(DICTIONARY_PREFIXES):
+        return [{} for _ in range(row_count(5))]
+    return None
+
+
+def is_known(view):
+    view = view.upper()
+    return view in VIEWS or view.startswith(DICTIONARY_PREFIXES)
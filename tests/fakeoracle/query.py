@@ -0,0 +1,609 @@
+"""
+Tiny SELECT evaluator for the fake sqlplus
+
+Understands enough SQL for the dictionary queries oradba issues: select
+lists with aliases, literals, arithmetic, ||, ROUND/NVL/TO_CHAR/UPPER/
+LOWER/TRIM/SUBSTR and the COUNT/SUM/MIN/MAX/AVG aggregates, simple WHERE
+predicates (=, !=, <>, <, >, <=, >=, IN, LIKE joined by AND), GROUP BY,
+ORDER BY, FETCH FIRST / ROWNUM limits and UNION [ALL]. Joins and
+subqueries are not evaluated: the first dictionary view named in the
+FROM clause drives the rows.
+"""
+
+import re
+
+from . import catalog
+
+
+class SQLError(Exception):
+    """Raised with an ORA- message, printed by sqlplus as an error"""
+
+
+AGGREGATES = {'COUNT', 'SUM', 'MIN', 'MAX', 'AVG'}
+
+TOKEN_RE = re.compile(r"""
+    \s*(?:
+      (?P<number>\d+(?:\.\d+)?)
+    | (?P<string>'(?:[^']|'')*')
+    | (?P<ident>[A-Za-z_][\w$#]*(?:\.[A-Za-z_][\w$#]*)?)
+    | (?P<op>\|\||<>|!=|<=|>=|[-+*/(),=<>])
+    )""", re.VERBOSE)
+
+
+def tokenize(text):
+    tokens = []
+    pos = 0
+    text = text.strip()
+    while pos < len(text):
+        match = TOKEN_RE.match(text, pos)
+        if not match or match.end() == pos:
+            raise SQLError(f"ORA-00911: invalid character near '{text[pos:pos + 10]}'")
+        pos = match.end()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+def split_top(text, sep=','):
+    """Split on a separator that is not inside parentheses or quotes"""
+    parts, depth, quote, start = [], 0, False, 0
+    i = 0
+    while i < len(text):
+        ch = text[i]
+        if ch == "'":
+            quote = not quote
+        elif not quote:
+            if ch == '(':
+                depth += 1
+            elif ch == ')':
+                depth -= 1
+            elif depth == 0 and text.startswith(sep, i):
+                parts.append(text[start:i])
+                start = i + len(sep)
+                i += len(sep)
+                continue
+        i += 1
+    parts.append(text[start:])
+    return [p.strip() for p in parts]
+
+
+def find_top_keyword(text, keyword, start=0):
+    """Index of a keyword at nesting depth 0 (outside quotes), or -1"""
+    pattern = re.compile(r'\b' + keyword.replace(' ', r'\s+') + r'\b', re.IGNORECASE)
+    depth, quote = 0, False
+    masked = []
+    for ch in text:
+        if ch == "'":
+            quote = not quote
+            masked.append(' ')
+        elif quote:
+            masked.append(' ')
+        else:
+            if ch == '(':
+                depth += 1
+            elif ch == ')':
+                depth -= 1
+            masked.append(ch if depth == 0 and ch not in '()' else ' ')
+    match = pattern.search(''.join(masked), start)
+    return match.start() if match else -1
+
+
+def split_union(text):
+    """Split a query into UNION [ALL] branches at depth 0"""
+    branches = []
+    while True:
+        idx = find_top_keyword(text, 'UNION')
+        if idx < 0:
+            branches.append(text.strip())
+            return branches
+        branches.append(text[:idx].strip())
+        rest = text[idx + 5:].lstrip()
+        if rest[:3].upper() == 'ALL':
+            rest = rest[3:]
+        text = rest
+
+
+# ---------------------------------------------------------------------------
+# Expressions
+# ---------------------------------------------------------------------------
+
+class Expr:
+    """Parsed expression evaluated against a row (and its group)"""
+
+    def __init__(self, text):
+        self.text = text.strip()
+        self.tokens = tokenize(self.text)
+        self.pos = 0
+        self.tree = self._concat()
+        if self.pos != len(self.tokens):
+            raise SQLError("ORA-00923: FROM keyword not found where expected")
+
+    # --- parser -------------------------------------------------------------
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else (None, None)
+
+    def _take(self, value=None):
+        kind, tok = self._peek()
+        if value is not None and (tok is None or tok.upper() != value):
+            raise SQLError("ORA-00907: missing right parenthesis")
+        self.pos += 1
+        return kind, tok
+
+    def _concat(self):
+        node = self._additive()
+        while self._peek()[1] == '||':
+            self._take()
+            node = ('||', node, self._additive())
+        return node
+
+    def _additive(self):
+        node = self._term()
+        while self._peek()[1] in ('+', '-'):
+            op = self._take()[1]
+            node = (op, node, self._term())
+        return node
+
+    def _term(self):
+        node = self._unary()
+        while self._peek()[1] in ('*', '/'):
+            op = self._take()[1]
+            node = (op, node, self._unary())
+        return node
+
+    def _unary(self):
+        if self._peek()[1] == '-':
+            self._take()
+            return ('neg', self._unary())
+        return self._primary()
+
+    def _primary(self):
+        kind, tok = self._take()
+        if kind == 'number':
+            return ('lit', float(tok) if '.' in tok else int(tok))
+        if kind == 'string':
+            return ('lit', tok[1:-1].replace("''", "'"))
+        if tok == '(':
+            node = self._concat()
+            self._take(')')
+            return node
+        if kind == 'ident':
+            if self._peek()[1] == '(':
+                self._take()
+                args = []
+                if self._peek()[1] == '*':
+                    self._take()
+                    args.append(('star',))
+                elif self._peek()[1] != ')':
+                    args.append(self._concat())
+                    while self._peek()[1] == ',':
+                        self._take()
+                        args.append(self._concat())
+                self._take(')')
+                return ('call', tok.upper(), args)
+            if tok.upper() == 'NULL':
+                return ('lit', None)
+            if tok.upper() in ('SYSDATE', 'SYSTIMESTAMP'):
+                return ('lit', '2026-01-15 12:00:00')
+            return ('col', tok.split('.')[-1].upper())
+        raise SQLError("ORA-00936: missing expression")
+
+    # --- evaluation ---------------------------------------------------------
+    def is_aggregate(self):
+        return _has_aggregate(self.tree)
+
+    def columns(self):
+        found = []
+        _collect_columns(self.tree, found)
+        return found
+
+    def evaluate(self, row, group, ctx):
+        return _eval(self.tree, row, group, ctx)
+
+
+def _has_aggregate(node):
+    if node[0] == 'call':
+        return node[1] in AGGREGATES or any(_has_aggregate(a) for a in node[2])
+    if node[0] in ('lit', 'col', 'star'):
+        return False
+    return any(_has_aggregate(child) for child in node[1:] if isinstance(child, tuple))
+
+
+def _collect_columns(node, found):
+    if node[0] == 'col':
+        found.append(node[1])
+    elif node[0] == 'call':
+        for arg in node[2]:
+            _collect_columns(arg, found)
+    elif node[0] not in ('lit', 'star'):
+        for child in node[1:]:
+            if isinstance(child, tuple):
+                _collect_columns(child, found)
+
+
+def to_number(value):
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return float(value)
+        except ValueError:
+            raise SQLError("ORA-01722: invalid number")
+
+
+def _eval(node, row, group, ctx):
+    kind = node[0]
+    if kind == 'lit':
+        return node[1]
+    if kind == 'col':
+        name = node[1]
+        if name in row:
+            return row[name]
+        if name in ctx.get('aliases', {}):
+            return ctx['aliases'][name]
+        if ctx.get('generic'):
+            value = catalog.generate_value(name, ctx['rng'], ctx.get('index', 0))
+            row[name] = value
+            return value
+        raise SQLError(f'ORA-00904: "{name}": invalid identifier')
+    if kind == 'neg':
+        value = to_number(_eval(node[1], row, group, ctx))
+        return None if value is None else -value
+    if kind == '||':
+        left = _eval(node[1], row, group, ctx)
+        right = _eval(node[2], row, group, ctx)
+        return f"{format_value(left)}{format_value(right)}"
+    if kind in ('+', '-', '*', '/'):
+        left = to_number(_eval(node[1], row, group, ctx))
+        right = to_number(_eval(node[2], row, group, ctx))
+        if left is None or right is None:
+            return None
+        if kind == '+':
+            return left + right
+        if kind == '-':
+            return left - right
+        if kind == '*':
+            return left * right
+        if right == 0:
+            raise SQLError("ORA-01476: divisor is equal to zero")
+        return left / right
+    if kind == 'call':
+        return _call(node[1], node[2], row, group, ctx)
+    raise SQLError("ORA-00936: missing expression")
+
+
+def _call(name, args, row, group, ctx):
+    if name in AGGREGATES:
+        rows = group if group is not None else [row]
+        if args and args[0][0] == 'star':
+            return len(rows)
+        values = [_eval(args[0], r, None, ctx) for r in rows]
+        values = [v for v in values if v not in (None, '')]
+        if name == 'COUNT':
+            return len(values)
+        if not values:
+            return None
+        if name in ('MIN', 'MAX'):
+            numeric = [to_number(v) for v in values] if all(
+                _is_number(v) for v in values) else values
+            return min(numeric) if name == 'MIN' else max(numeric)
+        numbers = [to_number(v) for v in values]
+        total = sum(numbers)
+        return total if name == 'SUM' else total / len(numbers)
+
+    values = [_eval(a, row, group, ctx) for a in args]
+    if name == 'ROUND':
+        number = to_number(values[0])
+        if number is None:
+            return None
+        digits = int(to_number(values[1])) if len(values) > 1 else 0
+        result = round(number, digits)
+        return int(result) if digits <= 0 else result
+    if name == 'TRUNC':
+        number = to_number(values[0])
+        return None if number is None else int(number)
+    if name in ('NVL', 'COALESCE'):
+        for value in values:
+            if value not in (None, ''):
+                return value
+        return None
+    if name == 'TO_CHAR':
+        return format_value(values[0])
+    if name == 'TO_NUMBER':
+        return to_number(values[0])
+    if name == 'UPPER':
+        return format_value(values[0]).upper()
+    if name == 'LOWER':
+        return format_value(values[0]).lower()
+    if name in ('TRIM', 'LTRIM', 'RTRIM'):
+        return format_value(values[0]).strip()
+    if name == 'LENGTH':
+        return len(format_value(values[0]))
+    if name == 'SUBSTR':
+        text = format_value(values[0])
+        start = max(int(to_number(values[1])) - 1, 0)
+        if len(values) > 2:
+            return text[start:start + int(to_number(values[2]))]
+        return text[start:]
+    if name == 'DECODE':
+        subject = values[0]
+        pairs = values[1:]
+        for i in range(0, len(pairs) - 1, 2):
+            if format_value(subject) == format_value(pairs[i]):
+                return pairs[i + 1]
+        return pairs[-1] if len(pairs) % 2 else None
+    if name in ('SYS_CONTEXT', 'USERENV'):
+        return 'CDB$ROOT'
+    # Unknown function: behave like a plausible scalar
+    return catalog.generate_value(name, ctx['rng'], ctx.get('index', 0))
+
+
+def _is_number(value):
+    if isinstance(value, (int, float)):
+        return True
+    try:
+        float(value)
+        return True
+    except (TypeError, ValueError):
+        return False
+
+
+def format_value(value):
+    """Render a value the way sqlplus prints it"""
+    if value is None:
+        return ''
+    if isinstance(value, float):
+        if value.is_integer():
+            return str(int(value))
+        text = f"{value:.10f}".rstrip('0').rstrip('.')
+        return text
+    return str(value)
+
+
+# ---------------------------------------------------------------------------
+# Query execution
+# ---------------------------------------------------------------------------
+
+class Column:
+    """Result column: heading, whether it is numeric, whether it is a literal"""
+
+    def __init__(self, heading, expr, literal=False, from_view=False):
+        self.heading = heading
+        self.expr = expr
+        self.literal = literal
+        self.from_view = from_view
+        self.numeric = True
+
+
+def parse_select_item(text):
+    """Return (expr_text, alias or None)"""
+    match = re.match(r'^(.*?)\s+(?:AS\s+)?("?[A-Za-z_][\w$#]*"?)$', text, re.IGNORECASE | re.S)
+    if match:
+        expr_text, alias = match.group(1), match.group(2)
+        # "a - b" / "x || y" end with an operand, not an alias
+        if not re.search(r'(\|\||[-+*/(,])\s*$', expr_text) and \
+                alias.strip('"').upper() not in ('END', 'FROM'):
+            return expr_text.strip(), alias.strip('"').upper()
+    return text.strip(), None
+
+
+PREDICATE_RE = re.compile(
+    r"""^\s*(?P<col>[A-Za-z_][\w$#]*(?:\.[A-Za-z_][\w$#]*)?)\s*
+        (?:(?P<op>=|!=|<>|<=|>=|<|>)\s*(?P<value>'(?:[^']|'')*'|-?\d+(?:\.\d+)?)
+          |(?P<not>NOT\s+)?IN\s*\((?P<list>[^)]*)\)
+          |(?P<notlike>NOT\s+)?LIKE\s*(?P<pattern>'(?:[^']|'')*')
+          |IS\s+(?P<isnot>NOT\s+)?NULL)\s*$""", re.IGNORECASE | re.VERBOSE)
+
+
+def _literal(text):
+    text = text.strip()
+    if text.startswith("'"):
+        return text[1:-1].replace("''", "'")
+    return to_number(text)
+
+
+def _compare(left, op, right):
+    if isinstance(right, (int, float)):
+        left = to_number(left)
+        if left is None:
+            return False
+    else:
+        left = format_value(left)
+    return {
+        '=': left == right, '!=': left != right, '<>': left != right,
+        '<': left < right, '>': left > right, '<=': left <= right, '>=': left >= right,
+    }[op]
+
+
+def build_filter(where):
+    """Compile conjunctive simple predicates; anything else is ignored"""
+    tests = []
+    for part in split_top(where, ' AND ') if where else []:
+        match = PREDICATE_RE.match(part)
+        if not match:
+            # ROWNUM handled by the caller; unknown predicates do not filter
+            continue
+        col = match.group('col').split('.')[-1].upper()
+        if col == 'ROWNUM':
+            continue
+        if match.group('op'):
+            op, value = match.group('op'), _literal(match.group('value'))
+            tests.append(lambda r, c=col, o=op, v=value: c not in r or _compare(r[c], o, v))
+        elif match.group('list') is not None:
+            values = [_literal(v) for v in split_top(match.group('list'))]
+            negate = bool(match.group('not'))
+            tests.append(lambda r, c=col, vs=values, n=negate:
+                         c not in r or (any(_compare(r[c], '=', v) for v in vs) != n))
+        elif match.group('pattern'):
+            regex = re.compile('^' + re.escape(_literal(match.group('pattern')))
+                               .replace('%', '.*').replace('_', '.') + '$', re.S)
+            negate = bool(match.group('notlike'))
+            tests.append(lambda r, c=col, rx=regex, n=negate:
+                         c not in r or (bool(rx.match(format_value(r[c]))) != n))
+        else:
+            negate = bool(match.group('isnot'))
+            tests.append(lambda r, c=col, n=negate:
+                         c not in r or ((r[c] in (None, '')) != n))
+    return lambda row: all(test(row) for test in tests)
+
+
+def _clause(text, keyword, enders):
+    idx = find_top_keyword(text, keyword)
+    if idx < 0:
+        return None
+    start = idx + len(keyword.split()[0])
+    # skip "BY" in GROUP BY / ORDER BY
+    rest = text[start:]
+    if ' ' in keyword:
+        rest = re.sub(r'^\s*BY\b', '', rest, flags=re.IGNORECASE)
+    end = len(rest)
+    for ender in enders:
+        e = find_top_keyword(rest, ender)
+        if 0 <= e < end:
+            end = e
+    return rest[:end].strip()
+
+
+def run_branch(sql):
+    """Evaluate one SELECT branch: returns (columns, rows-of-values)"""
+    body = re.sub(r'^\s*SELECT\s+(DISTINCT\s+)?', '', sql, flags=re.IGNORECASE)
+    distinct = bool(re.match(r'^\s*SELECT\s+DISTINCT\b', sql, re.IGNORECASE))
+    from_idx = find_top_keyword(body, 'FROM')
+    select_list = body if from_idx < 0 else body[:from_idx]
+    rest = '' if from_idx < 0 else body[from_idx + 4:]
+
+    view = 'DUAL'
+    if rest:
+        names = re.findall(r'[A-Za-z_][\w$#]*(?:\.[A-Za-z_][\w$#]*)?', rest)
+        for name in names:
+            bare = name.split('.')[-1]
+            if catalog.is_known(bare):
+                view = bare.upper()
+                break
+        else:
+            raise SQLError("ORA-00942: table or view does not exist")
+    rows = catalog.lookup(view)
+    if rows is None:
+        raise SQLError("ORA-00942: table or view does not exist")
+    # canned views only carry the columns oradba reads; any other column
+    # is generated so new queries keep working (DUAL stays strict)
+    generic = view != 'DUAL'
+
+    enders = ['GROUP BY', 'ORDER BY', 'HAVING', 'FETCH', 'CONNECT BY', 'START WITH']
+    where = _clause(rest, 'WHERE', enders)
+    group_by = _clause(rest, 'GROUP BY', ['ORDER BY', 'HAVING', 'FETCH'])
+    order_by = _clause(rest, 'ORDER BY', ['FETCH'])
+    limit = None
+    fetch = re.search(r'FETCH\s+(?:FIRST|NEXT)\s+(\d+)\s+ROWS?\s+ONLY', rest, re.IGNORECASE)
+    if fetch:
+        limit = int(fetch.group(1))
+    rownum = re.search(r'ROWNUM\s*(<=|<|=)\s*(\d+)', where or '', re.IGNORECASE)
+    if rownum:
+        limit = int(rownum.group(2)) - (1 if rownum.group(1) == '<' else 0)
+
+    rng = catalog.rng_for(view)
+    ctx = {'generic': generic, 'rng': rng}
+
+    items = split_top(select_list)
+    columns = []
+    for item in items:
+        if item == '*' or item.endswith('.*'):
+            sample = rows[0] if rows else {}
+            for name in sample:
+                columns.append(Column(name, Expr(name), from_view=True))
+            continue
+        expr_text, alias = parse_select_item(item)
+        expr = Expr(expr_text)
+        literal = expr.tree[0] == 'lit'
+        plain = expr.tree[0] == 'col'
+        heading = alias or (expr.tree[1] if plain else re.sub(r'\s+', '', expr_text).upper())
+        columns.append(Column(heading, expr, literal=literal, from_view=plain))
+
+    if generic:
+        for i, row in enumerate(rows):
+            ctx['index'] = i
+            for column in columns:
+                for name in column.expr.columns():
+                    if name not in row:
+                        row[name] = catalog.generate_value(name, rng, i)
+
+    rows = [r for r in rows if build_filter(where)(r)]
+
+    aggregate = any(c.expr.is_aggregate() for c in columns)
+    result = []
+    if group_by or aggregate:
+        keys = [Expr(k) for k in split_top(group_by)] if group_by else []
+        groups = {}
+        for row in rows:
+            key = tuple(format_value(k.evaluate(row, None, ctx)) for k in keys)
+            groups.setdefault(key, []).append(row)
+        if not keys and not groups:
+            groups[()] = []
+        for index, (_, members) in enumerate(groups.items()):
+            ctx['index'] = index
+            first = members[0] if members else {}
+            result.append([c.expr.evaluate(dict(first), members, ctx) for c in columns])
+    else:
+        for index, row in enumerate(rows):
+            ctx['index'] = index
+            result.append([c.expr.evaluate(row, None, ctx) for c in columns])
+
+    if distinct:
+        seen, unique = set(), []
+        for values in result:
+            key = tuple(format_value(v) for v in values)
+            if key not in seen:
+                seen.add(key)
+                unique.append(values)
+        result = unique
+
+    if order_by:
+        headings = [c.heading for c in columns]
+        for term in reversed(split_top(order_by)):
+            parts = term.split()
+            name = parts[0].split('.')[-1].upper()
+            descending = len(parts) > 1 and parts[1].upper() == 'DESC'
+            if name.isdigit():
+                idx = int(name) - 1
+            elif name in headings:
+                idx = headings.index(name)
+            else:
+                continue
+            result.sort(key=lambda values, i=idx: _sort_key(values[i]), reverse=descending)
+
+    if limit is not None:
+        result = result[:limit]
+
+    for column in columns:
+        column.numeric = bool(result) and all(
+            isinstance(values[columns.index(column)], (int, float))
+            or values[columns.index(column)] is None for values in result) \
+            and not column.from_view
+        if column.from_view:
+            column.numeric = bool(result) and all(
+                _is_number(values[columns.index(column)])
+                for values in result if values[columns.index(column)] not in (None, ''))
+    return columns, result
+
+
+def _sort_key(value):
+    if _is_number(value):
+        return (0, float(value), '')
+    return (1, 0.0, format_value(value))
+
+
+def run_query(sql):
+    """Execute a (possibly UNION) SELECT; returns (columns, rows)"""
+    branches = split_union(sql)
+    columns, rows = run_branch(branches[0])
+    for branch in branches[1:]:
+        more_columns, more_rows = run_branch(branch)
+        if len(more_columns) != len(columns):
+            raise SQLError("ORA-01789: query block has incorrect number of result columns")
+        for column, other in zip(columns, more_columns):
+            column.numeric = column.numeric and (other.numeric or not more_rows)
+        rows.extend(more_rows)
+    return columns, rows
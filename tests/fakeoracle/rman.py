@@ -0,0 +1,257 @@
+"""
+Fake rman
+
+Reads an RMAN script from stdin (or the cmdfile= argument), echoes each
+command after an RMAN> prompt and answers with plausible output. BACKUP
+sleeps FAKEORACLE_RMAN_MS per command so backup paths can be timed;
+FAKEORACLE_FAIL makes matching commands fail with an RMAN-03002 stack.
+"""
+
+import os
+import re
+import sys
+import time
+
+BANNER = """
+Recovery Manager: Release 19.0.0.0.0 - Production on Thu Jan 15 12:00:00 2026
+Version 19.3.0.0.0
+
+Copyright (c) 1982, 2019, Oracle and/or its affiliates.  All rights reserved.
+"""
+
+ERROR_STACK = """RMAN-00571: ===========================================================
+RMAN-00569: =============== ERROR MESSAGE STACK FOLLOWS ===============
+RMAN-00571: ===========================================================
+{message}"""
+
+CONFIGURATION = [
+    "CONFIGURE RETENTION POLICY TO REDUNDANCY 1; # default",
+    "CONFIGURE BACKUP OPTIMIZATION OFF; # default",
+    "CONFIGURE DEFAULT DEVICE TYPE TO DISK; # default",
+    "CONFIGURE CONTROLFILE AUTOBACKUP ON; # default",
+    "CONFIGURE DEVICE TYPE DISK PARALLELISM 1 BACKUP TYPE TO BACKUPSET; # default",
+    "CONFIGURE MAXSETSIZE TO UNLIMITED; # default",
+    "CONFIGURE ENCRYPTION FOR DATABASE OFF; # default",
+    "CONFIGURE COMPRESSION ALGORITHM 'BASIC' AS OF RELEASE 'DEFAULT' OPTIMIZE FOR LOAD TRUE ; # default",
+    "CONFIGURE ARCHIVELOG DELETION POLICY TO NONE; # default",
+]
+
+
+def split_commands(text):
+    """Split on ';' at top level, keeping RUN { ... } blocks whole"""
+    commands, current, depth = [], [], 0
+    for ch in text:
+        current.append(ch)
+        if ch == '{':
+            depth += 1
+        elif ch == '}':
+            depth -= 1
+            if depth == 0:
+                commands.append(''.join(current).strip())
+                current = []
+        elif ch == ';' and depth == 0:
+            commands.append(''.join(current).strip())
+            current = []
+    rest = ''.join(current).strip()
+    if rest:
+        commands.append(rest)
+    lines = []
+    for command in commands:
+        body = '\n'.join(line for line in command.splitlines()
+                         if not line.strip().startswith('#'))
+        if body.strip():
+            lines.append(body.strip())
+    return lines
+
+
+class Rman:
+    """Executes fake RMAN commands, writing output to ``out``"""
+
+    def __init__(self, out):
+        self.out = out
+        self.backup_delay = _ms_env('FAKEORACLE_RMAN_MS')
+        fail = os.environ.get('FAKEORACLE_FAIL')
+        self.fail_re = re.compile(fail, re.IGNORECASE) if fail else None
+        self.channels = 0
+        self.piece = 0
+        self.failed = False
+
+    def write(self, text=''):
+        self.out.write(text + '\n')
+
+    def execute(self, command):
+        self.write()
+        self.write(f"RMAN> {command}")
+        self.write()
+        if self.fail_re and self.fail_re.search(command):
+            self.error(f"RMAN-03002: failure of {command.split()[0].lower()} command\n"
+                       f"ORA-19504: failed to create file")
+            return True
+        body = command.rstrip(';').strip()
+        word = body.split(None, 1)[0].upper() if body else ''
+        if word == 'RUN':
+            inner = body[body.find('{') + 1:body.rfind('}')]
+            for sub in split_commands(inner):
+                if not self.dispatch(sub.rstrip(';').strip()):
+                    return False
+            self.release_channels()
+            return True
+        return self.dispatch(body)
+
+    def dispatch(self, body):
+        word = body.split(None, 1)[0].upper() if body else ''
+        handler = getattr(self, f"do_{word.lower()}", None)
+        if word in ('EXIT', 'QUIT'):
+            return False
+        if handler is None:
+            self.error('RMAN-00558: error encountered while parsing input commands\n'
+                       'RMAN-01009: syntax error: found "identifier": expecting one of: '
+                       '"allocate, alter, backup, ..."\nRMAN-01007: at line 1 column 1 '
+                       'file: standard input')
+            return True
+        handler(body)
+        return True
+
+    def error(self, message):
+        self.write(ERROR_STACK.format(message=message))
+        self.failed = True
+
+    # --- commands -------------------------------------------------------
+
+    def do_configure(self, body):
+        self.write("new RMAN configuration parameters:")
+        self.write(body + ';')
+        self.write("new RMAN configuration parameters are successfully stored")
+
+    def do_show(self, body):
+        self.write("RMAN configuration parameters for database with db_unique_name GDCPROD are:")
+        for line in CONFIGURATION:
+            self.write(line)
+
+    def do_allocate(self, body):
+        self.channels += 1
+        name = body.split()[2] if len(body.split()) > 2 else f"c{self.channels}"
+        self.write(f"allocated channel: {name}")
+        self.write(f"channel {name}: SID=1{self.channels:02d} device type=DISK")
+
+    def do_release(self, body):
+        name = body.split()[2] if len(body.split()) > 2 else 'c1'
+        self.write(f"released channel: {name}")
+
+    def release_channels(self):
+        for i in range(1, self.channels + 1):
+            self.write(f"released channel: c{i}")
+        self.channels = 0
+
+    def do_backup(self, body):
+        if self.backup_delay:
+            time.sleep(self.backup_delay)
+        self.write("Starting backup at 15-JAN-26")
+        if not self.channels:
+            self.write("using channel ORA_DISK_1")
+        self.write("channel ORA_DISK_1: starting full datafile backup set")
+        self.write("channel ORA_DISK_1: specifying datafile(s) in backup set")
+        for n, name in enumerate(('system01.dbf', 'sysaux01.dbf', 'undotbs01.dbf',
+                                  'users01.dbf'), 1):
+            self.write(f"input datafile file number={n:05d} "
+                       f"name=/u01/app/oracle/oradata/GDCPROD/{name}")
+        self.piece += 1
+        self.write("channel ORA_DISK_1: starting piece 1 at 15-JAN-26")
+        self.write("channel ORA_DISK_1: finished piece 1 at 15-JAN-26")
+        self.write(f"piece handle=/u01/app/oracle/fast_recovery_area/GDCPROD/backupset/"
+                   f"o1_mf_nnndf_TAG20260115T120000_{self.piece:04d}_.bkp "
+                   f"tag=TAG20260115T120000 comment=NONE")
+        self.write("channel ORA_DISK_1: backup set complete, elapsed time: 00:00:01")
+        self.write("Finished backup at 15-JAN-26")
+
+    def do_list(self, body):
+        self.write()
+        self.write("List of Backup Sets")
+        self.write("===================")
+        self.write()
+        self.write("BS Key  Type LV Size       Device Type Elapsed Time Completion Time")
+        self.write("------- ---- -- ---------- ----------- ------------ ---------------")
+        for key in range(1, 4):
+            self.write(f"{key:<7} Full    1.2G       DISK        00:00:42     15-JAN-26")
+
+    def do_report(self, body):
+        self.write("RMAN retention policy will be applied to the command")
+        self.write("RMAN retention policy is set to redundancy 1")
+        self.write("no obsolete backups found")
+
+    def do_crosscheck(self, body):
+        self.write("using channel ORA_DISK_1")
+        self.write("Crosschecked 3 objects")
+
+    def do_delete(self, body):
+        self.write("using channel ORA_DISK_1")
+        self.write("no obsolete backups found")
+
+    def do_restore(self, body):
+        self.write("Starting restore at 15-JAN-26")
+        self.write("using channel ORA_DISK_1")
+        self.write("Finished restore at 15-JAN-26")
+
+    def do_recover(self, body):
+        self.write("Starting recover at 15-JAN-26")
+        self.write("using channel ORA_DISK_1")
+        self.write("media recovery complete, elapsed time: 00:00:01")
+        self.write("Finished recover at 15-JAN-26")
+
+    def do_validate(self, body):
+        self.write("Starting validate at 15-JAN-26")
+        self.write("Finished validate at 15-JAN-26")
+
+    def do_sql(self, body):
+        self.write("sql statement: " + body[3:].strip().strip("'\""))
+
+    def do_set(self, body):
+        self.write("executing command: SET " + body[3:].strip().split()[0].upper())
+
+    def do_alter(self, body):
+        self.write("Statement processed")
+
+    def do_startup(self, body):
+        self.write("database is already started")
+
+    def do_shutdown(self, body):
+        self.write("database closed")
+        self.write("database dismounted")
+        self.write("Oracle instance shut down")
+
+    def do_connect(self, body):
+        self.write("connected to target database: GDCPROD (DBID=1234567890)")
+
+
+def _ms_env(name):
+    try:
+        return max(0.0, float(os.environ.get(name, 0))) / 1000
+    except ValueError:
+        return 0.0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    script = None
+    for arg in argv:
+        if arg.lower().startswith('cmdfile='):
+            with open(arg.split('=', 1)[1]) as f:
+                script = f.read()
+    if script is None:
+        script = sys.stdin.read()
+
+    rman = Rman(sys.stdout)
+    rman.write(BANNER)
+    if any(a.lower().startswith('target') for a in argv):
+        rman.write("connected to target database: GDCPROD (DBID=1234567890)")
+    for command in split_commands(script):
+        if not rman.execute(command):
+            break
+    rman.write()
+    rman.write("Recovery Manager complete.")
+    sys.stdout.flush()
+    return 1 if rman.failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
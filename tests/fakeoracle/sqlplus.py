@@ -0,0 +1,472 @@
+"""
+Fake sqlplus
+
+Reads a script from stdin like `sqlplus -s / as sysdba` does and prints
+result sets formatted the way SQL*Plus formats them: SET COLSEP,
+PAGESIZE (headings repeated per page, 0 = none), HEADING, UNDERLINE,
+FEEDBACK, LINESIZE-independent column widths, COL ... FORMAT An and
+SET MARKUP CSV/HTML. PROMPT, WHENEVER SQLERROR EXIT and EXIT n work.
+
+Environment knobs:
+    FAKEORACLE_ROWS        size of scalable views (tablespaces, users, ...)
+    FAKEORACLE_LATENCY_MS  sleep before each executed statement
+    FAKEORACLE_CONNECT_MS  sleep once at startup (logon cost)
+    FAKEORACLE_FAIL        regex: matching statements fail ...
+    FAKEORACLE_ERROR       ... with this message (default ORA-01034)
+"""
+
+import os
+import re
+import sys
+import time
+
+from .query import SQLError, format_value, run_query
+
+SQLPLUS_COMMANDS = {
+    'SET', 'COL', 'COLUMN', 'PROMPT', 'PRO', 'EXIT', 'QUIT', 'SPOOL', 'WHENEVER',
+    'SHOW', 'SHO', 'REM', 'REMARK', 'TTITLE', 'BTITLE', 'BREAK', 'COMPUTE',
+    'CLEAR', 'DEFINE', 'UNDEFINE', 'VARIABLE', 'VAR', 'PRINT', 'CONNECT', 'CONN',
+    'DISCONNECT', 'STARTUP', 'SHUTDOWN', 'HOST', 'TIMING', 'DESC', 'DESCRIBE',
+    'EXEC', 'EXECUTE', 'RECOVER', 'ARCHIVE', 'ACCEPT', 'PAUSE',
+}
+
+PLSQL_START_RE = re.compile(
+    r'^\s*(DECLARE|BEGIN|CREATE\s+(OR\s+REPLACE\s+)?'
+    r'(EDITIONABLE\s+)?(PROCEDURE|FUNCTION|PACKAGE|TRIGGER|TYPE))\b', re.IGNORECASE)
+
+FEEDBACK_MESSAGES = [
+    (r'CREATE\s+(BIGFILE\s+|SMALLFILE\s+|TEMPORARY\s+|UNDO\s+)*TABLESPACE', 'Tablespace created.'),
+    (r'CREATE\s+USER', 'User created.'),
+    (r'CREATE\s+ROLE', 'Role created.'),
+    (r'CREATE\s+PROFILE', 'Profile created.'),
+    (r'CREATE\s+(GLOBAL\s+TEMPORARY\s+)?TABLE', 'Table created.'),
+    (r'CREATE\s+(UNIQUE\s+)?INDEX', 'Index created.'),
+    (r'CREATE\s+(OR\s+REPLACE\s+)?VIEW', 'View created.'),
+    (r'CREATE\s+PLUGGABLE\s+DATABASE', 'Pluggable database created.'),
+    (r'CREATE\s+RESTORE\s+POINT', 'Restore point created.'),
+    (r'CREATE\s+SEQUENCE', 'Sequence created.'),
+    (r'CREATE\s+(OR\s+REPLACE\s+)?DIRECTORY', 'Directory created.'),
+    (r'ALTER\s+SYSTEM', 'System altered.'),
+    (r'ALTER\s+SESSION', 'Session altered.'),
+    (r'ALTER\s+DATABASE', 'Database altered.'),
+    (r'ALTER\s+PLUGGABLE\s+DATABASE', 'Pluggable database altered.'),
+    (r'ALTER\s+TABLESPACE', 'Tablespace altered.'),
+    (r'ALTER\s+USER', 'User altered.'),
+    (r'ALTER\s+PROFILE', 'Profile altered.'),
+    (r'ALTER\s+TABLE', 'Table altered.'),
+    (r'DROP\s+PLUGGABLE\s+DATABASE', 'Pluggable database dropped.'),
+    (r'DROP\s+(\w+)', None),
+    (r'GRANT', 'Grant succeeded.'),
+    (r'REVOKE', 'Revoke succeeded.'),
+    (r'AUDIT', 'Audit succeeded.'),
+    (r'NOAUDIT', 'Noaudit succeeded.'),
+    (r'INSERT', '1 row created.'),
+    (r'UPDATE', '1 row updated.'),
+    (r'DELETE', '1 row deleted.'),
+    (r'MERGE', '1 row merged.'),
+    (r'COMMIT', 'Commit complete.'),
+    (r'ROLLBACK', 'Rollback complete.'),
+    (r'TRUNCATE', 'Table truncated.'),
+    (r'FLASHBACK\s+TABLE', 'Flashback complete.'),
+    (r'FLASHBACK\s+DATABASE', 'Flashback complete.'),
+    (r'ANALYZE', 'Table analyzed.'),
+    (r'PURGE', 'Recyclebin purged.'),
+]
+
+
+class Session:
+    """State of one sqlplus invocation"""
+
+    def __init__(self, out, silent=True):
+        self.out = out
+        self.silent = silent
+        self.colsep = ' '
+        self.pagesize = 14
+        self.heading = True
+        self.underline = '-'
+        self.feedback = 6
+        self.markup = None        # None, 'CSV' or 'HTML'
+        self.csv_quote = True
+        self.col_formats = {}     # COLUMN -> width
+        self.col_headings = {}    # COLUMN -> heading text
+        self.exit_on_error = None
+        self.exit_code = None
+        self.container = 'CDB$ROOT'
+        self.latency = _ms_env('FAKEORACLE_LATENCY_MS')
+        fail = os.environ.get('FAKEORACLE_FAIL')
+        self.fail_re = re.compile(fail, re.IGNORECASE) if fail else None
+        self.fail_message = os.environ.get(
+            'FAKEORACLE_ERROR', 'ORA-01034: ORACLE not available')
+
+    def write(self, text=''):
+        self.out.write(text + '\n')
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    def execute(self, statement):
+        """Run one complete SQL statement or PL/SQL block"""
+        text = statement.strip()
+        if text.endswith(';') and not PLSQL_START_RE.match(text):
+            text = text[:-1].rstrip()
+        if not text:
+            return
+        if self.latency:
+            time.sleep(self.latency)
+        try:
+            if self.fail_re and self.fail_re.search(text):
+                raise SQLError(self.fail_message)
+            keyword = text.split(None, 1)[0].upper()
+            if keyword in ('SELECT', 'WITH') or text.startswith('('):
+                columns, rows = run_query(text)
+                self.print_result(columns, rows)
+            elif PLSQL_START_RE.match(text):
+                self.feedback_message('PL/SQL procedure successfully completed.')
+            else:
+                match = re.match(r'ALTER\s+SESSION\s+SET\s+CONTAINER\s*=\s*(\S+)', text, re.IGNORECASE)
+                if match:
+                    self.container = match.group(1).upper()
+                self.feedback_message(self.dml_message(text))
+        except SQLError as e:
+            self.error(str(e))
+
+    def dml_message(self, text):
+        for pattern, message in FEEDBACK_MESSAGES:
+            match = re.match(pattern, text, re.IGNORECASE)
+            if match:
+                if message is None:
+                    return f"{match.group(1).capitalize()} dropped."
+                return message
+        raise SQLError("ORA-00900: invalid SQL statement")
+
+    def feedback_message(self, message):
+        if self.feedback:
+            self.write()
+            self.write(message)
+            self.write()
+
+    def error(self, message):
+        self.write("ERROR at line 1:")
+        self.write(message)
+        self.write()
+        if self.exit_on_error is not None and self.exit_code is None:
+            self.exit_code = self.exit_on_error
+
+    def command(self, line):
+        """Run a SQL*Plus command (a single line, no terminator needed)"""
+        text = line.strip().rstrip(';')
+        parts = text.split(None, 1)
+        word = parts[0].upper()
+        arg = parts[1] if len(parts) > 1 else ''
+        if word == 'SET':
+            self.set(arg)
+        elif word in ('COL', 'COLUMN'):
+            self.column(arg)
+        elif word in ('PROMPT', 'PRO'):
+            self.write(arg)
+        elif word in ('EXIT', 'QUIT'):
+            code = arg.split()[0].upper() if arg.split() else 'SUCCESS'
+            if code in ('SUCCESS', ''):
+                self.exit_code = 0 if self.exit_code is None else self.exit_code
+            elif code == 'FAILURE':
+                self.exit_code = 1
+            elif code.isdigit():
+                self.exit_code = int(code)
+            else:
+                self.exit_code = 0 if self.exit_code is None else self.exit_code
+            return False
+        elif word == 'WHENEVER':
+            match = re.match(r'SQLERROR\s+EXIT\s*(\S+)?', arg, re.IGNORECASE)
+            if match:
+                code = (match.group(1) or 'FAILURE').upper()
+                self.exit_on_error = int(code) if code.isdigit() else 1
+            elif re.match(r'SQLERROR\s+CONTINUE', arg, re.IGNORECASE):
+                self.exit_on_error = None
+        elif word in ('SHOW', 'SHO'):
+            self.show(arg)
+        elif word in ('CONNECT', 'CONN'):
+            self.write('Connected.')
+        elif word == 'STARTUP':
+            self.write('ORACLE instance started.')
+            if not re.search(r'NOMOUNT', arg, re.IGNORECASE):
+                self.write('Database mounted.')
+            if not re.search(r'MOUNT', arg, re.IGNORECASE):
+                self.write('Database opened.')
+        elif word == 'SHUTDOWN':
+            self.write('Database closed.')
+            self.write('Database dismounted.')
+            self.write('ORACLE instance shut down.')
+        elif word in ('EXEC', 'EXECUTE'):
+            self.feedback_message('PL/SQL procedure successfully completed.')
+        elif word in ('DESC', 'DESCRIBE'):
+            self.write(f" Name{' ' * 36}Null?    Type")
+            self.write(f" {'-' * 39} -------- {'-' * 28}")
+        return True
+
+    def set(self, arg):
+        tokens = arg.split()
+        i = 0
+        while i < len(tokens):
+            option = tokens[i].upper()
+            value = tokens[i + 1] if i + 1 < len(tokens) else ''
+            consumed = 2
+            if option in ('COLSEP', 'COLS'):
+                match = re.match(r"\s*\S+\s+('(?:[^']|'')*'|\"[^\"]*\"|\S+)", arg[arg.upper().find(option):])
+                raw = match.group(1) if match else value
+                self.colsep = raw[1:-1] if raw[:1] in ("'", '"') else raw
+                consumed = len(raw.split()) + 1 if raw[:1] in ("'", '"') else 2
+            elif option in ('PAGESIZE', 'PAGES'):
+                self.pagesize = int(value) if value.isdigit() else self.pagesize
+            elif option in ('HEADING', 'HEA'):
+                self.heading = value.upper() == 'ON'
+            elif option in ('UNDERLINE', 'UND'):
+                self.underline = '' if value.upper() == 'OFF' else \
+                    ('-' if value.upper() == 'ON' else value.strip("'\"")[:1])
+            elif option in ('FEEDBACK', 'FEED'):
+                up = value.upper()
+                self.feedback = 0 if up == 'OFF' else 6 if up == 'ON' else \
+                    int(up) if up.isdigit() else self.feedback
+            elif option in ('MARKUP', 'MARK'):
+                rest = [t.upper() for t in tokens[i + 1:]]
+                if rest and rest[0] == 'CSV':
+                    on = len(rest) > 1 and rest[1] == 'ON'
+                    self.markup = 'CSV' if on else None
+                    if 'QUOTE' in rest:
+                        q = rest.index('QUOTE')
+                        self.csv_quote = q + 1 < len(rest) and rest[q + 1] == 'ON'
+                elif rest and rest[0] == 'HTML':
+                    self.markup = 'HTML' if len(rest) > 1 and rest[1] == 'ON' else None
+                break
+            i += consumed
+
+    def column(self, arg):
+        match = re.match(r'(\S+)(.*)$', arg)
+        if not match:
+            return
+        name = match.group(1).upper().split('.')[-1]
+        rest = match.group(2)
+        fmt = re.search(r'FOR(?:MAT)?\s+A(\d+)', rest, re.IGNORECASE)
+        if fmt:
+            self.col_formats[name] = int(fmt.group(1))
+        heading = re.search(r"HEA(?:DING)?\s+'((?:[^']|'')*)'", rest, re.IGNORECASE)
+        if heading:
+            self.col_headings[name] = heading.group(1)
+        if re.search(r'\bCLEAR\b', rest, re.IGNORECASE):
+            self.col_formats.pop(name, None)
+            self.col_headings.pop(name, None)
+
+    def show(self, arg):
+        up = arg.upper().strip()
+        if up.startswith('USER'):
+            self.write('USER is "SYS"')
+        elif up.startswith(('CON_NAME', 'CON_ID')):
+            self.write()
+            self.write('CON_NAME' if up.startswith('CON_NAME') else 'CON_ID')
+            self.write('------------------------------')
+            self.write(self.container if up.startswith('CON_NAME') else
+                       ('1' if self.container == 'CDB$ROOT' else '3'))
+        elif up.startswith('PDBS'):
+            columns, rows = run_query(
+                "SELECT CON_ID, NAME AS CON_NAME, OPEN_MODE FROM V$PDBS")
+            self.print_result(columns, rows)
+        elif up.startswith(('PARAMETER', 'PARAMETERS')):
+            name = arg.split(None, 1)[1].lower() if len(arg.split()) > 1 else 'parameter'
+            self.write()
+            self.write('NAME                                 TYPE        VALUE')
+            self.write('------------------------------------ ----------- ------------------------------')
+            self.write(f'{name:<36} string      fake')
+        else:
+            self.write(f'{arg.lower()} OFF')
+
+    # ------------------------------------------------------------------
+    # Result formatting
+    # ------------------------------------------------------------------
+
+    def print_result(self, columns, rows):
+        if self.markup == 'CSV':
+            return self._print_csv(columns, rows)
+        if self.markup == 'HTML':
+            return self._print_html(columns, rows)
+
+        rendered = [[format_value(v) for v in values] for values in rows]
+        widths = []
+        headings = []
+        for idx, column in enumerate(columns):
+            heading = self.col_headings.get(column.heading, column.heading)
+            values = [r[idx] for r in rendered]
+            longest = max((len(v) for v in values), default=0)
+            if column.numeric:
+                width = max(10, len(heading))
+            elif column.heading in self.col_formats:
+                width = self.col_formats[column.heading]
+            elif column.literal:
+                # literal columns are only as wide as the data; the heading
+                # is truncated to fit (sqlplus prints METRI for 'METRIC')
+                width = max(longest, 1)
+            else:
+                width = max(longest, len(heading), 1)
+            widths.append(width)
+            headings.append(heading[:width])
+
+        if not rows:
+            if self.feedback:
+                self.write()
+                self.write('no rows selected')
+                self.write()
+            return
+
+        def fmt(cells):
+            out = []
+            for idx, cell in enumerate(cells):
+                if columns[idx].numeric:
+                    out.append(cell.rjust(widths[idx]))
+                else:
+                    out.append(cell.ljust(widths[idx]))
+            return self.colsep.join(out).rstrip()
+
+        def heading_lines():
+            lines = [fmt(headings)]
+            if self.underline:
+                lines.append(self.colsep.join(self.underline * w for w in widths))
+            return lines
+
+        show_heading = self.heading and self.pagesize > 0
+        per_page = max(1, self.pagesize - 3) if show_heading else None
+        for n, cells in enumerate(rendered):
+            if show_heading and n % per_page == 0:
+                self.write()
+                for line in heading_lines():
+                    self.write(line)
+            for line in self._wrap(cells, widths, columns):
+                self.write(fmt(line))
+
+        if self.feedback and len(rows) >= self.feedback:
+            self.write()
+            self.write(f"{len(rows)} row{'s' if len(rows) != 1 else ''} selected.")
+        self.write()
+
+    def _wrap(self, cells, widths, columns):
+        """Split over-long character cells over several lines (WRAP ON)"""
+        chunks = []
+        for idx, cell in enumerate(cells):
+            width = widths[idx]
+            if columns[idx].numeric or len(cell) <= width:
+                chunks.append([cell])
+            else:
+                chunks.append([cell[i:i + width] for i in range(0, len(cell), width)])
+        height = max(len(c) for c in chunks)
+        return [[c[i] if i < len(c) else '' for c in chunks] for i in range(height)]
+
+    def _print_csv(self, columns, rows):
+        def quote(value, numeric):
+            if numeric or not self.csv_quote:
+                return value
+            return '"' + value.replace('"', '""') + '"'
+        if self.heading:
+            self.write(','.join(quote(c.heading, False) for c in columns))
+        for values in rows:
+            self.write(','.join(quote(format_value(v), c.numeric)
+                                for v, c in zip(values, columns)))
+        if self.feedback and len(rows) >= self.feedback:
+            self.write()
+            self.write(f"{len(rows)} rows selected.")
+
+    def _print_html(self, columns, rows):
+        self.write('<p>')
+        self.write('<table border="1" width="90%">')
+        if self.heading:
+            self.write('<tr>')
+            for c in columns:
+                self.write(f'<th scope="col">\n{c.heading}\n</th>')
+            self.write('</tr>')
+        for values in rows:
+            self.write('<tr>')
+            for v, c in zip(values, columns):
+                align = ' align="right"' if c.numeric else ''
+                self.write(f'<td{align}>\n{format_value(v)}\n</td>')
+            self.write('</tr>')
+        self.write('</table>')
+        self.write('<p>')
+
+
+def _ms_env(name):
+    try:
+        return max(0.0, float(os.environ.get(name, 0))) / 1000
+    except ValueError:
+        return 0.0
+
+
+def run_script(lines, session):
+    """Feed script lines to a session. Returns the exit code."""
+    buffer = []
+    plsql = False
+    for raw in lines:
+        line = raw.rstrip('\n')
+        stripped = line.strip()
+        if plsql:
+            if stripped == '/':
+                session.execute('\n'.join(buffer))
+                buffer, plsql = [], False
+            else:
+                buffer.append(line)
+            continue
+        if not buffer:
+            if not stripped or stripped.startswith('--'):
+                continue
+            first = stripped.split(None, 1)[0].upper().rstrip(';')
+            if first in SQLPLUS_COMMANDS:
+                if not session.command(stripped):
+                    break
+                if session.exit_code is not None:
+                    break
+                session.out.flush()     # interactive clients wait for PROMPT output
+                continue
+            if PLSQL_START_RE.match(stripped):
+                plsql = True
+                buffer.append(line)
+                continue
+        if stripped == '/':
+            if buffer:
+                session.execute('\n'.join(buffer))
+                buffer = []
+        elif stripped.endswith(';'):
+            buffer.append(line)
+            session.execute('\n'.join(buffer))
+            buffer = []
+        elif stripped:
+            buffer.append(line)
+        if session.exit_code is not None:
+            break
+    return session.exit_code or 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    flags = {a.upper() for a in argv if a.startswith('-')}
+    if '-V' in flags or '-VERSION' in flags:
+        print('\nSQL*Plus: Release 19.0.0.0.0 - Production\nVersion 19.3.0.0.0\n')
+        return 0
+    silent = '-S' in flags or '-SILENT' in flags
+    connect = _ms_env('FAKEORACLE_CONNECT_MS')
+    if connect:
+        time.sleep(connect)
+    session = Session(sys.stdout, silent=silent)
+    if not silent:
+        session.write()
+        session.write('SQL*Plus: Release 19.0.0.0.0 - Production on Thu Jan 15 12:00:00 2026')
+        session.write('Version 19.3.0.0.0')
+        session.write()
+        session.write('Connected to:')
+        session.write('Oracle Database 19c Enterprise Edition Release 19.0.0.0.0 - Production')
+        session.write()
+    code = run_script(sys.stdin, session)
+    if not silent:
+        session.write('Disconnected from Oracle Database 19c Enterprise Edition '
+                      'Release 19.0.0.0.0 - Production')
+    sys.stdout.flush()
+    return code
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Tests for the indexed alert log reader (modules/alertlog.py)
+"""
+
+from datetime import datetime, timezone
+
+import pytest
+from click.testing import CliRunner
+
+from oracledba.modules.alertlog import (AlertLog, find_alert_log, normalize_ora_code,
+                                        parse_time, parse_timestamp)
+
+BASE = datetime(2024, 3, 5, 10, 0, 0, tzinfo=timezone.utc).timestamp()
+
+
+def iso(ts):
+    return datetime.fromtimestamp(ts, timezone.utc).isoformat(timespec='microseconds')
+
+
+def text_entries(count, start=0, every=60):
+    """Alert log text: one entry per minute, an ORA-00600 every 100th"""
+    out = []
+    for i in range(start, start + count):
+        out.append(iso(BASE + i * every) + '\n')
+        if i % 100 == 99:
+            out.append(f'Errors in file /u01/trace/GDCPROD_ora_{i}.trc:\n'
+                       f'ORA-00600: internal error code, arguments: [{i}]\n')
+        else:
+            out.append(f'Thread 1 advanced to log sequence {i} (LGWR switch)\n')
+    return ''.join(out)
+
+
+@pytest.fixture
+def alert_file(tmp_path):
+    path = tmp_path / 'alert_GDCPROD.log'
+    path.write_text(text_entries(1000))
+    return path
+
+
+@pytest.fixture
+def log(alert_file, tmp_path):
+    return AlertLog(alert_file, index_dir=tmp_path / 'idx', block_bytes=4096)
+
+
+class TestParsing:
+    """Timestamp formats, ORA- codes and --since values"""
+
+    def test_timestamps(self):
+        assert parse_timestamp('2024-03-05T10:00:00.123456+00:00') == pytest.approx(BASE + 0.123456)
+        assert parse_timestamp('2024-03-05T11:00:00.1+01:00') == pytest.approx(BASE + 0.1)
+        assert parse_timestamp('Tue Mar  5 10:00:00 2024') == datetime(2024, 3, 5, 10).timestamp()
+        assert parse_timestamp('Thread 1 advanced to log sequence 7') is None
+
+    def test_parse_time(self):
+        assert parse_time('2h', now=10000) == 10000 - 7200
+        assert parse_time('') is None
+        assert parse_time('2024-03-05 10:00') == datetime(2024, 3, 5, 10).timestamp()
+        with pytest.raises(ValueError):
+            parse_time('yesterday-ish')
+
+    def test_ora_codes(self):
+        assert normalize_ora_code('600') == 'ORA-00600'
+        assert normalize_ora_code('ora-1555') == 'ORA-01555'
+        with pytest.raises(ValueError):
+            normalize_ora_code('TNS-12541')
+
+    def test_xml_log(self, tmp_path):
+        path = tmp_path / 'log.xml'
+        path.write_text(
+            "<msg time='2024-03-05T10:00:00.000+00:00' org_id='oracle' comp_id='rdbms'\n"
+            " type='UNKNOWN' level='16' pid='4242'>\n <txt>Starting ORACLE instance (normal)\n </txt>\n</msg>\n"
+            "<msg time='2024-03-05T10:05:00.000+00:00' org_id='oracle' comp_id='rdbms'\n"
+            " type='INCIDENT_ERROR' level='1' pid='4243'>\n"
+            " <txt>ORA-01555: snapshot too old: rollback segment &quot;_SYSSMU1$&quot; too small\n </txt>\n</msg>\n")
+        records = AlertLog(path, index_dir=tmp_path / 'idx').tail(10)
+        assert [r.time for r in records] == [BASE, BASE + 300]
+        assert records[1].codes == ('ORA-01555',)
+        assert '"_SYSSMU1$"' in records[1].text
+        assert records[1].attrs['type'] == 'INCIDENT_ERROR' and records[1].attrs['pid'] == '4243'
+
+
+class TestIndex:
+    """Incremental refresh, rotation and index-driven reads"""
+
+    def test_tail(self, log):
+        records = log.tail(3)
+        assert [r.time for r in records] == [BASE + 997 * 60, BASE + 998 * 60, BASE + 999 * 60]
+        assert 'ORA-00600' in records[-1].text and records[-1].codes == ('ORA-00600',)
+
+    def test_incremental_refresh(self, log, alert_file):
+        size = alert_file.stat().st_size
+        log.refresh()
+        assert log.last_parsed_bytes == size
+        with open(alert_file, 'a') as f:
+            f.write(text_entries(5, start=1000))
+        log.refresh()
+        assert 0 < log.last_parsed_bytes < 2 * 4096 + 1000
+        assert log.tail(1)[0].time == BASE + 1004 * 60
+
+    def test_index_persisted(self, log, alert_file, tmp_path):
+        log.refresh()
+        again = AlertLog(alert_file, index_dir=tmp_path / 'idx', block_bytes=4096)
+        again.refresh()
+        assert again.last_parsed_bytes == 0
+
+    def test_rotation_rebuilds(self, log, alert_file):
+        log.refresh()
+        alert_file.write_text(text_entries(3, start=5000))
+        records = log.tail(10)
+        assert [r.time for r in records] == [BASE + i * 60 for i in (5000, 5001, 5002)]
+
+    def test_ora_filter_reads_only_matching_blocks(self, log, alert_file):
+        page = log.search(ora='600', limit=500)
+        assert len(page['records']) == 10
+        assert all(r.codes == ('ORA-00600',) for r in page['records'])
+        assert page['scanned_bytes'] < alert_file.stat().st_size / 2
+        assert log.search(grep='ORA-600', limit=500)['scanned_bytes'] == page['scanned_bytes']
+
+    def test_time_range(self, log, alert_file):
+        page = log.search(since=BASE + 100 * 60, until=BASE + 109 * 60, limit=500)
+        assert [r.time for r in page['records']] == [BASE + i * 60 for i in range(109, 99, -1)]
+        assert page['scanned_bytes'] <= 2 * 4096 + 200
+
+    def test_grep_and_pagination(self, log):
+        seen, before = [], None
+        while True:
+            page = log.search(grep=r'sequence 1\d\d\b', limit=30, before=before)
+            seen.extend(r.time for r in page['records'])
+            before = page['next_before']
+            if before is None:
+                break
+        expected = [BASE + i * 60 for i in range(199, 99, -1) if i % 100 != 99]
+        assert seen == expected
+
+
+class TestAlertLogInterfaces:
+    """`oradba logs alert` and /api/logs/alert"""
+
+    def test_cli(self, alert_file, monkeypatch, tmp_path):
+        from oracledba.commands.database import logs
+        monkeypatch.setenv('HOME', str(tmp_path))
+        result = CliRunner().invoke(logs, ['alert', '--file', str(alert_file), '--ora', '600',
+                                           '--tail', '2'])
+        assert result.exit_code == 0, result.output
+        assert result.output.count('ORA-00600') == 2
+        assert 'arguments: [999]' in result.output
+        bad = CliRunner().invoke(logs, ['alert', '--file', str(alert_file), '--since', 'soon'])
+        assert bad.exit_code == 1
+
+    def test_find_alert_log(self, tmp_path):
+        trace = tmp_path / 'diag' / 'rdbms' / 'gdcprod_dg' / 'GDCPROD' / 'trace'
+        trace.mkdir(parents=True)
+        (trace / 'alert_GDCPROD.log').write_text('')
+        assert find_alert_log('GDCPROD', oracle_base=str(tmp_path)) == trace / 'alert_GDCPROD.log'
+        assert find_alert_log('OTHER', oracle_base=str(tmp_path)) is None
+
+    def test_api(self, alert_file, monkeypatch, tmp_path):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'alert_logs', {})
+        monkeypatch.setattr(web_server, 'CONFIG_DIR', tmp_path)
+        monkeypatch.setattr(web_server, 'find_alert_log', lambda *a, **k: alert_file)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.get('/api/logs/alert?ora=ORA-00600&limit=4').get_json()
+        assert data['success'] and len(data['records']) == 4
+        assert data['records'][0]['codes'] == ['ORA-00600']
+        more = client.get(f"/api/logs/alert?ora=600&limit=10&before={data['next_before']}").get_json()
+        assert len(more['records']) == 6 and more['next_before'] is None
+        assert client.get('/api/logs/alert?since=whenever').status_code == 400
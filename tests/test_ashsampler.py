@@ -0,0 +1,154 @@
+"""
+Tests for the active session sampler (modules/ashsampler.py)
+"""
+
+import json
+
+import pytest
+
+from oracledba.modules.ashsampler import ASH_QUERY, AshSampler, SampleBuffer, summarize
+from oracledba.modules.database import DatabaseManager
+from oracledba.utils.sqlsession import SessionError
+
+HEADER = 'SID|BLOCKING_SESSION|USERNAME|SQL_ID|MODULE|EVENT|WAIT_CLASS'
+
+
+def row(sid, event='ON CPU', wait_class='CPU', sql_id='b6usrg82hwsa3', module='SQL*Plus',
+        user='APP', blocker=''):
+    return {'SID': str(sid), 'BLOCKING_SESSION': str(blocker), 'USERNAME': user, 'SQL_ID': sql_id,
+            'MODULE': module, 'EVENT': event, 'WAIT_CLASS': wait_class}
+
+
+def output(rows):
+    return '\n'.join([HEADER] + ['|'.join(r.values()) for r in rows]) + '\n'
+
+
+class FakeSession:
+    """SqlSession stand-in answering the ASH query with the next poll's rows"""
+
+    def __init__(self, polls, clock, fail_after=None):
+        self.polls, self.clock, self.fail_after = polls, clock, fail_after
+        self.alive, self.queries = False, 0
+
+    def start(self):
+        self.alive = True
+
+    def execute(self, sql, timeout=None):
+        if sql != ASH_QUERY:
+            return ''
+        if self.fail_after is not None and self.queries >= self.fail_after:
+            self.alive = False
+            raise SessionError('sqlplus exited')
+        self.queries += 1
+        self.clock.now += 1
+        result = self.polls.pop(0)
+        return result if isinstance(result, str) else output(result)
+
+    def close(self):
+        self.alive = False
+
+
+def sampler(clock, polls, fail_after=None):
+    """AshSampler over FakeSessions; each poll takes one clock second and
+    only the first session fails"""
+    clock.now, sessions = 1_700_000_000.0, []
+
+    def factory():
+        sessions.append(FakeSession(polls, clock, None if sessions else fail_after))
+        return sessions[-1]
+    return AshSampler(session_factory=factory, clock=clock), sessions
+
+
+class TestSampleBuffer:
+    """Columnar ring: windows, wraparound and string compaction"""
+
+    def test_window_and_top(self):
+        buf = SampleBuffer(capacity=100)
+        buf.add(10, [row(1), row(2, 'db file sequential read', 'User I/O', sql_id='7ztv2z24kw0s0')])
+        buf.add(11, [row(1)])
+        buf.add(12, [])
+        buf.add(13, [row(3, 'enq: TX - row lock contention', 'Application', blocker=1)])
+        polls, data = buf.window(11, 13)
+        assert polls == 3 and data['sid'] == [1, 3] and data['blocker'] == [-1, 1]
+        report = summarize(polls, data)
+        assert report['average_active_sessions'] == 0.67
+        assert report['events'][0] == {'name': 'ON CPU', 'samples': 1, 'pct': 50.0, 'aas': 0.33,
+                                       'wait_class': 'CPU'}
+        assert report['blockers'][0]['name'] == '1'
+        assert summarize(*buf.window())['sql_ids'][0] == {'name': 'b6usrg82hwsa3', 'samples': 3,
+                                                          'pct': 75.0, 'aas': 0.75}
+
+    def test_wraparound_clips_window_to_oldest_row(self):
+        buf = SampleBuffer(capacity=5, poll_capacity=4)
+        for t in range(10):
+            buf.add(t, [row(t), row(t + 100)])
+        polls, data = buf.window()
+        assert data['time'] == [7, 8, 8, 9, 9] and polls == 3
+        assert buf.window(8.5)[1]['sid'] == [9, 109]
+        assert buf.window(20)[1]['sid'] == [] and buf.window(20)[0] == 0
+
+    def test_poll_ring_wrapping_first_keeps_aas(self):
+        buf = SampleBuffer(capacity=1000, poll_capacity=100)
+        for t in range(500):
+            buf.add(t, [row(1)])
+        polls, data = buf.window()
+        assert polls == 100 and len(data['time']) == 100 and data['time'][0] == 400
+        assert summarize(polls, data)['average_active_sessions'] == 1.0
+        assert buf.window(450)[0] == 50 and len(buf.window(450)[1]['sid']) == 50
+
+    def test_row_size(self):
+        buf = SampleBuffer(capacity=10)
+        columns = [buf.times, buf.sids, buf.blockers, *buf.columns.values()]
+        assert sum(c.itemsize for c in columns) == 36
+        buf.add(1, [row(2_000_000_000, blocker=65536)])
+        assert buf.window()[1]['sid'] == [2_000_000_000] and buf.window()[1]['blocker'] == [65536]
+
+    def test_compaction_keeps_live_strings(self):
+        buf = SampleBuffer(capacity=4)
+        for t in range(1100):
+            buf.add(t, [row(1, sql_id=f'sql{t}')])
+        assert len(buf.strings) < 1030
+        assert buf.window()[1]['sql_id'] == ['sql1096', 'sql1097', 'sql1098', 'sql1099']
+
+
+class TestAshSampler:
+    """Polling over a persistent session, reconnects and reports"""
+
+    def test_sample_and_report(self, clock):
+        ash, sessions = sampler(clock, [[row(1), row(2)], [row(1, module='JDBC|Thin')]])
+        assert len(ash.sample()) == 2 and len(ash.sample()) == 1
+        assert len(sessions) == 1 and sessions[0].queries == 2
+        report = ash.report(top=1)
+        assert report['polls'] == 2 and report['samples'] == 3 and len(report['modules']) == 1
+        assert report['users'][0] == {'name': 'APP', 'samples': 3, 'pct': 100.0, 'aas': 1.5}
+
+    def test_reconnects_after_session_loss(self, clock):
+        ash, sessions = sampler(clock, [[row(1)], [row(2)]], fail_after=1)
+        ash.sample()
+        with pytest.raises(SessionError):
+            ash.sample()
+        ash.sample()
+        assert len(sessions) == 2 and ash.buffer.window()[1]['sid'] == [1, 2]
+
+    def test_query_error(self, clock):
+        ash, _ = sampler(clock, ['ORA-00942: table or view does not exist\n'])
+        with pytest.raises(RuntimeError, match='ORA-00942'):
+            ash.sample()
+        assert ash.buffer.polls_written == 0
+
+    def test_manager_and_api(self, capsys, monkeypatch, clock):
+        monkeypatch.setattr('time.sleep', lambda seconds: None)
+        ash, _ = sampler(clock, [[row(1)], [row(1), row(2)], [row(3)]])
+        report = DatabaseManager().sample_sessions(duration=3, as_json=True, sampler=ash)
+        assert report['polls'] == 3 and json.loads(capsys.readouterr().out)['samples'] == 4
+
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'ash_sampler', ash)
+        monkeypatch.setattr(ash, 'start', lambda: None)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.get('/api/monitor/ash?since=1970-01-01&top=1').get_json()
+        assert data['success'] and data['samples'] == 4 and data['sessions'][0]['name'] == '1'
+        assert not client.get('/api/monitor/ash?since=yesterday').get_json()['success']
@@ -0,0 +1,158 @@
+"""
+Tests for the AWR snapshot diff (modules/awrdiff.py)
+"""
+
+import json
+
+import pytest
+
+from oracledba.modules.awrdiff import AwrDiff, build_report, diff_counters
+from oracledba.modules.tuning import TuningManager
+
+
+def snap_rows(snap_id, values, column='VALUE', **extra):
+    return [{'SNAP_ID': str(snap_id), 'NAME': name, column: str(value), **extra}
+            for name, value in values.items()]
+
+
+def event_rows(snap_id, events):
+    return [{'SNAP_ID': str(snap_id), 'NAME': name, 'WAIT_CLASS': wait_class,
+             'WAITS': str(waits), 'MICROS': str(micros)}
+            for name, (wait_class, waits, micros) in events.items()]
+
+
+def diff_rows(startup_end='2026-10-01 06:00:00'):
+    """Snapshots 10 and 11, an hour apart"""
+    return {
+        'snapshots': [
+            {'SNAP_ID': '10', 'INSTANCE_NUMBER': '1', 'END_TIME': '2026-10-18 09:00:00',
+             'STARTUP_TIME': '2026-10-01 06:00:00'},
+            {'SNAP_ID': '11', 'INSTANCE_NUMBER': '1', 'END_TIME': '2026-10-18 10:00:00',
+             'STARTUP_TIME': startup_end}],
+        'sysstat': (snap_rows(10, {'redo size': 1000, 'user commits': 100, 'user rollbacks': 0,
+                                   'session logical reads': 50000, 'execute count': 7000})
+                    + snap_rows(11, {'redo size': 3601000, 'user commits': 1900, 'user rollbacks': 200,
+                                     'session logical reads': 770000, 'execute count': 79000})),
+        'time_model': (snap_rows(10, {'DB time': 10e6, 'DB CPU': 5e6})
+                       + snap_rows(11, {'DB time': 7210e6, 'DB CPU': 1805e6})),
+        'events': (event_rows(10, {'db file sequential read': ('User I/O', 1000, 2e6),
+                                   'log file sync': ('Commit', 100, 1e6),
+                                   'enq: TX - row lock contention': ('Application', 5, 1e6)})
+                   + event_rows(11, {'db file sequential read': ('User I/O', 901000, 3602e6),
+                                     'log file sync': ('Commit', 2100, 181e6),
+                                     'enq: TX - row lock contention': ('Application', 5, 1e6),
+                                     'direct path read': ('User I/O', 400, 720e6)})),
+        'osstat': (snap_rows(10, {'BUSY_TIME': 1000, 'IDLE_TIME': 9000, 'NUM_CPUS': 8, 'LOAD': 0.5})
+                   + snap_rows(11, {'BUSY_TIME': 721000, 'IDLE_TIME': 2169000, 'NUM_CPUS': 8, 'LOAD': 2.25})),
+        'sqlstat': [
+            {'SQL_ID': 'b6usrg82hwsa3', 'MODULE': 'SQL*Plus', 'ELAPSED': '1800000000', 'CPU': '600000000',
+             'IOWAIT': '1100000000', 'EXECUTIONS': '3', 'BUFFER_GETS': '9000000', 'DISK_READS': '400000',
+             'ROWS_PROCESSED': '3', 'SQL_TEXT': 'SELECT SUM(AMOUNT) FROM SALES WHERE'},
+            {'SQL_ID': '7ztv2z24kw0s0', 'MODULE': '', 'ELAPSED': '3600000000', 'CPU': '900000000',
+             'IOWAIT': '2500000000', 'EXECUTIONS': '0', 'BUFFER_GETS': '12', 'DISK_READS': '0',
+             'ROWS_PROCESSED': '0', 'SQL_TEXT': ''}],
+    }
+
+
+class FakeClient:
+    """query_many/query stand-in returning one diff and the snapshot list"""
+
+    def __init__(self, rows=None, error=None):
+        self.rows, self.error = rows or diff_rows(), error
+        self.queries = None
+
+    def query(self, sql):
+        assert 'DBA_HIST_SNAPSHOT' in sql
+        return True, [{'SNAP_ID': '11', 'INSTANCE_NUMBER': '1', 'END_TIME': '2026-10-18 10:00:00',
+                       'STARTUP_TIME': '2026-10-01 06:00:00'},
+                      {'SNAP_ID': '10', 'INSTANCE_NUMBER': '1', 'END_TIME': '2026-10-18 09:00:00',
+                       'STARTUP_TIME': '2026-10-01 06:00:00'}], ''
+
+    def query_many(self, queries):
+        self.queries = queries
+        if self.error:
+            return True, {name: [] for name in queries}, {'sysstat': self.error}
+        return True, self.rows, {}
+
+
+class TestDiff:
+    """Deltas, rates and rankings between two snapshots"""
+
+    def test_diff_counters(self):
+        names, deltas = diff_counters({'a': 1.0, 'b': 5.0}, {'b': 7.5, 'a': 4.0, 'c': 2.0})
+        assert names == ['a', 'b', 'c'] and list(deltas) == [3.0, 2.5, 2.0]
+
+    def test_load_profile(self):
+        report = build_report(diff_rows(), 10, 11)
+        assert report['elapsed_seconds'] == 3600 and report['instances'] == 1
+        assert report['db_time_seconds'] == 7200 and report['average_active_sessions'] == 2.0
+        profile = {row['name']: row for row in report['load_profile']}
+        assert profile['Redo size (bytes)']['per_second'] == 1000
+        assert profile['Redo size (bytes)']['per_transaction'] == 1800
+        assert profile['Transactions']['total'] == 2000
+        assert profile['Logical reads (blocks)']['per_second'] == 200
+        assert profile['Executes']['per_transaction'] == 36
+
+    def test_top_events_include_db_cpu(self):
+        report = build_report(diff_rows(), 10, 11, top=3)
+        events = report['wait_events']
+        assert [e['event'] for e in events] == ['db file sequential read', 'DB CPU', 'direct path read']
+        assert events[0]['waits'] == 900000 and events[0]['avg_ms'] == 4.0
+        assert events[0]['pct_db_time'] == 50.0 and events[1]['time_seconds'] == 1800
+        classes = {c['wait_class']: c['time_seconds'] for c in report['wait_classes']}
+        assert classes == {'User I/O': 4320.0, 'CPU': 1800.0, 'Commit': 180.0}
+
+    def test_sql_and_os(self):
+        report = build_report(diff_rows(), 10, 11, top=10)
+        assert [s['sql_id'] for s in report['sql']] == ['7ztv2z24kw0s0', 'b6usrg82hwsa3']
+        assert report['sql'][0]['elapsed_per_exec_ms'] is None and report['sql'][0]['pct_db_time'] == 50.0
+        assert report['sql'][1]['elapsed_per_exec_ms'] == 600000
+        os_stats = {row['name']: row for row in report['os']}
+        assert os_stats['BUSY_TIME']['value'] == 720000 and os_stats['BUSY_TIME']['per_second'] == 200
+        assert os_stats['LOAD']['value'] == 2.25 and os_stats['LOAD']['per_second'] is None
+        assert report['host_cpu_busy_pct'] == 25.0
+
+    def test_refuses_restart_and_missing_snapshot(self):
+        with pytest.raises(ValueError, match='restarted'):
+            build_report(diff_rows(startup_end='2026-10-18 09:30:00'), 10, 11)
+        with pytest.raises(ValueError, match='Snapshot 12 not found'):
+            build_report(diff_rows(), 10, 12)
+
+
+class TestAwrDiff:
+    """One round trip, default snapshot pair, terminal/JSON/API output"""
+
+    def test_defaults_to_last_two_snapshots(self):
+        client = FakeClient()
+        report = AwrDiff(client).report(top=5)
+        assert (report['begin_snap'], report['end_snap']) == (10, 11)
+        assert set(client.queries) == {'snapshots', 'sysstat', 'time_model', 'events', 'osstat', 'sqlstat'}
+        assert 'SNAP_ID > 10 AND SNAP_ID <= 11' in client.queries['sqlstat']
+        assert 'FETCH FIRST 5 ROWS ONLY' in client.queries['sqlstat']
+
+    def test_errors(self):
+        with pytest.raises(ValueError, match='must be before'):
+            AwrDiff(FakeClient()).report(11, 10)
+        with pytest.raises(RuntimeError, match='ORA-00942'):
+            AwrDiff(FakeClient(error='ORA-00942: table or view does not exist')).report(10, 11)
+
+    def test_manager_output(self, capsys):
+        mgr = TuningManager(FakeClient())
+        assert mgr.generate_awr(10, 11, as_json=True)['end_snap'] == 11
+        assert json.loads(capsys.readouterr().out)['average_active_sessions'] == 2.0
+        assert mgr.generate_awr(10, 11) is not None
+        out = capsys.readouterr().out
+        assert 'Top Timed Events' in out and 'b6usrg82hwsa3' in out
+        assert TuningManager(FakeClient()).generate_awr(11, 11) is None
+
+    def test_api(self, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'awr_diff', AwrDiff(FakeClient()))
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.get('/api/tuning/awr?top=2').get_json()
+        assert data['success'] and len(data['wait_events']) == 2 and data['end_snap'] == 11
+        assert client.get('/api/tuning/awr/snapshots').get_json()['snapshots'][0]['snap_id'] == 11
+        assert not client.get('/api/tuning/awr?begin=11&end=11').get_json()['success']
@@ -0,0 +1,205 @@
+"""
+Tests for the local SQLite backup catalog (modules/backupcatalog.py)
+"""
+
+import re
+
+import pytest
+
+from oracledba.modules.backupcatalog import BackupCatalog
+
+
+def backup_set(recid, kind, time, level=None, pieces=1):
+    return {'RECID': str(recid), 'STAMP': str(recid), 'SET_STAMP': str(1000 + recid),
+            'SET_COUNT': str(recid), 'BACKUP_TYPE': kind, 'INCREMENTAL_LEVEL': '' if level is None else str(level),
+            'CONTROLFILE_INCLUDED': 'YES' if kind == 'C' else 'NO', 'PIECES': str(pieces),
+            'ELAPSED_SECONDS': '60', 'START_TIME': time, 'COMPLETION_TIME': time}
+
+
+def piece(recid, set_recid, time, gb=1, status='A', piece_no=1):
+    return {'RECID': str(recid), 'SET_STAMP': str(1000 + set_recid), 'SET_COUNT': str(set_recid),
+            'PIECE#': str(piece_no), 'HANDLE': f'/u01/backup/piece{recid}.bkp', 'TAG': f'TAG{set_recid}',
+            'STATUS': status, 'DEVICE_TYPE': 'DISK', 'BYTES': str(gb * 1073741824), 'COMPLETION_TIME': time}
+
+
+def datafile(recid, set_recid, file_no, scn, time, level=None):
+    return {'RECID': str(recid), 'SET_STAMP': str(1000 + set_recid), 'SET_COUNT': str(set_recid),
+            'FILE#': str(file_no), 'INCREMENTAL_LEVEL': '' if level is None else str(level),
+            'CHECKPOINT_CHANGE#': str(scn), 'CHECKPOINT_TIME': time, 'BLOCKS': '100', 'BLOCK_SIZE': '8192'}
+
+
+def redolog(recid, set_recid, seq, first, nxt, first_time, next_time):
+    return {'RECID': str(recid), 'SET_STAMP': str(1000 + set_recid), 'SET_COUNT': str(set_recid),
+            'THREAD#': '1', 'SEQUENCE#': str(seq), 'FIRST_CHANGE#': str(first), 'NEXT_CHANGE#': str(nxt),
+            'FIRST_TIME': first_time, 'NEXT_TIME': next_time, 'BLOCKS': '10', 'BLOCK_SIZE': '512'}
+
+
+def archived(recid, seq, first, nxt, first_time, next_time, deleted='NO'):
+    return {'RECID': str(recid), 'NAME': '' if deleted == 'YES' else f'/u01/arch/1_{seq}.arc',
+            'THREAD#': '1', 'SEQUENCE#': str(seq), 'FIRST_CHANGE#': str(first), 'NEXT_CHANGE#': str(nxt),
+            'FIRST_TIME': first_time, 'NEXT_TIME': next_time, 'BLOCKS': '10', 'BLOCK_SIZE': '512',
+            'DELETED': deleted, 'STATUS': 'D' if deleted == 'YES' else 'A'}
+
+
+def copy(recid, file_no, scn, time, tag='INCR_FOREVER'):
+    return {'RECID': str(recid), 'NAME': f'/u01/fra/copy/data_D-CDB_FNO-{file_no}.dbf', 'TAG': tag,
+            'FILE#': str(file_no), 'INCREMENTAL_LEVEL': '0', 'CHECKPOINT_CHANGE#': str(scn),
+            'CHECKPOINT_TIME': time, 'BLOCKS': '131072', 'BLOCK_SIZE': '8192', 'COMPLETION_TIME': time}
+
+
+class FakeClient:
+    """Answers the catalog's query_many from in-memory control file records"""
+
+    def __init__(self):
+        self.rows = {
+            'sets': [backup_set(1, 'I', '2026-01-10 01:00:00', level=0),
+                     backup_set(2, 'L', '2026-01-10 02:00:00'),
+                     backup_set(3, 'I', '2026-01-11 01:00:00', level=1),
+                     backup_set(4, 'D', '2026-01-11 01:05:00')],
+            'pieces': [piece(1, 1, '2026-01-10 01:00:00', gb=20),
+                       piece(2, 2, '2026-01-10 02:00:00', gb=2),
+                       piece(3, 3, '2026-01-11 01:00:00', gb=3),
+                       piece(4, 4, '2026-01-11 01:05:00', gb=0)],
+            'datafiles': [datafile(1, 1, 1, 1000, '2026-01-10 01:00:00', level=0),
+                          datafile(2, 1, 2, 1000, '2026-01-10 01:00:00', level=0),
+                          datafile(3, 3, 1, 1500, '2026-01-11 01:00:00', level=1),
+                          datafile(4, 3, 2, 1500, '2026-01-11 01:00:00', level=1),
+                          datafile(5, 4, 0, 1510, '2026-01-11 01:05:00')],
+            'redologs': [redolog(1, 2, 10, 990, 1100, '2026-01-09 23:00:00', '2026-01-10 01:30:00'),
+                         redolog(2, 2, 11, 1100, 1200, '2026-01-10 01:30:00', '2026-01-10 02:00:00')],
+            'archived': [archived(1, 10, 990, 1100, '2026-01-09 23:00:00', '2026-01-10 01:30:00', 'YES'),
+                         archived(2, 11, 1100, 1200, '2026-01-10 01:30:00', '2026-01-10 02:00:00', 'YES'),
+                         archived(3, 12, 1200, 1400, '2026-01-10 02:00:00', '2026-01-10 12:00:00'),
+                         archived(4, 13, 1400, 1600, '2026-01-10 12:00:00', '2026-01-11 00:30:00'),
+                         archived(5, 14, 1600, 1800, '2026-01-11 00:30:00', '2026-01-11 02:00:00')],
+            'copies': [],
+        }
+        self.calls = 0
+
+    def query_many(self, queries):
+        self.calls += 1
+        results = {}
+        for name, sql in queries.items():
+            if name.endswith('_high'):
+                rows = self.rows[name[:-len('_high')]]
+                results[name] = [{'HIGH': str(max((int(r['RECID']) for r in rows), default=0))}]
+                continue
+            if name == 'copies':
+                results[name] = list(self.rows['copies'])
+                continue
+            since = int(re.search(r'RECID (?:>|<=) (\d+)', sql).group(1))
+            if name.endswith('_gone'):
+                view = name[:-len('_gone')]
+                results[name] = [r for r in self.rows[view]
+                                 if r['STATUS'] != 'A' and int(r['RECID']) <= since]
+            else:
+                results[name] = [r for r in self.rows[name] if int(r['RECID']) > since]
+        return True, results, {}
+
+
+@pytest.fixture
+def fake():
+    return FakeClient()
+
+
+@pytest.fixture
+def catalog(fake, tmp_path):
+    catalog = BackupCatalog(fake, path=tmp_path / 'catalog.db')
+    catalog.refresh()
+    return catalog
+
+
+class TestSync:
+    """Incremental refresh by RECID"""
+
+    def test_only_new_and_changed_records(self, catalog, fake):
+        assert catalog.refresh() == {'skipped': False, 'updated': 0, 'copies': 0,
+                                     'new': {'sets': 0, 'pieces': 0, 'datafiles': 0,
+                                             'redologs': 0, 'archived': 0}}
+        fake.rows['pieces'][1]['STATUS'] = 'D'
+        fake.rows['sets'].append(backup_set(5, 'L', '2026-01-12 02:00:00'))
+        stats = catalog.refresh()
+        assert stats['new']['sets'] == 1 and stats['updated'] == 1
+        assert catalog.recent_backups(10)[-1]['status'] == 'AVAILABLE'
+        statuses = {b['recid']: b['status'] for b in catalog.recent_backups(10)}
+        assert statuses[2] == 'DELETED'
+
+    def test_min_interval(self, catalog, fake):
+        calls = fake.calls
+        assert catalog.refresh(min_interval=3600)['skipped']
+        assert fake.calls == calls
+
+    def test_recreated_control_file(self, catalog, fake):
+        fake.rows['sets'] = [backup_set(1, 'L', '2026-02-01 02:00:00')]
+        fake.rows['pieces'] = [piece(1, 1, '2026-02-01 02:00:00')]
+        catalog.refresh()
+        backups = catalog.recent_backups(10)
+        assert [(b['recid'], b['kind']) for b in backups] == [(1, 'ARCHIVELOG')]
+
+
+class TestQuestions:
+    """Restore plans and size trends from the catalog alone"""
+
+    def test_plan_before_level1(self, catalog):
+        plan = catalog.restore_plan('2026-01-11 00:00:00')
+        assert plan['restorable'] and plan['start_scn'] == 1000
+        assert [d['incrementals'] for d in plan['datafiles']] == [0, 0]
+        assert [p['handle'] for p in plan['pieces']] == ['/u01/backup/piece1.bkp', '/u01/backup/piece2.bkp']
+        assert plan['archived_logs'] == {'from_backup': 2,
+                                         'on_disk': ['/u01/arch/1_12.arc', '/u01/arch/1_13.arc']}
+        assert plan['total_gb'] == 22.0
+
+    def test_plan_now_uses_level1(self, catalog):
+        plan = catalog.restore_plan()
+        assert plan['restorable'] and plan['start_scn'] == 1500
+        assert {p['kind'] for p in plan['pieces']} == {'LEVEL 0', 'LEVEL 1'}
+        assert plan['archived_logs']['on_disk'] == ['/u01/arch/1_13.arc', '/u01/arch/1_14.arc']
+
+    def test_plan_reports_gaps(self, catalog, fake):
+        fake.rows['pieces'][1]['STATUS'] = 'X'
+        catalog.refresh()
+        plan = catalog.restore_plan('2026-01-11 00:00:00')
+        assert not plan['restorable']
+        assert plan['missing'] == ['archived log thread 1 sequence 10', 'archived log thread 1 sequence 11']
+        assert not catalog.restore_plan('2026-01-01 00:00:00')['restorable']
+
+    def test_plan_from_image_copies(self, catalog, fake):
+        """Incremental forever: rolled-forward copies are the level 0 base"""
+        fake.rows['pieces'][0]['STATUS'] = 'D'            # the old level 0 backup set is gone
+        fake.rows['copies'] = [copy(1, 1, 1200, '2026-01-10 02:00:00'),
+                               copy(2, 2, 1200, '2026-01-10 02:00:00')]
+        catalog.refresh()
+        assert not catalog.restore_plan('2026-01-10 01:30:00')['restorable']
+        plan = catalog.restore_plan('2026-01-11 00:00:00')
+        assert plan['restorable'] and plan['start_scn'] == 1200 and plan['pieces'] == []
+        assert [d['base'] for d in plan['datafiles']] == ['copy', 'copy']
+        assert [c['name'] for c in plan['copies']] == ['/u01/fra/copy/data_D-CDB_FNO-1.dbf',
+                                                       '/u01/fra/copy/data_D-CDB_FNO-2.dbf']
+        assert plan['total_gb'] == 2.0
+        plan = catalog.restore_plan()
+        assert plan['restorable'] and plan['start_scn'] == 1500
+        assert {p['kind'] for p in plan['pieces']} == {'LEVEL 1'}
+        # a copy rolled forward again replaces its old checkpoint
+        fake.rows['copies'] = [copy(1, 1, 1500, '2026-01-11 01:00:00')]
+        catalog.refresh()
+        assert not catalog.restore_plan()['restorable']
+
+    def test_size_trend(self, catalog):
+        trend = catalog.size_trend(days=100000)
+        daily = {(d['day'], d['kind']): d['gb'] for d in trend['daily']}
+        assert daily[('2026-01-10', 'LEVEL 0')] == 20.0
+        assert daily[('2026-01-11', 'CONTROLFILE')] == 0.0
+        assert trend['summary']['LEVEL 1'] == {'days': 1, 'total_gb': 3.0, 'avg_gb': 3.0,
+                                               'first_gb': 3.0, 'last_gb': 3.0}
+
+    def test_api(self, catalog, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'backup_catalog', catalog)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.get('/api/rman/catalog/restore-plan?until=2026-01-11 00:00:00').get_json()
+        assert data['success'] and data['restorable'] and len(data['pieces']) == 2
+        assert not client.get('/api/rman/catalog/restore-plan?until=yesterday').get_json()['success']
+        assert len(client.get('/api/rman/catalog?limit=2').get_json()['backups']) == 2
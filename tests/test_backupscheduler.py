@@ -0,0 +1,299 @@
+"""
+Tests for the backup scheduler (modules/backupscheduler.py)
+"""
+
+import sys
+import time
+from datetime import datetime, timedelta
+
+import pytest
+
+from oracledba.modules import rman as rman_module
+from oracledba.modules.backupscheduler import BackupScheduler, CronSchedule, in_windows
+from oracledba.utils.jobs import Job
+
+PY = sys.executable
+
+
+class FakeJobs:
+    """JobManager stand-in: jobs stay running until finish() is called"""
+
+    def __init__(self, tmp_path):
+        self.dir = tmp_path / 'jobs'
+        self.jobs = {}
+
+    def create(self, cmd, name, tag=None, meta=None):
+        job_id = f'job{len(self.jobs) + 1}'
+        return Job(job_id, name, cmd, self.dir / f'{job_id}.log', tag=tag, meta=meta)
+
+    def enqueue(self, job):
+        job.state = 'running'
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        return self.jobs.get(job_id)
+
+    def cancel(self, job_id):
+        self.jobs[job_id].state = 'cancelled'
+        return True
+
+    def finish(self, job_id, state='done'):
+        self.jobs[job_id].state = state
+
+
+@pytest.fixture
+def clock(clock):
+    clock.now = datetime(2026, 1, 12, 0, 30)          # a Monday
+    return clock
+
+
+@pytest.fixture
+def jobs(tmp_path):
+    return FakeJobs(tmp_path)
+
+
+@pytest.fixture
+def scheduler(tmp_path, monkeypatch, jobs, clock, canned_client):
+    monkeypatch.setattr(rman_module, 'TUNING_FILE', tmp_path / 'rman-tuning.json')
+    monkeypatch.setattr(rman_module, 'STRATEGY_FILE', tmp_path / 'rman-strategy.json')
+    return BackupScheduler(jobs, canned_client(), state_file=tmp_path / 'schedule.json',
+                           clock=clock)
+
+
+def script(jobs, job_id):
+    with open(jobs.get(job_id).stdin_file) as f:
+        return f.read()
+
+
+class TestCron:
+    """Cron fields, next/last slot and windows"""
+
+    def test_next_and_last(self):
+        cron = CronSchedule('0 1 * * 0')
+        monday = datetime(2026, 1, 12, 0, 30)
+        assert cron.next_after(monday) == datetime(2026, 1, 18, 1, 0)
+        assert cron.last_at_or_before(monday) == datetime(2026, 1, 11, 1, 0)
+        assert cron.last_at_or_before(datetime(2026, 1, 11, 1, 0)) == datetime(2026, 1, 11, 1, 0)
+        assert CronSchedule('*/15 2-3 * * *').next_after(datetime(2026, 1, 1, 3, 50)) == \
+            datetime(2026, 1, 2, 2, 0)
+
+    def test_day_fields_or_when_both_set(self):
+        cron = CronSchedule('0 0 1 * 1')                 # the 1st or any Monday
+        assert cron.next_after(datetime(2026, 1, 12, 0, 0)) == datetime(2026, 1, 19, 0, 0)
+        assert cron.next_after(datetime(2026, 1, 26, 0, 0)) == datetime(2026, 2, 1, 0, 0)
+
+    def test_invalid(self):
+        for expr in ('0 1 * *', '60 * * * *', '* * * * 8', 'a * * * *', '*/0 * * * *'):
+            with pytest.raises(ValueError):
+                CronSchedule(expr)
+
+    def test_windows(self):
+        assert in_windows([], datetime(2026, 1, 1, 12, 0))
+        assert in_windows(['22:00-06:00'], datetime(2026, 1, 1, 23, 0))
+        assert in_windows(['22:00-06:00'], datetime(2026, 1, 1, 5, 59))
+        assert not in_windows(['22:00-06:00', '12:00-13:00'], datetime(2026, 1, 1, 6, 0))
+
+
+class TestDispatch:
+    """Global limit, per-database exclusion and I/O windows"""
+
+    def test_due_policies_respect_global_limit(self, scheduler, jobs, clock):
+        for db in ('SALES', 'HR', 'FIN'):
+            scheduler.add_policy(db, 'full', '0 1 * * *')
+        clock.now = datetime(2026, 1, 12, 1, 0)
+        started = scheduler.tick()
+        assert [r['database'] for r in started] == ['SALES', 'HR']
+        assert 'PLUGGABLE DATABASE SALES' in script(jobs, started[0]['job_id'])
+        status = scheduler.status()
+        assert [r['database'] for r in status['queue']] == ['FIN']
+
+        jobs.finish(started[0]['job_id'])
+        clock.now += timedelta(minutes=1)
+        assert [r['database'] for r in scheduler.tick()] == ['FIN']
+        status = scheduler.status()
+        assert status['history'][0]['state'] == 'done'
+        sales = next(p for p in status['policies'] if p['id'] == 'sales-full')
+        assert sales['last_result']['state'] == 'done'
+        assert sales['next_run'] == '2026-01-13 01:00'
+
+    def test_cdb_excludes_pdbs(self, scheduler, jobs):
+        scheduler.configure(max_concurrent=4)
+        scheduler.submit('SALES', 'full')
+        scheduler.submit('CDB', 'archive')
+        scheduler.submit('HR', 'incremental')
+        assert [r['database'] for r in scheduler.tick()] == ['SALES', 'HR']
+        assert [r['type'] for r in scheduler.status()['queue']] == ['archive']
+        for job_id in list(jobs.jobs):
+            jobs.finish(job_id)
+        started = scheduler.tick()
+        assert [r['type'] for r in started] == ['archive']
+        scheduler.submit('SALES', 'full')
+        assert scheduler.tick() == []                   # the archive run holds the CDB
+
+    def test_windows_hold_scheduled_runs_only(self, scheduler, jobs, clock):
+        scheduler.configure(windows=['22:00-06:00'])
+        scheduler.add_policy('CDB', 'full', '0 12 * * *')
+        scheduler.add_policy('HR', 'archive', '0 12 * * *')
+        clock.now = datetime(2026, 1, 12, 12, 0)
+        started = scheduler.tick()
+        assert [r['type'] for r in started] == ['archive']
+        jobs.finish(started[0]['job_id'])
+        scheduler.submit('SALES', 'full')
+        assert [r['database'] for r in scheduler.tick()] == ['SALES']
+        clock.now = datetime(2026, 1, 12, 22, 0)
+        assert scheduler.status()['queue'][0]['database'] == 'CDB'
+
+    def test_cancel(self, scheduler, jobs):
+        first = scheduler.submit('SALES', 'full')
+        second = scheduler.submit('SALES', 'incremental')
+        scheduler.tick()
+        assert scheduler.cancel(second['id'])
+        assert scheduler.status()['queue'] == []
+        job_id = scheduler.status()['running'][0]['job_id']
+        assert scheduler.cancel(first['id']) and jobs.get(job_id).state == 'cancelled'
+        assert not scheduler.cancel('nope')
+
+
+class TestRestart:
+    """Persisted state and missed slots"""
+
+    def test_missed_slots_coalesce_into_one_catch_up(self, scheduler, jobs, clock, tmp_path):
+        scheduler.add_policy('CDB', 'archive', '0 * * * *')
+        scheduler.add_policy('HR', 'archive', '0 * * * *', catch_up=False)
+        clock.now = datetime(2026, 1, 12, 5, 10)        # five hourly slots missed
+        again = BackupScheduler(jobs, scheduler.client, state_file=tmp_path / 'schedule.json',
+                                clock=clock)
+        started = again.tick()
+        assert [(r['database'], r['reason']) for r in started] == [('CDB', 'catch-up')]
+        policies = {p['id']: p for p in again.status()['policies']}
+        assert policies['hr-archive']['last_slot'] == '2026-01-12 05:00'
+        clock.now = datetime(2026, 1, 12, 6, 0)
+        jobs.finish(started[0]['job_id'])
+        assert [(r['database'], r['reason']) for r in again.tick()] == [('CDB', 'schedule')]
+        assert [r['database'] for r in again.status()['queue']] == ['HR']   # archive runs share the CDB
+
+    def test_no_duplicate_while_previous_run_pending(self, scheduler, clock):
+        scheduler.configure(windows=['22:00-06:00'])
+        scheduler.add_policy('CDB', 'full', '*/10 * * * *')
+        for minute in (10, 20, 30):
+            clock.now = datetime(2026, 1, 12, 12, minute)
+            scheduler.tick()
+        assert len(scheduler.status()['queue']) == 1
+
+    def test_single_dispatcher(self, scheduler, jobs, tmp_path):
+        other = BackupScheduler(jobs, scheduler.client, state_file=tmp_path / 'schedule.json')
+        assert scheduler.acquire() and scheduler.active
+        assert not other.acquire()
+        run = other.submit('CDB', 'full')                # queued only
+        assert scheduler.status()['queue'][0]['id'] == run['id']
+        scheduler.submit('HR', 'full')                  # the holder dispatches at once
+        assert [r['database'] for r in scheduler.status()['running']] == ['CDB']
+        scheduler.release()
+        assert other.acquire()
+        other.release()
+
+    def test_run_started_by_another_process(self, tmp_path, clock, canned_client):
+        """`oradba rman schedule now` dispatches, exits, and the web server records the result"""
+        import os
+        import subprocess
+        from oracledba.utils.jobs import JobManager
+        web = BackupScheduler(JobManager(tmp_path / 'jobs'), canned_client(),
+                              state_file=tmp_path / 'schedule.json', clock=clock)
+        web.tick()
+        assert web.jobs.list() == []          # index read before the CLI job exists
+        rman = tmp_path / 'rman'
+        rman.write_text('#!/bin/sh\ncat > /dev/null\nsleep 0.3\n')
+        rman.chmod(0o755)
+        script = ('import sys; from oracledba.modules.backupscheduler import BackupScheduler; '
+                  'from oracledba.utils.jobs import JobManager\n'
+                  'class Client:\n    rman = sys.argv[1]\n    wrap = staticmethod(list)\n'
+                  'cli = BackupScheduler(JobManager(sys.argv[2]), Client(),\n'
+                  '                      state_file=sys.argv[3])\n'
+                  'cli.submit("CDB", "archive"); cli.tick()')
+        subprocess.run([PY, '-c', script, str(rman), str(tmp_path / 'jobs'),
+                        str(tmp_path / 'schedule.json')],
+                       env={**os.environ, 'HOME': str(tmp_path)}, check=True)
+        run, = web.status()['running']
+        deadline = time.time() + 10
+        while web.status()['running'] and time.time() < deadline:
+            time.sleep(0.1)
+            web.tick()
+        assert web.status()['history'][-1]['id'] == run['id']
+        assert web.status()['history'][-1]['state'] == 'succeeded'
+
+    def test_daemon_errors_are_logged(self, scheduler, monkeypatch, caplog):
+        import logging
+        from oracledba.utils import logger
+        monkeypatch.setattr(logger, '_logger', logging.getLogger('oracledba'))
+
+        def tick():
+            scheduler._stop.set()
+            raise OSError('state file is read-only')
+        monkeypatch.setattr(scheduler, 'tick', tick)
+        with caplog.at_level(logging.ERROR, logger='oracledba'):
+            scheduler.run_forever(interval=0)
+        assert 'backup scheduler: state file is read-only' in caplog.text
+
+
+class TestScheduleApi:
+    """/api/databases/<name>/backup goes through the scheduler"""
+
+    def test_pdb_backup_is_queued(self, scheduler, jobs, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'backup_scheduler', scheduler)
+        assert scheduler.acquire()
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.post('/api/databases/sales/backup', json={'type': 'incremental'}).get_json()
+        assert data['success'] and data['job_id'] in jobs.jobs
+        assert 'INCREMENTAL LEVEL 1' in script(jobs, data['job_id'])
+        data = client.post('/api/databases/sales/backup', json={'type': 'full'}).get_json()
+        assert data['success'] and data['job_id'] is None and 'queued' in data['message']
+
+        data = client.post('/api/rman/schedule/policies',
+                           json={'database': 'sales', 'type': 'full', 'schedule': '0 1 * * 0'}).get_json()
+        assert data['success'] and data['policy']['id'] == 'sales-full'
+        assert not client.post('/api/rman/schedule/policies',
+                               json={'type': 'full', 'schedule': 'daily'}).get_json()['success']
+        status = client.get('/api/rman/schedule').get_json()
+        assert status['scheduler_active'] and status['policies'][0]['next_run'] == '2026-01-18 01:00'
+        assert client.delete('/api/rman/schedule/policies/sales-full').get_json()['success']
+        scheduler.release()
+
+    def test_daemons_start_on_first_request(self, monkeypatch):
+        """Under gunicorn/waitress start_gui_server() never runs"""
+        from oracledba import web_server
+        started = []
+        monkeypatch.setattr(web_server, '_daemons_started', False)
+        monkeypatch.setenv('ORADBA_DAEMONS', '1')
+        monkeypatch.setenv('ORADBA_SCHEDULER', '1')
+        monkeypatch.setitem(web_server.dg_monitor.settings, 'targets', ['GDCSTBY'])
+        for name in ('backup_scheduler', 'fra_watcher', 'dg_monitor'):
+            monkeypatch.setattr(getattr(web_server, name), 'start',
+                                lambda name=name: started.append(name))
+        client = web_server.app.test_client()
+        client.get('/login')
+        client.get('/login')
+        assert started == ['backup_scheduler', 'fra_watcher', 'dg_monitor']
+
+    def test_rman_backup_script_on_stdin(self, scheduler, jobs, monkeypatch):
+        """RMAN runs as oracle: the script is fed on stdin, not read from root's home"""
+        import os
+        import stat
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'backup_scheduler', scheduler)
+        assert scheduler.acquire()
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.post('/api/rman/backup', json={'type': 'full'}).get_json()
+        job = jobs.get(data['job_id'])
+        assert job.cmd == [scheduler.client.rman, 'target', '/']
+        assert job.stdin_file == str(jobs.dir / f'{job.id}.rcv')
+        assert stat.S_IMODE(os.stat(job.stdin_file).st_mode) == 0o600
+        assert 'BACKUP' in script(jobs, job.id) and script(jobs, job.id).endswith('EXIT;\n')
+        scheduler.release()
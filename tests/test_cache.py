@@ -0,0 +1,226 @@
+"""
+Tests for the query result cache (utils/cache.py) and its GUI wiring
+"""
+
+import threading
+import time
+
+import pytest
+
+from oracledba.utils.cache import ResultCache
+
+
+class TestResultCache:
+    """TTL, LRU, single-flight and tag invalidation"""
+
+    def test_ttl(self, clock):
+        cache = ResultCache(clock=clock)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 'v'
+        assert cache.get_or_compute('k', compute, ttl=10) == 'v'
+        clock.now += 9
+        cache.get_or_compute('k', compute, ttl=10)
+        assert len(calls) == 1
+        clock.now += 2
+        cache.get_or_compute('k', compute, ttl=10)
+        assert len(calls) == 2
+
+    def test_lru_eviction(self, clock):
+        cache = ResultCache(max_entries=2, clock=clock)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')          # a is now most recently used
+        cache.set('c', 3)
+        assert cache.get('b') is None
+        assert cache.get('a') == 1 and cache.get('c') == 3
+        assert cache.stats()['evictions'] == 1
+
+    def test_tags(self, clock):
+        cache = ResultCache(clock=clock)
+        cache.set('ts', 1, tags=['tablespaces'])
+        cache.set('users', 2, tags=['users'])
+        assert cache.invalidate_tags('users') == 1
+        assert cache.get('users') is None
+        assert cache.get('ts') == 1
+
+    def test_uncacheable_result_not_stored(self, clock):
+        cache = ResultCache(clock=clock)
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return 'ORA-01034: ORACLE not available'
+        for _ in range(2):
+            cache.get_or_compute('k', compute, cacheable=lambda v: 'ORA-' not in v)
+        assert len(calls) == 2
+
+    def test_single_flight(self):
+        cache = ResultCache()
+        started, release = threading.Event(), threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return 'result'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_compute('k', slow)))
+                   for _ in range(5)]
+        threads[0].start()
+        started.wait(5)
+        for t in threads[1:]:
+            t.start()
+        while cache.stats()['coalesced'] < 4:
+            time.sleep(0.001)
+        release.set()
+        for t in threads:
+            t.join(5)
+        assert calls == [1]
+        assert results == ['result'] * 5
+
+    def test_errors_shared_not_cached(self):
+        cache = ResultCache()
+        with pytest.raises(ZeroDivisionError):
+            cache.get_or_compute('k', lambda: 1 / 0)
+        assert cache.get_or_compute('k', lambda: 'ok') == 'ok'
+
+    def test_invalidation_during_flight_discards_result(self):
+        cache = ResultCache()
+
+        def compute():
+            # a DROP USER lands while the SELECT is still running
+            cache.invalidate_tags('users')
+            return 'stale'
+
+        assert cache.get_or_compute('k', compute, tags=['users']) == 'stale'
+        assert cache.get('k') is None
+
+
+class TestGuiCache:
+    """Read endpoints hit sqlplus once; mutations invalidate"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from oracledba import web_server
+        calls = []
+
+        def fake_sqlplus(sql, *args, **kwargs):
+            calls.append(sql)
+            return "USERNAME|ACCOUNT_STATUS\n--------|--------------\nAPP|OPEN"
+
+        monkeypatch.setattr(web_server, 'run_sqlplus', fake_sqlplus)
+        monkeypatch.setattr(web_server, 'sql_cache', ResultCache())
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        client.calls = calls
+        return client
+
+    def test_cached_and_invalidated(self, client):
+        client.get('/api/security/users')
+        client.get('/api/security/users')
+        assert len(client.calls) == 1
+        client.post('/api/security/user/APP/lock')
+        client.get('/api/security/users')
+        assert len(client.calls) == 3
+
+    def test_free_form_sql_invalidates(self, client, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'check_terminal_command', lambda command: 'not allowed')
+        client.get('/api/security/users')
+        client.post('/api/terminal/execute', json={'command': 'sqlplus / as sysdba'})
+        client.get('/api/security/users')
+        assert len(client.calls) == 2
+
+    def test_background_job_invalidates_when_finished(self, client, monkeypatch, tmp_path):
+        import sys
+        from oracledba import web_server
+        from oracledba.utils.jobs import JobManager
+        jobs = JobManager(tmp_path, on_finish=web_server._job_finished)
+        monkeypatch.setattr(web_server, 'jobs', jobs)
+        gate = tmp_path / 'gate'
+        job = jobs.submit([sys.executable, '-c', f'import os, time\n'
+                           f'while not os.path.exists({str(gate)!r}): time.sleep(0.02)'],
+                          name='TP04', meta={'invalidates': ['users']})
+        client.get('/api/security/users')
+        client.get('/api/security/users')
+        assert len(client.calls) == 1                      # still running: cache kept
+        gate.touch()
+        jobs.wait(job.id, 10)
+        client.get('/api/security/users')
+        assert len(client.calls) == 2
+
+    def test_refresh_bypasses_cache(self, client):
+        client.get('/api/security/users')
+        client.get('/api/security/users?refresh=1')
+        assert len(client.calls) == 2
+
+    def test_stats(self, client):
+        client.get('/api/security/users')
+        client.get('/api/security/users')
+        stats = client.get('/api/admin/cache').get_json()['cache']
+        assert stats['hits'] == 1 and stats['misses'] == 1
+
+
+class TestStatusCoalescing:
+    """Concurrent /api/system-status calls share one detector run"""
+
+    @pytest.fixture
+    def web(self, monkeypatch):
+        from oracledba import web_server
+        calls = {'detect': 0, 'metrics': 0}
+        gate = threading.Event()
+
+        class SlowDetector:
+            def detect_all(self):
+                calls['detect'] += 1
+                gate.wait(5)
+                return {
+                    'oracle': {'oracle_home': '/u01', 'installed': True, 'version': '19c',
+                               'binaries': True},
+                    'database': {'running': True, 'instances': ['GDCPROD'],
+                                 'current_sid': 'GDCPROD', 'processes': {}},
+                    'listener': {'running': True, 'listeners': ['LISTENER'], 'ports': [1521]},
+                    'cluster': {'configured': False}, 'grid': {'installed': False},
+                    'asm': {'running': False}, 'features': {},
+                }
+
+            def get_oracle_metrics(self):
+                calls['metrics'] += 1
+                return {'sessions': {'count': 1}}
+
+        monkeypatch.setattr(web_server, 'detector', SlowDetector())
+        monkeypatch.setattr(web_server, 'status_cache', ResultCache(default_ttl=5))
+        monkeypatch.setattr(web_server, 'calls', calls, raising=False)
+        monkeypatch.setattr(web_server, 'gate', gate, raising=False)
+        return web_server
+
+    def test_single_computation(self, web):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(web.get_system_status()))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        while web.status_cache.stats()['coalesced'] < 7:
+            time.sleep(0.001)
+        web.gate.set()
+        for t in threads:
+            t.join(5)
+        assert web.calls == {'detect': 1, 'metrics': 1}
+        assert len(results) == 8
+        assert all(r is results[0] for r in results)
+
+    def test_metrics_endpoint_shares_result(self, web):
+        web.gate.set()
+        web.get_system_status()
+        client = web.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+        assert client.get('/api/oracle-metrics').get_json() == {'sessions': {'count': 1}}
+        assert web.calls['metrics'] == 1
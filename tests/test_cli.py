@@ -0,0 +1,51 @@
+"""
+Tests for the lazy CLI command registry
+"""
+
+import subprocess
+import sys
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from oracledba.cli import LAZY_COMMANDS, main
+
+
+class TestLazyCommands:
+    """Test suite for LazyGroup / LAZY_COMMANDS"""
+
+    def test_import_is_cheap(self):
+        """Importing the CLI loads no command or manager modules, nor rich"""
+        code = (
+            "import sys, oracledba.cli; "
+            "heavy = [m for m in sys.modules if m.startswith(('oracledba.commands.', "
+            "'oracledba.modules.', 'rich', 'requests'))]; "
+            "print(','.join(heavy))"
+        )
+        result = subprocess.run([sys.executable, '-c', code],
+                                capture_output=True, text=True, check=True)
+        assert result.stdout.strip() == ''
+
+    @pytest.mark.parametrize('name', sorted(LAZY_COMMANDS))
+    def test_registry_matches_command(self, name):
+        """Each registry entry resolves to a command whose help matches"""
+        ctx = click.Context(main)
+        command = main.get_command(ctx, name)
+        assert isinstance(command, click.Command)
+        assert command.name == name
+        first_line = command.help.strip().splitlines()[0].strip()
+        assert first_line == LAZY_COMMANDS[name][1]
+
+    def test_help_lists_all_commands(self):
+        """--help lists every registered command"""
+        result = CliRunner().invoke(main, ['--help'])
+        assert result.exit_code == 0
+        for name in LAZY_COMMANDS:
+            assert name in result.output
+
+    def test_unknown_command(self):
+        """Unknown commands fail the usual click way"""
+        result = CliRunner().invoke(main, ['no-such-command'])
+        assert result.exit_code != 0
+        assert 'No such command' in result.output
@@ -0,0 +1,136 @@
+"""
+Tests for standby redo apply tuning (modules/dgapply.py)
+"""
+
+import json
+
+import pytest
+
+from oracledba.modules.dgapply import (ApplyTuner, apply_statements, parse_inspection,
+                                       recommend_apply)
+
+MB = 1048576
+
+
+def inspection_rows(role='PHYSICAL STANDBY', cpus=16, workers=2, peak_mbps=30, message_size=16384,
+                    broker='FALSE'):
+    processes = [{'NAME': 'MRP0', 'ROLE': 'managed recovery'}] if workers else []
+    processes += [{'NAME': f'PR{i:02d}', 'ROLE': 'recovery apply slave'} for i in range(workers + 1 if workers else 0)]
+    return {
+        'database': [{'DATABASE_ROLE': role, 'DB_UNIQUE_NAME': 'GDCSTBY'}],
+        'parameters': [{'NAME': 'cpu_count', 'VALUE': str(cpus)},
+                       {'NAME': 'parallel_execution_message_size', 'VALUE': str(message_size)},
+                       {'NAME': 'db_block_checking', 'VALUE': 'FULL'},
+                       {'NAME': 'dg_broker_start', 'VALUE': broker}],
+        'processes': processes,
+        'redo': [{'HOURS': '168', 'AVG_BYTES': str(10 * MB * 3600),
+                  'PEAK_BYTES': str(peak_mbps * MB * 3600)}],
+    }
+
+
+def progress_rows(applied_mb, lag='+00 00:05:00', rate_kbps=0):
+    return {'progress': [{'ITEM': 'Redo Applied', 'SOFAR': str(applied_mb)},
+                         {'ITEM': 'Active Apply Rate', 'SOFAR': str(rate_kbps)}],
+            'stats': [{'NAME': 'apply lag', 'VALUE': lag}]}
+
+
+class FakeClient:
+    """Standby that applies ``rates`` MB/s (the first before and the second
+    after run_sql) as ``clock`` advances"""
+
+    def __init__(self, clock, rows, rates=(12, 30), lag='+00 00:05:00', fail=False):
+        self.rows, self.rates, self.lag, self.fail = rows, rates, lag, fail
+        self.clock = clock
+        self.statements = None
+        self.started = 0.0
+
+    def query_many(self, queries):
+        if 'parameters' in queries:
+            return True, self.rows, {}
+        rate = self.rates[1 if self.statements else 0]
+        return True, progress_rows(rate * (self.clock.now - self.started), self.lag), {}
+
+    def run_sql(self, statements):
+        if self.fail:
+            return False, 'ORA-16136: Managed Standby Recovery not active', ''
+        self.statements = statements
+        self.started = self.clock.now            # new recovery session: Redo Applied restarts at 0
+        return True, '', ''
+
+
+def tuner(client, tmp_path):
+    return ApplyTuner(client, clock=client.clock, sleep=client.clock.sleep,
+                      history_file=tmp_path / 'history.json')
+
+
+class TestRecommend:
+    """Degree from CPUs, redo rate and the measured per-process rate"""
+
+    def test_inspection(self):
+        info = parse_inspection(inspection_rows(workers=4, peak_mbps=30))
+        assert info['mrp_running'] and info['workers'] == 4
+        assert info['peak_redo_mbps'] == 30 and info['avg_redo_mbps'] == 10
+
+    def test_measured_rate_sizes_degree(self):
+        rec = recommend_apply(16, 30, apply_mbps=12, workers=2)
+        assert rec['inputs']['per_process_mbps'] == 6
+        assert rec['parallel'] == 10 and rec['bottleneck'] == 'redo rate'
+        assert rec['capacity_mbps'] == 60
+
+    def test_cpu_bound_and_defaults(self):
+        assert recommend_apply(8, 100)['parallel'] == 6          # a quarter of the CPUs stays free
+        assert recommend_apply(8, 100)['bottleneck'] == 'cpu'
+        assert recommend_apply(8, 1)['parallel'] == 2
+        assert recommend_apply(1, 100)['parallel'] == 1
+        assert recommend_apply(64, 1000)['parallel'] == 32
+
+    def test_parameters_and_notes(self):
+        rec = recommend_apply(16, 30, parameters={'parallel_execution_message_size': '16384',
+                                                  'db_block_checking': 'FULL',
+                                                  'dg_broker_start': 'TRUE'})
+        assert rec['changes'][0]['value'] == 32768 and rec['changes'][0]['scope'] == 'SPFILE'
+        assert len(rec['notes']) == 2 and 'ApplyParallel=6' in rec['notes'][1]
+        assert not recommend_apply(16, 30, parameters={'parallel_execution_message_size': '65536'})['changes']
+
+    def test_statements(self):
+        changes = [{'name': 'parallel_execution_message_size', 'value': 32768, 'scope': 'SPFILE'}]
+        assert apply_statements(8, changes) == [
+            'ALTER SYSTEM SET parallel_execution_message_size=32768 SCOPE=SPFILE',
+            'ALTER DATABASE RECOVER MANAGED STANDBY DATABASE CANCEL',
+            'ALTER DATABASE RECOVER MANAGED STANDBY DATABASE PARALLEL 8 DISCONNECT FROM SESSION']
+        assert apply_statements(1, mrp_running=False) == [
+            'ALTER DATABASE RECOVER MANAGED STANDBY DATABASE NOPARALLEL DISCONNECT FROM SESSION']
+
+
+class TestTune:
+    """Measure, restart managed recovery, measure again"""
+
+    def test_improvement_reported_and_saved(self, tmp_path, clock):
+        client = FakeClient(clock, inspection_rows(workers=2, peak_mbps=30), rates=(12, 30))
+        run = tuner(client, tmp_path).tune(measure_seconds=60)
+        assert run['before']['apply_mbps'] == 12 and run['after']['apply_mbps'] == 30
+        assert run['improvement_pct'] == 150.0
+        assert run['recommendation']['parallel'] == 10
+        assert client.statements[-1].endswith('PARALLEL 10 DISCONNECT FROM SESSION')
+        history = json.loads((tmp_path / 'history.json').read_text())
+        assert history[0]['improvement_pct'] == 150.0
+
+    def test_caught_up_standby_does_not_size_from_its_rate(self, tmp_path, clock):
+        client = FakeClient(clock, inspection_rows(workers=2, peak_mbps=30), rates=(2, 2),
+                            lag='+00 00:00:01')
+        run = tuner(client, tmp_path).tune(measure_seconds=20, apply=False)
+        assert run['before']['caught_up'] and not run['applied']
+        assert run['recommendation']['inputs']['per_process_mbps'] == 10    # not 2 / 2
+        assert client.statements is None and not (tmp_path / 'history.json').exists()
+
+    def test_requested_degree(self, tmp_path, clock):
+        client = FakeClient(clock, inspection_rows(), rates=(12, 12))
+        run = tuner(client, tmp_path).tune(parallel=4, measure_seconds=10)
+        assert run['recommendation']['bottleneck'] == 'requested' and run['improvement_pct'] == 0.0
+        assert client.statements[-1].endswith('PARALLEL 4 DISCONNECT FROM SESSION')
+
+    def test_refuses_primary_and_reports_sql_errors(self, tmp_path, clock):
+        with pytest.raises(RuntimeError, match='not a physical standby'):
+            tuner(FakeClient(clock, inspection_rows(role='PRIMARY')), tmp_path).tune()
+        with pytest.raises(RuntimeError, match='ORA-16136'):
+            tuner(FakeClient(clock, inspection_rows(), fail=True), tmp_path).tune(measure_seconds=5)
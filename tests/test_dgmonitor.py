@@ -0,0 +1,142 @@
+"""
+Tests for the Data Guard lag monitor (modules/dgmonitor.py)
+"""
+
+import json
+import math
+
+import pytest
+
+from oracledba.modules.dgmonitor import (DgLagMonitor, LagStore, build_sample, parse_interval,
+                                         percentile)
+
+
+def standby_rows(transport='+00 00:00:02', apply='+00 00:00:40', rate='5120'):
+    return {
+        'database': [{'DATABASE_ROLE': 'PHYSICAL STANDBY', 'DB_UNIQUE_NAME': 'GDCSTBY'}],
+        'stats': [{'NAME': 'transport lag', 'VALUE': transport},
+                  {'NAME': 'apply lag', 'VALUE': apply},
+                  {'NAME': 'apply finish time', 'VALUE': '+00 00:00:03.500'}],
+        'progress': [{'ITEM': 'Active Apply Rate', 'SOFAR': rate},
+                     {'ITEM': 'Average Apply Rate', 'SOFAR': '4096'}],
+        'dests': [],
+    }
+
+
+def primary_rows(archived=120, applied=118):
+    return {
+        'database': [{'DATABASE_ROLE': 'PRIMARY', 'DB_UNIQUE_NAME': 'GDCPROD'}],
+        'stats': [], 'progress': [],
+        'dests': [{'DEST_ID': '2', 'DB_UNIQUE_NAME': 'GDCSTBY', 'STATUS': 'VALID',
+                   'GAP_STATUS': 'NO GAP', 'ARCHIVED_SEQ#': str(archived), 'APPLIED_SEQ#': str(applied)}],
+    }
+
+
+class TestSample:
+    """V$DATAGUARD_STATS intervals and primary sequence gaps"""
+
+    def test_parse_interval(self):
+        assert parse_interval('+00 00:01:05') == 65
+        assert parse_interval('+01 02:00:00.250') == 93600.25
+        assert math.isnan(parse_interval('')) and math.isnan(parse_interval(None))
+
+    def test_standby(self):
+        sample = build_sample(standby_rows(), now=1)
+        assert sample['role'] == 'PHYSICAL STANDBY'
+        assert sample['transport_lag'] == 2 and sample['apply_lag'] == 40
+        assert sample['apply_rate'] == 5120 and sample['avg_apply_rate'] == 4096
+        assert sample['seq_gap'] is None
+
+    def test_primary(self):
+        sample = build_sample(primary_rows(), now=1)
+        assert math.isnan(sample['apply_lag']) and sample['seq_gap'] == 2
+        assert sample['dests'][0]['db_unique_name'] == 'GDCSTBY'
+
+
+class TestStore:
+    """Ring file of struct records"""
+
+    def test_wraps_and_persists(self, tmp_path):
+        store = LagStore(tmp_path / 'db.bin', capacity=4)
+        for t in range(6):
+            store.append({'timestamp': float(t), 'apply_lag': float(t * 10), 'seq_gap': None})
+        assert (tmp_path / 'db.bin').stat().st_size == 16 + 4 * 28
+        reopened = LagStore(tmp_path / 'db.bin', capacity=100)     # capacity comes from the file
+        samples = reopened.read()
+        assert [s['timestamp'] for s in samples] == [2.0, 3.0, 4.0, 5.0]
+        assert samples[0]['apply_lag'] == 20.0 and samples[0]['seq_gap'] is None
+        assert math.isnan(samples[0]['transport_lag'])
+        reopened.append({'timestamp': 6.0, 'apply_lag': 60.0, 'seq_gap': 3})
+        assert [s['timestamp'] for s in store.read(since=4)] == [4.0, 5.0, 6.0]
+        assert store.read()[-1]['seq_gap'] == 3
+
+    def test_percentiles(self, tmp_path):
+        assert percentile([1, 2, 3, 4], 50) == 2.5 and percentile([], 90) is None
+        store = LagStore(tmp_path / 'db.bin')
+        for t in range(1, 101):
+            store.append({'timestamp': float(t), 'apply_lag': float(t), 'transport_lag': math.nan})
+        stats = store.stats(since=51)
+        assert stats['apply_lag']['count'] == 50
+        assert stats['apply_lag']['p50'] == 75.5 and stats['apply_lag']['p99'] == 99.5
+        assert stats['apply_lag']['max'] == 100 and stats['apply_lag']['last'] == 100
+        assert stats['transport_lag'] == {'count': 0, 'max': None, 'p50': None, 'p90': None,
+                                          'p95': None, 'p99': None, 'last': None}
+
+
+class TestMonitor:
+    """Sampling, alert transitions and the API"""
+
+    @pytest.fixture
+    def monitor(self, tmp_path, clock, canned_client):
+        client = canned_client([standby_rows(apply='+00 00:00:40'),
+                                standby_rows(apply='+00 00:06:00'),
+                                standby_rows(apply='+00 00:40:00'),
+                                standby_rows(apply='+00 00:00:10')], oracle_sid='GDCSTBY')
+        settings = {'targets': [], 'interval': 30,
+                    'thresholds': {'apply_lag': [300, 1800], 'transport_lag': [30, 300]}}
+        clock.now, clock.step = 200000.0, 30                # one poll interval per read
+        return DgLagMonitor({'GDCSTBY': client}, store_dir=tmp_path, settings=settings,
+                            clock=clock)
+
+    def test_alert_transitions(self, monitor, tmp_path):
+        levels = []
+        for _ in range(4):
+            monitor.sample_all()
+            levels.append(monitor.levels['GDCSTBY']['apply_lag'])
+            if levels[-1] == 'critical':
+                assert monitor.active_alerts() == [{'target': 'GDCSTBY', 'metric': 'apply_lag',
+                                                    'level': 'critical', 'value': 2400.0}]
+        assert levels == ['ok', 'warning', 'critical', 'ok']
+        history = [json.loads(line) for line in (tmp_path / 'alerts.jsonl').read_text().splitlines()]
+        assert [(h['previous'], h['level']) for h in history] == [
+            ('ok', 'warning'), ('warning', 'critical'), ('critical', 'ok')]
+        assert 'V$DATAGUARD_STATS' in monitor.targets['GDCSTBY'].queries['stats']
+        assert monitor.percentiles()['GDCSTBY']['apply_lag']['max'] == 2400
+
+    def test_api(self, monitor, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'dg_monitor', monitor)
+        for _ in range(3):
+            monitor.sample_all()
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.get('/api/dataguard/lag?since=2026-01-01&series=GDCSTBY').get_json()
+        assert data['success'] and data['alerts'][0]['level'] == 'critical'
+        target = data['targets']['GDCSTBY']
+        assert target['last']['apply_lag'] == 2400 and target['last']['seq_gap'] is None
+        assert target['percentiles']['apply_lag']['count'] == 0      # the fake clock is in 1970
+        data = client.get('/api/dataguard/lag?since=1970-01-01&series=GDCSTBY').get_json()
+        assert [p['apply_lag'] for p in data['series']] == [40, 360, 2400]
+        assert not client.get('/api/dataguard/lag?since=soon').get_json()['success']
+
+    def test_status(self, tmp_path, monkeypatch, canned_client):
+        from oracledba.modules import dgmonitor
+        from oracledba.modules.dataguard import DataGuardManager
+        monkeypatch.setattr(dgmonitor, 'STORE_DIR', tmp_path)
+        monkeypatch.setattr(dgmonitor, 'SETTINGS_FILE', tmp_path / 'dg.json')
+        samples = DataGuardManager(canned_client([primary_rows(130, 120)],
+                                                 oracle_sid='GDCSTBY')).status()
+        assert samples['GDCSTBY']['seq_gap'] == 10
+        assert (tmp_path / 'GDCSTBY.bin').exists()
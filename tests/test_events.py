@@ -0,0 +1,111 @@
+"""
+Tests for the structured install event stream
+"""
+
+import json
+
+from oracledba.utils.events import EventStream, read_events, summarize_progress
+from oracledba.modules.install import InstallManager
+
+
+class TestEventStream:
+    """Test suite for EventStream / read_events"""
+
+    def test_emit_and_read(self, tmp_path):
+        """Events round-trip through the JSON-lines file"""
+        path = tmp_path / "events.jsonl"
+        stream = EventStream(path)
+        stream.emit('step_start', step=1, total=4, title='System Readiness')
+        stream.emit('step_end', step=1, success=True, duration=12.5)
+        stream.close()
+
+        events, offset = read_events(path)
+        assert [e['event'] for e in events] == ['step_start', 'step_end']
+        assert events[0]['title'] == 'System Readiness'
+        assert 'ts' in events[0]
+        assert offset == path.stat().st_size
+
+    def test_incremental_read(self, tmp_path):
+        """Only events after the offset are returned"""
+        path = tmp_path / "events.jsonl"
+        stream = EventStream(path)
+        stream.emit('step_start', step=1, total=4)
+        _, offset = read_events(path)
+
+        stream.emit('percent', step=1, percent=40)
+        events, new_offset = read_events(path, offset)
+        stream.close()
+
+        assert len(events) == 1
+        assert events[0]['percent'] == 40
+        assert new_offset > offset
+
+    def test_partial_line_not_consumed(self, tmp_path):
+        """A half-written trailing line is left for the next read"""
+        path = tmp_path / "events.jsonl"
+        path.write_text(json.dumps({'event': 'a'}) + '\n{"event": "b"')
+
+        events, offset = read_events(path)
+        assert [e['event'] for e in events] == ['a']
+
+        with open(path, 'a') as f:
+            f.write('}\n')
+        events, _ = read_events(path, offset)
+        assert [e['event'] for e in events] == ['b']
+
+    def test_missing_file_and_stale_offset(self, tmp_path):
+        """Missing files read as empty; offsets past EOF restart from 0"""
+        assert read_events(tmp_path / "nope.jsonl") == ([], 0)
+
+        path = tmp_path / "events.jsonl"
+        path.write_text(json.dumps({'event': 'a'}) + '\n')
+        events, _ = read_events(path, 10_000)
+        assert len(events) == 1
+
+    def test_summarize_progress(self):
+        """Stepper state is folded from step events; lab steps are ignored"""
+        events = [
+            {'event': 'step_start', 'step': 1, 'total': 4},
+            {'event': 'step_end', 'step': 1, 'success': True},
+            {'event': 'step_start', 'step': 2, 'total': 4},
+            {'event': 'percent', 'step': 2, 'percent': 55},
+        ]
+        state = summarize_progress(events)
+        assert state['current_step'] == 2
+        assert state['step_statuses'] == {1: 'complete'}
+        assert state['percent'] == 55
+
+        events += [
+            {'event': 'step_end', 'step': 2, 'success': False},
+            {'event': 'step_start', 'kind': 'lab', 'step': 1, 'total': 12},
+            {'event': 'install_end', 'success': False},
+        ]
+        state = summarize_progress(events)
+        assert state['step_statuses'][2] == 'failed'
+        assert state['current_step'] == 2
+        assert state['finished'] is True
+
+
+class TestInstallManagerEvents:
+    """InstallManager writes events alongside its log"""
+
+    def test_step_events(self, tmp_path, monkeypatch):
+        """Step header/result and percentage lines produce events"""
+        events_file = tmp_path / "install.events.jsonl"
+        monkeypatch.setenv('ORADBA_EVENTS_FILE', str(events_file))
+        mgr = InstallManager()
+        mgr.log_dir = tmp_path
+
+        mgr._open_log("install-test")
+        mgr._step_header(4, 4, 'Create Database')
+        mgr._out("Copying database files")
+        mgr._out("31% complete")
+        mgr._step_result(4, True, 65.2)
+        mgr._close_log()
+
+        events, _ = read_events(events_file)
+        kinds = [e['event'] for e in events]
+        assert kinds == ['log_open', 'step_start', 'percent', 'step_end']
+        assert events[2]['percent'] == 31
+        assert events[2]['step'] == 4
+        assert events[3]['duration'] == 65.2
@@ -0,0 +1,124 @@
+"""
+Tests for the Prometheus exporter (modules/exporter.py)
+"""
+
+import pytest
+
+from oracledba.modules.exporter import MetricsSampler, render_metrics
+
+METRICS = {
+    'sga': {'shared pool': 352.0, 'DEFAULT buffer cache': 1120.0},
+    'pga': {'total PGA allocated': 210.5},
+    'memory': {'total_sga_mb': 1472.0, 'total_pga_mb': 210.5},
+    'processes': {'count': 40},
+    'sessions': {'count': 52},
+    'datafiles': 4,
+    'tempfiles': 1,
+    'tablespaces': [{'name': 'USERS', 'total_mb': 100.0, 'used_mb': 25.0,
+                     'free_mb': 75.0, 'pct_used': 25.0}],
+}
+
+
+class FakeDetector:
+    """Counts sqlplus-backed calls instead of running them"""
+
+    def __init__(self, running=True):
+        self.running = running
+        self.metric_calls = 0
+        self.ps_calls = 0
+
+    def get_running_databases(self):
+        self.ps_calls += 1
+        return ['GDCPROD'] if self.running else []
+
+    def get_oracle_metrics(self, running_dbs=None):
+        if running_dbs is None:
+            running_dbs = self.get_running_databases()
+        self.metric_calls += 1
+        return METRICS
+
+    def count_background_processes(self):
+        return {'pmon': 1, 'dbwr': 2}
+
+
+class TestRenderMetrics:
+    """Exposition format and units"""
+
+    def test_gauges(self, clock):
+        sampler = MetricsSampler(FakeDetector(), interval=15, clock=clock)
+        text = render_metrics(sampler.sample())
+        assert '# TYPE oracle_sessions gauge' in text
+        assert 'oracle_up{sid="GDCPROD"} 1' in text
+        assert 'oracle_sga_component_bytes{component="shared pool"} 369098752' in text
+        assert 'oracle_tablespace_used_bytes{tablespace="USERS"} 26214400' in text
+        assert 'oracle_tablespace_used_ratio{tablespace="USERS"} 0.25' in text
+        assert 'oracle_background_processes{process="dbwr"} 2' in text
+        assert text.endswith('\n')
+
+    def test_instance_down(self, clock):
+        sampler = MetricsSampler(FakeDetector(running=False), clock=clock)
+        text = render_metrics(sampler.sample())
+        assert 'oracle_up 0' in text
+        assert 'oracle_sessions' not in text
+
+    def test_label_escaping(self):
+        snapshot = {'timestamp': 0, 'duration': 0, 'instances': ['A"B\\C'],
+                    'metrics': None, 'processes': {}}
+        assert 'oracle_up{sid="A\\"B\\\\C"} 1' in render_metrics(snapshot)
+
+
+class TestMetricsSampler:
+    """Scrapes reuse the cached sample"""
+
+    def test_scrapes_are_cached(self, clock):
+        detector = FakeDetector()
+        sampler = MetricsSampler(detector, interval=15, clock=clock)
+        for _ in range(10):
+            sampler.snapshot()
+            clock.now += 2
+        assert detector.metric_calls == 1
+
+    def test_stale_snapshot_resampled(self, clock):
+        detector = FakeDetector()
+        sampler = MetricsSampler(detector, interval=15, clock=clock)
+        sampler.snapshot()
+        clock.now += 31
+        sampler.snapshot()
+        assert detector.metric_calls == 2
+
+    def test_one_instance_scan_per_sample(self, clock):
+        detector = FakeDetector()
+        MetricsSampler(detector, clock=clock).sample()
+        assert detector.ps_calls == 1 and detector.metric_calls == 1
+
+    def test_sample_errors_counted(self, clock):
+        detector = FakeDetector()
+        detector.get_oracle_metrics = lambda running_dbs=None: 1 / 0
+        sampler = MetricsSampler(detector, clock=clock)
+        snapshot = sampler.sample()
+        assert not snapshot['ok']
+        assert 'oradba_exporter_sample_errors 1' in render_metrics(snapshot)
+
+
+class TestMetricsEndpoint:
+    """/metrics on the web server"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, clock):
+        from oracledba import web_server
+        sampler = MetricsSampler(FakeDetector(), interval=3600, clock=clock)
+        monkeypatch.setattr(sampler, 'start', lambda: None)
+        monkeypatch.setattr(web_server, 'metrics_sampler', sampler)
+        return web_server.app.test_client()
+
+    def test_metrics(self, client):
+        response = client.get('/metrics')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/plain; version=0.0.4')
+        assert b'oracle_sessions 52' in response.data
+
+    def test_token(self, client, monkeypatch):
+        monkeypatch.setenv('ORADBA_METRICS_TOKEN', 's3cret')
+        assert client.get('/metrics').status_code == 401
+        response = client.get('/metrics', headers={'Authorization': 'Bearer s3cret'})
+        assert response.status_code == 200
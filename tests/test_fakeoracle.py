@@ -0,0 +1,85 @@
+"""
+Tests for the fakeoracle sqlplus/rman simulators used by the benchmarks
+"""
+
+import os
+import subprocess
+
+import pytest
+
+import fakeoracle
+
+SQLPLUS_PREAMBLE = (
+    "SET PAGESIZE 1000\nSET LINESIZE 1000\nSET FEEDBACK OFF\nSET HEADING ON\n"
+    "SET COLSEP '|'\nSET TRIMSPOOL ON\nSET TRIMOUT ON\n"
+)
+
+
+@pytest.fixture
+def fake_bin(tmp_path):
+    return fakeoracle.install(tmp_path / 'bin')
+
+
+def run(binary, script, args=(), **env):
+    result = subprocess.run([binary, *args], input=script, capture_output=True, text=True,
+                            env={**os.environ, **env})
+    return result.stdout, result.returncode
+
+
+class TestFakeSqlplus:
+    """Output must be parseable the way web_server parses real sqlplus"""
+
+    def test_parse_sql_rows(self, fake_bin):
+        from oracledba.web_server import parse_sql_rows
+        out, code = run(fake_bin['sqlplus'], SQLPLUS_PREAMBLE +
+                        "SELECT NAME, OPEN_MODE, CON_ID FROM V$PDBS ORDER BY CON_ID;\nEXIT;\n",
+                        ['-s', '/ as sysdba'])
+        assert code == 0
+        assert parse_sql_rows(out) == [
+            {'NAME': 'PDB$SEED', 'OPEN_MODE': 'READ ONLY', 'CON_ID': '2'},
+            {'NAME': 'GDCPDB', 'OPEN_MODE': 'READ WRITE', 'CON_ID': '3'},
+        ]
+
+    def test_literal_heading_truncated(self, fake_bin):
+        """sqlplus sizes literal columns to the data: METRIC becomes METRI"""
+        out, _ = run(fake_bin['sqlplus'], SQLPLUS_PREAMBLE +
+                     "SELECT 'proc' AS metric, COUNT(*) AS cnt FROM v$process\n"
+                     "UNION ALL SELECT 'dfile', COUNT(*) FROM v$datafile;\n", ['-s'])
+        header = [line for line in out.splitlines() if '|' in line][0]
+        assert header.split('|')[0] == 'METRI'
+
+    def test_rows_scale_and_feedback(self, fake_bin):
+        out, _ = run(fake_bin['sqlplus'],
+                     "SET FEEDBACK ON\nSELECT USERNAME FROM DBA_USERS;\n", ['-s'],
+                     FAKEORACLE_ROWS='40')
+        assert '40 rows selected.' in out
+
+    def test_error_injection_and_whenever(self, fake_bin):
+        out, code = run(fake_bin['sqlplus'],
+                        "WHENEVER SQLERROR EXIT 3\nSELECT STATUS FROM V$INSTANCE;\n"
+                        "PROMPT not reached\n", ['-s'],
+                        FAKEORACLE_FAIL='V\\$INSTANCE')
+        assert code == 3
+        assert 'ORA-01034' in out
+        assert 'not reached' not in out
+
+    def test_unknown_table(self, fake_bin):
+        out, _ = run(fake_bin['sqlplus'], "SELECT * FROM no_such_table;\n", ['-s'])
+        assert 'ORA-00942' in out
+
+
+class TestFakeRman:
+    """RMAN echo, success and failure exit codes"""
+
+    def test_backup(self, fake_bin):
+        out, code = run(fake_bin['rman'], "BACKUP DATABASE PLUS ARCHIVELOG;\nEXIT;\n",
+                        ['target', '/'])
+        assert code == 0
+        assert 'RMAN> BACKUP DATABASE PLUS ARCHIVELOG;' in out
+        assert 'Finished backup' in out
+        assert 'Recovery Manager complete.' in out
+
+    def test_syntax_error(self, fake_bin):
+        out, code = run(fake_bin['rman'], "BOGUS COMMAND;\n", ['target', '/'])
+        assert code == 1
+        assert 'RMAN-00571' in out
@@ -0,0 +1,130 @@
+"""
+Tests for the FRA pressure watcher (modules/frawatcher.py)
+"""
+
+import pytest
+
+from oracledba.modules import rman as rman_module
+from oracledba.modules.backupscheduler import BackupScheduler
+from oracledba.modules.frawatcher import (DEFAULT_SETTINGS, FraWatcher, build_sample, next_interval,
+                                          submit_relief)
+from oracledba.modules.rman import archive_commands
+
+GB = 1024 ** 3
+
+
+def rows(archived_pct, redo, recent=0, limit_gb=100):
+    return {
+        'dest': [{'NAME': '/u01/app/oracle/fast_recovery_area', 'SPACE_LIMIT': str(limit_gb * GB),
+                  'SPACE_USED': str(int((archived_pct + 10) * limit_gb / 100 * GB)),
+                  'SPACE_RECLAIMABLE': str(5 * GB), 'NUMBER_OF_FILES': '120'}],
+        'usage': [{'FILE_TYPE': 'ARCHIVED LOG', 'PERCENT_SPACE_USED': str(archived_pct),
+                   'PERCENT_SPACE_RECLAIMABLE': '0', 'NUMBER_OF_FILES': '110'},
+                  {'FILE_TYPE': 'FLASHBACK LOG', 'PERCENT_SPACE_USED': '10',
+                   'PERCENT_SPACE_RECLAIMABLE': '5', 'NUMBER_OF_FILES': '10'}],
+        'redo': [{'VALUE': str(redo)}],
+        'recent': [{'BYTES': str(recent)}],
+    }
+
+
+class TestSample:
+    """Pressure, redo rate and the adaptive interval"""
+
+    def test_pressure_excludes_reclaimable(self):
+        snap = build_sample(rows(50, redo=0), DEFAULT_SETTINGS, now=1000)
+        assert snap['configured'] and snap['pressure_pct'] == 55.0
+        assert [u['file_type'] for u in snap['usage']] == ['ARCHIVED LOG', 'FLASHBACK LOG']
+        assert snap['reclaimable_gb'] == 5.0
+
+    def test_redo_rate_from_delta_then_fallback(self):
+        first = build_sample(rows(50, redo=10 * GB, recent=3600 * 1048576), DEFAULT_SETTINGS, now=1000)
+        assert first['redo_mbps'] == 1.0                    # last hour of archived logs
+        second = build_sample(rows(50, redo=10 * GB + 100 * 1048576), DEFAULT_SETTINGS, first, now=1010)
+        assert second['redo_mbps'] == 10.0
+        restarted = build_sample(rows(50, redo=5, recent=0), DEFAULT_SETTINGS, second, now=1020)
+        assert restarted['redo_mbps'] == 0.0
+
+    def test_interval_follows_redo_rate(self):
+        assert next_interval(25 * GB, 0, 15, 600) == 600
+        assert next_interval(25 * GB, 10 * 1048576, 15, 600) == 600     # ~43 min to go
+        assert next_interval(1 * GB, 10 * 1048576, 15, 600) == 25
+        assert next_interval(0, 10 * 1048576, 15, 600) == 15
+        snap = build_sample(rows(70, redo=0, recent=3600 * 50 * 1048576), DEFAULT_SETTINGS, now=1)
+        assert snap['seconds_to_threshold'] == int(5 * GB / (50 * 1048576))
+        assert snap['interval'] == int(5 * GB / (50 * 1048576) / 4)
+
+    def test_check_calls_on_pressure_above_threshold(self, canned_client):
+        calls = []
+        client = canned_client([rows(60, 0), rows(76, 0)])
+        watcher = FraWatcher(client, settings={'threshold': 80},
+                             on_pressure=lambda snap: calls.append(snap) or 'queued')
+        assert watcher.check()['relief'] is None
+        assert 'V$RECOVERY_AREA_USAGE' in client.queries['usage']
+        snap = watcher.check()
+        assert snap['pressure_pct'] == 81.0 and snap['relief'] == 'queued' and len(calls) == 1
+
+    def test_errors_are_logged(self, monkeypatch, caplog, canned_client):
+        import logging
+        from oracledba.utils import logger
+        monkeypatch.setattr(logger, '_logger', logging.getLogger('oracledba'))
+        watcher = FraWatcher(canned_client([rows(60, 0)]))
+
+        def check():
+            watcher._stop.set()
+            raise RuntimeError('ORA-01034: ORACLE not available')
+        monkeypatch.setattr(watcher, 'check', check)
+        with caplog.at_level(logging.ERROR, logger='oracledba'):
+            watcher._run()
+        assert watcher.errors == 1 and 'FRA watcher: ORA-01034' in caplog.text
+
+
+class TestRelief:
+    """Urgent archive log backup through the scheduler"""
+
+    @pytest.fixture
+    def scheduler(self, tmp_path, monkeypatch, canned_client):
+        from test_backupscheduler import FakeJobs
+        monkeypatch.setattr(rman_module, 'TUNING_FILE', tmp_path / 'rman-tuning.json')
+        monkeypatch.setattr(rman_module, 'STRATEGY_FILE', tmp_path / 'rman-strategy.json')
+        jobs = FakeJobs(tmp_path)
+        scheduler = BackupScheduler(jobs, canned_client(), state_file=tmp_path / 'schedule.json')
+        scheduler.acquire()
+        yield scheduler
+        scheduler.release()
+
+    def test_parallel_script_off_the_fra(self):
+        script = archive_commands('RELIEF', channels=3, dest='/u01/backup/')
+        assert script.count('ALLOCATE CHANNEL') == 3
+        assert "FORMAT '/u01/backup/arch_%d_%U'" in script
+        assert script.index('NOT BACKED UP 1 TIMES') < script.index('DELETE NOPROMPT ARCHIVELOG ALL BACKED UP')
+        assert 'ALLOCATE' not in archive_commands('ARCH')
+
+    def test_jumps_queue_once(self, scheduler):
+        scheduler.configure(max_concurrent=1)
+        scheduler.submit('SALES', 'full')
+        scheduler.submit('FIN', 'full')                     # waits for the slot
+        run = submit_relief(scheduler, '/u02/relief')
+        assert submit_relief(scheduler)['id'] == run['id']
+        status = scheduler.status()
+        assert [r['reason'] for r in status['queue']] == ['fra-pressure', 'manual']
+        scheduler.jobs.finish(status['running'][0]['job_id'])
+        started = scheduler.tick()
+        assert [r['reason'] for r in started] == ['fra-pressure']
+        with open(scheduler.jobs.get(started[0]['job_id']).stdin_file) as f:
+            script = f.read()
+        assert script.count('ALLOCATE CHANNEL') == rman_module.ARCHIVE_CHANNELS
+        assert "/u02/relief/arch_%d_%U" in script
+
+    def test_pressure_api(self, scheduler, monkeypatch, canned_client):
+        from oracledba import web_server
+        watcher = FraWatcher(canned_client([rows(85, 0)]),
+                             on_pressure=lambda snap: submit_relief(scheduler))
+        monkeypatch.setattr(web_server, 'fra_watcher', watcher)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.get('/api/protection/fra/pressure').get_json()
+        assert data['success'] and data['pressure_pct'] == 90.0
+        assert data['relief']['reason'] == 'fra-pressure'
+        assert scheduler.status()['running'][0]['type'] == 'archive'
@@ -0,0 +1,254 @@
+"""
+Tests for the background job manager (utils/jobs.py) and /api/jobs
+"""
+
+import json
+import subprocess
+import sys
+import time
+
+import pytest
+
+from oracledba.utils.jobs import (CANCELLED, FAILED, LOST, QUEUED, RUNNING, SUCCEEDED,
+                                  JobManager)
+
+PY = sys.executable
+
+
+def sleeper(seconds):
+    return [PY, '-c', f'import time; print("start", flush=True); time.sleep({seconds})']
+
+
+class TestJobManager:
+    """State tracking, logs, concurrency, cancellation and persistence"""
+
+    def test_success_and_log(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        job = jobs.submit([PY, '-c', 'print("hello")'], name='hello', tag='t')
+        assert job.pid
+        job = jobs.wait(job.id, timeout=10)
+        assert job.state == SUCCEEDED
+        assert job.exit_code == 0
+        assert job.started <= job.ended
+        content, offset, size = jobs.read_log(job.id)
+        assert content == 'hello\n' and offset == size
+        assert jobs.read_log(job.id, offset)[0] == ''
+
+    def test_stdin_file(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        (tmp_path / 'input.rcv').write_text('BACKUP DATABASE;\n')
+        job = jobs.create([PY, '-c', 'import sys; print(sys.stdin.read().upper())'], name='stdin')
+        job.stdin_file = str(tmp_path / 'input.rcv')
+        job = jobs.wait(jobs.enqueue(job).id, 10)
+        assert job.state == SUCCEEDED and jobs.read_log(job.id)[0] == 'BACKUP DATABASE;\n\n'
+
+    def test_failure_exit_code(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        job = jobs.wait(jobs.submit([PY, '-c', 'raise SystemExit(3)'], name='fail').id, 10)
+        assert job.state == FAILED and job.exit_code == 3
+
+    def test_unstartable_command(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        job = jobs.submit([str(tmp_path / 'missing')], name='missing')
+        assert job.state == FAILED
+        assert 'Failed to start job' in jobs.read_log(job.id)[0]
+
+    def test_separate_logs(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        a = jobs.submit([PY, '-c', 'print("a")'], name='a', tag='tp01')
+        b = jobs.submit([PY, '-c', 'print("b")'], name='b', tag='tp01')
+        assert a.log_file != b.log_file
+        jobs.wait(a.id, 10)
+        jobs.wait(b.id, 10)
+        assert jobs.read_log(a.id)[0] == 'a\n'
+        assert jobs.latest('tp01').id == b.id
+
+    def test_concurrency_limit(self, tmp_path):
+        jobs = JobManager(tmp_path, max_concurrent=1)
+        first = jobs.submit(sleeper(0.3), name='first')
+        second = jobs.submit([PY, '-c', 'pass'], name='second')
+        assert first.state == RUNNING
+        assert second.state == QUEUED
+        assert jobs.wait(second.id, 10).state == SUCCEEDED
+        assert second.started >= first.ended
+
+    def test_cancel_running(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        job = jobs.submit(sleeper(30), name='long')
+        assert jobs.cancel(job.id)
+        job = jobs.wait(job.id, 10)
+        assert job.state == CANCELLED
+        assert not jobs.cancel(job.id)
+
+    def test_cancel_queued(self, tmp_path):
+        jobs = JobManager(tmp_path, max_concurrent=1)
+        running = jobs.submit(sleeper(30), name='running')
+        queued = jobs.submit([PY, '-c', 'pass'], name='queued')
+        assert jobs.cancel(queued.id)
+        assert queued.state == CANCELLED and queued.pid is None
+        jobs.cancel(running.id)
+        jobs.wait(running.id, 10)
+
+    def test_persisted_across_restart(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        job = jobs.wait(jobs.submit([PY, '-c', 'pass'], name='done', tag='x').id, 10)
+        index = json.loads((tmp_path / 'jobs.json').read_text())
+        assert index[0]['id'] == job.id
+
+        # a job recorded as running by a server that is gone
+        index.append(dict(index[0], id='stale', state=RUNNING, pid=2 ** 22 + 1,
+                          created=time.time(), log_file=str(tmp_path / 'stale.log')))
+        (tmp_path / 'jobs.json').write_text(json.dumps(index))
+        reloaded = JobManager(tmp_path)
+        assert reloaded.get(job.id).state == SUCCEEDED
+        assert reloaded.get('stale').state == LOST
+
+    def test_detached_job_frees_its_slot(self, tmp_path):
+        jobs = JobManager(tmp_path)
+        jobs.wait(jobs.submit([PY, '-c', 'pass'], name='done').id, 10)
+        proc = subprocess.Popen(sleeper(30), start_new_session=True, stdout=subprocess.DEVNULL)
+        index = json.loads((tmp_path / 'jobs.json').read_text())
+        index.append(dict(index[0], id='inherited', state=RUNNING, pid=proc.pid,
+                          created=time.time()))
+        (tmp_path / 'jobs.json').write_text(json.dumps(index))
+
+        reloaded = JobManager(tmp_path, max_concurrent=1)
+        assert reloaded.get('inherited').state == RUNNING
+        queued = reloaded.submit([PY, '-c', 'pass'], name='queued')
+        assert queued.state == QUEUED
+        assert reloaded.cancel('inherited')
+        proc.wait(10)
+        assert reloaded.get('inherited').state == CANCELLED
+        assert reloaded.wait(queued.id, 10).state == SUCCEEDED
+
+    def test_exit_status_from_another_process(self, tmp_path):
+        # as `oradba rman schedule now` does: start jobs and exit without waiting
+        script = ('import sys; from oracledba.utils.jobs import JobManager; '
+                  'jobs = JobManager(sys.argv[1]); '
+                  'nap = "import time; time.sleep(0.5); "; '
+                  'print(jobs.submit([sys.executable, "-c", nap], name="ok").id); '
+                  'print(jobs.submit([sys.executable, "-c", nap + "raise SystemExit(3)"], '
+                  'name="fail").id)')
+        ok, fail = subprocess.run([PY, '-c', script, str(tmp_path)], capture_output=True,
+                                  text=True, check=True).stdout.split()
+        jobs = JobManager(tmp_path)
+        assert jobs.get(ok).state == RUNNING and jobs.get(ok).detached
+        assert jobs.wait(ok, 10).state == SUCCEEDED and jobs.get(ok).exit_code == 0
+        assert jobs.wait(fail, 10).state == FAILED and jobs.get(fail).exit_code == 3
+
+    def test_index_shared_between_processes(self, tmp_path):
+        web = JobManager(tmp_path)
+        web.wait(web.submit([PY, '-c', 'pass'], name='web').id, 10)
+        script = ('import sys; from oracledba.utils.jobs import JobManager; '
+                  'print(JobManager(sys.argv[1]).submit(sys.argv[2:], name="cli").id)')
+        cli = subprocess.run([PY, '-c', script, str(tmp_path), *sleeper(30)],
+                             capture_output=True, text=True, check=True).stdout.strip()
+        # the other process's job is found and both survive our next write
+        assert web.get(cli).state == RUNNING
+        own = web.wait(web.submit([PY, '-c', 'pass'], name='web 2').id, 10)
+        index = {j['id'] for j in json.loads((tmp_path / 'jobs.json').read_text())}
+        assert {cli, own.id} <= index and len(index) == 3
+        assert web.cancel(cli)
+        assert web.wait(cli, 15).state == CANCELLED
+
+    def test_on_finish(self, tmp_path):
+        finished = []
+        jobs = JobManager(tmp_path, on_finish=finished.append)
+        job = jobs.wait(jobs.submit([PY, '-c', 'pass'], name='done').id, 10)
+        assert finished == [job]
+
+    def test_prune_keeps_recent(self, tmp_path):
+        jobs = JobManager(tmp_path, keep=2)
+        ids = [jobs.wait(jobs.submit([PY, '-c', 'pass'], name=str(i)).id, 10).id
+               for i in range(3)]
+        assert jobs.get(ids[0]) is None
+        assert not (tmp_path / f'{ids[0]}.log').exists()
+        assert [j.id for j in jobs.list()] == ids[:0:-1]
+
+
+class TestJobsApi:
+    """Labs run as jobs; status comes from job state"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, tmp_path):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'jobs', JobManager(tmp_path / 'jobs'))
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        return client
+
+    def test_run_sequence_submits_job(self, client, monkeypatch):
+        from oracledba import web_server
+        enqueued = []
+        monkeypatch.setattr(web_server.jobs, 'enqueue', enqueued.append)  # never run real labs
+        started = client.post('/api/labs/run-sequence', json={'start': '04', 'end': '05'}).get_json()
+        assert started['success']
+        job, = enqueued
+        assert started['job_id'] == job.id and started['log_file'] == job.log_file
+        assert job.tag == 'tp-sequence' and job.cmd == ['bash', str(job.path('sh'))]
+        assert 'tp05-gestion-stockage.sh' in job.path('sh').read_text()
+
+    def test_sequence_log_and_jobs_api(self, client):
+        from oracledba import web_server
+        job = web_server.jobs.submit([PY, '-c', 'print("=== TP04 completed ===")'],
+                                     name='seq', tag='tp-sequence')
+        web_server.jobs.wait(job.id, 10)
+
+        log = client.get('/api/labs/sequence-log').get_json()
+        assert log['is_running'] is False
+        assert 'TP04 completed' in log['logs']
+
+        listed = client.get('/api/jobs?tag=tp-sequence').get_json()
+        assert [j['id'] for j in listed['jobs']] == [job.id]
+        assert client.get(f'/api/jobs/{job.id}').get_json()['job']['state'] == SUCCEEDED
+        assert client.get(f'/api/jobs/{job.id}/log?offset=4').get_json()['logs'].startswith('TP04')
+        assert client.post(f'/api/jobs/{job.id}/cancel').get_json()['success'] is False
+
+    def test_unknown_job(self, client):
+        assert client.get('/api/jobs/nope').status_code == 404
+        assert client.post('/api/jobs/nope/cancel').status_code == 404
+
+    def test_installation_logs_use_job_state(self, client, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server.subprocess, 'run', None)  # no pgrep allowed
+        data = client.get('/api/installation/logs/quick').get_json()
+        assert data['is_running'] is False and data['job'] is None
+
+        job = web_server.jobs.submit(sleeper(30), name='install', tag='install-quick')
+        try:
+            data = client.get('/api/installation/logs/quick').get_json()
+            assert data['is_running'] is True
+            assert data['job']['id'] == job.id
+        finally:
+            web_server.jobs.cancel(job.id)
+            web_server.jobs.wait(job.id, 10)
+
+    def test_installation_progress_is_incremental(self, client, tmp_path, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'install_progress', {})
+        script = 'print("Step 1/4 System"); print("✓ Step 1 complete"); print("Step 2/4 Binaries")'
+        job = web_server.jobs.wait(web_server.jobs.submit(
+            [PY, '-c', script], name='install', tag='install-quick').id, 10)
+        data = client.get('/api/installation/logs/quick').get_json()
+        assert data['current_step'] == 2 and data['step_statuses'] == {'1': 'complete'}
+        # a poll with nothing new keeps the step markers seen earlier
+        data = client.get(f"/api/installation/logs/quick?offset={data['size']}").get_json()
+        assert data['logs'] == '' and data['current_step'] == 2
+
+        # once the event stream has events it wins, read from the last offset
+        events_file = tmp_path / 'install.events.jsonl'
+        first = '{"event": "step_start", "step": 3, "total": 4}\n'
+        events_file.write_text(first)
+        job.meta['events_file'] = str(events_file)
+        offsets = []
+        read_events = web_server.read_events
+        monkeypatch.setattr(web_server, 'read_events',
+                            lambda path, offset=0: offsets.append(offset) or read_events(path, offset))
+        assert client.get('/api/installation/logs/quick').get_json()['current_step'] == 3
+        with open(events_file, 'a') as f:
+            f.write('{"event": "percent", "step": 3, "percent": 40}\n')
+        data = client.get('/api/installation/logs/quick').get_json()
+        assert data['current_step'] == 3 and data['percent'] == 40
+        assert offsets == [0, len(first)]
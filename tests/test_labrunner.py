@@ -0,0 +1,143 @@
+"""
+Tests for the dependency-aware parallel lab runner (modules/labrunner.py)
+"""
+
+import threading
+import time
+
+import pytest
+
+from oracledba.modules.install import (LAB_DEPENDENCIES, LAB_EXCLUSIVE, LAB_MAP,
+                                       LAB_PDB_GROUPS, InstallManager)
+from oracledba.modules.labrunner import (FAILED, SKIPPED, SUCCEEDED, LabScheduler,
+                                         summarize, topological_order)
+
+
+class Recorder:
+    """run_lab stand-in recording overlap between labs"""
+
+    def __init__(self, duration=0.05, fail=()):
+        self.duration = duration
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.active = set()
+        self.overlaps = []
+        self.order = []
+        self.max_active = 0
+
+    def __call__(self, lab):
+        with self.lock:
+            self.overlaps.append((lab, frozenset(self.active)))
+            self.active.add(lab)
+            self.order.append(lab)
+            self.max_active = max(self.max_active, len(self.active))
+        time.sleep(self.duration)
+        with self.lock:
+            self.active.discard(lab)
+        return lab not in self.fail
+
+
+class TestLabGraph:
+    """The declared DAG is consistent"""
+
+    def test_every_lab_declared(self):
+        assert set(LAB_DEPENDENCIES) == set(LAB_MAP)
+        assert set(LAB_PDB_GROUPS) <= set(LAB_MAP) and LAB_EXCLUSIVE <= set(LAB_MAP)
+
+    def test_topological_order(self):
+        order = topological_order(LAB_DEPENDENCIES)
+        for lab, deps in LAB_DEPENDENCIES.items():
+            assert all(order.index(d) < order.index(lab) for d in deps)
+
+    def test_cycle_detected(self):
+        with pytest.raises(ValueError):
+            topological_order({'a': ('b',), 'b': ('a',)})
+
+    def test_unknown_lab(self):
+        with pytest.raises(ValueError):
+            topological_order(LAB_DEPENDENCIES, ['99'])
+
+
+class TestLabScheduler:
+    """Concurrency, exclusivity, PDB groups and failure propagation"""
+
+    def test_independent_labs_overlap(self):
+        rec = Recorder()
+        sched = LabScheduler(LAB_DEPENDENCIES, rec, max_workers=3)
+        results = sched.run(['05', '06', '10', '12'])
+        assert all(r['status'] == SUCCEEDED for r in results)
+        assert rec.max_active == 3
+        stats = summarize(results)
+        assert stats['serial'] > stats['wall']
+
+    def test_dependencies_respected(self):
+        rec = Recorder()
+        LabScheduler(LAB_DEPENDENCIES, rec, max_workers=4).run(['03', '04', '08', '13', '14'])
+        for lab, deps in LAB_DEPENDENCIES.items():
+            if lab in rec.order:
+                assert all(rec.order.index(d) < rec.order.index(lab)
+                           for d in deps if d in rec.order)
+
+    def test_exclusive_runs_alone(self):
+        rec = Recorder()
+        LabScheduler(LAB_DEPENDENCIES, rec, max_workers=4,
+                     exclusive=LAB_EXCLUSIVE).run([f'{n:02d}' for n in range(4, 16)])
+        for lab, others in rec.overlaps:
+            if lab in LAB_EXCLUSIVE:
+                assert not others
+            assert not (others & LAB_EXCLUSIVE)
+
+    def test_pdb_group_serialized(self):
+        rec = Recorder()
+        groups = {'06': 'GDCPDB', '10': 'GDCPDB', '13': 'GDCPDB'}
+        LabScheduler(LAB_DEPENDENCIES, rec, max_workers=4, groups=groups).run(['06', '10', '13'])
+        assert rec.max_active == 1
+
+    def test_failure_skips_dependents_only(self):
+        rec = Recorder(fail={'04'})
+        results = {r['lab']: r for r in
+                   LabScheduler(LAB_DEPENDENCIES, rec, max_workers=2).run(['04', '05', '08', '09'])}
+        assert results['04']['status'] == FAILED
+        assert results['08']['status'] == SKIPPED and results['09']['status'] == SKIPPED
+        assert 'dependency 04' in results['08']['reason']
+        assert results['05']['status'] == SUCCEEDED
+        assert '08' not in rec.order
+
+    def test_exception_is_failure(self):
+        def boom(lab):
+            raise RuntimeError('no sqlplus')
+        result, = LabScheduler(LAB_DEPENDENCIES, boom).run(['05'])
+        assert result['status'] == FAILED and result['reason'] == 'no sqlplus'
+
+
+class TestRetarget:
+    """PDB isolation rewrites the training PDB name"""
+
+    def test_retarget_script(self, tmp_path):
+        src = tmp_path / 'tp06.sh'
+        src.write_text("ALTER SESSION SET CONTAINER=gdcpdb;\nGDCPDB =\nsqlplus u/p@localhost:1521/gdcpdb\n")
+        mgr = InstallManager.__new__(InstallManager)
+        out = mgr._retarget_script(src, 'LABSEC', tmp_path)
+        assert out.read_text() == ("ALTER SESSION SET CONTAINER=labsec;\nLABSEC =\n"
+                                   "sqlplus u/p@localhost:1521/labsec\n")
+
+    def test_tp06_keeps_other_tns_aliases(self, tmp_path):
+        """The retargeted tp06 adds its alias block without dropping GDCPDB"""
+        import shutil
+        import subprocess
+        if not shutil.which('flock'):
+            pytest.skip('flock not installed')
+        mgr = InstallManager()
+        script = mgr._retarget_script(mgr.scripts_dir / 'tp06-securite-acces.sh', 'LABSEC', tmp_path)
+        text = script.read_text()
+        snippet = text[text.index('TNSNAMES='):text.index('# Test tnsping')]
+        admin = tmp_path / 'network' / 'admin'
+        admin.mkdir(parents=True)
+        tnsnames = admin / 'tnsnames.ora'
+        tnsnames.write_text("# BEGIN oradba GDCPDB\nGDCPDB =\n  (DESCRIPTION = ...)\n# END oradba GDCPDB\n")
+        for _ in range(2):
+            subprocess.run(['bash', '-c', snippet], env={'ORACLE_HOME': str(tmp_path), 'PATH': '/usr/bin:/bin'},
+                           check=True)
+        content = tnsnames.read_text()
+        assert content.count('GDCPDB =') == 1 and content.count('LABSEC =') == 1
+        assert content.count('GDCPROD =') == 1 and '(SERVICE_NAME = labsec)' in content
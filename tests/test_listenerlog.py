@@ -0,0 +1,154 @@
+"""
+Tests for the streaming listener log analyzer (modules/listenerlog.py)
+"""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from oracledba.modules.listenerlog import (ListenerLogAnalyzer, TopCounter, find_listener_log,
+                                           tail_lines)
+
+ESTABLISH = ('05-MAR-2024 10:{mm}:{ss} * (CONNECT_DATA=(SERVICE_NAME={svc})(CID=(PROGRAM={prog})'
+             '(HOST=app01)(USER=app))) * (ADDRESS=(PROTOCOL=tcp)(HOST={ip})(PORT=51234)) '
+             '* establish * {svc} * {code}\n')
+
+
+def establish(second, svc='gdcpdb', prog='/opt/app/bin/java', ip='10.0.0.5', code=0):
+    return ESTABLISH.format(mm=f'{second // 60:02d}', ss=f'{second % 60:02d}', svc=svc,
+                            prog=prog, ip=ip, code=code)
+
+
+def storm_log():
+    lines = ['05-MAR-2024 10:00:00 * service_update * GDCPROD * 0\n']
+    for s in range(0, 60):
+        lines.append(establish(s, ip=f'10.0.0.{s % 3}'))
+    lines += [establish(61, prog='C:\\app\\sqlplus.exe', ip='10.0.0.9') for _ in range(25)]
+    lines.append(establish(62, svc='nosuch', code=12514))
+    lines.append('TNS-12514: TNS:listener does not currently know of service requested in connect descriptor\n')
+    lines.append('05-MAR-2024 10:01:03 * ping * 0\n')
+    lines.append('05-MAR-2024 10:01:04 * 12502\n')
+    lines.append('TNS-12502: TNS:listener received no CONNECT_DATA from client\n')
+    lines.append('TNS-12560: TNS:protocol adapter error\n')
+    return ''.join(lines)
+
+
+@pytest.fixture
+def listener_log(tmp_path):
+    path = tmp_path / 'listener.log'
+    path.write_text(storm_log())
+    return path
+
+
+@pytest.fixture
+def analyzer(listener_log, tmp_path):
+    return ListenerLogAnalyzer(listener_log, state_dir=tmp_path / 'state')
+
+
+class TestAggregation:
+    """Connect rates, breakdowns and TNS errors"""
+
+    def test_report(self, analyzer):
+        analyzer.update()
+        report = analyzer.report(top=5)
+        assert report['connects'] == 86 and report['failed'] == 1
+        assert report['peak'] == {'second': '2024-03-05 10:01:01', 'connects': 25}
+        assert report['bursts'] == [{'second': '2024-03-05 10:01:01', 'connects': 25}]
+        assert report['per_minute'] == [{'minute': '2024-03-05 10:00', 'connects': 60},
+                                        {'minute': '2024-03-05 10:01', 'connects': 26}]
+        assert report['services'][0] == {'name': 'gdcpdb', 'connects': 85}
+        assert report['hosts'][0] == {'name': '10.0.0.9', 'connects': 25}
+        assert {'name': 'sqlplus.exe', 'connects': 25} in report['programs']
+        assert report['events']['establish'] == 86 and report['events']['ping'] == 1
+
+    def test_tns_errors_counted_once(self, analyzer):
+        analyzer.update()
+        errors = {e['code']: e for e in analyzer.report()['errors']}
+        # the TNS-12514 line explains the failed establish; TNS-12560 is part of 12502's stack
+        assert errors['TNS-12514']['count'] == 1
+        assert errors['TNS-12502']['count'] == 1
+        assert 'TNS-12560' not in errors
+        assert 'does not currently know' in errors['TNS-12514']['message']
+        assert analyzer.report()['recent_errors'][0]['message'].startswith('TNS:listener does not')
+
+    def test_top_counter_bounded(self):
+        counter = TopCounter(capacity=10)
+        for i in range(1000):
+            counter.add('hot', 5)
+            counter.add(f'rare{i}')
+        assert len(counter.counts) <= 20
+        assert counter.top(1) == [('hot', 5000)]
+        assert counter.dropped == 1
+
+
+class TestCheckpoint:
+    """Repeated runs only read appended data"""
+
+    def test_incremental(self, analyzer, listener_log, tmp_path):
+        size = listener_log.stat().st_size
+        assert analyzer.update() == size
+        assert analyzer.update() == 0
+        with open(listener_log, 'a') as f:
+            f.write(establish(61))
+            f.write('05-MAR-2024 10:05:00 * (CONNECT_DATA=')      # still being written
+        fresh = ListenerLogAnalyzer(listener_log, state_dir=tmp_path / 'state')
+        assert 0 < fresh.update() < 400
+        report = fresh.report()
+        assert report['connects'] == 87
+        assert report['peak']['connects'] == 25        # 10:01:01 already closed
+
+    def test_rotation_starts_over(self, analyzer, listener_log):
+        analyzer.update()
+        listener_log.write_text(establish(10))
+        analyzer.update()
+        assert analyzer.report()['connects'] == 1
+
+    def test_reset(self, analyzer):
+        analyzer.update()
+        analyzer.reset()
+        assert analyzer.report()['connects'] == 0
+        analyzer.update()
+        assert analyzer.report()['connects'] == 86
+
+
+class TestListenerInterfaces:
+    """`oradba logs listener` and /api/logs/listener"""
+
+    def test_tail_lines(self, listener_log):
+        assert tail_lines(listener_log, 2) == ['TNS-12502: TNS:listener received no CONNECT_DATA from client',
+                                               'TNS-12560: TNS:protocol adapter error']
+        assert len(tail_lines(listener_log, 1000, chunk=128)) == storm_log().count('\n')
+
+    def test_find_listener_log(self, tmp_path):
+        trace = tmp_path / 'diag' / 'tnslsnr' / 'oradb01' / 'listener' / 'trace'
+        trace.mkdir(parents=True)
+        (trace / 'listener.log').write_text('')
+        assert find_listener_log(str(tmp_path), hostname='oradb01.example.com') == trace / 'listener.log'
+        assert find_listener_log(str(tmp_path), listener='LISTENER_DG') is None
+
+    def test_cli_json(self, listener_log, monkeypatch, tmp_path):
+        from oracledba.commands.database import logs
+        monkeypatch.setenv('HOME', str(tmp_path))
+        result = CliRunner().invoke(logs, ['listener', '--file', str(listener_log), '--json'])
+        assert result.exit_code == 0, result.output
+        assert json.loads(result.output)['connects'] == 86
+        result = CliRunner().invoke(logs, ['listener', '--file', str(listener_log), '--report'])
+        assert 'Connects per Service' in result.output and 'TNS-12514' in result.output
+
+    def test_api(self, listener_log, monkeypatch, tmp_path):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'listener_analyzers', {})
+        monkeypatch.setattr(web_server, 'CONFIG_DIR', tmp_path)
+        monkeypatch.setattr(web_server, 'find_listener_log', lambda *a, **k: listener_log)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        data = client.get('/api/logs/listener?top=3').get_json()
+        assert data['success'] and data['report']['connects'] == 86
+        assert len(data['report']['hosts']) == 3
+        again = client.get('/api/logs/listener').get_json()
+        assert again['report']['bytes_read'] == 0
+        assert client.post('/api/logs/listener/reset').get_json()['success']
+        assert client.get('/api/logs/listener').get_json()['report']['bytes_read'] > 0
@@ -0,0 +1,133 @@
+"""
+Tests for latency instrumentation (utils/perf.py and the web server hooks)
+"""
+
+import json
+
+import pytest
+
+from oracledba.utils.perf import (PerfRecorder, fingerprint_command, fingerprint_sql,
+                                  percentile, server_timing)
+
+
+class TestFingerprint:
+    """Statements differing only in literals share a fingerprint"""
+
+    def test_literals_normalized(self):
+        a = fingerprint_sql("SELECT NAME FROM V$PDBS WHERE NAME='GDCPDB' AND CON_ID = 3;")
+        b = fingerprint_sql("select name from v$pdbs\n where name = 'OTHER' and con_id=12")
+        assert a == b
+        assert a == "SELECT NAME FROM V$PDBS WHERE NAME=? AND CON_ID=?"
+
+    def test_sqlplus_commands_and_comments_dropped(self):
+        fp = fingerprint_sql("COL NAME FORMAT A30\n-- usage\nSELECT name FROM v$datafile;")
+        assert fp == "SELECT NAME FROM V$DATAFILE"
+
+    def test_in_lists_collapsed(self):
+        assert fingerprint_sql("SELECT 1 FROM t WHERE x IN (1, 2, 3)") == \
+            fingerprint_sql("SELECT 1 FROM t WHERE x IN ('a','b')")
+
+    def test_command(self):
+        assert fingerprint_command(['/usr/local/bin/oradba', 'rman', 'backup', '--type', 'full']) \
+            == 'oradba rman backup'
+        assert fingerprint_command('lsnrctl status') == 'lsnrctl status'
+
+
+class TestPerfRecorder:
+    """Reservoir stats, percentiles, request attribution and slow log"""
+
+    def test_percentiles(self):
+        samples = sorted(range(1, 101))
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 99) == 99
+        assert percentile([], 50) is None
+
+    def test_summary(self):
+        perf = PerfRecorder(slow_ms=10_000)
+        for ms in range(1, 101):
+            perf.record('sql', 'SELECT ?', float(ms))
+        row = perf.summary()['sql'][0]
+        assert row['key'] == 'SELECT ?'
+        assert row['count'] == 100
+        assert row['p50_ms'] == 50
+        assert row['p95_ms'] == 95
+        assert row['max_ms'] == 100
+
+    def test_reservoir_is_bounded(self):
+        perf = PerfRecorder(slow_ms=10_000, reservoir=16)
+        for ms in range(1000):
+            perf.record('sql', 'k', float(ms))
+        series = perf._series[('sql', 'k')]
+        assert len(series.samples) == 16
+        assert series.count == 1000
+
+    def test_request_attribution(self):
+        perf = PerfRecorder(slow_ms=10_000)
+        perf.begin_request()
+        perf.record('sql', 'a', 5.0)
+        perf.record('sql', 'b', 7.0)
+        perf.record('shell', 'c', 3.0)
+        total, spans = perf.end_request('GET /x')
+        assert spans == {'sql': 12.0, 'shell': 3.0}
+        assert perf.summary('route')['route'][0]['key'] == 'GET /x'
+        assert server_timing(20.0, spans) == 'shell;dur=3.0, sql;dur=12.0, total;dur=20.0'
+
+    def test_timed_decorator(self):
+        perf = PerfRecorder(slow_ms=10_000)
+
+        @perf.timed('sql', lambda sql: fingerprint_sql(sql))
+        def run(sql):
+            return 'ok'
+
+        assert run("SELECT 1 FROM dual") == 'ok'
+        assert perf.summary()['sql'][0]['key'] == 'SELECT ? FROM DUAL'
+
+    def test_slow_log(self, tmp_path):
+        log = tmp_path / 'slow.jsonl'
+        perf = PerfRecorder(slow_log=log, slow_ms=100)
+        perf.record('sql', 'fast', 5.0)
+        perf.record('sql', 'slow', 250.0)
+        entries = [json.loads(line) for line in log.read_text().splitlines()]
+        assert [e['key'] for e in entries] == ['slow']
+        assert perf.recent_slow()[0]['ms'] == 250.0
+
+
+class TestWebServerHooks:
+    """Server-Timing header and /api/admin/perf"""
+
+    @pytest.fixture
+    def client(self, tmp_path, monkeypatch):
+        from oracledba import web_server
+        recorder = PerfRecorder(slow_log=tmp_path / 'slow.jsonl', slow_ms=10_000)
+        monkeypatch.setattr(web_server, 'perf', recorder)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        return client
+
+    def test_server_timing_and_report(self, client):
+        response = client.get('/api/admin/perf')
+        assert 'total;dur=' in response.headers['Server-Timing']
+        data = client.get('/api/admin/perf').get_json()
+        assert data['success']
+        assert [r['key'] for r in data['routes']] == ['GET /api/admin/perf']
+        assert data['serialization'][0]['key'] == 'GET /api/admin/perf'
+
+    def test_admin_only(self, client):
+        with client.session_transaction() as sess:
+            sess['role'] = 'viewer'
+        response = client.get('/api/admin/perf')
+        assert response.status_code == 302
+
+    def test_cli_commands_timed(self):
+        from oracledba import web_server
+        web_server.execute_cli_command(['true'])
+        keys = [r['key'] for r in web_server.perf.summary('cli')['cli']]
+        assert fingerprint_command(['true']) in keys and 'cli_environment' not in keys
+
+    def test_detector_timed_per_instance(self):
+        from oracledba import web_server
+        from oracledba.modules.detector import SystemDetector
+        assert hasattr(web_server.detector._run_sql, '__wrapped__')
+        assert not hasattr(SystemDetector()._run_sql, '__wrapped__')
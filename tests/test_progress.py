@@ -0,0 +1,122 @@
+"""
+Tests for runInstaller/DBCA progress parsing and ETA estimation
+"""
+
+import pytest
+
+from oracledba.modules.progress import (
+    ProgressHistory, ProgressTracker, format_duration, render_bar
+)
+
+
+DBCA_OUTPUT = [
+    ("Prepare for db operation", 0),
+    ("8% complete", 30),
+    ("Copying database files", 0),
+    ("31% complete", 120),
+    ("Creating and starting Oracle instance", 0),
+    ("54% complete", 200),
+    ("Executing Post Configuration Actions", 0),
+    ("100% complete", 50),
+]
+
+
+class TestProgressTracker:
+    """Test suite for ProgressTracker"""
+
+    def test_unknown_operation(self, tmp_path):
+        """Only runinstaller and dbca are supported"""
+        with pytest.raises(ValueError):
+            ProgressTracker('netca', history=ProgressHistory(tmp_path / "h.json"))
+
+    def test_dbca_percent_and_phases(self, tmp_path, clock):
+        """DBCA phase lines and percentages are recognised"""
+        tracker = ProgressTracker('dbca', history=ProgressHistory(tmp_path / "h.json"),
+                                  clock=clock)
+        assert tracker.feed("Prepare for db operation")['phase'] == 'Prepare for db operation'
+        clock.now = 30
+        update = tracker.feed("10% complete")
+        assert update['percent'] == 10
+        # Rate-based ETA with no history: 10% in 30s -> 270s left
+        assert update['eta'] == pytest.approx(270)
+        assert tracker.feed("10% complete") is None
+        assert tracker.feed("[WARNING] [DBT-06208] password") is None
+        for line in ("Warning messages were encountered", "Warning", "During setup, check:",
+                     "Something went wrong", "Loading: 3 files"):
+            assert tracker.feed(line) is None, line
+        assert tracker.feed("Registering database with Oracle Restart")['phase'] == \
+            'Registering database with Oracle Restart'
+
+    def test_runinstaller_phases(self, tmp_path, clock):
+        """OUI 'in progress'/'successful' markers drive phase and percent"""
+        tracker = ProgressTracker('runinstaller',
+                                  history=ProgressHistory(tmp_path / "h.json"), clock=clock)
+        tracker.feed("Launching Oracle Database Setup Wizard...")
+        assert tracker.feed("Prepare in progress.")['phase'] == 'Prepare'
+        clock.now = 5
+        update = tracker.feed("Prepare successful.")
+        assert update['phase'] is None
+        assert update['percent'] == int(100 / 6)
+        tracker.feed("Copy files in progress.")
+        clock.now = 65
+        tracker.feed("Copy files successful.")
+        assert tracker.completed == [('Prepare', 5), ('Copy files', 60)]
+
+    def test_history_eta_and_recording(self, tmp_path, clock):
+        """A recorded run makes the next run's ETA history-based"""
+        history_file = tmp_path / "h.json"
+        tracker = ProgressTracker('dbca', history=ProgressHistory(history_file), clock=clock)
+        for line, advance in DBCA_OUTPUT:
+            clock.now += advance
+            tracker.feed(line)
+        tracker.finish(success=True)
+
+        history = ProgressHistory(history_file)
+        assert history.expected('dbca', 'Copying database files') == 120
+        assert len(history.data['dbca']['runs']) == 1
+
+        clock.now = 0
+        tracker = ProgressTracker('dbca', history=history, clock=clock)
+        tracker.feed("Prepare for db operation")
+        clock.now = 10
+        tracker.feed("Copying database files")
+        clock.now = 40
+        # 90s left in copying + 200s instance + 50s post config
+        assert tracker.eta() == pytest.approx(340)
+
+        clock.now = 370
+        tracker.feed("Creating and starting Oracle instance")
+        rates = tracker.phase_rates()
+        assert rates[-1]['phase'] == 'Copying database files'
+        assert rates[-1]['ratio'] == pytest.approx(3.0)
+
+        # the last phase is closed by finish() and compared with earlier runs only
+        clock.now = 970
+        tracker.finish(success=True)
+        rates = tracker.phase_rates()
+        assert rates[-1]['phase'] == 'Creating and starting Oracle instance'
+        assert rates[-1]['ratio'] == pytest.approx(3.0)
+        assert rates[-2]['ratio'] == pytest.approx(3.0)
+
+    def test_failed_run_not_recorded(self, tmp_path):
+        """Failed installs do not pollute the history"""
+        history_file = tmp_path / "h.json"
+        tracker = ProgressTracker('dbca', history=ProgressHistory(history_file))
+        tracker.feed("Copying database files")
+        tracker.finish(success=False)
+        assert not history_file.exists()
+
+
+class TestFormatting:
+    """Test suite for progress formatting helpers"""
+
+    def test_format_duration(self):
+        assert format_duration(None) == '--'
+        assert format_duration(42) == '42s'
+        assert format_duration(245) == '4m 05s'
+
+    def test_render_bar(self):
+        line = render_bar({'percent': 50, 'phase': 'Copying database files', 'eta': 90},
+                          width=10)
+        assert '█████░░░░░' in line
+        assert 'ETA 1m 30s' in line
@@ -0,0 +1,139 @@
+"""
+Tests for block change tracking and the incremental-forever strategy (modules/rman.py)
+"""
+
+import json
+
+import pytest
+
+from oracledba.modules import backupcatalog
+from oracledba.modules import rman as rman_module
+from oracledba.modules.rman import RMANManager, incremental_forever_commands
+
+
+class FakeClient:
+    """query_many/run_rman stand-in for one database state"""
+
+    def __init__(self, bct='DISABLED', fra='/u01/app/oracle/fast_recovery_area', copies=0):
+        self.bct = bct
+        self.fra = fra
+        self.copies = copies
+        self.scripts = []
+
+    def query_many(self, queries):
+        self.queries = queries
+        return True, {
+            'bct': [{'STATUS': self.bct, 'FILENAME': '/u02/bct.chg' if self.bct == 'ENABLED' else '',
+                     'BYTES': '11599872'}],
+            'fra': [{'NAME': self.fra, 'SPACE_LIMIT': str(50 * 1024 ** 3),
+                     'SPACE_USED': str(12 * 1024 ** 3)}],
+            'copy': [{'FILES': str(self.copies), 'BYTES': str(self.copies * 1024 ** 3),
+                      'CHECKPOINT_TIME': '2026-01-14 23:00:00' if self.copies else ''}],
+        }, {}
+
+    def run_rman(self, commands):
+        self.scripts.append(commands)
+        if 'ENABLE BLOCK CHANGE TRACKING' in commands:
+            self.bct = 'ENABLED'
+        return True, 'Recovery Manager complete.', ''
+
+
+@pytest.fixture(autouse=True)
+def config_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(rman_module, 'TUNING_FILE', tmp_path / 'rman-tuning.json')
+    monkeypatch.setattr(rman_module, 'STRATEGY_FILE', tmp_path / 'rman-strategy.json')
+    monkeypatch.setattr(backupcatalog, 'CATALOG_FILE', tmp_path / 'backup-catalog.db')
+
+
+class TestIncrementalForever:
+    """Roll-forward script and strategy switching"""
+
+    def test_script_rolls_copy_forward_before_next_level1(self):
+        script = incremental_forever_commands('IF', window_days=3, section_size='8G')
+        recover = script.index("RECOVER COPY OF DATABASE WITH TAG 'IF' UNTIL TIME 'SYSDATE-3';")
+        backup = script.index("BACKUP INCREMENTAL LEVEL 1 SECTION SIZE 8G FOR RECOVER OF COPY WITH TAG 'IF' DATABASE;")
+        assert recover < backup
+        assert 'UNTIL TIME' not in incremental_forever_commands('IF')
+
+    def test_enables_bct_and_saves(self):
+        client = FakeClient(bct='DISABLED')
+        mgr = RMANManager(client)
+        strategy = mgr.set_strategy('incremental-forever', window_days=2, bct_file='/u02/bct.chg')
+        assert strategy['enabled_bct']
+        assert client.scripts == ['SQL "ALTER DATABASE ENABLE BLOCK CHANGE TRACKING USING FILE \'\'/u02/bct.chg\'\'";']
+        saved = json.loads(rman_module.STRATEGY_FILE.read_text())
+        assert saved['mode'] == 'incremental-forever' and saved['window_days'] == 2
+        assert RMANManager(client).strategy['mode'] == 'incremental-forever'
+
+    def test_bct_already_enabled(self):
+        client = FakeClient(bct='ENABLED')
+        assert not RMANManager(client).set_strategy('incremental-forever')['enabled_bct']
+        assert client.scripts == []
+
+    def test_requires_fra(self):
+        client = FakeClient(fra='')
+        with pytest.raises(RuntimeError, match='FRA'):
+            RMANManager(client).apply_strategy('incremental-forever')
+        assert not rman_module.STRATEGY_FILE.exists()
+        assert RMANManager(client).set_strategy('backupset')['mode'] == 'backupset'
+
+    def test_incremental_backup_follows_strategy(self):
+        client = FakeClient(bct='ENABLED')
+        mgr = RMANManager(client)
+        assert mgr.backup('incremental', tag='L1', monitor=False)
+        assert 'INCREMENTAL LEVEL 1' in client.scripts[-1] and 'RECOVER COPY' not in client.scripts[-1]
+        mgr.set_strategy('incremental-forever')
+        assert mgr.backup('incremental', monitor=False)
+        assert f"RECOVER COPY OF DATABASE WITH TAG '{rman_module.FOREVER_TAG}'" in client.scripts[-1]
+        mgr.backup('full', tag='F', monitor=False)
+        assert 'RECOVER COPY' not in client.scripts[-1]
+
+    def test_status(self):
+        status = RMANManager(FakeClient(bct='ENABLED', copies=12)).strategy_status()
+        assert status['bct'] == {'enabled': True, 'file': '/u02/bct.chg', 'mb': 11.1}
+        assert status['fra']['limit_gb'] == 50.0
+        assert status['copy']['files'] == 12 and status['copy']['gb'] == 12.0
+
+
+class TestStrategyApi:
+    """/api/rman/strategy and the scheduled backup job"""
+
+    @pytest.fixture
+    def api(self, monkeypatch, tmp_path):
+        from oracledba import web_server
+        from oracledba.modules.backupscheduler import BackupScheduler
+        from oracledba.utils.jobs import JobManager
+        fake = FakeClient()
+        fake.rman = '/u01/app/oracle/product/19.3.0/dbhome_1/bin/rman'
+        fake.wrap = lambda cmd: cmd
+        monkeypatch.setattr(web_server, 'rman_client', fake)
+        queued = []
+        manager = JobManager(tmp_path / 'jobs')
+        monkeypatch.setattr(manager, 'enqueue', lambda job: queued.append(job) or job)
+        scheduler = BackupScheduler(manager, fake, state_file=tmp_path / 'schedule.json')
+        assert scheduler.acquire()
+        monkeypatch.setattr(web_server, 'backup_scheduler', scheduler)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        yield client, fake, queued
+        scheduler.release()
+
+    def test_set_and_backup(self, api):
+        client, fake, queued = api
+        assert client.get('/api/rman/strategy').get_json()['mode'] == 'backupset'
+        data = client.post('/api/rman/strategy', json={'mode': 'incremental-forever'}).get_json()
+        assert data['success'] and data['mode'] == 'incremental-forever' and data['bct']['enabled']
+
+        data = client.post('/api/rman/backup', json={'type': 'incremental'}).get_json()
+        assert data['success'] and queued[0].id == data['job_id']
+        assert queued[0].cmd[-2:] == ['target', '/']
+        with open(queued[0].stdin_file) as f:
+            assert 'FOR RECOVER OF COPY' in f.read()
+        assert not client.post('/api/rman/backup', json={'type': 'bogus'}).get_json()['success']
+
+    def test_rejects_unknown_mode(self, api):
+        client, _, _ = api
+        data = client.post('/api/rman/strategy', json={'mode': 'tape'}).get_json()
+        assert not data['success'] and 'Unknown strategy' in data['error']
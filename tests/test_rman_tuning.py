@@ -0,0 +1,114 @@
+"""
+Tests for RMAN throughput tuning (modules/rman.py) and OracleClient stdin helpers
+"""
+
+import json
+
+import pytest
+
+import fakeoracle
+from oracledba.modules import backupcatalog
+from oracledba.modules import rman as rman_module
+from oracledba.modules.rman import (ACO_ALGORITHMS, GIB, RMANManager, measure_write_throughput,
+                                    recommend_rman_settings)
+from oracledba.utils.oracle_client import OracleClient, parse_rows
+
+
+def files(count, gb, bigfile=False):
+    return [{'file': i + 1, 'bytes': int(gb * GIB), 'bigfile': bigfile} for i in range(count)]
+
+
+@pytest.fixture
+def oracle_home(tmp_path, monkeypatch):
+    fakeoracle.install(tmp_path / 'home' / 'bin')
+    monkeypatch.setenv('ORACLE_HOME', str(tmp_path / 'home'))
+    monkeypatch.setattr(rman_module, 'TUNING_FILE', tmp_path / 'rman-tuning.json')
+    monkeypatch.setattr(backupcatalog, 'CATALOG_FILE', tmp_path / 'backup-catalog.db')
+    return tmp_path / 'home'
+
+
+class TestRecommendation:
+    """Channel count, compression and section size choices"""
+
+    def test_cpu_bound_uses_more_channels(self):
+        rec = recommend_rman_settings(16, files(40, 16), dest_mbps=600)
+        assert rec['channels'] > 2
+        assert rec['estimated_minutes'] < recommend_rman_settings(2, files(40, 16), 600)['estimated_minutes']
+
+    def test_slow_destination_prefers_compression(self):
+        slow = recommend_rman_settings(16, files(40, 16), dest_mbps=100)
+        fast = recommend_rman_settings(16, files(40, 16), dest_mbps=4000)
+        ratio = {a: r for a, (_, r) in rman_module.COMPRESSION_PROFILES.items()}
+        assert ratio[slow['compression']] > ratio[fast['compression']]
+
+    def test_channels_leave_cpu_headroom(self):
+        assert recommend_rman_settings(8, files(100, 4), dest_mbps=10000)['channels'] <= 6
+        assert recommend_rman_settings(1, files(10, 4), dest_mbps=10000)['channels'] == 1
+
+    def test_bigfile_gets_section_size(self):
+        rec = recommend_rman_settings(16, files(1, 2000, bigfile=True) + files(3, 1), dest_mbps=1000)
+        assert rec['section_size'] and rec['section_size'].endswith('G')
+        assert int(rec['section_size'][:-1]) * rec['channels'] <= 2000
+        assert recommend_rman_settings(16, files(40, 2), dest_mbps=1000)['section_size'] is None
+
+    def test_no_aco(self):
+        rec = recommend_rman_settings(16, files(40, 16), dest_mbps=300, allow_aco=False)
+        assert rec['compression'] not in ACO_ALGORITHMS
+
+    def test_measure_write_throughput(self, tmp_path):
+        assert measure_write_throughput(tmp_path, sample_mb=8) > 0
+        assert list(tmp_path.iterdir()) == []
+
+
+class TestOracleClient:
+    """stdin-fed sqlplus/rman without a shell"""
+
+    def test_parse_rows(self):
+        out = "A |B\n--|--\n1 |x\n2 |y\n"
+        assert parse_rows(out) == [{'A': '1', 'B': 'x'}, {'A': '2', 'B': 'y'}]
+        assert parse_rows("N\n----\n4\n") == [{'N': '4'}]
+
+    def test_query(self, oracle_home):
+        ok, rows, error = OracleClient(str(oracle_home)).query("SELECT FILE#, BYTES FROM V$DATAFILE")
+        assert ok and error == ''
+        assert rows and all(r['BYTES'].isdigit() for r in rows)
+        ok, rows, error = OracleClient(str(oracle_home)).query("SELECT * FROM no_such_table")
+        assert not ok and 'ORA-00942' in error
+
+    def test_run_rman(self, oracle_home):
+        ok, out, _ = OracleClient(str(oracle_home)).run_rman("SHOW ALL;")
+        assert ok and 'CONFIGURE RETENTION POLICY' in out
+
+
+class TestTune:
+    """`oradba rman tune` configures RMAN and backups pick the settings up"""
+
+    def test_tune_and_backup(self, oracle_home, monkeypatch):
+        monkeypatch.setattr(rman_module.os, 'cpu_count', lambda: 16)
+        mgr = RMANManager()
+        scripts = []
+        run = mgr._run_rman
+        monkeypatch.setattr(mgr, '_run_rman', lambda c: scripts.append(c) or run(c))
+
+        rec = mgr.tune(dest_mbps=800)
+        assert rec and rec['channels'] > 2
+        assert f"PARALLELISM {rec['channels']}" in scripts[0]
+        saved = json.loads(rman_module.TUNING_FILE.read_text())
+        assert saved['channels'] == rec['channels']
+
+        assert RMANManager().tuning['compression'] == rec['compression']
+        mgr.tuning['section_size'] = '8G'
+        assert mgr.backup('full', tag='T1', monitor=False)
+        assert 'SECTION SIZE 8G' in scripts[-1] and f"FILESPERSET {rec['filesperset']}" in scripts[-1]
+        mgr.backup('archive', tag='T2', monitor=False)
+        assert 'SECTION SIZE' not in scripts[-1]
+
+    def test_dry_run_does_not_configure(self, oracle_home, monkeypatch):
+        mgr = RMANManager()
+        monkeypatch.setattr(mgr, '_run_rman', lambda c: pytest.fail('RMAN should not run'))
+        assert mgr.tune(dest_mbps=500, apply=False)['channels'] >= 1
+        assert not rman_module.TUNING_FILE.exists()
+
+    def test_measured_destination(self, oracle_home, tmp_path):
+        rec = RMANManager().tune(dest=str(tmp_path), sample_mb=8, apply=False)
+        assert rec['inputs']['dest_mbps'] > 0 and rec['dest'] == str(tmp_path)
@@ -0,0 +1,162 @@
+"""
+Tests for live RMAN progress monitoring (modules/rmanmonitor.py)
+"""
+
+import threading
+
+import pytest
+
+from oracledba.modules.rmanmonitor import (RmanMonitor, build_snapshot, job_record,
+                                           throughput_trend)
+
+MB_BLOCKS = 128        # 8K blocks per MB
+
+
+def poll(sofar1, sofar2, agg_sofar, running=True):
+    """Rows of one poll: two channels and the aggregate input operation"""
+    if not running:
+        return {'status': [], 'longops': [], 'asyncio': [], 'block_size': [{'VALUE': '8192'}]}
+    return {
+        'block_size': [{'VALUE': '8192'}],
+        'status': [{'SESSION_RECID': '41', 'SESSION_STAMP': '1160000000', 'OPERATION': 'BACKUP',
+                    'OBJECT_TYPE': 'DB FULL', 'STATUS': 'RUNNING', 'MBYTES_PROCESSED': '512',
+                    'START_TIME': '2026-01-15 01:00:00'}],
+        'longops': [
+            {'SID': '21', 'SERIAL#': '1', 'OPNAME': 'RMAN: full datafile backup', 'SOFAR': str(sofar1),
+             'TOTALWORK': str(100 * MB_BLOCKS), 'ELAPSED_SECONDS': '10', 'TIME_REMAINING': '30'},
+            {'SID': '22', 'SERIAL#': '1', 'OPNAME': 'RMAN: full datafile backup', 'SOFAR': str(sofar2),
+             'TOTALWORK': str(400 * MB_BLOCKS), 'ELAPSED_SECONDS': '10', 'TIME_REMAINING': ''},
+            {'SID': '21', 'SERIAL#': '1', 'OPNAME': 'RMAN: aggregate input', 'SOFAR': str(agg_sofar),
+             'TOTALWORK': str(1000 * MB_BLOCKS), 'ELAPSED_SECONDS': '10', 'TIME_REMAINING': '90'},
+        ],
+        'asyncio': [
+            {'SID': '21', 'TYPE': 'INPUT', 'FILENAME': '/u01/oradata/GDCPROD/users01.dbf',
+             'EFFECTIVE_BYTES_PER_SECOND': str(40 * 1048576)},
+            {'SID': '21', 'TYPE': 'AGGREGATE', 'FILENAME': '',
+             'EFFECTIVE_BYTES_PER_SECOND': str(50 * 1048576)},
+            {'SID': '22', 'TYPE': 'INPUT', 'FILENAME': '/u01/oradata/GDCPROD/sysaux01.dbf',
+             'EFFECTIVE_BYTES_PER_SECOND': str(20 * 1048576)},
+        ],
+    }
+
+
+def job_row(key, mbps, status='COMPLETED', input_type='DB FULL', start='2026-01-10 01:00:00'):
+    return {'SESSION_KEY': str(key), 'SESSION_RECID': '41' if key == 9 else str(key),
+            'SESSION_STAMP': '1160000000' if key == 9 else '1', 'INPUT_TYPE': input_type,
+            'STATUS': status, 'START_TIME': start, 'END_TIME': start, 'ELAPSED_SECONDS': '100',
+            'INPUT_BYTES': str(mbps * 100 * 1048576), 'OUTPUT_BYTES': str(mbps * 30 * 1048576),
+            'INPUT_BYTES_PER_SEC': str(mbps * 1048576), 'OUTPUT_BYTES_PER_SEC': str(mbps * 314573),
+            'COMPRESSION_RATIO': '3.3'}
+
+
+class TestSnapshot:
+    """Percent, ETA and MB/s from the three views"""
+
+    def test_first_poll_uses_async_io(self):
+        snap = build_snapshot(poll(20 * MB_BLOCKS, 40 * MB_BLOCKS, 100 * MB_BLOCKS), now=100)
+        assert snap['running'] and snap['job']['object_type'] == 'DB FULL'
+        assert snap['percent'] == 10.0 and snap['eta_seconds'] == 90
+        ch21, ch22 = snap['channels']
+        assert ch21['sid'] == '21' and ch21['percent'] == 20.0 and ch21['mbps'] == 50.0
+        assert ch21['file'].endswith('users01.dbf') and ch21['eta_seconds'] == 30
+        assert ch22['mbps'] == 20.0 and ch22['eta_seconds'] == (400 - 40) // 20
+        assert snap['mbps'] == 70.0
+
+    def test_later_polls_use_sofar_delta(self):
+        first = build_snapshot(poll(20 * MB_BLOCKS, 40 * MB_BLOCKS, 100 * MB_BLOCKS), now=100)
+        second = build_snapshot(poll(80 * MB_BLOCKS, 70 * MB_BLOCKS, 200 * MB_BLOCKS), first, now=102)
+        assert [c['mbps'] for c in second['channels']] == [30.0, 15.0]
+        assert second['mbps'] == 45.0
+
+    def test_idle(self):
+        snap = build_snapshot(poll(0, 0, 0, running=False), now=1)
+        assert not snap['running'] and snap['percent'] is None and snap['channels'] == []
+
+    def test_without_aggregate_row(self):
+        rows = poll(50 * MB_BLOCKS, 100 * MB_BLOCKS, 0)
+        rows['longops'] = rows['longops'][:2]
+        snap = build_snapshot(rows, now=1)
+        assert snap['percent'] == 30.0 and snap['eta_seconds'] == 30
+
+
+class TestHistory:
+    """Finished jobs are recorded once and compared with their type's median"""
+
+    def test_record_after_job_ends(self, tmp_path, canned_client):
+        client = canned_client([poll(10, 10, 10), poll(900, 900, 900), poll(0, 0, 0, running=False)],
+                               rows=[job_row(9, 120)])
+        monitor = RmanMonitor(client, history_file=tmp_path / 'h.jsonl', clock=iter(range(100)).__next__)
+        snaps = []
+        last = monitor.watch(interval=0, on_snapshot=snaps.append)
+        assert not last['running'] and len(snaps) == 3
+        history = monitor.history()
+        assert len(history) == 1 and history[0]['input_mbps'] == 120.0
+        assert history[0]['channels'] == 2 and history[0]['peak_mbps'] > 0
+        assert monitor.record_finished() == []          # already recorded
+
+    def test_watch_until_stopped(self, tmp_path, canned_client):
+        client = canned_client([poll(10, 10, 10)])
+        monitor = RmanMonitor(client, history_file=tmp_path / 'h.jsonl')
+        stop = threading.Event()
+        monitor.watch(interval=0, stop=stop,
+                      on_snapshot=lambda snap: client.calls == 3 and stop.set())
+        assert client.calls == 3
+
+    def test_trend_flags_slow_jobs(self):
+        rows = [job_row(k, mbps, start=f'2026-01-{k:02d} 01:00:00')
+                for k, mbps in enumerate([200, 210, 190, 205, 90, 200], 1)]
+        rows.append(job_row(7, 10, status='FAILED'))
+        rows.append(job_row(8, 50, input_type='ARCHIVELOG'))
+        trend = throughput_trend([job_record(r) for r in rows])
+        full = trend['DB FULL']
+        assert full['runs'] == 7 and full['failed'] == 1
+        assert [s['session_key'] for s in full['slow']] == ['5']
+        assert full['slow'][0]['baseline_mbps'] == 202.5
+        assert trend['ARCHIVELOG']['slow'] == [] and trend['ARCHIVELOG']['median_mbps'] == 50.0
+
+
+class TestRmanProgressApi:
+    """/api/rman/progress and /api/rman/throughput"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, tmp_path, canned_client):
+        from oracledba import web_server
+        fake = canned_client([poll(20 * MB_BLOCKS, 40 * MB_BLOCKS, 100 * MB_BLOCKS)],
+                             rows=[job_row(k, 100 + k, start=f'2026-01-{k:02d} 01:00:00')
+                                   for k in (1, 2, 3)])
+        monkeypatch.setattr(web_server, 'rman_monitor',
+                            RmanMonitor(fake, history_file=tmp_path / 'h.jsonl'))
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        return client
+
+    def test_progress(self, client):
+        data = client.get('/api/rman/progress').get_json()
+        assert data['success'] and data['running'] and data['percent'] == 10.0
+        assert [c['sid'] for c in data['channels']] == ['21', '22']
+
+    def test_throughput(self, client):
+        data = client.get('/api/rman/throughput').get_json()
+        assert [j['session_key'] for j in data['jobs']] == ['1', '2', '3']
+        assert data['trend']['DB FULL']['median_mbps'] == 102.0
+
+
+class TestMonitoredBackup:
+    """RMANManager.backup polls progress from a second session while RMAN runs"""
+
+    def test_backup_with_monitor(self, tmp_path, monkeypatch):
+        import fakeoracle
+        from oracledba.modules import rmanmonitor
+        from oracledba.modules.rman import RMANManager
+        fakeoracle.install(tmp_path / 'home' / 'bin')
+        monkeypatch.setenv('ORACLE_HOME', str(tmp_path / 'home'))
+        monkeypatch.setattr(rmanmonitor, 'HISTORY_FILE', tmp_path / 'h.jsonl')
+        mgr = RMANManager()
+        mgr.tuning = {}
+        polls = []
+        monkeypatch.setattr(RmanMonitor, 'snapshot',
+                            lambda self: polls.append(1) or build_snapshot({}, now=len(polls)))
+        assert mgr._run_rman_monitored("BACKUP DATABASE;", interval=0.05)[0]
+        assert polls
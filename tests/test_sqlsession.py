@@ -0,0 +1,134 @@
+"""
+Tests for persistent sqlplus sessions (utils/sqlsession.py) and the terminal API
+"""
+
+import pytest
+
+import fakeoracle
+from oracledba.utils.sqlsession import (SessionError, SessionLimitError, SqlSession,
+                                        SqlSessionManager, check_sql_input,
+                                        terminate_statement)
+
+
+@pytest.fixture
+def sqlplus(tmp_path):
+    return fakeoracle.install(tmp_path / 'bin')['sqlplus']
+
+
+@pytest.fixture
+def manager(sqlplus):
+    mgr = SqlSessionManager(lambda connect, owner: SqlSession([sqlplus, '-s', '-L', connect],
+                                                              owner=owner),
+                            max_per_user=2, max_total=3)
+    yield mgr
+    mgr.shutdown()
+
+
+class TestStatements:
+    """Statement completion and shell-escape checks"""
+
+    def test_terminate_statement(self):
+        assert terminate_statement('select * from dual') == 'select * from dual;'
+        assert terminate_statement('SELECT 1 FROM dual;') == 'SELECT 1 FROM dual;'
+        assert terminate_statement('show pdbs') == 'show pdbs'
+        assert terminate_statement('BEGIN NULL; END;') == 'BEGIN NULL; END;\n/'
+
+    def test_shell_escapes_rejected(self):
+        for sql in ('host rm -rf /', '!ls', '$ ls', 'ed afiedt.buf', 'select 1 from dual\nHOST id',
+                    'ho id', 'HOS id', 'hOsT id', 'EDI x', 'edit x', '@/tmp/x.sql', '@@x', ' start x.sql',
+                    'sta x', 'STAR x', 'spool /tmp/x.sql', 'SPO x', 'spoo x'):
+            assert check_sql_input(sql), sql
+        for sql in ("select 'host' from dual", 'spool off', 'SPOOL', 'startup', 'show edition',
+                    "select user from dual where 'a@b' = 'a'"):
+            assert check_sql_input(sql) is None, sql
+
+
+class TestSqlSession:
+    """State survives between statements; EXIT and timeouts close the session"""
+
+    def test_session_state_persists(self, manager):
+        session, _banner = manager.open('admin')
+        assert 'CDB$ROOT' in session.execute('show con_name')
+        assert 'Session altered.' in session.execute('ALTER SESSION SET CONTAINER=GDCPDB')
+        assert 'GDCPDB' in session.execute('show con_name')
+        rows = session.execute("SELECT name FROM v$pdbs")
+        assert 'PDB$SEED' in rows and 'GDCPDB' in rows
+        assert session.statements == 4
+
+    def test_exit_closes(self, manager):
+        session, _ = manager.open('admin')
+        session.execute('exit')
+        assert not session.alive
+        with pytest.raises(SessionError):
+            session.execute('show user')
+        assert manager.get(session.id, 'admin') is None
+
+    def test_timeout_kills_session(self, manager):
+        session, _ = manager.open('admin')
+        with pytest.raises(SessionError):
+            session.execute('select 1 from dual', timeout=0)
+        assert not session.alive
+
+
+class TestSqlSessionManager:
+    """Per-user limits, ownership and idle reaping"""
+
+    def test_limits(self, manager):
+        manager.open('alice')
+        manager.open('alice')
+        with pytest.raises(SessionLimitError):
+            manager.open('alice')
+        manager.open('bob')
+        with pytest.raises(SessionLimitError):
+            manager.open('carol')       # max_total=3
+
+    def test_ownership(self, manager):
+        session, _ = manager.open('alice')
+        assert manager.get(session.id, 'bob') is None
+        assert manager.get(session.id, 'alice') is session
+
+    def test_idle_reaped(self, manager):
+        session, _ = manager.open('alice')
+        manager.idle_timeout = 0
+        assert manager.reap() == 1
+        assert not session.alive and manager.list() == []
+
+    def test_close_owner(self, manager):
+        manager.open('alice')
+        manager.open('alice')
+        assert manager.close_owner('alice') == 2
+
+
+class TestTerminalSqlApi:
+    """`sqlplus <connect>` opens a session; statements reuse it"""
+
+    @pytest.fixture
+    def client(self, monkeypatch, manager):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'sql_sessions', manager)
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        return client
+
+    def test_open_execute_exit(self, client):
+        opened = client.post('/api/terminal/sql', json={'command': 'sqlplus / as sysdba'}).get_json()
+        assert opened['success']
+        sid = opened['session_id']
+        client.post(f'/api/terminal/sql/{sid}', json={'sql': 'alter session set container=GDCPDB'})
+        out = client.post(f'/api/terminal/sql/{sid}', json={'sql': 'show con_name'}).get_json()
+        assert 'GDCPDB' in out['output'] and out['closed'] is False
+        assert client.get('/api/terminal/sql').get_json()['sessions'][0]['id'] == sid
+        assert client.post(f'/api/terminal/sql/{sid}', json={'sql': 'host id'}).get_json()['success'] is False
+        assert client.post(f'/api/terminal/sql/{sid}', json={'sql': 'exit'}).get_json()['closed'] is True
+        assert client.post(f'/api/terminal/sql/{sid}', json={'sql': 'show user'}).status_code == 404
+
+    def test_script_invocation_not_a_session(self, client):
+        data = client.post('/api/terminal/sql', json={'command': 'sqlplus / as sysdba @x.sql'}).get_json()
+        assert data['success'] is False
+
+    def test_logout_closes_sessions(self, client, manager):
+        client.post('/api/terminal/sql', json={'command': 'sqlplus / as sysdba'})
+        client.get('/logout')
+        assert manager.list('admin') == []
@@ -0,0 +1,127 @@
+"""
+Tests for streaming command execution (utils/stream.py) and the SSE terminal
+"""
+
+import json
+import sys
+import time
+
+import pytest
+
+from oracledba.utils.stream import CommandStream
+
+PY = sys.executable
+
+
+def collect(stream, heartbeat=5):
+    return [(kind, data) for kind, data in stream.events(heartbeat=heartbeat)
+            if kind != 'heartbeat']
+
+
+class TestCommandStream:
+    """Line streaming, exit codes, backpressure and cancellation"""
+
+    def test_lines_and_exit(self):
+        stream = CommandStream([PY, '-c', 'import sys; print("a"); print("b"); '
+                                          'print("oops", file=sys.stderr); sys.exit(2)']).start()
+        events = collect(stream)
+        assert [d for k, d in events if k == 'stdout'] == ['a\n', 'b\n']
+        assert ('stderr', 'oops\n') in events
+        kind, info = events[-1]
+        assert kind == 'exit' and info['code'] == 2 and not info['cancelled']
+
+    def test_lines_arrive_before_exit(self):
+        stream = CommandStream([PY, '-u', '-c',
+                                'import time; print("first"); time.sleep(30)']).start()
+        events = stream.events(heartbeat=5)
+        assert next(events) == ('stdout', 'first\n')
+        stream.cancel()
+        kind, info = [e for e in events if e[0] != 'heartbeat'][-1]
+        assert kind == 'exit' and info['cancelled'] and info['reason'] == 'cancelled'
+
+    def test_backpressure_delivers_everything(self):
+        stream = CommandStream([PY, '-c', 'for i in range(200): print(i)'], max_queue=4).start()
+        lines = []
+        for kind, data in stream.events():
+            if kind == 'stdout':
+                lines.append(int(data))
+                time.sleep(0.001)
+        assert lines == list(range(200))
+
+    def test_stalled_consumer_cancels(self):
+        stream = CommandStream([PY, '-c', 'while True: print("x" * 100)'], max_queue=2,
+                               stall_timeout=0.3).start()
+        deadline = time.time() + 10
+        while not stream.finished and time.time() < deadline:
+            time.sleep(0.1)
+        assert stream.finished
+        assert stream.cancel_reason == 'consumer stalled'
+        assert collect(stream)[-1][0] == 'exit'
+
+    def test_max_runtime(self):
+        stream = CommandStream([PY, '-c', 'import time; time.sleep(30)'], max_runtime=0.2).start()
+        kind, info = collect(stream, heartbeat=0.1)[-1]
+        assert info['cancelled'] and info['reason'].startswith('exceeded')
+
+    def test_max_runtime_without_consumer(self):
+        stream = CommandStream([PY, '-c', 'import time; time.sleep(30)'], max_runtime=0.2).start()
+        deadline = time.time() + 10
+        while not stream.finished and time.time() < deadline:
+            time.sleep(0.1)
+        assert stream.finished and stream.cancel_reason == 'exceeded 0.2s'
+        assert stream.attached is None and stream.finished_at >= stream.started
+
+
+class TestTerminalStreamApi:
+    """Same allowlist as /api/terminal/execute, SSE output, ownership"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, 'terminal_streams', {})
+        monkeypatch.setattr(web_server, '_terminal_argv',
+                            lambda command: ([PY, '-c', 'print("line 1"); print("line 2")'], None))
+        client = web_server.app.test_client()
+        with client.session_transaction() as sess:
+            sess['user'] = 'admin'
+            sess['role'] = 'admin'
+        return client
+
+    def test_allowlist(self, client):
+        for command in ('rm -rf /', 'sqlplus / as sysdba; reboot', 'ls /u01 | sh'):
+            data = client.post('/api/terminal/stream', json={'command': command}).get_json()
+            assert data['success'] is False
+
+    def test_stream_events(self, client):
+        data = client.post('/api/terminal/stream', json={'command': 'lsnrctl status'}).get_json()
+        assert data['success']
+        response = client.get(f"/api/terminal/stream/{data['stream_id']}")
+        assert response.mimetype == 'text/event-stream'
+        body = response.get_data(as_text=True)
+        assert 'event: stdout\ndata: "line 1\\n"' in body
+        exit_data = body.split('event: exit\ndata: ')[1].split('\n')[0]
+        assert json.loads(exit_data)['code'] == 0
+        # finished streams are forgotten
+        assert client.get(f"/api/terminal/stream/{data['stream_id']}").status_code == 404
+
+    def test_other_users_stream_hidden(self, client):
+        from oracledba import web_server
+        stream_id = client.post('/api/terminal/stream',
+                                json={'command': 'hostname'}).get_json()['stream_id']
+        with client.session_transaction() as sess:
+            sess['user'] = 'someone-else'
+        assert client.post(f'/api/terminal/stream/{stream_id}/cancel').status_code == 404
+        web_server.terminal_streams[stream_id].cancel()
+
+    def test_unattached_streams_reaped(self, client, monkeypatch):
+        from oracledba import web_server
+        monkeypatch.setattr(web_server, '_terminal_argv',
+                            lambda command: ([PY, '-c', 'import time; time.sleep(30)'], None))
+        stream_id = client.post('/api/terminal/stream',
+                                json={'command': 'hostname'}).get_json()['stream_id']
+        stream = web_server.terminal_streams[stream_id]
+        web_server._reap_terminal_streams()
+        assert stream_id in web_server.terminal_streams
+        web_server._reap_terminal_streams(now=time.time() + web_server.TERMINAL_ATTACH_GRACE + 1)
+        assert stream_id not in web_server.terminal_streams
+        assert stream.cancel_reason == 'client never attached'